@@ -7,7 +7,7 @@ from datetime import datetime
 from luminoracore_cli.utils.errors import CLIError
 from luminoracore_cli.utils.console import console
 from luminoracore_cli.utils.http import create_http_client
-from luminoracore_cli.utils.cache import get_cache_manager
+from luminoracore_cli.utils.cache import get_cache_manager, make_cache_key
 from luminoracore_cli.config.settings import load_settings
 
 
@@ -45,7 +45,7 @@ class LuminoraCoreClient:
         """
         try:
             # Check cache first
-            cache_key = f"validation_{hash(str(personality_data))}"
+            cache_key = make_cache_key("validation", personality_data, strict)
             cached_result = self.cache_manager.get(cache_key)
             
             if cached_result:
@@ -90,7 +90,7 @@ class LuminoraCoreClient:
                 model = getattr(self.settings, "default_model", "gpt-3.5-turbo")
             
             # Check cache first
-            cache_key = f"compile_{hash(str(personality_data))}_{provider}_{model}"
+            cache_key = make_cache_key("compile", personality_data, provider, model, include_metadata)
             cached_result = self.cache_manager.get(cache_key)
             
             if cached_result:
@@ -4,7 +4,7 @@ from .console import console, error_console
 from .errors import CLIError, ValidationError, handle_cli_error
 from .files import find_personality_files, read_json_file, write_json_file
 from .http import HTTPClient, create_http_client
-from .cache import CacheManager, get_cache_manager
+from .cache import CacheManager, get_cache_manager, make_cache_key
 from .formatting import format_personality_info, format_validation_results
 from .progress import ProgressTracker, track_progress
 
@@ -21,6 +21,7 @@ __all__ = [
     "create_http_client",
     "CacheManager",
     "get_cache_manager",
+    "make_cache_key",
     "format_personality_info",
     "format_validation_results",
     "ProgressTracker",
@@ -2,17 +2,50 @@
 
 import json
 import hashlib
+import sqlite3
 import time
 from pathlib import Path
 from typing import Dict, Any, Optional, Union
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from luminoracore_cli.utils.errors import CLIError
 from luminoracore_cli.utils.console import console
 
 
+CACHE_DB_NAME = "cache.db"
+
+# Writes between full expiry/size passes
+MAINTENANCE_INTERVAL = 64
+
+
+def make_cache_key(namespace: str, *parts: Any) -> str:
+    """
+    Build a stable cache key from a namespace and JSON-serializable parts.
+    
+    The key is a SHA-256 of the canonical JSON of the parts, so it is the
+    same in every process (unlike the salted built-in ``hash``).
+    
+    Args:
+        namespace: Key prefix (e.g. "validation")
+        *parts: Values the cached result depends on
+    
+    Returns:
+        Cache key string
+    """
+    canonical = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return f"{namespace}_{hashlib.sha256(canonical.encode()).hexdigest()}"
+
+
 class CacheManager:
-    """Manages local caching for LuminoraCore CLI."""
+    """
+    Manages local caching for LuminoraCore CLI.
+    
+    Entries live in a single SQLite file (``cache.db``) in the cache
+    directory. Expired entries are dropped when read, and the full expiry
+    and size passes run every ``MAINTENANCE_INTERVAL`` writes or as soon as
+    the cache grows past ``max_size``; size eviction removes the oldest
+    entries through an index on the creation time.
+    """
     
     def __init__(self, cache_dir: Path, max_size: int = 1073741824, ttl: int = 86400):
         """
@@ -30,200 +63,187 @@ class CacheManager:
         # Create cache directory
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
-        # Cache metadata file
-        self.metadata_file = self.cache_dir / "metadata.json"
-        self.metadata = self._load_metadata()
+        self.db_path = self.cache_dir / CACHE_DB_NAME
+        self._conn = self._connect()
+        self._writes_since_maintenance = 0
+        self._total_size = self._query_total_size()
+        self._remove_legacy_files()
     
-    def _load_metadata(self) -> Dict[str, Any]:
-        """Load cache metadata."""
-        if self.metadata_file.exists():
+    def _connect(self) -> sqlite3.Connection:
+        """Open the cache database."""
+        try:
+            conn = sqlite3.connect(str(self.db_path), timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY,"
+                " label TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_created_at ON entries (created_at)")
+            return conn
+        except sqlite3.Error as e:
+            raise CLIError(f"Failed to open cache database {self.db_path}: {e}")
+    
+    def _remove_legacy_files(self) -> None:
+        """Remove the per-entry files and metadata.json of the old cache layout."""
+        legacy_metadata = self.cache_dir / "metadata.json"
+        if not legacy_metadata.exists():
+            return
+        for cache_file in self.cache_dir.glob("*.json"):
             try:
-                with open(self.metadata_file, "r") as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
+                cache_file.unlink()
+            except OSError:
                 pass
-        
-        return {
-            "entries": {},
-            "total_size": 0,
-            "created_at": datetime.now().isoformat()
-        }
     
-    def _save_metadata(self) -> None:
-        """Save cache metadata."""
-        try:
-            with open(self.metadata_file, "w") as f:
-                json.dump(self.metadata, f, indent=2)
-        except IOError as e:
-            console.print(f"[red]Warning: Failed to save cache metadata: {e}[/red]")
+    def _query_total_size(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
     
     def _get_cache_key(self, key: str) -> str:
         """Generate cache key from string."""
-        return hashlib.md5(key.encode()).hexdigest()
+        return hashlib.sha256(key.encode()).hexdigest()
     
-    def _get_cache_path(self, cache_key: str) -> Path:
-        """Get cache file path for key."""
-        return self.cache_dir / f"{cache_key}.json"
+    def _expiry_cutoff(self) -> float:
+        return time.time() - self.ttl
     
-    def _is_expired(self, entry: Dict[str, Any]) -> bool:
-        """Check if cache entry is expired."""
-        created_at = datetime.fromisoformat(entry["created_at"])
-        return datetime.now() - created_at > timedelta(seconds=self.ttl)
-    
-    def _cleanup_expired(self) -> None:
+    def _cleanup_expired(self) -> int:
         """Remove expired cache entries."""
-        expired_keys = []
-        
-        for key, entry in self.metadata["entries"].items():
-            if self._is_expired(entry):
-                expired_keys.append(key)
-        
-        for key in expired_keys:
-            self._remove_entry(key)
+        cursor = self._conn.execute("DELETE FROM entries WHERE created_at < ?", (self._expiry_cutoff(),))
+        return cursor.rowcount
     
-    def _cleanup_size(self) -> None:
-        """Remove oldest entries if cache size exceeds limit."""
-        while self.metadata["total_size"] > self.max_size:
-            if not self.metadata["entries"]:
+    def _cleanup_size(self) -> int:
+        """Remove oldest entries while the cache exceeds its size limit."""
+        excess = self._total_size - self.max_size
+        if excess <= 0:
+            return 0
+        
+        victims = []
+        freed = 0
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY created_at"):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
                 break
-            
-            # Find oldest entry
-            oldest_key = min(
-                self.metadata["entries"].keys(),
-                key=lambda k: self.metadata["entries"][k]["created_at"]
-            )
-            
-            self._remove_entry(oldest_key)
-    
-    def _remove_entry(self, key: str) -> None:
-        """Remove cache entry."""
-        if key in self.metadata["entries"]:
-            entry = self.metadata["entries"][key]
-            cache_path = self._get_cache_path(key)
-            
-            # Remove file if it exists
-            if cache_path.exists():
-                try:
-                    cache_path.unlink()
-                except IOError:
-                    pass
-            
-            # Update metadata
-            self.metadata["total_size"] -= entry["size"]
-            del self.metadata["entries"][key]
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+        return len(victims)
+    
+    def _maintain(self) -> None:
+        """Run the expiry and size passes in one transaction."""
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._cleanup_expired()
+            self._total_size = self._query_total_size()
+            self._cleanup_size()
+            self._total_size = self._query_total_size()
+            self._conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            console.print(f"[red]Warning: Cache maintenance failed: {e}[/red]")
+        self._writes_since_maintenance = 0
     
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache."""
         cache_key = self._get_cache_key(key)
         
-        # Check if entry exists in metadata
-        if cache_key not in self.metadata["entries"]:
+        try:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM entries WHERE key = ?", (cache_key,)
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
             return None
         
-        entry = self.metadata["entries"][cache_key]
+        value, created_at = row
         
         # Check if expired
-        if self._is_expired(entry):
-            self._remove_entry(cache_key)
-            self._save_metadata()
-            return None
-        
-        # Load from file
-        cache_path = self._get_cache_path(cache_key)
-        if not cache_path.exists():
-            self._remove_entry(cache_key)
-            self._save_metadata()
+        if created_at < self._expiry_cutoff():
+            self.delete(key)
             return None
         
         try:
-            with open(cache_path, "r") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            self._remove_entry(cache_key)
-            self._save_metadata()
+            return json.loads(value)
+        except json.JSONDecodeError:
+            self.delete(key)
             return None
     
     def set(self, key: str, value: Any) -> None:
         """Set value in cache."""
         cache_key = self._get_cache_key(key)
-        cache_path = self._get_cache_path(cache_key)
         
         # Serialize value
         try:
-            json_data = json.dumps(value, indent=2)
-            json_bytes = json_data.encode()
-            size = len(json_bytes)
+            json_data = json.dumps(value, separators=(",", ":"))
+            size = len(json_data.encode())
         except (TypeError, ValueError) as e:
             raise CLIError(f"Failed to serialize cache value: {e}")
         
-        # Write to file
         try:
-            cache_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(cache_path, "w") as f:
-                f.write(json_data)
-        except IOError as e:
-            raise CLIError(f"Failed to write cache file: {e}")
-        
-        # Remove existing entry if it exists
-        if cache_key in self.metadata["entries"]:
-            self._remove_entry(cache_key)
+            self._conn.execute("BEGIN IMMEDIATE")
+            previous = self._conn.execute("SELECT size FROM entries WHERE key = ?", (cache_key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, label, value, size, created_at) VALUES (?, ?, ?, ?, ?)",
+                (cache_key, key, json_data, size, time.time())
+            )
+            self._conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            raise CLIError(f"Failed to write cache entry: {e}")
         
-        # Add to metadata
-        self.metadata["entries"][cache_key] = {
-            "key": key,
-            "size": size,
-            "created_at": datetime.now().isoformat()
-        }
-        self.metadata["total_size"] += size
+        self._total_size += size - (previous[0] if previous else 0)
+        self._writes_since_maintenance += 1
         
         # Cleanup
-        self._cleanup_expired()
-        self._cleanup_size()
-        
-        # Save metadata
-        self._save_metadata()
+        if self._total_size > self.max_size or self._writes_since_maintenance >= MAINTENANCE_INTERVAL:
+            self._maintain()
     
     def delete(self, key: str) -> bool:
         """Delete value from cache."""
         cache_key = self._get_cache_key(key)
         
-        if cache_key in self.metadata["entries"]:
-            self._remove_entry(cache_key)
-            self._save_metadata()
-            return True
-        
-        return False
+        try:
+            row = self._conn.execute("SELECT size FROM entries WHERE key = ?", (cache_key,)).fetchone()
+            if row is None:
+                return False
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (cache_key,))
+        except sqlite3.Error:
+            return False
+        
+        self._total_size -= row[0]
+        return True
     
     def clear(self) -> None:
         """Clear all cache entries."""
-        # Remove all cache files
-        for cache_file in self.cache_dir.glob("*.json"):
-            if cache_file.name != "metadata.json":
-                try:
-                    cache_file.unlink()
-                except IOError:
-                    pass
-        
-        # Reset metadata
-        self.metadata = {
-            "entries": {},
-            "total_size": 0,
-            "created_at": datetime.now().isoformat()
-        }
-        self._save_metadata()
+        self._conn.execute("DELETE FROM entries")
+        self._conn.execute("VACUUM")
+        self._total_size = 0
+        self._writes_since_maintenance = 0
     
     def info(self) -> Dict[str, Any]:
         """Get cache information."""
-        self._cleanup_expired()
+        self._maintain()
+        total_entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        created_at = self._conn.execute("SELECT MIN(created_at) FROM entries").fetchone()[0]
         
         return {
             "cache_dir": str(self.cache_dir),
-            "total_entries": len(self.metadata["entries"]),
-            "total_size": self.metadata["total_size"],
+            "cache_file": str(self.db_path),
+            "total_entries": total_entries,
+            "total_size": self._total_size,
             "max_size": self.max_size,
             "ttl": self.ttl,
-            "usage_percent": (self.metadata["total_size"] / self.max_size) * 100
+            "oldest_entry": datetime.fromtimestamp(created_at).isoformat() if created_at else None,
+            "usage_percent": (self._total_size / self.max_size) * 100
         }
+    
+    def close(self) -> None:
+        """Close the cache database."""
+        self._conn.close()
 
 
 def get_cache_manager(cache_dir: Optional[Path] = None) -> CacheManager:
@@ -0,0 +1,84 @@
+"""Tests for the cache manager."""
+
+import json
+import subprocess
+import sys
+import time
+
+import pytest
+
+from luminoracore_cli.utils.cache import CacheManager, make_cache_key
+
+
+class TestCacheKeys:
+    """Test cases for make_cache_key."""
+    
+    def test_key_is_stable_across_processes(self, sample_personality):
+        """Test that keys do not depend on the process hash seed."""
+        key = make_cache_key("validation", sample_personality, False)
+        script = (
+            "import json, sys; from luminoracore_cli.utils.cache import make_cache_key; "
+            "print(make_cache_key('validation', json.loads(sys.argv[1]), False))"
+        )
+        other = subprocess.run(
+            [sys.executable, "-c", script, json.dumps(sample_personality)],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+        
+        assert other == key
+    
+    def test_key_covers_content_and_parts(self, sample_personality):
+        """Test that content, key order and parts are handled canonically."""
+        reordered = dict(reversed(list(sample_personality.items())))
+        edited = dict(sample_personality, description="changed")
+        
+        key = make_cache_key("compile", sample_personality, "openai", "gpt-4")
+        assert make_cache_key("compile", reordered, "openai", "gpt-4") == key
+        assert make_cache_key("compile", edited, "openai", "gpt-4") != key
+        assert make_cache_key("compile", sample_personality, "anthropic", "gpt-4") != key
+
+
+class TestCacheManager:
+    """Test cases for CacheManager."""
+    
+    def test_entries_persist_in_single_file(self, temp_dir):
+        """Test that entries survive a new manager on the same directory."""
+        cache = CacheManager(temp_dir)
+        cache.set("a", {"value": 1})
+        cache.close()
+        
+        reopened = CacheManager(temp_dir)
+        assert reopened.get("a") == {"value": 1}
+        assert [path.name for path in temp_dir.iterdir() if path.suffix == ".json"] == []
+        assert reopened.delete("a") is True
+        assert reopened.get("a") is None
+    
+    def test_size_eviction_removes_oldest(self, temp_dir):
+        """Test that exceeding max_size evicts the oldest entries first."""
+        entry_size = len(json.dumps("x" * 100))
+        cache = CacheManager(temp_dir, max_size=entry_size * 3)
+        for name in "abcd":
+            cache.set(name, "x" * 100)
+        
+        assert cache.get("a") is None
+        assert all(cache.get(name) == "x" * 100 for name in "bcd")
+        assert cache.info()["total_size"] == entry_size * 3
+    
+    def test_expired_entries(self, temp_dir):
+        """Test that expired entries are not returned and are cleaned up."""
+        cache = CacheManager(temp_dir, ttl=60)
+        cache.set("old", 1)
+        cache.set("new", 2)
+        cache._conn.execute("UPDATE entries SET created_at = ? WHERE label = 'old'", (time.time() - 120,))
+        
+        assert cache.get("old") is None
+        assert cache.get("new") == 2
+        assert cache.info()["total_entries"] == 1
+    
+    def test_legacy_files_removed(self, temp_dir):
+        """Test that the old per-file cache layout is cleaned up."""
+        (temp_dir / "metadata.json").write_text("{}")
+        (temp_dir / "0123abcd.json").write_text("{}")
+        
+        CacheManager(temp_dir)
+        assert sorted(path.name for path in temp_dir.glob("*.json")) == []
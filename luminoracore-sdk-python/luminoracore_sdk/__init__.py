@@ -48,7 +48,7 @@ from .utils.exceptions import (
 )
 
 # Logging configuration
-from .logging_config import setup_logging, auto_configure, get_logger
+from .logging_config import setup_logging, auto_configure, get_logger, get_structured_logger
 
 try:
     __version__ = version("luminoracore-sdk")
@@ -99,6 +99,7 @@ __all__ = [
     "setup_logging",
     "auto_configure",
     "get_logger",
+    "get_structured_logger",
     # Version
     "__version__",
 ]
@@ -1,9 +1,12 @@
 """Analysis tools for LuminoraCore SDK."""
 
-from .sentiment_analyzer import AdvancedSentimentAnalyzer, SentimentResult
+from .sentiment_analyzer import AdvancedSentimentAnalyzer, SentimentAggregate, SentimentResult
+from .sentiment_matcher import MessageHits, SentimentMatcher
 
 __all__ = [
     "AdvancedSentimentAnalyzer",
+    "SentimentAggregate",
     "SentimentResult",
+    "MessageHits",
+    "SentimentMatcher",
 ]
-
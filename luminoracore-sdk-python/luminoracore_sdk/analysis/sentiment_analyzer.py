@@ -6,13 +6,14 @@ Real implementation of sentiment analysis using LLM providers.
 
 import asyncio
 import json
-import re
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass
+from dataclasses import dataclass, field, asdict
 import logging
+from collections import OrderedDict
 
 from ..session.storage_v1_1 import StorageV11Extension
+from .sentiment_matcher import MessageHits, SentimentMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -30,21 +31,60 @@ class SentimentResult:
     detailed_analysis: Dict[str, Any]
 
 
+@dataclass
+class SentimentAggregate:
+    """Running sentiment aggregates for incremental analysis of a session"""
+    high_water_mark: str = ""  # Last analyzed conversation_history turn key
+    message_count: int = 0
+    positive_count: int = 0
+    negative_count: int = 0
+    neutral_count: int = 0
+    emotion_counts: Dict[str, int] = field(default_factory=dict)
+    ema_score: float = 0.5
+    updated_at: str = ""
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SentimentAggregate":
+        known = cls.__dataclass_fields__
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+
 class AdvancedSentimentAnalyzer:
     """
     Advanced sentiment analyzer using LLM providers for accurate analysis
     """
     
-    def __init__(self, storage: StorageV11Extension, llm_provider=None):
+    def __init__(
+        self,
+        storage: StorageV11Extension,
+        llm_provider=None,
+        ema_alpha: float = 0.3,
+        max_cached_sessions: int = 1000
+    ):
         """
         Initialize sentiment analyzer
         
         Args:
             storage: Storage backend for persistence
             llm_provider: LLM provider for advanced analysis
+            ema_alpha: Weight of each new message in the incremental moving score
+            max_cached_sessions: Sessions whose incremental state is kept in
+                memory; the least recently used are reloaded from storage
         """
+        if not 0.0 < ema_alpha <= 1.0:
+            raise ValueError("ema_alpha must be in (0, 1]")
+        if max_cached_sessions < 1:
+            raise ValueError("max_cached_sessions must be at least 1")
         self.storage = storage
         self.llm_provider = llm_provider
+        self.ema_alpha = ema_alpha
+        self.max_cached_sessions = max_cached_sessions
+        
+        # Incremental state per session, LRU order (loaded lazily from storage)
+        self._aggregates: "OrderedDict[str, SentimentAggregate]" = OrderedDict()
         
         # Sentiment thresholds
         self.POSITIVE_THRESHOLD = 0.6
@@ -116,10 +156,50 @@ class AdvancedSentimentAnalyzer:
             ]
         }
     
+        self.compile_patterns()
+    
+    def compile_patterns(self) -> None:
+        """
+        Compile SENTIMENT_PATTERNS and EMOTION_KEYWORDS into the single-pass matcher
+        
+        Called on initialization; call again after changing either table.
+        """
+        self._matcher = SentimentMatcher(self.SENTIMENT_PATTERNS, self.EMOTION_KEYWORDS)
+    
+    def score_messages(self, messages: List[str]) -> List[Dict[str, Any]]:
+        """
+        Score many messages in one matcher pass (e.g. for backfills)
+        
+        Args:
+            messages: Message texts
+            
+        Returns:
+            Per message: sentiment_score (0-1), overall_sentiment and the
+            matched terms per polarity and emotion
+        """
+        results = []
+        for hits in self._matcher.scan_batch(messages):
+            score = self._message_score(hits)
+            if score >= self.POSITIVE_THRESHOLD:
+                overall_sentiment = "positive"
+            elif score <= self.NEGATIVE_THRESHOLD:
+                overall_sentiment = "negative"
+            else:
+                overall_sentiment = "neutral"
+            results.append({
+                "sentiment_score": score,
+                "overall_sentiment": overall_sentiment,
+                "sentiment_hits": hits.sentiments,
+                "emotions_detected": list(hits.emotions),
+                "emotion_hits": hits.emotions
+            })
+        return results
+    
     async def analyze_sentiment(
         self,
         session_id: str,
         user_id: str,
+        incremental: bool = False,
         **params
     ) -> SentimentResult:
         """
@@ -128,11 +208,16 @@ class AdvancedSentimentAnalyzer:
         Args:
             session_id: Session identifier
             user_id: User identifier
+            incremental: Only analyze turns added since the last incremental
+                run and fold them into the session's running aggregates
             **params: Additional parameters
             
         Returns:
             SentimentResult with comprehensive analysis
         """
+        if incremental:
+            return await self._analyze_incremental(session_id, user_id)
+        
         try:
             logger.info(f"Starting sentiment analysis for session {session_id}")
             
@@ -175,6 +260,213 @@ class AdvancedSentimentAnalyzer:
             logger.error(f"Sentiment analysis failed for session {session_id}: {e}")
             return self._create_error_result(session_id, str(e))
     
+    async def _analyze_incremental(self, session_id: str, user_id: str) -> SentimentResult:
+        """
+        Incremental analysis: O(new messages) parsing and matching per call
+        
+        Turn keys (turn_YYYYmmdd_HHMMSS_ffffff) sort chronologically, so the
+        high-water mark is the last analyzed key and older turns are skipped
+        without being decoded. Sessions without conversation_history turns
+        fall back to a full analysis.
+        """
+        try:
+            aggregate = await self._load_aggregate(session_id, user_id)
+            new_messages, high_water_mark = await self._get_new_conversation_data(
+                session_id, aggregate.high_water_mark
+            )
+            
+            if new_messages is None:
+                if aggregate.message_count == 0:
+                    return await self.analyze_sentiment(session_id, user_id)
+                new_messages = []
+            
+            self._fold_messages(aggregate, new_messages)
+            if high_water_mark:
+                aggregate.high_water_mark = high_water_mark
+            
+            if aggregate.message_count == 0:
+                return self._create_no_data_result(session_id)
+            
+            basic_analysis = self._aggregate_basic_analysis(aggregate)
+            emotion_analysis = self._aggregate_emotion_analysis(aggregate)
+            if new_messages:
+                advanced_analysis = await self._perform_advanced_analysis(new_messages)
+            else:
+                advanced_analysis = {"advanced_analysis": "No new messages"}
+            trend_analysis = await self._perform_trend_analysis(session_id, user_id)
+            
+            combined_result = self._combine_analyses(
+                basic_analysis, advanced_analysis, emotion_analysis, trend_analysis
+            )
+            combined_result["detailed_analysis"]["analysis_method"] = "incremental"
+            combined_result["detailed_analysis"]["incremental"] = {
+                "new_messages": len(new_messages),
+                "high_water_mark": aggregate.high_water_mark,
+                "ema_score": aggregate.ema_score
+            }
+            
+            result = SentimentResult(
+                overall_sentiment=combined_result["overall_sentiment"],
+                sentiment_score=combined_result["sentiment_score"],
+                emotions_detected=combined_result["emotions_detected"],
+                confidence=combined_result["confidence"],
+                analysis_timestamp=datetime.now().isoformat(),
+                message_count=aggregate.message_count,
+                sentiment_trend=combined_result["sentiment_trend"],
+                detailed_analysis=combined_result["detailed_analysis"]
+            )
+            
+            # Nothing new: the previous result and state are still current
+            if new_messages:
+                aggregate.updated_at = result.analysis_timestamp
+                await self._save_aggregate(session_id, user_id, aggregate)
+                await self._save_sentiment_analysis(session_id, user_id, result)
+            
+            return result
+        
+        except Exception as e:
+            logger.error(f"Incremental sentiment analysis failed for session {session_id}: {e}")
+            return self._create_error_result(session_id, str(e))
+    
+    def forget(self, session_id: str) -> None:
+        """
+        Drop a session's cached incremental state (the stored state is kept)
+        
+        Args:
+            session_id: Session identifier
+        """
+        self._aggregates.pop(session_id, None)
+    
+    async def reset_incremental_state(self, session_id: str, user_id: str) -> bool:
+        """
+        Drop a session's running aggregates so the next incremental run starts over
+        
+        Args:
+            session_id: Session identifier
+            user_id: User identifier
+        
+        Returns:
+            True if the stored state was cleared
+        """
+        self._aggregates.pop(session_id, None)
+        try:
+            await self.storage.save_memory(
+                user_id=user_id,
+                memory_key=f"sentiment_state_{session_id}",
+                memory_value=json.dumps(SentimentAggregate().to_dict()),
+                session_id=session_id
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Failed to reset sentiment state: {e}")
+            return False
+    
+    async def _load_aggregate(self, session_id: str, user_id: str) -> SentimentAggregate:
+        """Get a session's running aggregates (memory first, then storage)"""
+        aggregate = self._aggregates.get(session_id)
+        if aggregate is not None:
+            self._aggregates.move_to_end(session_id)
+            return aggregate
+        
+        aggregate = SentimentAggregate()
+        try:
+            stored = await self.storage.get_memory(user_id, f"sentiment_state_{session_id}")
+            if stored:
+                data = json.loads(stored) if isinstance(stored, str) else stored
+                aggregate = SentimentAggregate.from_dict(data)
+        except Exception as e:
+            logger.debug(f"No stored sentiment state for session {session_id}: {e}")
+        
+        self._aggregates[session_id] = aggregate
+        if len(self._aggregates) > self.max_cached_sessions:
+            self._aggregates.popitem(last=False)
+        return aggregate
+    
+    async def _save_aggregate(self, session_id: str, user_id: str, aggregate: SentimentAggregate) -> bool:
+        """Persist a session's running aggregates"""
+        try:
+            await self.storage.save_memory(
+                user_id=user_id,
+                memory_key=f"sentiment_state_{session_id}",
+                memory_value=json.dumps(aggregate.to_dict()),
+                session_id=session_id
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save sentiment state: {e}")
+            return False
+    
+    async def _get_new_conversation_data(
+        self,
+        session_id: str,
+        high_water_mark: str
+    ) -> Tuple[Optional[List[Dict[str, Any]]], str]:
+        """
+        Get conversation messages from turns newer than the high-water mark
+        
+        Returns:
+            (messages, new high-water mark); messages is None when the
+            session has no conversation_history turns at all
+        """
+        history_facts = await self.storage.get_facts(
+            user_id=session_id,
+            category="conversation_history"
+        )
+        
+        new_turns = []
+        has_turns = False
+        for fact in history_facts or []:
+            key = fact.get("key", "")
+            if not key.startswith("turn_"):
+                continue
+            has_turns = True
+            if key > high_water_mark:
+                new_turns.append((key, fact.get("value", {})))
+        
+        if not has_turns:
+            return None, high_water_mark
+        
+        new_turns.sort(key=lambda turn: turn[0])
+        messages = []
+        for key, turn_data in new_turns:
+            try:
+                if isinstance(turn_data, str):
+                    turn_data = json.loads(turn_data)
+                timestamp = turn_data.get("timestamp", "")
+                messages.append({"content": turn_data.get("user_message", ""), "type": "user", "timestamp": timestamp})
+                messages.append({"content": turn_data.get("assistant_response", ""), "type": "assistant", "timestamp": timestamp})
+            except (json.JSONDecodeError, AttributeError, TypeError) as e:
+                logger.warning(f"Error parsing conversation turn {key}: {e}")
+        
+        return messages, new_turns[-1][0] if new_turns else high_water_mark
+    
+    def _fold_messages(self, aggregate: SentimentAggregate, messages: List[Dict[str, Any]]) -> None:
+        """Add messages to running counts, emotion tallies and the moving score"""
+        alpha = self.ema_alpha
+        for hits in self._scan_messages(messages):
+            aggregate.message_count += 1
+            aggregate.positive_count += hits.has("positive")
+            aggregate.negative_count += hits.has("negative")
+            aggregate.neutral_count += hits.has("neutral")
+            for emotion in hits.emotions:
+                aggregate.emotion_counts[emotion] = aggregate.emotion_counts.get(emotion, 0) + 1
+            aggregate.ema_score = alpha * self._message_score(hits) + (1 - alpha) * aggregate.ema_score
+    
+    def _aggregate_basic_analysis(self, aggregate: SentimentAggregate) -> Dict[str, Any]:
+        """Basic analysis from running counts (same result as a full re-scan)"""
+        analysis = self._basic_analysis_from_counts(
+            aggregate.positive_count,
+            aggregate.negative_count,
+            aggregate.neutral_count,
+            aggregate.message_count
+        )
+        analysis["ema_score"] = aggregate.ema_score
+        return analysis
+    
+    def _aggregate_emotion_analysis(self, aggregate: SentimentAggregate) -> Dict[str, Any]:
+        """Emotion analysis from running tallies"""
+        return self._emotion_analysis_from_counts(dict(aggregate.emotion_counts))
+    
     async def get_sentiment_history(
         self,
         session_id: str,
@@ -331,28 +623,32 @@ class AdvancedSentimentAnalyzer:
         negative_count = 0
         neutral_count = 0
         
-        for message in conversation_data:
-            content = message.get("content", "").lower()
+        for hits in self._scan_messages(conversation_data):
+            positive_count += hits.has("positive")
+            negative_count += hits.has("negative")
+            neutral_count += hits.has("neutral")
             
-            # Check positive patterns
-            for pattern in self.SENTIMENT_PATTERNS["positive"]:
-                if re.search(pattern, content, re.IGNORECASE):
-                    positive_count += 1
-                    break
+        return self._basic_analysis_from_counts(
+            positive_count, negative_count, neutral_count, len(conversation_data)
+        )
             
-            # Check negative patterns
-            for pattern in self.SENTIMENT_PATTERNS["negative"]:
-                if re.search(pattern, content, re.IGNORECASE):
-                    negative_count += 1
-                    break
+    def _scan_messages(self, conversation_data: List[Dict[str, Any]]) -> List[MessageHits]:
+        """Sentiment and emotion hits for each message, in one matcher pass"""
+        return self._matcher.scan_batch([message.get("content", "") for message in conversation_data])
             
-            # Check neutral patterns
-            for pattern in self.SENTIMENT_PATTERNS["neutral"]:
-                if re.search(pattern, content, re.IGNORECASE):
-                    neutral_count += 1
-                    break
+    @staticmethod
+    def _message_score(hits: MessageHits) -> float:
+        """Single-message score on the same 0-1 scale as the basic analysis"""
+        return (hits.has("positive") - hits.has("negative") + 1) / 2
         
-        total_messages = len(conversation_data)
+    def _basic_analysis_from_counts(
+        self,
+        positive_count: int,
+        negative_count: int,
+        neutral_count: int,
+        total_messages: int
+    ) -> Dict[str, Any]:
+        """Sentiment score and label from per-message polarity counts"""
         if total_messages == 0:
             return {
                 "sentiment_score": 0.5,
@@ -455,15 +751,14 @@ class AdvancedSentimentAnalyzer:
         """Perform emotion detection analysis"""
         emotion_counts = {}
         
-        for message in conversation_data:
-            content = message.get("content", "").lower()
+        for hits in self._scan_messages(conversation_data):
+            for emotion in hits.emotions:
+                emotion_counts[emotion] = emotion_counts.get(emotion, 0) + 1
             
-            for emotion, keywords in self.EMOTION_KEYWORDS.items():
-                for keyword in keywords:
-                    if keyword in content:
-                        emotion_counts[emotion] = emotion_counts.get(emotion, 0) + 1
-                        break
+        return self._emotion_analysis_from_counts(emotion_counts)
         
+    def _emotion_analysis_from_counts(self, emotion_counts: Dict[str, int]) -> Dict[str, Any]:
+        """Top emotions and intensity from per-emotion message counts"""
         # Get top emotions
         top_emotions = sorted(
             emotion_counts.items(),
@@ -0,0 +1,213 @@
+"""
+Single-pass sentiment and emotion matcher.
+
+Compiles the sentiment pattern and emotion keyword tables of
+AdvancedSentimentAnalyzer into one regular expression, so each message
+is scanned once for every polarity and emotion.
+"""
+
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Tuple
+
+# A sentiment pattern that is a plain word-bounded alternation of phrases,
+# e.g. r"\b(good|great|thank you)\b"
+_LITERAL_PATTERN = re.compile(r"^\\b\((?:\?:)?([^()\[\]{}\\.*+?^$]+)\)\\b$")
+_WORD_CHAR = re.compile(r"\w")
+
+
+@dataclass
+class MessageHits:
+    """Sentiment and emotion hits for one message, in table order"""
+    sentiments: Dict[str, List[str]] = field(default_factory=dict)
+    emotions: Dict[str, List[str]] = field(default_factory=dict)
+    
+    def has(self, polarity: str) -> bool:
+        return polarity in self.sentiments
+
+
+def _trie_regex(words: List[str]) -> str:
+    """
+    Regex matching the longest of words at a position, factored by prefix
+    
+    Words ending at a node that also has children are tried last, so the
+    engine prefers the longest word and backtracks to shorter ones.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = True
+    
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        terminal = "" in node
+        if not branches:
+            return ""
+        if len(branches) == 1 and not terminal:
+            return branches[0]
+        body = "|".join(branches)
+        return f"(?:{body})?" if terminal else f"(?:{body})"
+    
+    return build(trie)
+
+
+def _word_boundary(text: str, position: int) -> bool:
+    before = position > 0 and _WORD_CHAR.match(text[position - 1]) is not None
+    after = position < len(text) and _WORD_CHAR.match(text[position]) is not None
+    return before != after
+
+
+class SentimentMatcher:
+    """
+    Precompiled matcher for sentiment patterns and emotion keywords
+    
+    Literal phrases from word-bounded sentiment patterns and all emotion
+    keywords are built into prefix tries and combined into one regex of
+    zero-width lookaheads, so overlapping hits ("no me gusta" is negative
+    and contains the positive "me gusta") are all found in a single scan.
+    At each position the regex reports the longest phrase; every shorter
+    phrase that also matches there is one of its prefixes, whose labels
+    are folded in at compile time.
+    
+    Sentiment patterns that are not plain alternations are compiled once
+    and searched separately, so custom tables keep working.
+    
+    Matching follows the analyzer's rules: sentiment phrases are whole
+    words, emotion keywords match anywhere, and text is lowercased.
+    
+    Example:
+        >>> matcher = SentimentMatcher(analyzer.SENTIMENT_PATTERNS, analyzer.EMOTION_KEYWORDS)
+        >>> matcher.scan("Thanks, I am so happy")
+        MessageHits(sentiments={'positive': ['thanks', 'happy']}, emotions={'joy': ['happy']})
+    """
+    
+    def __init__(
+        self,
+        sentiment_patterns: Dict[str, List[str]],
+        emotion_keywords: Dict[str, List[str]]
+    ):
+        """
+        Compile the tables.
+        
+        Args:
+            sentiment_patterns: Polarity -> regex patterns
+            emotion_keywords: Emotion -> substring keywords
+        """
+        self.polarities = list(sentiment_patterns)
+        self.emotions = list(emotion_keywords)
+        
+        phrase_labels: Dict[str, set] = {}
+        self._fallback: List[Tuple[str, "re.Pattern"]] = []
+        for polarity, patterns in sentiment_patterns.items():
+            for pattern in patterns:
+                literal = _LITERAL_PATTERN.match(pattern)
+                if literal is None:
+                    self._fallback.append((polarity, re.compile(pattern, re.IGNORECASE)))
+                    continue
+                for phrase in literal.group(1).split("|"):
+                    phrase = phrase.lower()
+                    if phrase:
+                        phrase_labels.setdefault(phrase, set()).add(polarity)
+        
+        keyword_labels: Dict[str, set] = {}
+        for emotion, keywords in emotion_keywords.items():
+            for keyword in keywords:
+                if keyword:
+                    keyword_labels.setdefault(keyword.lower(), set()).add(emotion)
+        
+        # Labels of every phrase that matches wherever the longest one does
+        self._phrase_hits = {
+            phrase: [
+                (shorter, label)
+                for shorter in phrase_labels
+                if phrase.startswith(shorter) and _word_boundary(phrase, len(shorter))
+                for label in phrase_labels[shorter]
+            ]
+            for phrase in phrase_labels
+        }
+        self._keyword_hits = {
+            keyword: [
+                (shorter, label)
+                for shorter in keyword_labels
+                if keyword.startswith(shorter)
+                for label in keyword_labels[shorter]
+            ]
+            for keyword in keyword_labels
+        }
+        
+        # Group s: sentiment phrase, e: emotion keyword at the same position,
+        # k: emotion keyword where no sentiment phrase starts
+        sentiment = _trie_regex(list(phrase_labels)) or "(?!)"
+        emotion = _trie_regex(list(keyword_labels)) or "(?!)"
+        self._regex: Optional["re.Pattern"] = None
+        if phrase_labels or keyword_labels:
+            self._regex = re.compile(
+                rf"(?=\b(?P<s>{sentiment})\b)(?=(?P<e>{emotion}))?|(?=(?P<k>{emotion}))"
+            )
+    
+    def _collect(self, match: "re.Match", hits: MessageHits) -> None:
+        phrase, keyword, only_keyword = match.group("s", "e", "k")
+        keyword = keyword or only_keyword
+        if phrase is not None:
+            for term, polarity in self._phrase_hits[phrase]:
+                hits.sentiments.setdefault(polarity, []).append(term)
+        if keyword is not None:
+            for term, emotion in self._keyword_hits[keyword]:
+                hits.emotions.setdefault(emotion, []).append(term)
+    
+    def _finish(self, text: str, hits: MessageHits) -> MessageHits:
+        for polarity, regex in self._fallback:
+            found = regex.search(text)
+            if found is not None:
+                hits.sentiments.setdefault(polarity, []).append(found.group(0))
+        
+        # Table order, like the per-pattern loops this replaces
+        hits.sentiments = {p: hits.sentiments[p] for p in self.polarities if p in hits.sentiments}
+        hits.emotions = {e: hits.emotions[e] for e in self.emotions if e in hits.emotions}
+        return hits
+    
+    def scan(self, text: Optional[str]) -> MessageHits:
+        """
+        Find all sentiment and emotion hits in one message.
+        
+        Args:
+            text: Message content
+        
+        Returns:
+            MessageHits with matched terms per polarity and emotion
+        """
+        text = (text or "").lower()
+        hits = MessageHits()
+        if self._regex is not None:
+            for match in self._regex.finditer(text):
+                self._collect(match, hits)
+        return self._finish(text, hits)
+    
+    def scan_batch(self, texts: List[Optional[str]]) -> List[MessageHits]:
+        """
+        Scan many messages with a single regex pass.
+        
+        Messages are joined with newlines, which no phrase or keyword
+        spans and which act as word boundaries, so hits are the same as
+        scanning each message on its own.
+        
+        Args:
+            texts: Message contents
+        
+        Returns:
+            MessageHits per message, in order
+        """
+        lowered = [(text or "").lower() for text in texts]
+        results = [MessageHits() for _ in lowered]
+        if self._regex is not None and lowered:
+            starts = []
+            offset = 0
+            for text in lowered:
+                starts.append(offset)
+                offset += len(text) + 1
+            for match in self._regex.finditer("\n".join(lowered)):
+                self._collect(match, results[bisect_right(starts, match.start()) - 1])
+        return [self._finish(text, hits) for text, hits in zip(lowered, results)]
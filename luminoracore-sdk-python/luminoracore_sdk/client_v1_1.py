@@ -4,18 +4,20 @@ LuminoraCore Client v1.1 Extensions
 Adds v1.1 API methods to the SDK client.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, AsyncGenerator
 import logging
 import json
 from datetime import datetime
 
-from .session.storage_v1_1 import StorageV11Extension
+from .session.storage_v1_1 import StorageV11Extension, INTERNAL_FACT_CATEGORIES, calculate_affinity_level
 from .session.storage_sqlite_flexible import FlexibleSQLiteStorageV11
 from .session.storage_dynamodb_flexible import FlexibleDynamoDBStorageV11
 from .session.memory_v1_1 import MemoryManagerV11
 from .evolution.personality_evolution import PersonalityEvolutionEngine
 from .analysis.sentiment_analyzer import AdvancedSentimentAnalyzer
 from .conversation_memory_manager import ConversationMemoryManager
+from .monitoring.metrics import MetricsCollector
+from .monitoring.tracer import DistributedTracer
 from .types.memory import FactDict, EpisodeDict, MemorySearchResult
 from .types.relationship import AffinityDict, AffinityProgressDict
 from .types.snapshot import PersonalitySnapshotDict, SnapshotExportOptions
@@ -36,16 +38,26 @@ class LuminoraCoreClientV11:
         episodes = await client_v11.get_episodes(user_id="user1")
     """
     
-    def __init__(self, base_client, storage_v11: Optional[StorageV11Extension] = None):
+    def __init__(
+        self,
+        base_client,
+        storage_v11: Optional[StorageV11Extension] = None,
+        metrics_collector: Optional[MetricsCollector] = None,
+        tracer: Optional[DistributedTracer] = None
+    ):
         """
         Initialize v1.1 client extensions
         
         Args:
             base_client: Base LuminoraCoreClient instance
             storage_v11: v1.1 storage instance
+            metrics_collector: Optional collector for per-stage chat metrics
+            tracer: Optional tracer for per-stage chat spans
         """
         self.base_client = base_client
         self.storage_v11 = storage_v11
+        self.metrics_collector = metrics_collector
+        self.tracer = tracer
         self.memory_v11 = MemoryManagerV11(storage_v11=storage_v11) if storage_v11 else None
         
         # Initialize advanced systems
@@ -248,7 +260,8 @@ class LuminoraCoreClientV11:
         user_message: str,
         user_id: Optional[str] = None,
         personality_name: str = "default",
-        provider_config: Optional[Dict[str, Any]] = None
+        provider_config: Optional[Dict[str, Any]] = None,
+        include_timings: bool = False
     ) -> Dict[str, Any]:
         """
         CRITICAL METHOD: Send message with full conversation context and memory
@@ -259,6 +272,9 @@ class LuminoraCoreClientV11:
             user_id: User ID (persistent across sessions) - defaults to "demo"
             personality_name: Name of the personality to use
             provider_config: LLM provider configuration
+            include_timings: Add a "timings" block with per-stage latency
+                (history fetch, fact fetch, affinity, personality load, LLM
+                call, fact extraction, affinity rating, writes) and token usage
         
         Returns:
             Response with full context and memory integration
@@ -308,8 +324,75 @@ class LuminoraCoreClientV11:
             user_message=user_message,
             user_id=user_id,  # Pass user_id to conversation manager
             personality_name=personality_name,
+            provider_config=provider_config,
+            include_timings=include_timings
+        )
+    
+    async def stream_message_with_memory(
+        self,
+        session_id: str,
+        user_message: str,
+        user_id: Optional[str] = None,
+        personality_name: str = "default",
+        provider_config: Optional[Dict[str, Any]] = None,
+        include_timings: bool = False
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Streaming variant of send_message_with_memory
+        
+        Conversation history, facts, affinity and personality are assembled
+        before the LLM call; response tokens are then yielded as the
+        provider streams them. Fact extraction and the affinity update run
+        when the stream completes and are reported in a final event.
+        
+        Args:
+            session_id: Session ID for the conversation
+            user_message: User's message
+            user_id: User ID (persistent across sessions) - defaults to session_id
+            personality_name: Name of the personality to use
+            provider_config: LLM provider configuration
+            include_timings: Add a "timings" block to the final event
+        
+        Yields:
+            {"type": "token", "content": str} per streamed chunk, then
+            {"type": "metadata", ...} with the send_message_with_memory
+            fields (response, facts_learned, new_facts, affinity_change, ...)
+        
+        Example:
+            >>> async for event in client_v11.stream_message_with_memory(session_id, "Hi!", provider_config=config):
+            ...     if event["type"] == "token":
+            ...         print(event["content"], end="")
+            ...     else:
+            ...         print(event["affinity_change"])
+        """
+        if not self.conversation_manager:
+            yield {
+                "type": "metadata",
+                "success": False,
+                "error": "Conversation memory manager not initialized",
+                "response": "I apologize, but the conversation memory system is not available."
+            }
+            return
+        
+        if user_id is None:
+            user_id = session_id
+        
+        session_id = await self.ensure_session_exists(
+            session_id=session_id,
+            user_id=user_id,
+            personality_name=personality_name,
             provider_config=provider_config
         )
+        
+        async for event in self.conversation_manager.stream_message_with_full_context(
+            session_id=session_id,
+            user_message=user_message,
+            user_id=user_id,
+            personality_name=personality_name,
+            provider_config=provider_config,
+            include_timings=include_timings
+        ):
+            yield event
     
     # MEMORY METHODS
     async def search_memories(
@@ -549,43 +632,12 @@ class LuminoraCoreClientV11:
             logger.warning("Storage v1.1 not configured")
             return None
         
-        # Get current affinity
-        affinity = await self.storage_v11.get_affinity(user_id, personality_name)
-        
-        if not affinity:
-            # Create new affinity record
-            new_points = max(0, min(100, points_delta))
-            new_level = self._calculate_affinity_level(new_points)
-            await self.storage_v11.save_affinity(
-                user_id=user_id,
-                personality_name=personality_name,
-                affinity_points=new_points,
-                current_level=new_level
-            )
-        else:
-            # Update existing
-            new_points = affinity["affinity_points"] + points_delta
-            new_points = max(0, min(100, new_points))
-            new_level = self._calculate_affinity_level(new_points)
-            
-            await self.storage_v11.save_affinity(
-                user_id=user_id,
-                personality_name=personality_name,
-                affinity_points=new_points,
-                current_level=new_level
-            )
-        
-        # Return updated affinity
-        return await self.storage_v11.get_affinity(user_id, personality_name)
+        # Single atomic read-modify-write in the storage backend (clamped to 0-100)
+        return await self.storage_v11.increment_affinity(user_id, personality_name, points_delta)
     
     def _calculate_affinity_level(self, points: int) -> str:
         """Calculate affinity level based on points"""
-        if points >= 50:
-            return "friend"
-        elif points >= 25:
-            return "acquaintance"
-        else:
-            return "stranger"
+        return calculate_affinity_level(points)
     
     # SNAPSHOT METHODS
     async def export_snapshot(
@@ -721,7 +773,8 @@ class LuminoraCoreClientV11:
         user_id: str,
         message: Optional[str] = None,
         context: Optional[List[str]] = None,
-        session_id: Optional[str] = None
+        session_id: Optional[str] = None,
+        incremental: bool = False
     ) -> Dict[str, Any]:
         """
         Analyze sentiment of user message or entire session
@@ -731,6 +784,7 @@ class LuminoraCoreClientV11:
             message: Optional message to analyze. If None and session_id provided, analyzes entire session
             context: Previous messages for context (only used if message is provided)
             session_id: Optional session ID. If provided and message is None, analyzes entire session conversations
+            incremental: For session analysis, only analyze turns added since the last incremental run
             
         Returns:
             Sentiment analysis results with:
@@ -754,7 +808,9 @@ class LuminoraCoreClientV11:
                 
                 # Use the original session_id to find conversations
                 # Conversations are stored with: get_facts(user_id=session_id, category="conversation_history")
-                result = await self.sentiment_analyzer.analyze_sentiment(session_id, user_id)
+                result = await self.sentiment_analyzer.analyze_sentiment(
+                    session_id, user_id, incremental=incremental
+                )
                 
                 return {
                     "sentiment": result.overall_sentiment,
@@ -843,14 +899,14 @@ class LuminoraCoreClientV11:
             # Get conversation history
             conversation_history = await self._get_conversation_history(session_id)
             
-            # Get user facts if session exists (excluir conversation_history)
+            # Get user facts if session exists (excluir categorías internas)
             # ✅ FIX: No incluir conversation_history en facts del usuario para export
             user_facts = []
             if session_data:
                 user_id = session_data.get("user_id", "unknown")
                 all_user_facts = await self.get_facts(user_id)
-                # Filtrar conversation_history de user_facts (los turns no son facts del usuario)
-                user_facts = [f for f in all_user_facts if f.get('category') != 'conversation_history']
+                # Filtrar conversation_history y evolution_history (no son facts del usuario)
+                user_facts = [f for f in all_user_facts if f.get('category') not in INTERNAL_FACT_CATEGORIES]
             
             export_data = {
                 "session_id": session_id,
@@ -896,10 +952,10 @@ class LuminoraCoreClientV11:
             All user conversations
         """
         try:
-            # Get all user facts (excluir conversation_history)
+            # Get all user facts (excluir categorías internas)
             # ✅ FIX: No incluir conversation_history en facts del usuario
             all_user_facts = await self.get_facts(user_id)
-            user_facts = [f for f in all_user_facts if f.get('category') != 'conversation_history']
+            user_facts = [f for f in all_user_facts if f.get('category') not in INTERNAL_FACT_CATEGORIES]
             
             # Get user affinity data
             affinity_data = {}
@@ -1079,7 +1135,8 @@ class LuminoraCoreClientV11:
         session_id: str,
         user_id: str,
         limit: int = 10,
-        include_details: bool = True
+        include_details: bool = True,
+        before: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Get personality evolution history
@@ -1089,6 +1146,7 @@ class LuminoraCoreClientV11:
             user_id: User identifier
             limit: Maximum number of entries to return
             include_details: Whether to include detailed change information
+            before: Page cursor (entry_id of the last entry of the previous page)
             
         Returns:
             List of evolution history entries
@@ -1099,7 +1157,7 @@ class LuminoraCoreClientV11:
         
         try:
             return await self.evolution_engine.get_evolution_history(
-                session_id, user_id, limit, include_details
+                session_id, user_id, limit, include_details, before=before
             )
         except Exception as e:
             logger.error(f"Failed to get evolution history: {e}")
@@ -1617,11 +1675,11 @@ class LuminoraCoreClientV11:
             # Get conversation history
             conversation_history = await self.conversation_manager._get_conversation_history(session_id)
             
-            # Get user facts (excluir conversation_history)
+            # Get user facts (excluir categorías internas)
             # ✅ FIX: No incluir conversation_history en facts del usuario
             user_id = session_data.get('user_id', session_id)
             all_user_facts = await self.get_facts(user_id)
-            user_facts = [f for f in all_user_facts if f.get('category') != 'conversation_history']
+            user_facts = [f for f in all_user_facts if f.get('category') not in INTERNAL_FACT_CATEGORIES]
             
             # Get affinity
             personality_name = session_data.get('personality_name', 'default')
@@ -1657,10 +1715,10 @@ class LuminoraCoreClientV11:
             if not self.storage_v11:
                 return json.dumps({"error": "Storage v1.1 not configured"})
             
-            # Get all user data (excluir conversation_history)
+            # Get all user data (excluir categorías internas)
             # ✅ FIX: No incluir conversation_history en facts del usuario
             all_user_facts = await self.get_facts(user_id)
-            user_facts = [f for f in all_user_facts if f.get('category') != 'conversation_history']
+            user_facts = [f for f in all_user_facts if f.get('category') not in INTERNAL_FACT_CATEGORIES]
             affinity_data = await self.get_affinity(user_id, "default")
             sentiment_history = await self.get_sentiment_history(user_id)
             mood_history = await self.get_mood_history(user_id, "default")
@@ -8,7 +8,7 @@ import asyncio
 import json
 import time
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple, AsyncGenerator
 from datetime import datetime
 from dataclasses import dataclass
 
@@ -16,6 +16,11 @@ logger = logging.getLogger(__name__)
 
 # from .client_v1_1 import LuminoraCoreClientV11  # Avoid circular import
 from .types.provider import ProviderConfig
+from .monitoring.stages import StageTimer, NULL_STAGE_TIMER
+from .session.storage_v1_1 import INTERNAL_FACT_CATEGORIES
+from .logging_config import StructuredLogger, Lazy
+
+log = StructuredLogger(logger)
 
 
 @dataclass
@@ -59,7 +64,8 @@ class ConversationMemoryManager:
         user_message: str,
         user_id: str = "demo",
         personality_name: str = "default",
-        provider_config: Optional[ProviderConfig] = None
+        provider_config: Optional[ProviderConfig] = None,
+        include_timings: bool = False
     ) -> Dict[str, Any]:
         """
         CRITICAL METHOD: Send message with full conversation context
@@ -70,10 +76,16 @@ class ConversationMemoryManager:
             user_id: User ID (persistent across sessions) - defaults to "demo"
             personality_name: Name of the personality to use
             provider_config: LLM provider configuration
+            include_timings: Add a "timings" block (per-stage milliseconds
+                and token usage) to the response
         
         Returns:
             Response with full context and memory integration
         
+        Stage timings are also recorded in the client's metrics collector
+        and tracer when those are configured; with neither configured and
+        include_timings=False, timing is a no-op.
+        
         This is the method that should be used instead of individual message sending.
         It:
         1. Gets conversation history
@@ -85,6 +97,13 @@ class ConversationMemoryManager:
         7. Updates conversation history
         8. Updates affinity based on interaction
         """
+        timer = StageTimer.create(
+            "chat_turn",
+            enabled=include_timings,
+            metrics=getattr(self.client, "metrics_collector", None),
+            tracer=getattr(self.client, "tracer", None)
+        )
+        
         try:
             # Ensure session_id is not None
             if not session_id:
@@ -94,53 +113,195 @@ class ConversationMemoryManager:
             if not user_id:
                 user_id = session_id
             
-            # Step 1: Get conversation history
-            conversation_history = await self._get_conversation_history(session_id)
-            
-            # Step 2: Get user facts from memory (excluir conversation_history)
-            # ✅ FIX: No incluir conversation_history en facts del usuario para contexto
-            # Los turns de conversación se guardan como facts pero no deben usarse como facts
-            all_user_facts = await self.client.get_facts(user_id)
-            user_facts = [f for f in all_user_facts if f.get('category') != 'conversation_history']
-            
-            # Step 3: Get user affinity/relationship level
-            affinity = await self.client.get_affinity(user_id, personality_name)
+            # Steps 1-4: history, facts, affinity and LLM context
+            conversation_history, user_facts, affinity, context = await self._load_turn_context(
+                session_id, user_id, user_message, personality_name, timer
+            )
             
-            # Handle case where affinity is None (new user)
-            if affinity is None:
-                affinity = {
-                    "current_level": "stranger",
-                    "affinity_points": 0,
-                    "total_interactions": 0,
-                    "positive_interactions": 0
-                }
+            # Step 5: Generate response with full context
+            response = await self._generate_response_with_context(
+                context=context,
+                provider_config=provider_config,
+                timer=timer
+            )
             
-            # Step 4: Build complete context for LLM
-            context = await self._build_llm_context(
+            # Steps 6-9: facts, conversation turn and affinity
+            result = await self._complete_turn(
                 session_id=session_id,
+                user_id=user_id,
+                user_message=user_message,
                 personality_name=personality_name,
+                provider_config=provider_config,
                 conversation_history=conversation_history,
                 user_facts=user_facts,
                 affinity=affinity,
-                current_message=user_message
+                response_content=response["content"],
+                timer=timer
             )
             
-            # Step 5: Generate response with full context
-            response = await self._generate_response_with_context(
-                context=context,
-                provider_config=provider_config
+        except Exception as e:
+            result = self._error_result(e)
+        
+        timings = timer.finish()
+        if include_timings:
+            result["timings"] = timings
+        return result
+    
+    async def stream_message_with_full_context(
+        self,
+        session_id: str,
+        user_message: str,
+        user_id: str = "demo",
+        personality_name: str = "default",
+        provider_config: Optional[ProviderConfig] = None,
+        include_timings: bool = False
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Streaming variant of send_message_with_full_context
+        
+        Context assembly (history, facts, affinity, personality) happens
+        before the LLM call, then response tokens are yielded as the
+        provider streams them. Fact extraction, the conversation turn and
+        the affinity update run once the stream completes.
+        
+        Args:
+            session_id: Session ID for the conversation
+            user_message: User's message
+            user_id: User ID (persistent across sessions) - defaults to "demo"
+            personality_name: Name of the personality to use
+            provider_config: LLM provider configuration
+            include_timings: Add a "timings" block to the metadata event
+        
+        Yields:
+            {"type": "token", "content": ...} per streamed chunk, then one
+            {"type": "metadata", ...} event with the same fields as the
+            send_message_with_full_context result (facts_learned,
+            new_facts, affinity_change, ...)
+        """
+        timer = StageTimer.create(
+            "chat_turn",
+            enabled=include_timings,
+            metrics=getattr(self.client, "metrics_collector", None),
+            tracer=getattr(self.client, "tracer", None)
+        )
+        
+        try:
+            if not session_id:
+                session_id = f"session_{int(time.time())}"
+            if not user_id:
+                user_id = session_id
+            
+            conversation_history, user_facts, affinity, context = await self._load_turn_context(
+                session_id, user_id, user_message, personality_name, timer
             )
             
-            # Step 6: Extract new facts from the conversation
+            response: Dict[str, Any] = {}
+            stream = self._stream_response_with_context(context, provider_config, timer, response)
+            try:
+                async for token in stream:
+                    yield {"type": "token", "content": token}
+            finally:
+                await stream.aclose()
+            
+            result = await self._complete_turn(
+                session_id=session_id,
+                user_id=user_id,
+                user_message=user_message,
+                personality_name=personality_name,
+                provider_config=provider_config,
+                conversation_history=conversation_history,
+                user_facts=user_facts,
+                affinity=affinity,
+                response_content=response["content"],
+                timer=timer
+            )
+        
+        except (GeneratorExit, asyncio.CancelledError):
+            # Consumer stopped reading: close the timer's trace and stop
+            timer.finish()
+            raise
+        except Exception as e:
+            result = self._error_result(e)
+        
+        timings = timer.finish()
+        if include_timings:
+            result["timings"] = timings
+        yield {"type": "metadata", **result}
+    
+    async def _load_turn_context(
+        self,
+        session_id: str,
+        user_id: str,
+        user_message: str,
+        personality_name: str,
+        timer: StageTimer = NULL_STAGE_TIMER
+    ) -> Tuple[List[ConversationTurn], List[Dict[str, Any]], Dict[str, Any], ConversationContext]:
+        """Steps 1-4 of a turn: history, user facts, affinity and the LLM context"""
+        
+        # Step 1: Get conversation history
+        with timer.stage("history_fetch"):
+            conversation_history = await self._get_conversation_history(session_id)
+        
+        # Step 2: Get user facts from memory (excluir categorías internas)
+        # ✅ FIX: No incluir conversation_history en facts del usuario para contexto
+        # Los turns de conversación se guardan como facts pero no deben usarse como facts
+        with timer.stage("fact_fetch"):
+            all_user_facts = await self.client.get_facts(user_id)
+        user_facts = [f for f in all_user_facts if f.get('category') not in INTERNAL_FACT_CATEGORIES]
+        
+        # Step 3: Get user affinity/relationship level
+        with timer.stage("affinity_fetch"):
+            affinity = await self.client.get_affinity(user_id, personality_name)
+        
+        # Handle case where affinity is None (new user)
+        if affinity is None:
+            affinity = {
+                "current_level": "stranger",
+                "affinity_points": 0,
+                "total_interactions": 0,
+                "positive_interactions": 0
+            }
+        
+        # Step 4: Build complete context for LLM
+        context = await self._build_llm_context(
+            session_id=session_id,
+            personality_name=personality_name,
+            conversation_history=conversation_history,
+            user_facts=user_facts,
+            affinity=affinity,
+            current_message=user_message
+        )
+        
+        return conversation_history, user_facts, affinity, context
+    
+    async def _complete_turn(
+        self,
+        session_id: str,
+        user_id: str,
+        user_message: str,
+        personality_name: str,
+        provider_config: Optional[ProviderConfig],
+        conversation_history: List[ConversationTurn],
+        user_facts: List[Dict[str, Any]],
+        affinity: Dict[str, Any],
+        response_content: str,
+        timer: StageTimer = NULL_STAGE_TIMER
+    ) -> Dict[str, Any]:
+        """Steps 6-9 of a turn: extract and save facts, save the turn, update affinity"""
+        
+        # Step 6: Extract new facts from the conversation
+        with timer.stage("fact_extraction"):
             new_facts = await self._extract_facts_from_conversation(
                 session_id=session_id,
                 user_message=user_message,
-                assistant_response=response["content"],
+                assistant_response=response_content,
                 existing_facts=user_facts,
-                provider_config=provider_config  # Pass provider_config
+                provider_config=provider_config,  # Pass provider_config
+                timer=timer
             )
-            
-            # Step 7: Save new facts to memory
+        
+        # Step 7: Save new facts to memory
+        with timer.stage("writes"):
             for fact in new_facts:
                 await self.client.save_fact(
                     user_id=user_id,  # Facts are per USER, not per session
@@ -150,55 +311,57 @@ class ConversationMemoryManager:
                     confidence=fact["confidence"],
                     session_id=session_id  # Track which session learned this fact
                 )
-            
-            # Step 8: Save conversation turn
-            conversation_turn = ConversationTurn(
-                user_message=user_message,
-                assistant_response=response["content"],
-                personality_name=personality_name,
-                timestamp=datetime.now(),
-                facts_learned=new_facts
-            )
-            
+        
+        # Step 8: Save conversation turn
+        conversation_turn = ConversationTurn(
+            user_message=user_message,
+            assistant_response=response_content,
+            personality_name=personality_name,
+            timestamp=datetime.now(),
+            facts_learned=new_facts
+        )
+        
+        with timer.stage("writes"):
             await self._save_conversation_turn(session_id, conversation_turn)
-            
-            # Step 9: Update affinity based on interaction
-            affinity_change = await self._update_affinity_from_interaction(
-                session_id=session_id,
-                conversation_turn=conversation_turn,
-                current_affinity=affinity,
-                provider_config=provider_config  # Pass provider_config
-            )
-            
-            # ✅ FIX: Calculate context_used correctly based on actual context
-            # context_used should be True if we had previous context to use
-            # - If there are previous conversation turns → context was used
-            # - If there are existing user facts → context was used
-            # - If both are empty (first message) → NO context used
-            context_used = len(conversation_history) > 0 or len(user_facts) > 0
-            
-            return {
-                "success": True,
-                "response": response["content"],
-                "personality_name": personality_name,
-                "facts_learned": len(new_facts),
-                "memory_facts_count": len(user_facts),
-                "user_facts": user_facts,
-                "affinity_level": affinity["current_level"],
-                "affinity_points": affinity["affinity_points"],
-                "conversation_length": len(conversation_history) + 1,
-                "context_used": context_used,  # ✅ CORRECT: Based on actual context
-                "new_facts": new_facts,
-                "affinity_change": affinity_change
-            }
-            
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "response": f"I apologize, but I encountered an error: {str(e)}. Please try again.",
-                "context_used": False
-            }
+        
+        # Step 9: Update affinity based on interaction
+        affinity_change = await self._update_affinity_from_interaction(
+            session_id=session_id,
+            conversation_turn=conversation_turn,
+            current_affinity=affinity,
+            provider_config=provider_config,  # Pass provider_config
+            timer=timer
+        )
+        
+        # ✅ FIX: Calculate context_used correctly based on actual context
+        # context_used should be True if we had previous context to use
+        # - If there are previous conversation turns → context was used
+        # - If there are existing user facts → context was used
+        # - If both are empty (first message) → NO context used
+        context_used = len(conversation_history) > 0 or len(user_facts) > 0
+        
+        return {
+            "success": True,
+            "response": response_content,
+            "personality_name": personality_name,
+            "facts_learned": len(new_facts),
+            "memory_facts_count": len(user_facts),
+            "user_facts": user_facts,
+            "affinity_level": affinity["current_level"],
+            "affinity_points": affinity["affinity_points"],
+            "conversation_length": len(conversation_history) + 1,
+            "context_used": context_used,  # ✅ CORRECT: Based on actual context
+            "new_facts": new_facts,
+            "affinity_change": affinity_change
+        }
+    
+    def _error_result(self, error: Exception) -> Dict[str, Any]:
+        return {
+            "success": False,
+            "error": str(error),
+            "response": f"I apologize, but I encountered an error: {str(error)}. Please try again.",
+            "context_used": False
+        }
     
     async def _get_conversation_history(self, session_id: str) -> List[ConversationTurn]:
         """Get conversation history for the session"""
@@ -230,7 +393,7 @@ class ConversationMemoryManager:
                             facts_learned=turn_data.get("facts_learned", [])
                         ))
                     except (json.JSONDecodeError, KeyError, TypeError) as e:
-                        print(f"Error parsing conversation turn: {e}")
+                        log.warning("Error parsing conversation turn: %s", e, session_id=session_id)
                         continue
             
             # Sort by timestamp and return last N turns
@@ -238,7 +401,7 @@ class ConversationMemoryManager:
             return conversation_history[-self.max_history_turns:]
             
         except Exception as e:
-            print(f"Error getting conversation history: {e}")
+            log.warning("Error getting conversation history: %s", e, session_id=session_id)
             return []
     
     async def _build_llm_context(
@@ -458,149 +621,234 @@ class ConversationMemoryManager:
         
         return "\n".join(prompt_parts)
     
+    async def _build_chat_messages(
+        self,
+        context: ConversationContext,
+        timer: StageTimer = NULL_STAGE_TIMER
+    ) -> List[Any]:
+        """Build the system and user messages for the LLM call"""
+        from .types.provider import ChatMessage
+        
+        # Build a comprehensive context string for the LLM
+        context_parts = []
+        
+        # ✅ FIX: Load and apply personality data from JSON file
+        with timer.stage("personality_load"):
+            personality_data = await self._load_personality_data(context.personality_name)
+        if personality_data:
+            # Build complete personality prompt from JSON
+            personality_prompt = self._build_personality_prompt(personality_data, context.personality_name)
+            context_parts.append(personality_prompt)
+        else:
+            # Fallback to simple name if file not found
+            context_parts.append(f"You are {context.personality_name}, an AI personality.")
+        
+        # Relationship context
+        context_parts.append(f"\nCurrent relationship level: {context.affinity['current_level']} ({context.affinity['affinity_points']}/100 points)")
+        
+        # 2. User facts context
+        if context.user_facts:
+            facts_text = ', '.join([f"{fact['key']}: {fact['value']}" for fact in context.user_facts])
+            context_parts.append(f"User Facts: {facts_text}")
+        else:
+            context_parts.append("User Facts: No facts yet")
+        
+        # 3. Conversation history
+        if context.conversation_history:
+            history_text = '\n'.join([f"User: {turn.user_message}\nAssistant: {turn.assistant_response}" for turn in context.conversation_history[-3:]])
+            context_parts.append(f"Conversation History:\n{history_text}")
+        else:
+            context_parts.append("Conversation History: No previous conversation")
+        
+        # 4. Instructions based on relationship level
+        if context.affinity['current_level'] == 'stranger':
+            context_parts.append("Instructions: Be professional and formal. Ask questions to learn about the user.")
+        elif context.affinity['current_level'] == 'acquaintance':
+            context_parts.append("Instructions: Be friendly and polite. Reference what you know about the user.")
+        elif context.affinity['current_level'] == 'friend':
+            context_parts.append("Instructions: Be casual and friendly. Reference previous conversations and shared experiences.")
+        elif context.affinity['current_level'] == 'close_friend':
+            context_parts.append("Instructions: Be personal and warm. Show deep understanding of the user and their preferences.")
+        
+        # 5. Current message
+        context_parts.append(f"Current User Message: {context.current_message}")
+        
+        # Build the complete context string
+        full_context = "\n\n".join(context_parts)
+        
+        return [
+            ChatMessage(role="system", content=full_context),
+            ChatMessage(role="user", content=context.current_message)
+        ]
+    
+    def _provider_config_object(self, provider_config: Optional[ProviderConfig]) -> Optional[ProviderConfig]:
+        # Convert dict to ProviderConfig if needed
+        if isinstance(provider_config, dict):
+            return ProviderConfig(
+                name=provider_config.get("name", "deepseek"),
+                api_key=provider_config.get("api_key", "mock-key"),
+                model=provider_config.get("model", "deepseek-chat")
+            )
+        return provider_config
+    
+    def _response_metadata(self, context: ConversationContext, provider_config_obj: ProviderConfig) -> Dict[str, Any]:
+        return {
+            "context_used": True,
+            "personality_name": context.personality_name,
+            "affinity_level": context.affinity['current_level'],
+            "facts_count": len(context.user_facts),
+            "history_length": len(context.conversation_history),
+            "provider_used": provider_config_obj.name if provider_config_obj else "unknown"
+        }
+    
+    def _fallback_response(self, context: ConversationContext, error: Optional[Exception] = None) -> Dict[str, Any]:
+        fallback_response = self._create_context_aware_fallback_response(context)
+        if error is None:
+            # Fallback: context-aware response without LLM
+            log.debug("Using context-aware fallback response")
+            extra = {"fallback": True}
+        else:
+            # Error handling - use context-aware fallback instead of generic error
+            extra = {"error": True, "error_message": str(error)}
+        return {
+            "content": fallback_response["content"],
+            "metadata": {
+                **fallback_response["metadata"],
+                **extra
+            }
+        }
+    
     async def _generate_response_with_context(
         self,
         context: ConversationContext,
-        provider_config: Optional[ProviderConfig] = None
+        provider_config: Optional[ProviderConfig] = None,
+        timer: StageTimer = NULL_STAGE_TIMER
     ) -> Dict[str, Any]:
         """Generate response using LLM with full context"""
         
         try:
-            # Build a comprehensive context string for the LLM
-            context_parts = []
-            
-            # ✅ FIX: Load and apply personality data from JSON file
-            personality_data = await self._load_personality_data(context.personality_name)
-            if personality_data:
-                # Build complete personality prompt from JSON
-                personality_prompt = self._build_personality_prompt(personality_data, context.personality_name)
-                context_parts.append(personality_prompt)
-            else:
-                # Fallback to simple name if file not found
-                context_parts.append(f"You are {context.personality_name}, an AI personality.")
-            
-            # Relationship context
-            context_parts.append(f"\nCurrent relationship level: {context.affinity['current_level']} ({context.affinity['affinity_points']}/100 points)")
-            
-            # 2. User facts context
-            if context.user_facts:
-                facts_text = ', '.join([f"{fact['key']}: {fact['value']}" for fact in context.user_facts])
-                context_parts.append(f"User Facts: {facts_text}")
-            else:
-                context_parts.append("User Facts: No facts yet")
-            
-            # 3. Conversation history
-            if context.conversation_history:
-                history_text = '\n'.join([f"User: {turn.user_message}\nAssistant: {turn.assistant_response}" for turn in context.conversation_history[-3:]])
-                context_parts.append(f"Conversation History:\n{history_text}")
-            else:
-                context_parts.append("Conversation History: No previous conversation")
-            
-            # 4. Instructions based on relationship level
-            if context.affinity['current_level'] == 'stranger':
-                context_parts.append("Instructions: Be professional and formal. Ask questions to learn about the user.")
-            elif context.affinity['current_level'] == 'acquaintance':
-                context_parts.append("Instructions: Be friendly and polite. Reference what you know about the user.")
-            elif context.affinity['current_level'] == 'friend':
-                context_parts.append("Instructions: Be casual and friendly. Reference previous conversations and shared experiences.")
-            elif context.affinity['current_level'] == 'close_friend':
-                context_parts.append("Instructions: Be personal and warm. Show deep understanding of the user and their preferences.")
-            
-            # 5. Current message
-            context_parts.append(f"Current User Message: {context.current_message}")
-            
-            # Build the complete context string
-            full_context = "\n\n".join(context_parts)
+            messages = await self._build_chat_messages(context, timer)
+            provider_config_obj = self._provider_config_object(provider_config)
             
             # ✅ SOLUTION: Use Provider directly instead of base_client.send_message()
             # This avoids the requirement for an existing session in DynamoDB
-            
-            # Convert dict to ProviderConfig if needed
-            if isinstance(provider_config, dict):
-                from .types.provider import ProviderConfig
-                provider_config_obj = ProviderConfig(
-                    name=provider_config.get("name", "deepseek"),
-                    api_key=provider_config.get("api_key", "mock-key"),
-                    model=provider_config.get("model", "deepseek-chat")
-                )
-            else:
-                provider_config_obj = provider_config
-            
             if provider_config_obj:
                 try:
-                    # Import ProviderFactory
                     from .providers.factory import ProviderFactory
                     
                     # Create provider instance
                     provider = ProviderFactory.create_provider(provider_config_obj)
                     
-                    # Create the complete prompt with context
-                    system_prompt = full_context
-                    user_prompt = context.current_message
-                    
-                    # Prepare messages for the provider
-                    from .types.provider import ChatMessage
-                    messages = [
-                        ChatMessage(role="system", content=system_prompt),
-                        ChatMessage(role="user", content=user_prompt)
-                    ]
-                    
                     # Call provider directly (doesn't require session to exist)
-                    print(f"🔍 DEBUG: Calling LLM provider directly with context length: {len(full_context)}")
-                    response = await provider.chat(
-                        messages=messages,
-                        temperature=0.7
-                    )
+                    log.debug("Calling LLM provider directly", context_length=len(messages[0].content))
+                    with timer.stage("llm_call"):
+                        response = await provider.chat(
+                            messages=messages,
+                            temperature=0.7
+                        )
+                    timer.add_usage("llm_call", getattr(response, "usage", None))
                     
                     # Extract content
                     content = response.content if hasattr(response, 'content') else str(response)
                     
-                    print(f"🔍 DEBUG: LLM response received: {content[:100]}...")
+                    log.debug("LLM response received: %.100s", content)
                     
                     return {
                         "content": content,
-                        "metadata": {
-                            "context_used": True,
-                            "personality_name": context.personality_name,
-                            "affinity_level": context.affinity['current_level'],
-                            "facts_count": len(context.user_facts),
-                            "history_length": len(context.conversation_history),
-                            "provider_used": provider_config_obj.name if provider_config_obj else "unknown"
-                        }
+                        "metadata": self._response_metadata(context, provider_config_obj)
                     }
                     
                 except Exception as e:
-                    print(f"🔍 DEBUG: Provider direct call failed: {e}")
-                    import traceback
-                    traceback.print_exc()
+                    log.error("Provider direct call failed: %s", e, exc_info=True)
                     # Fall through to fallback
                     pass
             
-            # Fallback: context-aware response without LLM
-            print(f"🔍 DEBUG: Using context-aware fallback response")
-            fallback_response = self._create_context_aware_fallback_response(context)
-            return {
-                "content": fallback_response["content"],
-                "metadata": {
-                    **fallback_response["metadata"],
-                    "fallback": True
-                }
-            }
+            return self._fallback_response(context)
                 
         except Exception as e:
-            # Error handling - use context-aware fallback instead of generic error
-            print(f"🔍 DEBUG: Error in _generate_response_with_context: {e}")
-            import traceback
-            traceback.print_exc()
-            fallback_response = self._create_context_aware_fallback_response(context)
-            return {
-                "content": fallback_response["content"],
-                "metadata": {
-                    **fallback_response["metadata"],
-                    "error": True, 
-                    "error_message": str(e)
-                }
-            }
+            log.error("Error in _generate_response_with_context: %s", e, exc_info=True)
+            return self._fallback_response(context, error=e)
+    
+    async def _stream_response_with_context(
+        self,
+        context: ConversationContext,
+        provider_config: Optional[ProviderConfig],
+        timer: StageTimer,
+        response: Dict[str, Any]
+    ) -> AsyncGenerator[str, None]:
+        """
+        Stream the LLM response with full context
+        
+        Yields content chunks as the provider streams them and, once done,
+        fills ``response`` with the same content and metadata that
+        _generate_response_with_context returns. If the stream fails
+        before its first chunk, the context-aware fallback is yielded as a
+        single chunk; if it fails later, the partial response is kept.
+        """
+        try:
+            messages = await self._build_chat_messages(context, timer)
+            provider_config_obj = self._provider_config_object(provider_config)
+        except Exception as e:
+            log.error("Error in _stream_response_with_context: %s", e, exc_info=True)
+            response.update(self._fallback_response(context, error=e))
+            yield response["content"]
+            return
+        
+        chunks: List[str] = []
+        if provider_config_obj:
+            usage = None
+            try:
+                from .providers.factory import ProviderFactory
+                provider = ProviderFactory.create_provider(provider_config_obj)
+                
+                log.debug("Streaming from LLM provider directly", context_length=len(messages[0].content))
+                # Only the waits on the provider count as llm_call; time the
+                # consumer holds a yielded chunk belongs to the consumer
+                provider_seconds = 0.0
+                provider_stream = provider.stream_chat(messages=messages, temperature=0.7).__aiter__()
+                try:
+                    while True:
+                        started = time.perf_counter()
+                        try:
+                            chunk = await provider_stream.__anext__()
+                        except StopAsyncIteration:
+                            break
+                        finally:
+                            provider_seconds += time.perf_counter() - started
+                        # Providers report usage on the last chunk(s), not per chunk
+                        usage = getattr(chunk, "usage", None) or usage
+                        if chunk.content:
+                            chunks.append(chunk.content)
+                            yield chunk.content
+                finally:
+                    timer.add_duration("llm_call", provider_seconds)
+                    # A consumer that stops early must not leave the HTTP stream open
+                    aclose = getattr(provider_stream, "aclose", None)
+                    if aclose is not None:
+                        await aclose()
+                timer.add_usage("llm_call", usage)
+                
+                response["content"] = "".join(chunks)
+                response["metadata"] = {**self._response_metadata(context, provider_config_obj), "streamed": True}
+                log.debug("LLM stream finished: %.100s", Lazy(lambda: response["content"]))
+                return
+            
+            except Exception as e:
+                if chunks:
+                    log.error("Provider stream interrupted: %s", e, exc_info=True)
+                    timer.add_usage("llm_call", usage)
+                    response["content"] = "".join(chunks)
+                    response["metadata"] = {
+                        **self._response_metadata(context, provider_config_obj),
+                        "streamed": True,
+                        "error": True,
+                        "error_message": str(e)
+                    }
+                    return
+                log.error("Provider stream failed: %s", e, exc_info=True)
+        
+        response.update(self._fallback_response(context))
+        yield response["content"]
     
     def _create_context_aware_fallback_response(self, context: ConversationContext) -> Dict[str, Any]:
         """
@@ -641,7 +889,8 @@ class ConversationMemoryManager:
         user_message: str,
         assistant_response: str,
         existing_facts: List[Dict[str, Any]],
-        provider_config: Optional[ProviderConfig] = None
+        provider_config: Optional[ProviderConfig] = None,
+        timer: StageTimer = NULL_STAGE_TIMER
     ) -> List[Dict[str, Any]]:
         """
         Extract new facts from the conversation using LLM
@@ -653,8 +902,11 @@ class ConversationMemoryManager:
         
         new_facts = []
         
-        print(f"🔍 DEBUG: Starting fact extraction for user message: '{user_message[:50]}...'")
-        print(f"🔍 DEBUG: Existing facts count: {len(existing_facts)}")
+        log.debug(
+            "Starting fact extraction for user message: %.50s",
+            user_message,
+            existing_facts_count=len(existing_facts)
+        )
         
         # ✅ USE LLM FOR INTELLIGENT FACT EXTRACTION (NO HARDCODING)
         if hasattr(self.client, 'base_client') and self.client.base_client:
@@ -699,7 +951,11 @@ JSON response:"""
                 
                 # ✅ SOLUTION: Use Provider directly for fact extraction
                 # This avoids the requirement for an existing session in DynamoDB
-                print(f"🔍 DEBUG: Calling LLM provider directly for fact extraction: {provider_config.name if provider_config else 'None'}")
+                log.debug(
+                    "Calling LLM provider directly for fact extraction: %s",
+                    Lazy(lambda: provider_config.get("name") if isinstance(provider_config, dict)
+                         else getattr(provider_config, "name", None))
+                )
                 
                 # Convert dict to ProviderConfig if needed
                 if isinstance(provider_config, dict):
@@ -727,11 +983,12 @@ JSON response:"""
                         messages=messages,
                         temperature=0.3  # Lower temperature for more deterministic extraction
                     )
+                    timer.add_usage("fact_extraction", getattr(response, "usage", None))
                     
                     content = response.content if hasattr(response, 'content') else str(response)
-                    print(f"🔍 DEBUG: LLM response received for fact extraction: {content[:100]}...")
+                    log.debug("LLM response received for fact extraction: %.100s", content)
                 else:
-                    print(f"🔍 DEBUG: No provider config available for fact extraction")
+                    log.debug("No provider config available for fact extraction")
                     content = ""
                 
                 # Parse LLM response (content already extracted above)
@@ -739,20 +996,16 @@ JSON response:"""
                 # Try to extract JSON from response
                 import re
                 json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', content, re.DOTALL)
-                print(f"🔍 DEBUG: JSON match found: {json_match is not None}")
                 
                 if json_match:
                     json_str = json_match.group(0)
-                    print(f"🔍 DEBUG: Extracted JSON string: {json_str}")
                     try:
                         extracted_data = json.loads(json_str)
-                        print(f"🔍 DEBUG: Parsed JSON data: {extracted_data}")
                         
                         if isinstance(extracted_data, dict) and "facts" in extracted_data:
-                            print(f"🔍 DEBUG: Found {len(extracted_data['facts'])} facts in response")
+                            log.debug("Found %d facts in response", len(extracted_data["facts"]))
                             
                             for i, fact_data in enumerate(extracted_data["facts"]):
-                                print(f"🔍 DEBUG: Processing fact {i+1}: {fact_data}")
                                 
                                 # Check if fact already exists
                                 exists = any(
@@ -761,7 +1014,6 @@ JSON response:"""
                                     for f in existing_facts
                                 )
                                 
-                                print(f"🔍 DEBUG: Fact exists: {exists}, confidence: {fact_data.get('confidence', 0)}")
                                 
                                 if not exists and fact_data.get('confidence', 0) > 0.7:
                                     # ✅ FIX: Asegurar que value sea siempre string (no objeto)
@@ -782,26 +1034,32 @@ JSON response:"""
                                         "confidence": fact_data.get('confidence', 0.8)
                                     }
                                     new_facts.append(new_fact)
-                                    print(f"🔍 DEBUG: Added new fact: {new_fact}")
+                                    log.sampled(logging.DEBUG, 10, "Added new fact: %s", Lazy(lambda new_fact=new_fact: new_fact["key"]))
                                 else:
-                                    print(f"🔍 DEBUG: Skipped fact (exists or low confidence)")
+                                    log.sampled(
+                                        logging.DEBUG, 10,
+                                        "Skipped fact (exists or low confidence): %s",
+                                        Lazy(lambda fact_data=fact_data: fact_data.get("key")),
+                                        exists=exists
+                                    )
                         else:
-                            print(f"🔍 DEBUG: No 'facts' key in extracted data")
+                            log.debug("No 'facts' key in extracted data")
                     except json.JSONDecodeError as e:
-                        print(f"🔍 DEBUG: JSON decode error: {e}")
+                        log.debug("JSON decode error in fact extraction: %s", e)
                 else:
-                    print(f"🔍 DEBUG: No JSON pattern found in response")
+                    log.debug("No JSON pattern found in fact extraction response")
                 
             except Exception as e:
-                print(f"🔍 DEBUG: LLM fact extraction failed: {e}")
-                import traceback
-                traceback.print_exc()
+                log.warning("LLM fact extraction failed: %s", e, exc_info=True)
                 # Continue without extracting (better than wrong data)
         else:
-            print(f"🔍 DEBUG: No base_client available for fact extraction")
+            log.debug("No base_client available for fact extraction")
         
-        print(f"🔍 DEBUG: Final new_facts count: {len(new_facts)}")
-        print(f"🔍 DEBUG: Final new_facts: {new_facts}")
+        log.debug(
+            "Fact extraction finished: %d new facts",
+            len(new_facts),
+            new_fact_keys=Lazy(lambda: [fact["key"] for fact in new_facts])
+        )
         return new_facts
     
     async def _save_conversation_turn(self, session_id: str, turn: ConversationTurn):
@@ -829,7 +1087,8 @@ JSON response:"""
         session_id: str,
         conversation_turn: ConversationTurn,
         current_affinity: Dict[str, Any],
-        provider_config: Optional[ProviderConfig] = None
+        provider_config: Optional[ProviderConfig] = None,
+        timer: StageTimer = NULL_STAGE_TIMER
     ) -> Dict[str, Any]:
         """Update affinity based on the interaction"""
         
@@ -863,10 +1122,12 @@ Rate the interaction quality (1-5):"""
                     provider = ProviderFactory.create_provider(provider_config_obj)
                     
                     messages = [ChatMessage(role="user", content=sentiment_prompt)]
-                    response = await provider.chat(
-                        messages=messages,
-                        temperature=0.3
-                    )
+                    with timer.stage("affinity_rating"):
+                        response = await provider.chat(
+                            messages=messages,
+                            temperature=0.3
+                        )
+                    timer.add_usage("affinity_rating", getattr(response, "usage", None))
                     
                     # Parse rating
                     import re
@@ -877,19 +1138,22 @@ Rate the interaction quality (1-5):"""
                         points_change = rating  # Scale points with quality
                 
             except Exception as e:
-                print(f"LLM affinity evaluation failed: {e}")
+                log.warning("LLM affinity evaluation failed: %s", e)
                 # Fall through to default
         
-        new_points = current_affinity["affinity_points"] + points_change
-        new_points = min(100, new_points)  # Cap at 100
-        
         # Update affinity
-        await self.client.update_affinity(
-            user_id=session_id,  # Keep session_id for affinity tracking
-            personality_name=conversation_turn.personality_name,
-            points_delta=points_change,
-            interaction_type="conversation_interaction"
-        )
+        with timer.stage("writes"):
+            updated = await self.client.update_affinity(
+                user_id=session_id,  # Keep session_id for affinity tracking
+                personality_name=conversation_turn.personality_name,
+                points_delta=points_change,
+                interaction_type="conversation_interaction"
+            )
+        
+        if updated:
+            new_points = updated["affinity_points"]
+        else:
+            new_points = min(100, current_affinity["affinity_points"] + points_change)
         
         return {
             "points_change": points_change,
@@ -5,7 +5,10 @@ Handles personality evolution and adaptation based on user interactions.
 """
 
 from .personality_evolution import PersonalityEvolutionEngine
+from .batch_runner import BatchEvolutionRunner, BatchEvolutionReport
 
 __all__ = [
     "PersonalityEvolutionEngine",
+    "BatchEvolutionRunner",
+    "BatchEvolutionReport",
 ]
@@ -0,0 +1,348 @@
+"""
+Batch Personality Evolution
+
+Runs personality evolution over many users (e.g. a nightly job) in
+shards, with bounded storage concurrency and resumable checkpoints.
+"""
+
+import asyncio
+import json
+import time
+from typing import Dict, List, Optional, Any, Tuple, Union, Iterable, AsyncIterable, AsyncIterator, Callable
+from datetime import datetime
+from dataclasses import dataclass, asdict
+import logging
+
+from .personality_evolution import PersonalityEvolutionEngine
+
+logger = logging.getLogger(__name__)
+
+UserSource = Union[Iterable[str], AsyncIterable[str]]
+
+# Partition holding run checkpoints (one small fact per run)
+CHECKPOINT_USER_ID = "batch_evolution"
+CHECKPOINT_CATEGORY = "checkpoint"
+
+
+@dataclass
+class BatchEvolutionReport:
+    """Progress of a batch evolution run (also its checkpoint)"""
+    run_id: str
+    personality_name: str
+    position: int = 0  # Users consumed from the source, in order
+    evolved: int = 0
+    unchanged: int = 0
+    skipped: int = 0  # Already evolved by this run (resumed shard)
+    failed: int = 0
+    completed: bool = False
+    last_user_id: Optional[str] = None
+    resumed_from: int = 0
+    duration_seconds: float = 0.0
+    updated_at: str = ""
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BatchEvolutionReport":
+        known = cls.__dataclass_fields__
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+
+async def _iterate(source: UserSource) -> AsyncIterator[str]:
+    if hasattr(source, "__aiter__"):
+        async for user_id in source:
+            yield user_id
+    else:
+        for user_id in source:
+            yield user_id
+
+
+class BatchEvolutionRunner:
+    """
+    Evolve a personality for a stream of users, shard by shard
+    
+    For each shard the runner fetches every user's affinity, facts and
+    episodes concurrently (at most ``concurrency`` storage operations in
+    flight), reads the shard's stored personalities in one keyed lookup,
+    evaluates the evolution triggers column-wise over the whole shard,
+    computes trait changes for the users that triggered, and writes the
+    evolved personalities and history entries concurrently.
+    
+    After each shard the run's position is checkpointed in storage, so
+    a run restarted with the same run_id resumes after the last finished
+    shard. Evolved personalities are stamped with the run_id, so users of
+    a shard that was interrupted half-way are not evolved twice.
+    
+    Example:
+        >>> runner = BatchEvolutionRunner(engine, shard_size=500, concurrency=32)
+        >>> report = await runner.run(user_ids, "alicia")  # run_id defaults to today
+        >>> report.evolved, report.completed
+        (1234, True)
+    """
+    
+    def __init__(
+        self,
+        engine: PersonalityEvolutionEngine,
+        shard_size: int = 500,
+        concurrency: int = 16
+    ):
+        """
+        Initialize the batch runner
+        
+        Args:
+            engine: Evolution engine (storage, thresholds and trait rules)
+            shard_size: Users fetched, evaluated and checkpointed together
+            concurrency: Maximum storage operations in flight
+        """
+        if shard_size < 1:
+            raise ValueError("shard_size must be at least 1")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.engine = engine
+        self.storage = engine.storage
+        self.shard_size = shard_size
+        self.concurrency = concurrency
+    
+    async def run(
+        self,
+        user_ids: UserSource,
+        personality_name: str,
+        run_id: Optional[str] = None,
+        resume: bool = True
+    ) -> BatchEvolutionReport:
+        """
+        Evolve personality_name for every user in user_ids
+        
+        Args:
+            user_ids: Users to process (sync or async iterable); must yield
+                the same order when a run is resumed
+            personality_name: Personality being evolved
+            run_id: Run identifier (default: personality name and today's
+                date, so a nightly job restarted the same day resumes)
+            resume: Continue from the stored checkpoint of run_id
+        
+        Returns:
+            BatchEvolutionReport with the run's totals
+        """
+        run_id = run_id or f"{personality_name}-{datetime.now():%Y%m%d}"
+        report = BatchEvolutionReport(run_id=run_id, personality_name=personality_name)
+        if resume:
+            stored = await self.load_checkpoint(run_id)
+            if stored is not None:
+                if stored.completed:
+                    logger.info(f"Batch evolution {run_id} already completed")
+                    return stored
+                report = stored
+                report.resumed_from = stored.position
+        
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        skip = report.position
+        shard: List[str] = []
+        async for user_id in _iterate(user_ids):
+            if skip > 0:
+                skip -= 1
+                continue
+            shard.append(user_id)
+            if len(shard) >= self.shard_size:
+                await self._run_shard(shard, report, semaphore)
+                shard = []
+        if shard:
+            await self._run_shard(shard, report, semaphore)
+        
+        report.completed = True
+        report.duration_seconds += time.perf_counter() - started
+        await self._save_checkpoint(report)
+        logger.info(
+            f"Batch evolution {run_id} finished: {report.evolved} evolved, "
+            f"{report.unchanged} unchanged, {report.skipped} skipped, {report.failed} failed"
+        )
+        return report
+    
+    async def run_periodically(
+        self,
+        user_source: Callable[[], UserSource],
+        personality_name: str,
+        interval_seconds: float = 86400,
+        iterations: Optional[int] = None
+    ) -> List[BatchEvolutionReport]:
+        """
+        Run the batch on a fixed interval (e.g. nightly)
+        
+        Args:
+            user_source: Callable returning a fresh user stream per run
+            personality_name: Personality being evolved
+            interval_seconds: Seconds between run starts
+            iterations: Number of runs (None runs until cancelled)
+        
+        Returns:
+            Reports of the finished runs
+        """
+        reports = []
+        while iterations is None or len(reports) < iterations:
+            started = time.monotonic()
+            reports.append(await self.run(user_source(), personality_name))
+            if iterations is not None and len(reports) >= iterations:
+                break
+            await asyncio.sleep(max(0.0, interval_seconds - (time.monotonic() - started)))
+        return reports
+    
+    async def load_checkpoint(self, run_id: str) -> Optional[BatchEvolutionReport]:
+        """
+        Get the stored checkpoint of a run
+        
+        Args:
+            run_id: Run identifier
+        
+        Returns:
+            BatchEvolutionReport or None if the run has no checkpoint
+        """
+        facts = await self.storage.get_facts(CHECKPOINT_USER_ID, CHECKPOINT_CATEGORY)
+        for fact in facts or []:
+            if fact.get("key") == run_id:
+                value = fact.get("value", {})
+                if isinstance(value, str):
+                    value = json.loads(value)
+                return BatchEvolutionReport.from_dict(value)
+        return None
+    
+    async def _save_checkpoint(self, report: BatchEvolutionReport) -> None:
+        report.updated_at = datetime.now().isoformat()
+        await self.storage.save_fact(
+            user_id=CHECKPOINT_USER_ID,
+            category=CHECKPOINT_CATEGORY,
+            key=report.run_id,
+            value=report.to_dict()
+        )
+    
+    async def _shard_personalities(
+        self,
+        user_ids: List[str],
+        personality_name: str
+    ) -> Dict[str, Dict[str, Any]]:
+        """Stored personalities of a shard's users, by fact key"""
+        keys = [f"personality_{user_id}_{personality_name}" for user_id in user_ids]
+        personalities = {}
+        for key, fact in (await self.storage.get_facts_by_keys("global", "personality", keys)).items():
+            value = fact.get("value")
+            if isinstance(value, str):
+                try:
+                    value = json.loads(value)
+                except json.JSONDecodeError:
+                    continue
+            personalities[key] = value
+        return personalities
+    
+    async def _fetch_user(
+        self,
+        user_id: str,
+        semaphore: asyncio.Semaphore
+    ) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        async def bounded(operation, *args):
+            async with semaphore:
+                return await operation(*args)
+        
+        return await asyncio.gather(
+            bounded(self.storage.get_affinity, user_id, "default"),
+            bounded(self.storage.get_facts, user_id),
+            bounded(self.storage.get_episodes, user_id)
+        )
+    
+    def _shard_triggers(self, analyses: List[Dict[str, Any]]) -> List[List[str]]:
+        """
+        Evolution triggers for a shard, one rule at a time over all users
+        
+        Same rules and order as PersonalityEvolutionEngine._check_evolution_triggers.
+        """
+        engine = self.engine
+        interactions = [a.get("total_interactions", 0) for a in analyses]
+        affinity = [a.get("affinity_change", 0) for a in analyses]
+        positive = [a.get("sentiment_trends", {}).get("positive", 0) for a in analyses]
+        negative = [a.get("sentiment_trends", {}).get("negative", 0) for a in analyses]
+        patterns = [len(a.get("communication_patterns", {})) for a in analyses]
+        
+        positive_dominance = [p > n * 2 for p, n in zip(positive, negative)]
+        rules = [
+            ("sufficient_interactions",
+             [count >= engine.MIN_INTERACTIONS_FOR_EVOLUTION for count in interactions]),
+            ("significant_affinity_change",
+             [abs(change) >= engine.AFFINITY_CHANGE_THRESHOLD for change in affinity]),
+            ("positive_sentiment_dominance", positive_dominance),
+            ("negative_sentiment_dominance",
+             [not dominant and n > p * 2 for dominant, p, n in zip(positive_dominance, positive, negative)]),
+            ("established_communication_patterns", [count >= 3 for count in patterns]),
+        ]
+        
+        triggers: List[List[str]] = [[] for _ in analyses]
+        for name, mask in rules:
+            for index, hit in enumerate(mask):
+                if hit:
+                    triggers[index].append(name)
+        return triggers
+    
+    async def _run_shard(
+        self,
+        user_ids: List[str],
+        report: BatchEvolutionReport,
+        semaphore: asyncio.Semaphore
+    ) -> None:
+        engine = self.engine
+        personality_name = report.personality_name
+        personalities = await self._shard_personalities(user_ids, personality_name)
+        
+        # Bulk fetch
+        fetched = await asyncio.gather(
+            *(self._fetch_user(user_id, semaphore) for user_id in user_ids),
+            return_exceptions=True
+        )
+        users, analyses = [], []
+        for user_id, data in zip(user_ids, fetched):
+            if isinstance(data, BaseException):
+                logger.warning(f"Batch evolution fetch failed for {user_id}: {data}")
+                report.failed += 1
+                continue
+            try:
+                analysis = engine._build_interaction_analysis(*data)
+            except Exception as e:
+                # e.g. a malformed stored fact; skip the user, not the shard
+                logger.warning(f"Batch evolution analysis failed for {user_id}: {e}")
+                report.failed += 1
+                continue
+            users.append(user_id)
+            analyses.append(analysis)
+        
+        # Triggers and trait changes
+        writes = []
+        for user_id, analysis, triggers in zip(users, analyses, self._shard_triggers(analyses)):
+            current = personalities.get(f"personality_{user_id}_{personality_name}") or engine._get_default_personality(personality_name)
+            if current.get("last_evolution", {}).get("run_id") == report.run_id:
+                report.skipped += 1
+                continue
+            changes = await engine._calculate_personality_changes(current, analysis, triggers) if triggers else []
+            if not changes:
+                report.unchanged += 1
+                continue
+            updated = await engine._apply_personality_changes(current, changes)
+            updated["last_evolution"]["run_id"] = report.run_id
+            writes.append((user_id, updated, changes))
+        
+        # Bulk write (the save's storage calls run one after another)
+        async def write(user_id, updated, changes):
+            async with semaphore:
+                return await engine._save_evolved_personality(user_id, personality_name, updated, changes)
+        
+        saved = await asyncio.gather(
+            *(write(user_id, updated, changes) for user_id, updated, changes in writes),
+            return_exceptions=True
+        )
+        for ok in saved:
+            if ok is True:
+                report.evolved += 1
+            else:
+                report.failed += 1
+        
+        report.position += len(user_ids)
+        report.last_user_id = user_ids[-1]
+        await self._save_checkpoint(report)
@@ -5,6 +5,7 @@ Real implementation of personality evolution based on user interactions.
 """
 
 import asyncio
+import itertools
 import json
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
@@ -15,6 +16,9 @@ from ..session.storage_v1_1 import StorageV11Extension
 
 logger = logging.getLogger(__name__)
 
+# Before per-user history, each user's history was one blob under this user_id
+LEGACY_HISTORY_USER_ID = "global"
+
 
 @dataclass
 class PersonalityChange:
@@ -44,14 +48,29 @@ class PersonalityEvolutionEngine:
     and evolves personality traits accordingly.
     """
     
-    def __init__(self, storage: StorageV11Extension):
+    def __init__(
+        self,
+        storage: StorageV11Extension,
+        max_history_entries: int = 50,
+        history_ttl_days: Optional[int] = None,
+        history_prune_every: int = 10
+    ):
         """
         Initialize personality evolution engine
         
         Args:
             storage: Storage backend for persistence
+            max_history_entries: Evolution history entries kept per user
+            history_ttl_days: Optional age after which history entries expire
+            history_prune_every: Prune the appending user's history on
+                every this many appends (1 prunes on every append)
         """
         self.storage = storage
+        self.max_history_entries = max_history_entries
+        self.history_ttl_days = history_ttl_days
+        self.history_prune_every = max(1, history_prune_every)
+        self._history_sequence = itertools.count()
+        self._legacy_history_migrated = False
         
         # Evolution thresholds
         self.MIN_INTERACTIONS_FOR_EVOLUTION = 5
@@ -122,7 +141,9 @@ class PersonalityEvolutionEngine:
             )
             
             # Save evolved personality
-            await self._save_evolved_personality(user_id, personality_name, updated_personality)
+            await self._save_evolved_personality(
+                user_id, personality_name, updated_personality, personality_changes
+            )
             
             # Create evolution result
             result = EvolutionResult(
@@ -147,49 +168,40 @@ class PersonalityEvolutionEngine:
         session_id: str,
         user_id: str,
         limit: int = 10,
-        include_details: bool = True
+        include_details: bool = True,
+        before: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
-        Get personality evolution history
+        Get personality evolution history, newest first
         
         Args:
             session_id: Session identifier
             user_id: User identifier
-            limit: Maximum number of entries to return
+            limit: Maximum number of entries to return (0 for all)
             include_details: Whether to include detailed change information
+            before: Page cursor; only entries older than this entry_id
+                (pass the entry_id of the last entry of the previous page)
             
         Returns:
             List of evolution history entries
         """
         try:
-            # Get evolution history from storage using get_facts
-            evolution_facts = await self.storage.get_facts(user_id, "evolution_history")
-            
-            if not evolution_facts:
-                return []
-            
-            # Find the evolution history fact
-            history_fact = None
-            for fact in evolution_facts:
-                if fact.get("key") == f"evolution_history_{user_id}":
-                    history_fact = fact
-                    break
-            
-            if not history_fact:
-                return []
-            
-            history_data = history_fact.get("value", {})
-            history = history_data.get('evolutions', [])
-            
-            # Limit results
-            if limit > 0:
-                history = history[:limit]
-            
-            # Filter details if not requested
-            if not include_details:
-                for entry in history:
+            history = []
+            now = datetime.now().isoformat()
+            entries = await self._get_history_entries(user_id)
+            # Entries past the cap are waiting for the next prune
+            for key, entry in entries[:self.max_history_entries]:
+                if before is not None and key >= before:
+                    continue
+                if entry.get("expires_at") and entry["expires_at"] <= now:
+                    continue
+                entry = dict(entry, entry_id=key)
+                if not include_details:
                     entry.pop('changes', None)
                     entry.pop('detailed_analysis', None)
+                history.append(entry)
+                if limit > 0 and len(history) >= limit:
+                    break
             
             return history
             
@@ -197,6 +209,70 @@ class PersonalityEvolutionEngine:
             logger.error(f"Failed to get evolution history: {e}")
             return []
     
+    async def _get_history_entries(self, user_id: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """A user's (key, entry) evolution history, newest first"""
+        await self._migrate_legacy_history(user_id)
+        facts = await self.storage.get_facts(user_id, "evolution_history")
+        entries = []
+        for fact in facts or []:
+            key = fact.get("key", "")
+            if not key.startswith("evolution_"):
+                continue
+            value = fact.get("value", {})
+            if isinstance(value, str):
+                try:
+                    value = json.loads(value)
+                except json.JSONDecodeError:
+                    continue
+            entries.append((key, value))
+        entries.sort(key=lambda item: item[0], reverse=True)
+        return entries
+    
+    async def _migrate_legacy_history(self, user_id: str) -> int:
+        """
+        Move a user's pre-1.1 history blob into their own partition
+        
+        Older versions kept each user's history as a single
+        ``evolution_history_<user_id>`` fact under LEGACY_HISTORY_USER_ID.
+        Its entries are written as per-user entries and the blob is
+        deleted. Once the legacy partition is empty it is not read again.
+        """
+        if self._legacy_history_migrated:
+            return 0
+        legacy_facts = await self.storage.get_facts(LEGACY_HISTORY_USER_ID, "evolution_history")
+        if not legacy_facts:
+            self._legacy_history_migrated = True
+            return 0
+        
+        legacy_key = f"evolution_history_{user_id}"
+        fact = next((f for f in legacy_facts if f.get("key") == legacy_key), None)
+        if fact is None:
+            return 0
+        value = fact.get("value", {})
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except json.JSONDecodeError:
+                value = {}
+        
+        migrated = 0
+        # Stored newest first; the index keeps keys of equal timestamps unique
+        evolutions = value.get("evolutions", [])[:self.max_history_entries]
+        for index, entry in enumerate(reversed(evolutions)):
+            try:
+                timestamp = datetime.fromisoformat(entry["timestamp"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            await self.storage.save_fact(
+                user_id=user_id,
+                category="evolution_history",
+                key=f"evolution_{timestamp.strftime('%Y%m%d_%H%M%S_%f')}_{index:06d}",
+                value=entry
+            )
+            migrated += 1
+        await self.storage.delete_fact(LEGACY_HISTORY_USER_ID, "evolution_history", legacy_key)
+        return migrated
+    
     async def _get_current_personality(
         self,
         user_id: str,
@@ -235,46 +311,55 @@ class PersonalityEvolutionEngine:
     ) -> Dict[str, Any]:
         """Analyze user interactions for evolution cues"""
         try:
-            analysis = {
-                "total_interactions": 0,
-                "positive_interactions": 0,
-                "negative_interactions": 0,
-                "affinity_change": 0,
-                "communication_patterns": {},
-                "sentiment_trends": {},
-                "response_preferences": {}
-            }
-            
-            # Get affinity data
             affinity = await self.storage.get_affinity(user_id, "default")
-            if affinity:
-                analysis["affinity_change"] = affinity.get("affinity_points", 0)
-                analysis["total_interactions"] = affinity.get("total_interactions", 0)
-                analysis["positive_interactions"] = affinity.get("positive_interactions", 0)
-            
-            # Get facts for communication patterns
             facts = await self.storage.get_facts(user_id)
-            for fact in facts:
-                if fact["category"] == "communication_style":
-                    analysis["communication_patterns"][fact["key"]] = fact["value"]
-                elif fact["category"] == "preferences":
-                    analysis["response_preferences"][fact["key"]] = fact["value"]
-            
-            # Get episodes for sentiment analysis
             episodes = await self.storage.get_episodes(user_id)
-            sentiment_counts = {}
-            for episode in episodes:
-                sentiment = episode.get("sentiment", "neutral")
-                sentiment_counts[sentiment] = sentiment_counts.get(sentiment, 0) + 1
-            
-            analysis["sentiment_trends"] = sentiment_counts
-            
-            return analysis
+            return self._build_interaction_analysis(affinity, facts, episodes)
             
         except Exception as e:
             logger.error(f"Failed to analyze interactions: {e}")
             return {}
     
+    def _build_interaction_analysis(
+        self,
+        affinity: Optional[Dict[str, Any]],
+        facts: List[Dict[str, Any]],
+        episodes: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Build the interaction analysis from a user's affinity, facts and episodes"""
+        analysis = {
+            "total_interactions": 0,
+            "positive_interactions": 0,
+            "negative_interactions": 0,
+            "affinity_change": 0,
+            "communication_patterns": {},
+            "sentiment_trends": {},
+            "response_preferences": {}
+        }
+        
+        # Affinity data
+        if affinity:
+            analysis["affinity_change"] = affinity.get("affinity_points", 0)
+            analysis["total_interactions"] = affinity.get("total_interactions", 0)
+            analysis["positive_interactions"] = affinity.get("positive_interactions", 0)
+        
+        # Facts for communication patterns
+        for fact in facts or []:
+            if fact["category"] == "communication_style":
+                analysis["communication_patterns"][fact["key"]] = fact["value"]
+            elif fact["category"] == "preferences":
+                analysis["response_preferences"][fact["key"]] = fact["value"]
+        
+        # Episodes for sentiment analysis
+        sentiment_counts = {}
+        for episode in episodes or []:
+            sentiment = episode.get("sentiment", "neutral")
+            sentiment_counts[sentiment] = sentiment_counts.get(sentiment, 0) + 1
+        
+        analysis["sentiment_trends"] = sentiment_counts
+        
+        return analysis
+    
     async def _check_evolution_triggers(
         self,
         session_id: str,
@@ -459,7 +544,8 @@ class PersonalityEvolutionEngine:
         self,
         user_id: str,
         personality_name: str,
-        evolved_personality: Dict[str, Any]
+        evolved_personality: Dict[str, Any],
+        changes: Optional[List[PersonalityChange]] = None
     ) -> bool:
         """Save evolved personality to storage"""
         try:
@@ -472,7 +558,7 @@ class PersonalityEvolutionEngine:
             )
             
             # Save evolution history
-            await self._save_evolution_history(user_id, evolved_personality)
+            await self._save_evolution_history(user_id, evolved_personality, changes, personality_name)
             
             return True
             
@@ -483,62 +569,66 @@ class PersonalityEvolutionEngine:
     async def _save_evolution_history(
         self,
         user_id: str,
-        evolved_personality: Dict[str, Any]
+        evolved_personality: Dict[str, Any],
+        changes: Optional[List[PersonalityChange]] = None,
+        personality_name: Optional[str] = None
     ) -> bool:
-        """Save evolution to history"""
+        """
+        Append an evolution to the user's history
+        
+        Each evolution is its own fact in the user's partition, keyed by
+        timestamp, so appending never reads existing history. Storage is
+        pruned by _prune_evolution_history on every history_prune_every-th
+        append; reads apply the same limits in between.
+        """
         try:
-            history_key = f"evolution_history_{user_id}"
-            
-            # Get existing history using get_facts
-            evolution_facts = await self.storage.get_facts("global", "evolution_history")
-            history = {"evolutions": []}
-            
-            # Find existing history fact
-            existing_fact = None
-            for fact in evolution_facts:
-                if fact.get("key") == history_key:
-                    existing_fact = fact
-                    break
-            
-            if existing_fact:
-                existing_history = existing_fact.get("value", {})
-                history = json.loads(existing_history) if isinstance(existing_history, str) else existing_history
-            
-            # Add new evolution entry
+            now = datetime.now()
             evolution_entry = {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now.isoformat(),
+                "personality_name": personality_name,
                 "changes": [
                     {
-                        "trait": change.get("trait_name"),
-                        "old_value": change.get("old_value"),
-                        "new_value": change.get("new_value"),
-                        "reason": change.get("change_reason")
+                        "trait": change.trait_name,
+                        "old_value": change.old_value,
+                        "new_value": change.new_value,
+                        "reason": change.change_reason
                     }
-                    for change in evolved_personality.get("last_evolution", {}).get("changes", [])
+                    for change in changes or []
                 ],
                 "confidence_score": evolved_personality.get("last_evolution", {}).get("confidence_score", 0.0)
             }
+            if self.history_ttl_days is not None:
+                evolution_entry["expires_at"] = (now + timedelta(days=self.history_ttl_days)).isoformat()
             
-            history["evolutions"].insert(0, evolution_entry)  # Add to beginning
-            
-            # Keep only last 50 evolutions
-            if len(history["evolutions"]) > 50:
-                history["evolutions"] = history["evolutions"][:50]
-            
-            # Save updated history using save_fact
+            sequence = next(self._history_sequence)
             await self.storage.save_fact(
-                user_id="global",
+                user_id=user_id,
                 category="evolution_history",
-                key=history_key,
-                value=history
+                # Sequence suffix keeps keys unique on coarse clocks
+                key=f"evolution_{now.strftime('%Y%m%d_%H%M%S_%f')}_{sequence % 1000000:06d}",
+                value=evolution_entry
             )
             
+            if (sequence + 1) % self.history_prune_every == 0:
+                await self._prune_evolution_history(user_id)
+            
             return True
             
         except Exception as e:
             logger.error(f"Failed to save evolution history: {e}")
             return False
     
+    async def _prune_evolution_history(self, user_id: str) -> int:
+        """Delete a user's expired entries and entries beyond max_history_entries"""
+        now = datetime.now().isoformat()
+        removed = 0
+        for index, (key, entry) in enumerate(await self._get_history_entries(user_id)):
+            expired = entry.get("expires_at") and entry["expires_at"] <= now
+            if index >= self.max_history_entries or expired:
+                if await self.storage.delete_fact(user_id, "evolution_history", key):
+                    removed += 1
+        return removed
+    
     def _get_default_personality(self, personality_name: str) -> Dict[str, Any]:
         """Get default personality configuration"""
         return {
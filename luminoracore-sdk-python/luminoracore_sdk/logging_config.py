@@ -8,10 +8,14 @@ Author: LuminoraCore Team
 Version: 1.1.0
 """
 
+import atexit
+import itertools
 import logging
+import logging.handlers
+import queue
 import sys
 import os
-from typing import Optional, Literal
+from typing import Any, Callable, Dict, Optional, Literal
 
 # Type definitions for format types
 FormatType = Literal["lambda", "json", "text", "detailed"]
@@ -21,7 +25,8 @@ def setup_logging(
     level: str = "INFO",
     format_type: FormatType = "lambda",
     include_boto: bool = True,
-    propagate: bool = True
+    propagate: bool = True,
+    use_queue: bool = False
 ) -> None:
     """
     Configure logging for LuminoraCore SDK.
@@ -38,6 +43,9 @@ def setup_logging(
             - "detailed": Verbose text format with full context
         include_boto: If True, configure boto3/botocore logging
         propagate: If True, logs propagate to root logger
+        use_queue: If True, the root logger only enqueues records and a
+            background QueueListener thread formats and writes them, so
+            log I/O never runs on the event loop
     
     Examples:
         In AWS Lambda:
@@ -51,15 +59,20 @@ def setup_logging(
         In production with structured logging:
         >>> from luminoracore_sdk import setup_logging
         >>> setup_logging(level="INFO", format_type="json")
+        
+        Under load, without blocking the event loop on stdout:
+        >>> setup_logging(level="INFO", format_type="json", use_queue=True)
     
     Environment Variables:
         LUMINORACORE_LOG_LEVEL: Override log level
         LUMINORACORE_LOG_FORMAT: Override format type
+        LUMINORACORE_LOG_QUEUE: Enable queue mode ("1", "true", "yes")
         AWS_LAMBDA_FUNCTION_NAME: Auto-detects Lambda environment
     """
     # Override with environment variables if present
     level = os.getenv("LUMINORACORE_LOG_LEVEL", level).upper()
     format_type = os.getenv("LUMINORACORE_LOG_FORMAT", format_type)
+    use_queue = use_queue or os.getenv("LUMINORACORE_LOG_QUEUE", "").lower() in ["1", "true", "yes"]
     
     # Auto-detect Lambda environment
     if os.getenv("AWS_LAMBDA_FUNCTION_NAME") and format_type not in ["json", "detailed"]:
@@ -72,6 +85,7 @@ def setup_logging(
     
     # Configure root logger
     root_logger = logging.getLogger()
+    stop_queue_logging()
     root_logger.handlers.clear()
     root_logger.setLevel(numeric_level)
     
@@ -84,6 +98,9 @@ def setup_logging(
     handler.setFormatter(formatter)
     root_logger.addHandler(handler)
     
+    if use_queue:
+        start_queue_logging(root_logger)
+    
     # Configure all SDK loggers
     sdk_loggers = [
         'luminoracore_sdk',
@@ -118,7 +135,167 @@ def setup_logging(
     
     # Log confirmation
     logger = logging.getLogger('luminoracore_sdk')
-    logger.info(f"✓ LuminoraCore SDK logging configured: level={level}, format={format_type}")
+    logger.info(
+        "✓ LuminoraCore SDK logging configured: level=%s, format=%s, queue=%s",
+        level, format_type, use_queue
+    )
+
+
+# Queue mode: (logger, original handlers, listener) per configured logger
+_queue_listeners: Dict[str, Any] = {}
+
+
+def start_queue_logging(
+    target: Optional[logging.Logger] = None,
+    max_queue_size: int = 0
+) -> logging.handlers.QueueListener:
+    """
+    Move a logger's handlers behind a QueueHandler/QueueListener pair.
+    
+    Logging calls on the target logger only put the record on a queue;
+    formatting and I/O run in the listener's background thread. Calling
+    it again for the same logger returns the running listener.
+    
+    Args:
+        target: Logger to convert (defaults to the root logger)
+        max_queue_size: Queue bound (0 = unbounded)
+    
+    Returns:
+        The running QueueListener
+    
+    Example:
+        >>> setup_logging(level="INFO", format_type="json")
+        >>> start_queue_logging()
+    """
+    target = target if target is not None else logging.getLogger()
+    existing = _queue_listeners.get(target.name)
+    if existing is not None:
+        return existing[2]
+    
+    handlers = list(target.handlers)
+    log_queue: "queue.Queue" = queue.Queue(max_queue_size)
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    
+    for handler in handlers:
+        target.removeHandler(handler)
+    target.addHandler(logging.handlers.QueueHandler(log_queue))
+    
+    listener.start()
+    _queue_listeners[target.name] = (target, handlers, listener)
+    return listener
+
+
+def stop_queue_logging(target: Optional[logging.Logger] = None) -> None:
+    """
+    Flush and stop queue mode, restoring the original handlers.
+    
+    Args:
+        target: Logger to restore (defaults to every logger in queue mode)
+    """
+    names = [target.name] if target is not None else list(_queue_listeners)
+    for name in names:
+        entry = _queue_listeners.pop(name, None)
+        if entry is None:
+            continue
+        logger_, handlers, listener = entry
+        listener.stop()  # Processes queued records before returning
+        for handler in list(logger_.handlers):
+            if isinstance(handler, logging.handlers.QueueHandler):
+                logger_.removeHandler(handler)
+        for handler in handlers:
+            logger_.addHandler(handler)
+
+
+atexit.register(stop_queue_logging)
+
+
+class Lazy:
+    """
+    Deferred log value: the callable only runs if a handler formats it.
+    
+    Example:
+        >>> logger.debug("facts: %s", Lazy(lambda: json.dumps(facts)))
+    """
+    
+    __slots__ = ("func",)
+    
+    def __init__(self, func: Callable[[], Any]):
+        self.func = func
+    
+    def __str__(self) -> str:
+        return str(self.func())
+    
+    def __repr__(self) -> str:
+        return repr(self.func())
+
+
+class StructuredLogger:
+    """
+    Level-gated structured logging on top of a standard logger.
+    
+    - Messages use %-style arguments, formatted only if a handler emits them.
+    - Keyword arguments become record attributes (JSON fields with the
+      "json" format); nothing is built when the level is disabled.
+    - sampled() emits one in every N calls per event, for per-item logs.
+    
+    Example:
+        >>> log = get_structured_logger(__name__)
+        >>> log.debug("facts extracted", count=len(facts))
+        >>> for item in items:
+        ...     log.sampled(logging.DEBUG, 100, "processing item %s", Lazy(lambda: item["key"]))
+    """
+    
+    __slots__ = ("logger", "_counters")
+    
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+        self._counters: Dict[str, Any] = {}
+    
+    def is_enabled(self, level: int) -> bool:
+        """Whether a record at level would be processed."""
+        return self.logger.isEnabledFor(level)
+    
+    def log(self, level: int, message: str, *args: Any, exc_info: Any = None, **fields: Any) -> None:
+        """Log a message with optional structured fields."""
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, message, *args, exc_info=exc_info, extra=fields or None, stacklevel=2)
+    
+    def debug(self, message: str, *args: Any, exc_info: Any = None, **fields: Any) -> None:
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(message, *args, exc_info=exc_info, extra=fields or None, stacklevel=2)
+    
+    def info(self, message: str, *args: Any, exc_info: Any = None, **fields: Any) -> None:
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(message, *args, exc_info=exc_info, extra=fields or None, stacklevel=2)
+    
+    def warning(self, message: str, *args: Any, exc_info: Any = None, **fields: Any) -> None:
+        if self.logger.isEnabledFor(logging.WARNING):
+            self.logger.warning(message, *args, exc_info=exc_info, extra=fields or None, stacklevel=2)
+    
+    def error(self, message: str, *args: Any, exc_info: Any = None, **fields: Any) -> None:
+        if self.logger.isEnabledFor(logging.ERROR):
+            self.logger.error(message, *args, exc_info=exc_info, extra=fields or None, stacklevel=2)
+    
+    def sampled(self, level: int, every: int, message: str, *args: Any, **fields: Any) -> None:
+        """
+        Log one in every `every` calls of this message (the first included).
+        
+        Args:
+            level: Logging level
+            every: Sampling interval (1 logs every call)
+            message: Message template (also the sampling key)
+            *args: Lazy %-format arguments
+            **fields: Structured fields
+        """
+        if not self.logger.isEnabledFor(level):
+            return
+        counter = self._counters.get(message)
+        if counter is None:
+            counter = self._counters.setdefault(message, itertools.count())
+        if next(counter) % every:
+            return
+        fields["sample_every"] = every
+        self.logger.log(level, message, *args, extra=fields, stacklevel=2)
 
 
 def _create_formatter(format_type: FormatType) -> logging.Formatter:
@@ -235,6 +412,19 @@ def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name)
 
 
+def get_structured_logger(name: str) -> StructuredLogger:
+    """
+    Get a StructuredLogger for the given name.
+    
+    Args:
+        name: Logger name (usually __name__)
+    
+    Returns:
+        StructuredLogger wrapping logging.getLogger(name)
+    """
+    return StructuredLogger(logging.getLogger(name))
+
+
 # Convenience function for backward compatibility
 configure_logging = setup_logging
 
@@ -243,5 +433,10 @@ __all__ = [
     "setup_logging",
     "auto_configure",
     "get_logger",
+    "get_structured_logger",
+    "StructuredLogger",
+    "Lazy",
+    "start_queue_logging",
+    "stop_queue_logging",
     "configure_logging",  # Backward compatibility
 ]
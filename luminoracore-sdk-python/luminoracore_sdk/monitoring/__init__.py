@@ -3,9 +3,13 @@
 from .metrics import MetricsCollector
 from .logger import LuminoraLogger
 from .tracer import DistributedTracer
+from .trace_export import BatchTraceProcessor, FileTraceExporter, HttpTraceExporter
 
 __all__ = [
     "MetricsCollector",
     "LuminoraLogger",
     "DistributedTracer",
+    "BatchTraceProcessor",
+    "FileTraceExporter",
+    "HttpTraceExporter",
 ]
@@ -8,6 +8,7 @@ import json
 from pathlib import Path
 
 from ..utils.helpers import sanitize_api_key
+from ..logging_config import StructuredLogger, start_queue_logging, stop_queue_logging
 
 
 class LuminoraLogger:
@@ -22,7 +23,8 @@ class LuminoraLogger:
         include_timestamp: bool = True,
         include_level: bool = True,
         include_module: bool = True,
-        sanitize_sensitive: bool = True
+        sanitize_sensitive: bool = True,
+        use_queue: bool = False
     ):
         """
         Initialize the LuminoraCore logger.
@@ -36,6 +38,8 @@ class LuminoraLogger:
             include_level: Whether to include log level
             include_module: Whether to include module information
             sanitize_sensitive: Whether to sanitize sensitive information
+            use_queue: Whether to write through a background QueueListener
+                so that logging calls never block on I/O
         """
         self.name = name
         self.level = getattr(logging, level.upper())
@@ -51,6 +55,7 @@ class LuminoraLogger:
         self.logger.setLevel(self.level)
         
         # Remove existing handlers
+        stop_queue_logging(self.logger)
         self.logger.handlers.clear()
         
         # Add console handler
@@ -65,6 +70,17 @@ class LuminoraLogger:
             file_handler.setLevel(self.level)
             file_handler.setFormatter(self._create_formatter())
             self.logger.addHandler(file_handler)
+        
+        self.structured = StructuredLogger(self.logger)
+        self.use_queue = use_queue
+        if use_queue:
+            start_queue_logging(self.logger)
+    
+    def close(self) -> None:
+        """Flush queued records and stop the background listener."""
+        if self.use_queue:
+            stop_queue_logging(self.logger)
+            self.use_queue = False
     
     def _create_formatter(self) -> logging.Formatter:
         """Create log formatter based on configuration."""
@@ -83,25 +99,34 @@ class LuminoraLogger:
                 sanitize_sensitive=self.sanitize_sensitive
             )
     
-    def debug(self, message: str, **kwargs) -> None:
-        """Log debug message."""
-        self.logger.debug(message, extra=kwargs)
+    def debug(self, message: str, *args, **kwargs) -> None:
+        """Log debug message (args are %-formatted only if emitted)."""
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(message, *args, extra=kwargs)
     
-    def info(self, message: str, **kwargs) -> None:
+    def info(self, message: str, *args, **kwargs) -> None:
         """Log info message."""
-        self.logger.info(message, extra=kwargs)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(message, *args, extra=kwargs)
     
-    def warning(self, message: str, **kwargs) -> None:
+    def warning(self, message: str, *args, **kwargs) -> None:
         """Log warning message."""
-        self.logger.warning(message, extra=kwargs)
+        if self.logger.isEnabledFor(logging.WARNING):
+            self.logger.warning(message, *args, extra=kwargs)
     
-    def error(self, message: str, **kwargs) -> None:
+    def error(self, message: str, *args, **kwargs) -> None:
         """Log error message."""
-        self.logger.error(message, extra=kwargs)
+        if self.logger.isEnabledFor(logging.ERROR):
+            self.logger.error(message, *args, extra=kwargs)
     
-    def critical(self, message: str, **kwargs) -> None:
+    def critical(self, message: str, *args, **kwargs) -> None:
         """Log critical message."""
-        self.logger.critical(message, extra=kwargs)
+        if self.logger.isEnabledFor(logging.CRITICAL):
+            self.logger.critical(message, *args, extra=kwargs)
+    
+    def sampled(self, level: str, every: int, message: str, *args, **kwargs) -> None:
+        """Log one in every `every` calls of this message (for per-item logs)."""
+        self.structured.sampled(getattr(logging, level.upper()), every, message, *args, **kwargs)
     
     def log_api_call(
         self,
@@ -1,31 +1,414 @@
 """Metrics collection for LuminoraCore SDK."""
 
 import asyncio
+import functools
+import itertools
+import math
+import random
+import re
+import threading
 import time
-from typing import Dict, List, Optional, Any, Callable
-from datetime import datetime, timedelta
+import weakref
+from typing import Dict, List, Optional, Any, Callable, Tuple
+from datetime import datetime
 import logging
-from collections import defaultdict, deque
+from collections import deque
 
 logger = logging.getLogger(__name__)
 
+# Label set of a series: sorted (key, value) pairs
+LabelSet = Tuple[Tuple[str, str], ...]
+
+# Label set that absorbs new series once a metric hits its cardinality limit
+OVERFLOW_LABELS: LabelSet = (("overflow", "true"),)
+
+_PROMETHEUS_INVALID = re.compile(r"[^a-zA-Z0-9_:]")
+
+
+def _label_set(tags: Optional[Dict[str, str]]) -> LabelSet:
+    """Canonical, hashable label set for a tags dict."""
+    if not tags:
+        return ()
+    return tuple(sorted((str(key), str(value)) for key, value in tags.items()))
+
+
+class HistogramSketch:
+    """
+    Fixed-memory, mergeable histogram with relative-error quantiles.
+    
+    Values are counted in logarithmic buckets (DDSketch-style), so any
+    quantile is reported within ``relative_accuracy`` of the true value
+    regardless of how many values were recorded. Memory is bounded by
+    ``max_buckets``; when exceeded, the lowest buckets are collapsed,
+    which only affects accuracy of the smallest values. Two sketches with
+    the same accuracy merge by adding bucket counts.
+    """
+    
+    __slots__ = (
+        "relative_accuracy", "max_buckets", "_gamma", "_log_gamma",
+        "_positive", "_negative", "zero_count", "count", "sum", "min", "max",
+    )
+    
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        """
+        Initialize the sketch.
+        
+        Args:
+            relative_accuracy: Relative error bound for quantiles (0 < a < 1)
+            max_buckets: Maximum buckets per sign before collapsing
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        if max_buckets < 1:
+            raise ValueError("max_buckets must be at least 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._positive: Dict[int, int] = {}
+        self._negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+    
+    def add(self, value: float) -> None:
+        """Record a value."""
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        
+        if value > 0:
+            store = self._positive
+        elif value < 0:
+            store, value = self._negative, -value
+        else:
+            self.zero_count += 1
+            return
+        
+        index = math.ceil(math.log(value) / self._log_gamma)
+        store[index] = store.get(index, 0) + 1
+        if len(store) > self.max_buckets:
+            self._collapse(store)
+    
+    def _collapse(self, store: Dict[int, int]) -> None:
+        """Fold the lowest buckets together until the store fits."""
+        keys = sorted(store)
+        excess = len(keys) - self.max_buckets
+        target = keys[excess]
+        for key in keys[:excess]:
+            store[target] += store.pop(key)
+    
+    def merge(self, other: "HistogramSketch") -> None:
+        """Add another sketch's counts into this one."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative_accuracy")
+        if not other.count:
+            return
+        for mine, theirs in ((self._positive, other._positive), (self._negative, other._negative)):
+            for index, bucket_count in list(theirs.items()):
+                mine[index] = mine.get(index, 0) + bucket_count
+            if len(mine) > self.max_buckets:
+                self._collapse(mine)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+    
+    def _bucket_value(self, index: int) -> float:
+        """Representative value of a bucket (relative error midpoint)."""
+        return 2 * self._gamma ** index / (self._gamma + 1)
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile.
+        
+        Args:
+            q: Quantile in [0, 1]
+        
+        Returns:
+            Estimated value or None if the sketch is empty
+        """
+        if not self.count:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self._negative, reverse=True):
+            seen += self._negative[index]
+            if seen > rank:
+                return max(self.min, -self._bucket_value(index))
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for index in sorted(self._positive):
+            seen += self._positive[index]
+            if seen > rank:
+                return min(self.max, self._bucket_value(index))
+        return self.max
+    
+    def stats(self) -> Optional[Dict[str, float]]:
+        """Summary statistics, or None if the sketch is empty."""
+        if not self.count:
+            return None
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.sum / self.count,
+            "median": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+def _add_count(total: List[int], cell: List[int]) -> None:
+    total[0] += cell[0]
+
+
+class _ThreadToken:
+    """Object held only by a thread's local storage; collected when the thread ends."""
+    
+    __slots__ = ("__weakref__",)
+
+
+class _PerThread:
+    """
+    Per-thread cells that only their owning thread writes.
+    
+    Writers never block each other; readers aggregate a snapshot of all
+    cells. Within one event loop this is a plain attribute lookup. When a
+    thread ends, its cell is folded into a shared ``retired`` cell and
+    removed, so memory tracks live threads, not every thread ever seen.
+    """
+    
+    __slots__ = ("factory", "merge", "cells", "retired", "_local", "_keys", "_lock", "__weakref__")
+    
+    def __init__(self, factory: Callable[[], Any], merge: Callable[[Any, Any], None]):
+        """
+        Initialize the per-thread cells.
+        
+        Args:
+            factory: Creates an empty cell
+            merge: Adds the second cell's values into the first
+        """
+        self.factory = factory
+        self.merge = merge
+        self.cells: Dict[int, Any] = {}
+        self.retired: Optional[Any] = None  # Values of finished threads
+        self._local = threading.local()
+        self._keys = itertools.count()
+        self._lock = threading.Lock()
+    
+    def local(self) -> Any:
+        try:
+            return self._local.cell
+        except AttributeError:
+            return self._register()
+    
+    def _register(self) -> Any:
+        cell = self.factory()
+        token = _ThreadToken()
+        key = next(self._keys)
+        with self._lock:
+            self.cells[key] = cell
+        self._local.cell = cell
+        self._local.token = token
+        finalizer = weakref.finalize(token, _PerThread._retire, weakref.ref(self), key)
+        finalizer.atexit = False
+        return cell
+    
+    @staticmethod
+    def _retire(owner_ref: "weakref.ref[_PerThread]", key: int) -> None:
+        owner = owner_ref()
+        if owner is None:
+            return
+        with owner._lock:
+            cell = owner.cells.pop(key, None)
+            if cell is None:
+                return
+            if owner.retired is None:
+                owner.retired = owner.factory()
+            owner.merge(owner.retired, cell)
+    
+    def snapshot(self) -> List[Any]:
+        with self._lock:
+            cells = list(self.cells.values())
+            if self.retired is not None:
+                # Copy: a retiring thread may merge into it after we return
+                retired = self.factory()
+                self.merge(retired, self.retired)
+                cells.append(retired)
+        return cells
+
 
 class MetricsCollector:
     """Collects and manages metrics for LuminoraCore SDK."""
     
-    def __init__(self, max_history: int = 1000):
+    def __init__(
+        self,
+        max_history: int = 1000,
+        history_sample_rate: float = 0.0,
+        max_series_per_metric: int = 1000,
+        relative_accuracy: float = 0.01,
+        max_buckets: int = 2048,
+    ):
         """
         Initialize the metrics collector.
         
         Args:
-            max_history: Maximum number of metrics to keep in history
+            max_history: Maximum number of history entries kept per metric
+            history_sample_rate: Fraction of events recorded in the history
+                (0 disables history, 1 records every event)
+            max_series_per_metric: Maximum label sets per metric name; further
+                label sets are folded into a single overflow series
+            relative_accuracy: Relative error bound of histogram quantiles
+            max_buckets: Bucket limit of each histogram sketch
         """
+        if not 0 <= history_sample_rate <= 1:
+            raise ValueError("history_sample_rate must be between 0 and 1")
+        if max_series_per_metric < 1:
+            raise ValueError("max_series_per_metric must be at least 1")
         self.max_history = max_history
-        self._metrics: Dict[str, Any] = defaultdict(lambda: deque(maxlen=max_history))
-        self._counters: Dict[str, int] = defaultdict(int)
-        self._gauges: Dict[str, float] = {}
-        self._histograms: Dict[str, List[float]] = defaultdict(list)
-        self._lock = asyncio.Lock()
+        self.history_sample_rate = history_sample_rate
+        self.max_series_per_metric = max_series_per_metric
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._metrics: Dict[str, deque] = {}
+        self._counters: Dict[str, Dict[LabelSet, _PerThread]] = {}
+        self._gauges: Dict[str, Dict[LabelSet, List[float]]] = {}
+        self._histograms: Dict[str, Dict[LabelSet, _PerThread]] = {}
+        self._dropped_series = 0
+        # Only guards creation of new series (rare), never value updates
+        self._series_lock = threading.Lock()
+    
+    # Series management
+    
+    def _series(self, table: Dict[str, Dict[LabelSet, Any]], name: str,
+                labels: LabelSet, factory: Callable[[], Any]) -> Any:
+        """Get or create the series of a metric, enforcing the cardinality limit."""
+        series = table.get(name)
+        if series is not None:
+            cell = series.get(labels)
+            if cell is not None:
+                return cell
+        
+        with self._series_lock:
+            series = table.setdefault(name, {})
+            if labels not in series:
+                if len(series) >= self.max_series_per_metric:
+                    self._dropped_series += 1
+                    labels = OVERFLOW_LABELS
+                if labels not in series:
+                    series[labels] = factory()
+            return series[labels]
+    
+    def _new_sketch(self) -> HistogramSketch:
+        return HistogramSketch(self.relative_accuracy, self.max_buckets)
+    
+    def _record_history(self, kind: str, name: str, value: float,
+                        tags: Optional[Dict[str, str]], **extra: Any) -> None:
+        """Append a history entry for a sampled subset of events."""
+        rate = self.history_sample_rate
+        if not rate or (rate < 1 and random.random() >= rate):
+            return
+        history = self._metrics.get(name)
+        if history is None:
+            history = self._metrics.setdefault(name, deque(maxlen=self.max_history))
+        history.append((time.time(), kind, value, tags, extra))
+    
+    # Synchronous recording API (hot path)
+    
+    def inc(self, name: str, value: int = 1, tags: Optional[Dict[str, str]] = None) -> None:
+        """
+        Increment a counter without awaiting.
+        
+        Args:
+            name: Metric name
+            value: Value to increment by
+            tags: Optional tags for the metric
+        """
+        cell = self._series(self._counters, name, _label_set(tags),
+                            lambda: _PerThread(lambda: [0], _add_count)).local()
+        cell[0] += value
+        if self.history_sample_rate:
+            self._record_history("counter", name, value, tags)
+    
+    def set(self, name: str, value: float, tags: Optional[Dict[str, str]] = None) -> None:
+        """
+        Set a gauge without awaiting.
+        
+        Args:
+            name: Metric name
+            value: Gauge value
+            tags: Optional tags for the metric
+        """
+        self._series(self._gauges, name, _label_set(tags), lambda: [value])[0] = value
+        if self.history_sample_rate:
+            self._record_history("gauge", name, value, tags)
+    
+    def observe(self, name: str, value: float, tags: Optional[Dict[str, str]] = None) -> None:
+        """
+        Record a histogram value without awaiting.
+        
+        Args:
+            name: Metric name
+            value: Value to record
+            tags: Optional tags for the metric
+        """
+        self._series(self._histograms, name, _label_set(tags),
+                     lambda: _PerThread(self._new_sketch, HistogramSketch.merge)).local().add(value)
+        if self.history_sample_rate:
+            self._record_history("histogram", name, value, tags)
+    
+    def observe_timing(self, name: str, duration: float, tags: Optional[Dict[str, str]] = None) -> None:
+        """Record a timing (``{name}.duration`` histogram and ``{name}.count`` counter)."""
+        self.observe(f"{name}.duration", duration, tags)
+        self.inc(f"{name}.count", tags=tags)
+    
+    def time(self, name: str, tags: Optional[Dict[str, str]] = None) -> "TimingContext":
+        """Context manager (sync or async) that records a timing."""
+        return TimingContext(self, name, tags)
+    
+    # Aggregation
+    
+    def _counter_value(self, name: str, tags: Optional[Dict[str, str]]) -> int:
+        series = self._counters.get(name, {})
+        cells = series.values() if tags is None else [series.get(_label_set(tags))]
+        return sum(cell[0] for per_thread in cells if per_thread is not None
+                   for cell in per_thread.snapshot())
+    
+    def _merged_sketch(self, name: str, tags: Optional[Dict[str, str]]) -> HistogramSketch:
+        merged = self._new_sketch()
+        series = self._histograms.get(name, {})
+        cells = list(series.values()) if tags is None else [series.get(_label_set(tags))]
+        for per_thread in cells:
+            if per_thread is not None:
+                for sketch in per_thread.snapshot():
+                    merged.merge(sketch)
+        return merged
+    
+    def _latest_gauge(self, name: str, tags: Optional[Dict[str, str]]) -> Optional[float]:
+        series = self._gauges.get(name)
+        if not series:
+            return None
+        if tags is None:
+            cell = series.get(()) or next(reversed(list(series.values())))
+        else:
+            cell = series.get(_label_set(tags))
+        return None if cell is None else cell[0]
+    
+    # Async API
     
     async def increment_counter(self, name: str, value: int = 1, tags: Optional[Dict[str, str]] = None) -> None:
         """
@@ -36,19 +419,7 @@ class MetricsCollector:
             value: Value to increment by
             tags: Optional tags for the metric
         """
-        async with self._lock:
-            self._counters[name] += value
-            
-            # Store in history
-            metric_data = {
-                "timestamp": datetime.utcnow(),
-                "type": "counter",
-                "name": name,
-                "value": value,
-                "total": self._counters[name],
-                "tags": tags or {}
-            }
-            self._metrics[name].append(metric_data)
+        self.inc(name, value, tags)
     
     async def set_gauge(self, name: str, value: float, tags: Optional[Dict[str, str]] = None) -> None:
         """
@@ -59,18 +430,7 @@ class MetricsCollector:
             value: Gauge value
             tags: Optional tags for the metric
         """
-        async with self._lock:
-            self._gauges[name] = value
-            
-            # Store in history
-            metric_data = {
-                "timestamp": datetime.utcnow(),
-                "type": "gauge",
-                "name": name,
-                "value": value,
-                "tags": tags or {}
-            }
-            self._metrics[name].append(metric_data)
+        self.set(name, value, tags)
     
     async def record_histogram(self, name: str, value: float, tags: Optional[Dict[str, str]] = None) -> None:
         """
@@ -81,18 +441,7 @@ class MetricsCollector:
             value: Value to record
             tags: Optional tags for the metric
         """
-        async with self._lock:
-            self._histograms[name].append(value)
-            
-            # Store in history
-            metric_data = {
-                "timestamp": datetime.utcnow(),
-                "type": "histogram",
-                "name": name,
-                "value": value,
-                "tags": tags or {}
-            }
-            self._metrics[name].append(metric_data)
+        self.observe(name, value, tags)
     
     async def record_timing(self, name: str, duration: float, tags: Optional[Dict[str, str]] = None) -> None:
         """
@@ -103,76 +452,72 @@ class MetricsCollector:
             duration: Duration in seconds
             tags: Optional tags for the metric
         """
-        await self.record_histogram(f"{name}.duration", duration, tags)
-        await self.increment_counter(f"{name}.count", tags=tags)
+        self.observe_timing(name, duration, tags)
     
-    async def get_counter(self, name: str) -> int:
+    async def get_counter(self, name: str, tags: Optional[Dict[str, str]] = None) -> int:
         """
         Get counter value.
         
         Args:
             name: Counter name
-            
+            tags: Series to read; None sums all series of the counter
+        
         Returns:
             Counter value
         """
-        async with self._lock:
-            return self._counters.get(name, 0)
+        return self._counter_value(name, tags)
     
-    async def get_gauge(self, name: str) -> Optional[float]:
+    async def get_gauge(self, name: str, tags: Optional[Dict[str, str]] = None) -> Optional[float]:
         """
         Get gauge value.
         
         Args:
             name: Gauge name
-            
+            tags: Series to read; None reads the unlabeled (or latest) series
+        
         Returns:
             Gauge value or None if not set
         """
-        async with self._lock:
-            return self._gauges.get(name)
+        return self._latest_gauge(name, tags)
     
-    async def get_histogram_stats(self, name: str) -> Optional[Dict[str, float]]:
+    async def get_histogram_stats(self, name: str, tags: Optional[Dict[str, str]] = None) -> Optional[Dict[str, float]]:
         """
         Get histogram statistics.
         
         Args:
             name: Histogram name
-            
+            tags: Series to read; None merges all series of the histogram
+        
         Returns:
             Histogram statistics or None if no data
         """
-        async with self._lock:
-            values = self._histograms.get(name, [])
-            if not values:
-                return None
-            
-            return {
-                "count": len(values),
-                "min": min(values),
-                "max": max(values),
-                "mean": sum(values) / len(values),
-                "median": sorted(values)[len(values) // 2],
-                "p95": sorted(values)[int(len(values) * 0.95)],
-                "p99": sorted(values)[int(len(values) * 0.99)],
-            }
+        return self._merged_sketch(name, tags).stats()
     
     async def get_metric_history(self, name: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
-        Get metric history.
+        Get the sampled metric history.
         
         Args:
             name: Metric name
             limit: Maximum number of entries to return
-            
+        
         Returns:
             List of metric entries
         """
-        async with self._lock:
-            history = list(self._metrics.get(name, []))
-            if limit:
-                history = history[-limit:]
-            return history
+        history = list(self._metrics.get(name, ()))
+        if limit:
+            history = history[-limit:]
+        return [
+            dict(
+                extra,
+                timestamp=datetime.utcfromtimestamp(timestamp),
+                type=kind,
+                name=name,
+                value=value,
+                tags=tags or {},
+            )
+            for timestamp, kind, value, tags, extra in history
+        ]
     
     async def get_all_metrics(self) -> Dict[str, Any]:
         """
@@ -181,23 +526,23 @@ class MetricsCollector:
         Returns:
             Dictionary containing all metrics
         """
-        async with self._lock:
-            return {
-                "counters": dict(self._counters),
-                "gauges": dict(self._gauges),
-                "histograms": {
-                    name: await self.get_histogram_stats(name)
-                    for name in self._histograms.keys()
-                }
-            }
+        return {
+            "counters": {name: self._counter_value(name, None) for name in list(self._counters)},
+            "gauges": {name: self._latest_gauge(name, None) for name in list(self._gauges)},
+            "histograms": {
+                name: self._merged_sketch(name, None).stats()
+                for name in list(self._histograms)
+            },
+        }
     
     async def clear_metrics(self) -> None:
         """Clear all metrics."""
-        async with self._lock:
-            self._counters.clear()
-            self._gauges.clear()
-            self._histograms.clear()
-            self._metrics.clear()
+        with self._series_lock:
+            self._counters = {}
+            self._gauges = {}
+            self._histograms = {}
+            self._metrics = {}
+            self._dropped_series = 0
     
     async def export_metrics(self, format: str = "json") -> str:
         """
@@ -205,7 +550,7 @@ class MetricsCollector:
         
         Args:
             format: Export format (json, prometheus)
-            
+        
         Returns:
             Exported metrics string
         """
@@ -217,33 +562,58 @@ class MetricsCollector:
         else:
             raise ValueError(f"Unsupported export format: {format}")
     
+    @staticmethod
+    def _prometheus_name(name: str) -> str:
+        return _PROMETHEUS_INVALID.sub("_", name)
+    
+    @staticmethod
+    def _prometheus_labels(labels: LabelSet, extra: LabelSet = ()) -> str:
+        pairs = labels + extra
+        if not pairs:
+            return ""
+        rendered = ",".join(
+            '{}="{}"'.format(
+                _PROMETHEUS_INVALID.sub("_", key),
+                value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+            )
+            for key, value in pairs
+        )
+        return "{" + rendered + "}"
+    
     async def _export_prometheus(self) -> str:
-        """Export metrics in Prometheus format."""
+        """Export metrics in Prometheus text format (one sample per label set)."""
         lines = []
         
         # Export counters
-        for name, value in self._counters.items():
-            lines.append(f"# TYPE {name} counter")
-            lines.append(f"{name} {value}")
+        for name, series in list(self._counters.items()):
+            metric = self._prometheus_name(name)
+            lines.append(f"# TYPE {metric} counter")
+            for labels, per_thread in list(series.items()):
+                value = sum(cell[0] for cell in per_thread.snapshot())
+                lines.append(f"{metric}{self._prometheus_labels(labels)} {value}")
         
         # Export gauges
-        for name, value in self._gauges.items():
-            lines.append(f"# TYPE {name} gauge")
-            lines.append(f"{name} {value}")
-        
-        # Export histograms
-        for name, values in self._histograms.items():
-            if values:
-                stats = await self.get_histogram_stats(name)
-                lines.append(f"# TYPE {name} histogram")
-                lines.append(f"{name}_count {stats['count']}")
-                lines.append(f"{name}_sum {sum(values)}")
-                lines.append(f"{name}_min {stats['min']}")
-                lines.append(f"{name}_max {stats['max']}")
-                lines.append(f"{name}_mean {stats['mean']}")
-                lines.append(f"{name}_median {stats['median']}")
-                lines.append(f"{name}_p95 {stats['p95']}")
-                lines.append(f"{name}_p99 {stats['p99']}")
+        for name, series in list(self._gauges.items()):
+            metric = self._prometheus_name(name)
+            lines.append(f"# TYPE {metric} gauge")
+            for labels, cell in list(series.items()):
+                lines.append(f"{metric}{self._prometheus_labels(labels)} {cell[0]}")
+        
+        # Export histograms as summaries with sketch quantiles
+        for name, series in list(self._histograms.items()):
+            metric = self._prometheus_name(name)
+            lines.append(f"# TYPE {metric} summary")
+            for labels, per_thread in list(series.items()):
+                sketch = self._new_sketch()
+                for part in per_thread.snapshot():
+                    sketch.merge(part)
+                if not sketch.count:
+                    continue
+                for q in (0.5, 0.95, 0.99):
+                    quantile_labels = self._prometheus_labels(labels, (("quantile", str(q)),))
+                    lines.append(f"{metric}{quantile_labels} {sketch.quantile(q)}")
+                lines.append(f"{metric}_sum{self._prometheus_labels(labels)} {sketch.sum}")
+                lines.append(f"{metric}_count{self._prometheus_labels(labels)} {sketch.count}")
         
         return "\n".join(lines)
     
@@ -254,20 +624,25 @@ class MetricsCollector:
         Returns:
             Metrics summary
         """
-        async with self._lock:
-            return {
-                "total_counters": len(self._counters),
-                "total_gauges": len(self._gauges),
-                "total_histograms": len(self._histograms),
-                "counter_names": list(self._counters.keys()),
-                "gauge_names": list(self._gauges.keys()),
-                "histogram_names": list(self._histograms.keys()),
-                "total_metric_entries": sum(len(history) for history in self._metrics.values()),
-            }
+        return {
+            "total_counters": len(self._counters),
+            "total_gauges": len(self._gauges),
+            "total_histograms": len(self._histograms),
+            "counter_names": list(self._counters.keys()),
+            "gauge_names": list(self._gauges.keys()),
+            "histogram_names": list(self._histograms.keys()),
+            "total_series": sum(
+                len(series)
+                for table in (self._counters, self._gauges, self._histograms)
+                for series in list(table.values())
+            ),
+            "dropped_series": self._dropped_series,
+            "total_metric_entries": sum(len(history) for history in list(self._metrics.values())),
+        }
 
 
 class TimingContext:
-    """Context manager for timing operations."""
+    """Context manager for timing operations (usable with ``with`` and ``async with``)."""
     
     def __init__(self, metrics_collector: MetricsCollector, name: str, tags: Optional[Dict[str, str]] = None):
         """
@@ -282,17 +657,26 @@ class TimingContext:
         self.name = name
         self.tags = tags
         self.start_time = None
+        self.duration: Optional[float] = None
     
-    async def __aenter__(self):
+    def __enter__(self):
         """Enter timing context."""
-        self.start_time = time.time()
+        self.start_time = time.perf_counter()
         return self
     
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Exit timing context."""
+        if self.start_time is not None:
+            self.duration = time.perf_counter() - self.start_time
+            self.metrics_collector.observe_timing(self.name, self.duration, self.tags)
+    
+    async def __aenter__(self):
+        """Enter timing context."""
+        return self.__enter__()
+    
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Exit timing context."""
-        if self.start_time:
-            duration = time.time() - self.start_time
-            await self.metrics_collector.record_timing(self.name, duration, self.tags)
+        self.__exit__(exc_type, exc_val, exc_tb)
 
 
 def timing(metrics_collector: MetricsCollector, name: str, tags: Optional[Dict[str, str]] = None):
@@ -303,15 +687,17 @@ def timing(metrics_collector: MetricsCollector, name: str, tags: Optional[Dict[s
         metrics_collector: Metrics collector instance
         name: Metric name
         tags: Optional tags
-        
+    
     Returns:
         Decorated function
     """
     def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
         async def async_wrapper(*args, **kwargs):
             async with TimingContext(metrics_collector, name, tags):
                 return await func(*args, **kwargs)
         
+        @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
             with TimingContext(metrics_collector, name, tags):
                 return func(*args, **kwargs)
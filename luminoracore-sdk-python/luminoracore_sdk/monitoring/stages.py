@@ -0,0 +1,222 @@
+"""Per-stage request timing for LuminoraCore SDK."""
+
+import time
+from typing import Dict, Optional, Any
+
+from .metrics import MetricsCollector
+from .tracer import DistributedTracer
+
+
+class _Stage:
+    """Context manager timing one stage of a StageTimer."""
+    
+    __slots__ = ("timer", "name", "start", "span_id")
+    
+    def __init__(self, timer: "StageTimer", name: str):
+        self.timer = timer
+        self.name = name
+        self.start = 0.0
+        self.span_id: Optional[str] = None
+    
+    def __enter__(self):
+        timer = self.timer
+        if timer.tracer is not None and timer.trace_id is not None:
+            self.span_id = timer.tracer.start_span(
+                self.name, timer.trace_id, parent_span_id=timer.root_span_id
+            )
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        timer = self.timer
+        timer.add_duration(self.name, time.perf_counter() - self.start)
+        if self.span_id is not None:
+            if exc_type is not None:
+                timer.tracer.add_span_tag(self.span_id, "error", str(exc_val))
+            timer.tracer.finish_span(self.span_id)
+
+
+class _NullStage:
+    """Shared no-op stage used when timing is disabled."""
+    
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return None
+
+
+_NULL_STAGE = _NullStage()
+
+
+class StageTimer:
+    """
+    Wall-clock time and token usage per stage of a single request.
+    
+    Each stage is accumulated (a stage entered twice adds up), recorded as
+    a ``{name}.stage_seconds`` histogram labelled with the stage when a
+    MetricsCollector is given, and traced as a child span of one trace per
+    request when a DistributedTracer is given.
+    
+    Use ``StageTimer.create()`` so that requests without timings, metrics
+    or tracing get the shared disabled timer, whose stages are no-ops.
+    
+    Example:
+        >>> timer = StageTimer.create("chat_turn", enabled=True)
+        >>> with timer.stage("llm_call"):
+        ...     response = await provider.chat(messages)
+        >>> timer.add_usage("llm_call", response.usage)
+        >>> timer.finish()["stages"]
+        {'llm_call': 812.4}
+    """
+    
+    enabled = True
+    
+    def __init__(
+        self,
+        name: str,
+        metrics: Optional[MetricsCollector] = None,
+        tracer: Optional[DistributedTracer] = None
+    ):
+        """
+        Initialize the stage timer.
+        
+        Args:
+            name: Request name (metric prefix and trace operation)
+            metrics: Optional metrics collector
+            tracer: Optional distributed tracer
+        """
+        self.name = name
+        self.metrics = metrics
+        self.tracer = tracer
+        self.stages: Dict[str, float] = {}
+        self.tokens: Dict[str, Dict[str, int]] = {}
+        self.trace_id: Optional[str] = None
+        self.root_span_id: Optional[str] = None
+        self._start = time.perf_counter()
+        
+        if tracer is not None:
+            self.trace_id = tracer.start_trace(name)
+            trace = tracer.get_trace(self.trace_id)
+            if trace is not None and trace.root_span is not None:
+                self.root_span_id = trace.root_span.span_id
+            else:
+                self.trace_id = None  # Not sampled
+    
+    @classmethod
+    def create(
+        cls,
+        name: str,
+        enabled: bool = False,
+        metrics: Optional[MetricsCollector] = None,
+        tracer: Optional[DistributedTracer] = None
+    ) -> "StageTimer":
+        """
+        Get a timer, or the disabled timer when nothing would consume it.
+        
+        Args:
+            name: Request name
+            enabled: Whether the caller wants the timings block
+            metrics: Optional metrics collector
+            tracer: Optional distributed tracer
+        
+        Returns:
+            StageTimer
+        """
+        if not enabled and metrics is None and tracer is None:
+            return NULL_STAGE_TIMER
+        return cls(name, metrics, tracer)
+    
+    def stage(self, name: str) -> _Stage:
+        """Context manager timing a stage."""
+        return _Stage(self, name)
+    
+    def add_duration(self, stage: str, seconds: float) -> None:
+        """
+        Add time measured by the caller to a stage.
+        
+        For work that cannot be wrapped in ``stage()``, such as the
+        provider side of a stream whose chunks are yielded to a consumer
+        in between. No span is traced.
+        
+        Args:
+            stage: Stage name
+            seconds: Duration in seconds
+        """
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+        if self.metrics is not None:
+            self.metrics.observe(f"{self.name}.stage_seconds", seconds, {"stage": stage})
+    
+    def add_usage(self, stage: str, usage: Optional[Dict[str, Any]]) -> None:
+        """
+        Add token usage (e.g. ``ChatResponse.usage``) to a stage.
+        
+        Args:
+            stage: Stage name
+            usage: Usage dictionary with integer token counts
+        """
+        if not usage:
+            return
+        counts = self.tokens.setdefault(stage, {})
+        for kind, value in usage.items():
+            if isinstance(value, int) and not isinstance(value, bool):
+                counts[kind] = counts.get(kind, 0) + value
+                if self.metrics is not None:
+                    self.metrics.inc(f"{self.name}.tokens", value, {"stage": stage, "kind": kind})
+    
+    def finish(self) -> Optional[Dict[str, Any]]:
+        """
+        Close the request and build the timings block.
+        
+        Returns:
+            Dictionary with total_ms, per-stage milliseconds and token usage
+        """
+        total = time.perf_counter() - self._start
+        if self.metrics is not None:
+            self.metrics.observe(f"{self.name}.total_seconds", total)
+        if self.trace_id is not None:
+            self.tracer.finish_span(self.trace_id)
+            self.trace_id = None
+        
+        token_totals: Dict[str, int] = {}
+        for counts in self.tokens.values():
+            for kind, value in counts.items():
+                token_totals[kind] = token_totals.get(kind, 0) + value
+        
+        return {
+            "total_ms": round(total * 1000, 3),
+            "stages": {name: round(seconds * 1000, 3) for name, seconds in self.stages.items()},
+            "tokens": {"total": token_totals, "by_stage": self.tokens},
+        }
+
+
+class _DisabledStageTimer(StageTimer):
+    """Timer that records nothing."""
+    
+    enabled = False
+    
+    def __init__(self):
+        self.name = ""
+        self.metrics = None
+        self.tracer = None
+        self.stages = {}
+        self.tokens = {}
+        self.trace_id = None
+        self.root_span_id = None
+    
+    def stage(self, name: str) -> _NullStage:
+        return _NULL_STAGE
+    
+    def add_duration(self, stage: str, seconds: float) -> None:
+        return None
+    
+    def add_usage(self, stage: str, usage: Optional[Dict[str, Any]]) -> None:
+        return None
+    
+    def finish(self) -> Optional[Dict[str, Any]]:
+        return None
+
+
+NULL_STAGE_TIMER = _DisabledStageTimer()
@@ -0,0 +1,363 @@
+"""Trace export pipeline for LuminoraCore SDK."""
+
+import json
+import logging
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .tracer import Trace
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OTLP_ENDPOINT = "http://localhost:4318/v1/traces"
+
+
+def _micros(moment: datetime) -> int:
+    # Spans use naive UTC datetimes
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1_000_000)
+
+
+def _micros_from_iso(timestamp: str) -> int:
+    return _micros(datetime.fromisoformat(timestamp))
+
+
+def trace_to_jaeger(trace: "Trace") -> Dict[str, Any]:
+    """
+    Convert a trace to Jaeger JSON (the query/UI trace format).
+    
+    Args:
+        trace: Trace to convert
+    
+    Returns:
+        Jaeger trace dictionary
+    """
+    spans = []
+    for span in trace.spans:
+        jaeger_span = {
+            "traceID": span.trace_id,
+            "spanID": span.span_id,
+            "operationName": span.operation_name,
+            "startTime": _micros(span.start_time),
+            "duration": int((span.duration or 0) * 1_000_000),
+            "processID": "p1",
+            "tags": [
+                {"key": k, "value": str(v), "type": "string"}
+                for k, v in span.tags.items()
+            ],
+            "logs": [
+                {
+                    "timestamp": _micros_from_iso(log["timestamp"]),
+                    "fields": [
+                        {"key": k, "value": str(v), "type": "string"}
+                        for k, v in log["fields"].items()
+                    ]
+                }
+                for log in span.logs
+            ]
+        }
+        
+        if span.parent_span_id:
+            jaeger_span["references"] = [
+                {
+                    "refType": "CHILD_OF",
+                    "traceID": span.trace_id,
+                    "spanID": span.parent_span_id
+                }
+            ]
+        
+        spans.append(jaeger_span)
+    
+    return {
+        "traceID": trace.trace_id,
+        "spans": spans,
+        "processes": {"p1": {"serviceName": trace.service_name, "tags": []}},
+    }
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def traces_to_otlp(traces: List["Trace"]) -> Dict[str, Any]:
+    """
+    Convert traces to an OTLP/JSON ExportTraceServiceRequest.
+    
+    Args:
+        traces: Traces to convert (grouped by service name)
+    
+    Returns:
+        OTLP request dictionary
+    """
+    by_service: Dict[str, List[Dict[str, Any]]] = {}
+    for trace in traces:
+        otlp_spans = by_service.setdefault(trace.service_name, [])
+        for span in trace.spans:
+            end_time = span.end_time or span.start_time
+            otlp_span = {
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "name": span.operation_name,
+                "kind": 1,  # SPAN_KIND_INTERNAL
+                "startTimeUnixNano": str(_micros(span.start_time) * 1000),
+                "endTimeUnixNano": str(_micros(end_time) * 1000),
+                "attributes": [
+                    {"key": k, "value": _otlp_value(v)} for k, v in span.tags.items()
+                ],
+                "events": [
+                    {
+                        "timeUnixNano": str(_micros_from_iso(log["timestamp"]) * 1000),
+                        "name": log["message"],
+                        "attributes": [
+                            {"key": k, "value": _otlp_value(v)} for k, v in log["fields"].items()
+                        ],
+                    }
+                    for log in span.logs
+                ],
+                "status": {"code": 2 if span.is_error else 1},
+            }
+            if span.parent_span_id:
+                otlp_span["parentSpanId"] = span.parent_span_id
+            otlp_spans.append(otlp_span)
+    
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [{"key": "service.name", "value": {"stringValue": service}}]
+                },
+                "scopeSpans": [{"scope": {"name": "luminoracore_sdk"}, "spans": spans}],
+            }
+            for service, spans in by_service.items()
+        ]
+    }
+
+
+def _encode(traces: List["Trace"], format: str) -> Dict[str, Any]:
+    if format == "otlp":
+        return traces_to_otlp(traces)
+    if format == "jaeger":
+        return {"data": [trace_to_jaeger(trace) for trace in traces]}
+    raise ValueError(f"Unsupported export format: {format}")
+
+
+class TraceExporter(ABC):
+    """Base class for trace exporters."""
+    
+    @abstractmethod
+    def export(self, traces: List["Trace"]) -> None:
+        """
+        Export a batch of finished traces.
+        
+        Args:
+            traces: Finished traces
+        """
+        pass
+    
+    def shutdown(self) -> None:
+        """Release exporter resources."""
+
+
+class FileTraceExporter(TraceExporter):
+    """Appends one JSON document per batch to a file (JSON lines)."""
+    
+    def __init__(self, path: Union[str, Path], format: str = "otlp"):
+        """
+        Initialize the file exporter.
+        
+        Args:
+            path: Output file path
+            format: Export format (otlp, jaeger)
+        """
+        _encode([], format)  # Validate format early
+        self.path = Path(path)
+        self.format = format
+    
+    def export(self, traces: List["Trace"]) -> None:
+        """Append a batch to the file."""
+        line = json.dumps(_encode(traces, self.format), separators=(",", ":"))
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
+
+
+class HttpTraceExporter(TraceExporter):
+    """Posts batches to a local collector (OTLP/HTTP JSON by default)."""
+    
+    def __init__(
+        self,
+        endpoint: str = DEFAULT_OTLP_ENDPOINT,
+        format: str = "otlp",
+        timeout: float = 5.0,
+        headers: Optional[Dict[str, str]] = None
+    ):
+        """
+        Initialize the HTTP exporter.
+        
+        Args:
+            endpoint: Collector URL
+            format: Export format (otlp, jaeger)
+            timeout: Request timeout in seconds
+            headers: Optional extra headers
+        """
+        import httpx
+        
+        _encode([], format)
+        self.endpoint = endpoint
+        self.format = format
+        self._client = httpx.Client(
+            timeout=timeout,
+            headers={"Content-Type": "application/json", **(headers or {})}
+        )
+    
+    def export(self, traces: List["Trace"]) -> None:
+        """Post a batch to the collector."""
+        response = self._client.post(self.endpoint, content=json.dumps(_encode(traces, self.format)))
+        response.raise_for_status()
+    
+    def shutdown(self) -> None:
+        """Close the HTTP client."""
+        self._client.close()
+
+
+class BatchTraceProcessor:
+    """
+    Buffers finished traces and exports them in batches from a background thread.
+    
+    submit() never blocks the caller: when the queue is full the trace is
+    dropped and counted. A batch is exported when it reaches
+    max_batch_size or when schedule_delay seconds have passed.
+    """
+    
+    def __init__(
+        self,
+        exporter: TraceExporter,
+        max_queue_size: int = 2048,
+        max_batch_size: int = 256,
+        schedule_delay: float = 5.0
+    ):
+        """
+        Initialize the batch processor.
+        
+        Args:
+            exporter: Exporter that receives batches
+            max_queue_size: Maximum queued traces before dropping
+            max_batch_size: Maximum traces per export call
+            schedule_delay: Maximum seconds a trace waits before export
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.exporter = exporter
+        self.max_batch_size = max_batch_size
+        self.schedule_delay = schedule_delay
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self._flush_requests: "queue.Queue" = queue.Queue()
+        self._stopped = threading.Event()
+        self.exported = 0
+        self.dropped = 0
+        self.failed_batches = 0
+        self._worker = threading.Thread(target=self._run, name="luminoracore-trace-export", daemon=True)
+        self._worker.start()
+    
+    def submit(self, trace: "Trace") -> bool:
+        """
+        Queue a finished trace for export.
+        
+        Args:
+            trace: Finished trace
+        
+        Returns:
+            True if queued, False if dropped
+        """
+        if self._stopped.is_set():
+            self.dropped += 1
+            return False
+        try:
+            self._queue.put_nowait(trace)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+    
+    def _export(self, batch: List["Trace"]) -> None:
+        if not batch:
+            return
+        try:
+            self.exporter.export(batch)
+            self.exported += len(batch)
+        except Exception as e:
+            self.failed_batches += 1
+            logger.warning(f"Trace export failed ({len(batch)} traces): {e}")
+    
+    def _collect(self) -> List["Trace"]:
+        """Wait for a full batch, the schedule delay, or a flush request."""
+        batch: List["Trace"] = []
+        deadline = time.monotonic() + self.schedule_delay
+        while len(batch) < self.max_batch_size:
+            urgent = self._stopped.is_set() or not self._flush_requests.empty()
+            remaining = 0 if urgent else deadline - time.monotonic()
+            try:
+                trace = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if trace is None:  # Wake-up from flush(); drain without waiting
+                continue
+            batch.append(trace)
+        return batch
+    
+    def _run(self) -> None:
+        while True:
+            self._export(self._collect())
+            
+            # Flush/shutdown requests are honoured once the queue is empty
+            if self._queue.empty():
+                while not self._flush_requests.empty():
+                    self._flush_requests.get_nowait().set()
+                if self._stopped.is_set():
+                    return
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until everything queued so far has been exported.
+        
+        Args:
+            timeout: Maximum seconds to wait
+        
+        Returns:
+            True if the queue was flushed in time
+        """
+        done = threading.Event()
+        self._flush_requests.put(done)
+        try:
+            self._queue.put_nowait(None)  # Wake the worker
+        except queue.Full:
+            pass
+        return done.wait(timeout)
+    
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Flush pending traces, stop the worker and shut the exporter down."""
+        self._stopped.set()
+        self.flush(timeout)
+        self._worker.join(timeout)
+        self.exporter.shutdown()
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Export counters."""
+        return {
+            "queued": self._queue.qsize(),
+            "exported": self.exported,
+            "dropped": self.dropped,
+            "failed_batches": self.failed_batches,
+        }
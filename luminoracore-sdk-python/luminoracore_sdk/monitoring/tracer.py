@@ -1,14 +1,25 @@
 """Distributed tracing for LuminoraCore SDK."""
 
 import asyncio
-import uuid
-import time
-from typing import Dict, List, Optional, Any, Union
+import random
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any
 from datetime import datetime
 import json
 from contextlib import asynccontextmanager
 
-from ..utils.helpers import generate_session_id
+from .trace_export import BatchTraceProcessor, trace_to_jaeger, traces_to_otlp
+
+
+def generate_trace_id() -> str:
+    """Generate a 128-bit hex trace ID (W3C/OTLP compatible)."""
+    return f"{random.getrandbits(128):032x}"
+
+
+def generate_span_id() -> str:
+    """Generate a 64-bit hex span ID (W3C/OTLP compatible)."""
+    return f"{random.getrandbits(64):016x}"
 
 
 class Span:
@@ -45,6 +56,11 @@ class Span:
         self.child_spans: List[Span] = []
         self.parent_span_id: Optional[str] = None
     
+    @property
+    def is_error(self) -> bool:
+        """Whether the span was tagged as failed."""
+        return "error" in self.tags or self.tags.get("success") is False
+    
     def finish(self, end_time: Optional[datetime] = None) -> None:
         """
         Finish the span.
@@ -107,6 +123,7 @@ class Trace:
         self.start_time: Optional[datetime] = None
         self.end_time: Optional[datetime] = None
         self.duration: Optional[float] = None
+        self.dropped_spans = 0
     
     def add_span(self, span: Span) -> None:
         """Add a span to the trace."""
@@ -135,25 +152,141 @@ class Trace:
             "end_time": self.end_time.isoformat() if self.end_time else None,
             "duration": self.duration,
             "span_count": len(self.spans),
+            "dropped_spans": self.dropped_spans,
             "spans": [span.to_dict() for span in self.spans]
         }
 
 
 class DistributedTracer:
-    """Distributed tracer for LuminoraCore SDK."""
+    """
+    Distributed tracer for LuminoraCore SDK.
+    
+    Memory is bounded: at most ``max_traces`` traces are kept (finished
+    traces are evicted first, oldest first) and each trace records at most
+    ``max_spans_per_trace`` spans. Spans are found through a span-ID index
+    instead of scanning the trace.
     
-    def __init__(self, service_name: str = "luminoracore"):
+    Sampling happens twice:
+    
+    - Head sampling (``sample_rate``) is decided from the trace ID when a
+      trace starts, so unsampled traces cost almost nothing and the
+      decision is consistent across services sharing the trace ID.
+    - Tail sampling runs when a trace finishes: traces with errors or
+      slower than ``slow_trace_threshold`` are always exported, the rest
+      with probability ``tail_sample_rate``.
+    
+    Finished traces that pass tail sampling are handed to ``exporter``
+    (usually a BatchTraceProcessor), which exports off the request path.
+    """
+    
+    def __init__(
+        self,
+        service_name: str = "luminoracore",
+        sample_rate: float = 1.0,
+        tail_sample_rate: float = 1.0,
+        slow_trace_threshold: Optional[float] = None,
+        max_traces: int = 1000,
+        max_spans_per_trace: int = 1000,
+        exporter: Optional[BatchTraceProcessor] = None
+    ):
         """
         Initialize the distributed tracer.
         
         Args:
             service_name: Service name
+            sample_rate: Fraction of traces recorded (head sampling)
+            tail_sample_rate: Fraction of ordinary finished traces exported
+            slow_trace_threshold: Seconds above which a trace is always exported
+            max_traces: Maximum traces kept in memory
+            max_spans_per_trace: Maximum spans recorded per trace
+            exporter: Optional processor receiving finished traces
         """
+        for name, rate in (("sample_rate", sample_rate), ("tail_sample_rate", tail_sample_rate)):
+            if not 0 <= rate <= 1:
+                raise ValueError(f"{name} must be between 0 and 1")
+        if max_traces < 1 or max_spans_per_trace < 1:
+            raise ValueError("max_traces and max_spans_per_trace must be at least 1")
+        
         self.service_name = service_name
-        self._traces: Dict[str, Trace] = {}
+        self.sample_rate = sample_rate
+        self.tail_sample_rate = tail_sample_rate
+        self.slow_trace_threshold = slow_trace_threshold
+        self.max_traces = max_traces
+        self.max_spans_per_trace = max_spans_per_trace
+        self.exporter = exporter
+        self._traces: "OrderedDict[str, Trace]" = OrderedDict()
+        self._finished: "OrderedDict[str, None]" = OrderedDict()
+        self._span_index: Dict[str, Span] = {}
         self._active_spans: Dict[str, Span] = {}
+        self._stats = {
+            "sampled_out": 0,
+            "evicted_finished": 0,
+            "evicted_in_flight": 0,
+            "dropped_spans": 0,
+            "exported": 0,
+            "tail_dropped": 0,
+        }
         self._lock = asyncio.Lock()
     
+    def _head_sampled(self, trace_id: str) -> bool:
+        """Deterministic head-sampling decision for a trace ID."""
+        if self.sample_rate >= 1:
+            return True
+        if self.sample_rate <= 0:
+            return False
+        return zlib.crc32(trace_id.encode()) < self.sample_rate * 0x100000000
+    
+    def _new_trace(self, trace_id: str) -> Trace:
+        """Register a trace, evicting finished (then oldest) traces when full."""
+        while len(self._traces) >= self.max_traces:
+            if self._finished:
+                evicted_id, _ = self._finished.popitem(last=False)
+                self._stats["evicted_finished"] += 1
+            else:
+                evicted_id = next(iter(self._traces))
+                self._stats["evicted_in_flight"] += 1
+            self._forget(evicted_id)
+        
+        trace = Trace(trace_id, self.service_name)
+        self._traces[trace_id] = trace
+        return trace
+    
+    def _forget(self, trace_id: str) -> None:
+        """Drop a trace and its index entries."""
+        trace = self._traces.pop(trace_id, None)
+        self._finished.pop(trace_id, None)
+        if trace is None:
+            return
+        for span in trace.spans:
+            self._span_index.pop(span.span_id, None)
+            self._active_spans.pop(span.span_id, None)
+        if self._active_spans.get(trace_id) is trace.root_span:
+            self._active_spans.pop(trace_id, None)
+    
+    def _record_span(self, trace: Trace, span: Span) -> bool:
+        """Add a span to a trace unless the trace is at its span limit."""
+        if len(trace.spans) >= self.max_spans_per_trace:
+            trace.dropped_spans += 1
+            self._stats["dropped_spans"] += 1
+            return False
+        trace.add_span(span)
+        self._span_index[span.span_id] = span
+        return True
+    
+    def _keep_finished(self, trace: Trace) -> bool:
+        """Tail-sampling decision for a finished trace."""
+        if any(span.is_error for span in trace.spans):
+            return True
+        if (
+            self.slow_trace_threshold is not None
+            and trace.duration is not None
+            and trace.duration >= self.slow_trace_threshold
+        ):
+            return True
+        if self.tail_sample_rate >= 1:
+            return True
+        return random.random() < self.tail_sample_rate
+    
     def start_trace(self, operation_name: str, trace_id: Optional[str] = None) -> str:
         """
         Start a new trace.
@@ -166,13 +299,16 @@ class DistributedTracer:
             Trace ID
         """
         if not trace_id:
-            trace_id = generate_session_id()
+            trace_id = generate_trace_id()
         
-        trace = Trace(trace_id, self.service_name)
-        span = Span(trace_id, generate_session_id(), operation_name)
+        if not self._head_sampled(trace_id):
+            self._stats["sampled_out"] += 1
+            return trace_id
         
-        trace.add_span(span)
-        self._traces[trace_id] = trace
+        trace = self._new_trace(trace_id)
+        span = Span(trace_id, generate_span_id(), operation_name)
+        
+        self._record_span(trace, span)
         self._active_spans[trace_id] = span
         
         return trace_id
@@ -187,6 +323,9 @@ class DistributedTracer:
         """
         Start a new span.
         
+        Spans of unknown traces start the trace (subject to head sampling);
+        spans of unsampled traces are not recorded.
+        
         Args:
             operation_name: Operation name
             trace_id: Trace ID
@@ -196,22 +335,26 @@ class DistributedTracer:
         Returns:
             Span ID
         """
-        span_id = generate_session_id()
+        span_id = generate_span_id()
+        
+        trace = self._traces.get(trace_id)
+        if trace is None:
+            if not self._head_sampled(trace_id):
+                self._stats["sampled_out"] += 1
+                return span_id
+            trace = self._new_trace(trace_id)
+        elif trace_id in self._finished:
+            return span_id
+        
         span = Span(trace_id, span_id, operation_name, tags=tags)
+        if not self._record_span(trace, span):
+            return span_id
         
         if parent_span_id:
             span.parent_span_id = parent_span_id
-        
-        # Add to trace
-        if trace_id in self._traces:
-            self._traces[trace_id].add_span(span)
-            
-            # Add as child span if parent exists
-            if parent_span_id:
-                for existing_span in self._traces[trace_id].spans:
-                    if existing_span.span_id == parent_span_id:
-                        existing_span.add_child_span(span)
-                        break
+            parent = self._span_index.get(parent_span_id)
+            if parent is not None:
+                parent.add_child_span(span)
         
         self._active_spans[span_id] = span
         return span_id
@@ -220,22 +363,48 @@ class DistributedTracer:
         """
         Finish a span.
         
+        Finishing the root span finishes its trace.
+        
         Args:
             span_id: Span ID
         """
-        if span_id in self._active_spans:
-            self._active_spans[span_id].finish()
-            del self._active_spans[span_id]
+        span = self._active_spans.pop(span_id, None)
+        if span is None:
+            return
+        span.finish()
+        
+        trace = self._traces.get(span.trace_id)
+        if trace is not None and trace.root_span is span:
+            self._active_spans.pop(span.trace_id, None)
+            self._active_spans.pop(span.span_id, None)
+            self.finish_trace(span.trace_id)
     
     def finish_trace(self, trace_id: str) -> None:
         """
-        Finish a trace.
+        Finish a trace and hand it to the exporter if it passes tail sampling.
         
         Args:
             trace_id: Trace ID
         """
-        if trace_id in self._traces:
-            self._traces[trace_id].finish()
+        trace = self._traces.get(trace_id)
+        if trace is None or trace_id in self._finished:
+            return
+        
+        trace.finish()
+        self._finished[trace_id] = None
+        
+        # Release index entries of the spans; the trace itself stays
+        # readable until it is evicted
+        for span in trace.spans:
+            self._span_index.pop(span.span_id, None)
+        
+        if self.exporter is None:
+            return
+        if self._keep_finished(trace):
+            if self.exporter.submit(trace):
+                self._stats["exported"] += 1
+        else:
+            self._stats["tail_dropped"] += 1
     
     def add_span_tag(self, span_id: str, key: str, value: Any) -> None:
         """
@@ -283,7 +452,7 @@ class DistributedTracer:
         Returns:
             Span or None if not found
         """
-        return self._active_spans.get(span_id)
+        return self._active_spans.get(span_id) or self._span_index.get(span_id)
     
     def list_traces(self) -> List[str]:
         """
@@ -300,7 +469,7 @@ class DistributedTracer:
         
         Args:
             trace_id: Trace ID
-            format: Export format (json, jaeger)
+            format: Export format (json, jaeger, otlp)
             
         Returns:
             Exported trace string or None if trace not found
@@ -313,57 +482,20 @@ class DistributedTracer:
             return json.dumps(trace.to_dict(), indent=2)
         elif format == "jaeger":
             return self._export_jaeger(trace)
+        elif format == "otlp":
+            return json.dumps(traces_to_otlp([trace]), indent=2)
         else:
             raise ValueError(f"Unsupported export format: {format}")
     
     def _export_jaeger(self, trace: Trace) -> str:
         """Export trace in Jaeger format."""
-        # This is a simplified Jaeger export
-        # In a real implementation, you'd use the Jaeger Python client
-        jaeger_data = {
-            "traceID": trace.trace_id,
-            "spans": []
-        }
-        
-        for span in trace.spans:
-            jaeger_span = {
-                "traceID": span.trace_id,
-                "spanID": span.span_id,
-                "operationName": span.operation_name,
-                "startTime": int(span.start_time.timestamp() * 1000000),  # microseconds
-                "duration": int((span.duration or 0) * 1000000),  # microseconds
-                "tags": [
-                    {"key": k, "value": str(v), "type": "string"}
-                    for k, v in span.tags.items()
-                ],
-                "logs": [
-                    {
-                        "timestamp": int(datetime.fromisoformat(log["timestamp"]).timestamp() * 1000000),
-                        "fields": [
-                            {"key": k, "value": str(v), "type": "string"}
-                            for k, v in log["fields"].items()
-                        ]
-                    }
-                    for log in span.logs
-                ]
-            }
-            
-            if span.parent_span_id:
-                jaeger_span["references"] = [
-                    {
-                        "refType": "CHILD_OF",
-                        "traceID": span.trace_id,
-                        "spanID": span.parent_span_id
-                    }
-                ]
-            
-            jaeger_data["spans"].append(jaeger_span)
-        
-        return json.dumps(jaeger_data, indent=2)
+        return json.dumps(trace_to_jaeger(trace), indent=2)
     
     def clear_traces(self) -> None:
         """Clear all traces."""
         self._traces.clear()
+        self._finished.clear()
+        self._span_index.clear()
         self._active_spans.clear()
     
     def get_trace_summary(self) -> Dict[str, Any]:
@@ -373,12 +505,18 @@ class DistributedTracer:
         Returns:
             Trace summary
         """
-        return {
+        summary = {
             "total_traces": len(self._traces),
+            "finished_traces": len(self._finished),
             "active_spans": len(self._active_spans),
+            "indexed_spans": len(self._span_index),
             "trace_ids": list(self._traces.keys()),
             "active_span_ids": list(self._active_spans.keys()),
+            **self._stats,
         }
+        if self.exporter is not None:
+            summary["exporter"] = self.exporter.get_stats()
+        return summary
 
 
 @asynccontextmanager
@@ -400,7 +538,7 @@ async def trace_operation(
     Yields:
         Span ID
     """
-    span_id = tracer.start_span(operation_name, trace_id or generate_session_id(), tags=tags)
+    span_id = tracer.start_span(operation_name, trace_id or generate_trace_id(), tags=tags)
     
     try:
         yield span_id
@@ -428,7 +566,7 @@ def trace_function(
     """
     def decorator(func):
         async def async_wrapper(*args, **kwargs):
-            span_id = tracer.start_span(operation_name, trace_id or generate_session_id(), tags=tags)
+            span_id = tracer.start_span(operation_name, trace_id or generate_trace_id(), tags=tags)
             
             try:
                 result = await func(*args, **kwargs)
@@ -442,7 +580,7 @@ def trace_function(
                 tracer.finish_span(span_id)
         
         def sync_wrapper(*args, **kwargs):
-            span_id = tracer.start_span(operation_name, trace_id or generate_session_id(), tags=tags)
+            span_id = tracer.start_span(operation_name, trace_id or generate_trace_id(), tags=tags)
             
             try:
                 result = func(*args, **kwargs)
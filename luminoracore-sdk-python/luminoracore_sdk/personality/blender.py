@@ -9,7 +9,11 @@ Fecha: 2025-11-21
 """
 
 import asyncio
-from typing import Dict, List, Optional, Any, Tuple
+import hashlib
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple, Union
 import logging
 from datetime import datetime
 import json
@@ -29,6 +33,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BLEND_CACHE_ENTRIES = 128
+DEFAULT_BLEND_CACHE_BYTES = 16 * 1024 * 1024
+
 
 class PersonalityBlender:
     """
@@ -36,13 +43,31 @@ class PersonalityBlender:
     
     REFACTORED: Ahora delega a luminoracore.PersonaBlend via adapter.
     API pública se mantiene idéntica para backward compatibility.
+    
+    Blends are cached under a hash of every input personality's content
+    paired with its weight, so editing a personality invalidates its
+    blends. The cache is an LRU bounded by entries and serialized bytes;
+    with ``cache_dir`` set, blends are also written there as JSON and
+    reloaded on a miss, so warm blends survive restarts. The directory
+    is held to the same bounds, pruned by modification time on write.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        max_cache_entries: int = DEFAULT_BLEND_CACHE_ENTRIES,
+        max_cache_bytes: Optional[int] = DEFAULT_BLEND_CACHE_BYTES,
+        cache_dir: Optional[Union[str, Path]] = None
+    ):
         """
         Initialize the personality blender.
         
         CHANGED: Ahora usa adapter en lugar de implementación propia.
+        
+        Args:
+            max_cache_entries: Maximum blends kept in memory
+            max_cache_bytes: Maximum serialized size of the in-memory blends
+                (None = no byte limit)
+            cache_dir: Optional directory persisting blends across restarts
         """
         # NUEVO: Usar adapter en lugar de implementación propia
         if HAS_ADAPTER:
@@ -55,9 +80,19 @@ class PersonalityBlender:
         else:
             self._adapter = None
         
-        # Mantener cache para backward compatibility
-        self._blend_cache: Dict[str, PersonalityData] = {}
+        # LRU: iteration order is least -> most recently used
+        self._blend_cache: "OrderedDict[str, PersonalityData]" = OrderedDict()
+        self._blend_sizes: Dict[str, int] = {}
+        self._cache_bytes = 0
         self._lock = asyncio.Lock()
+        self.max_cache_entries = max_cache_entries
+        self.max_cache_bytes = max_cache_bytes
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._evictions = 0
     
     async def blend_personalities(
         self,
@@ -75,10 +110,10 @@ class PersonalityBlender:
             personalities: List of personality data objects
             weights: List of weights for each personality (must sum to 1.0)
             blend_name: Optional name for the blended personality
-            
+        
         Returns:
             Blended personality data
-            
+        
         Raises:
             PersonalityError: If blending fails or validation fails
         """
@@ -107,10 +142,10 @@ class PersonalityBlender:
         try:
             # Check cache first (mantener comportamiento)
             cache_key = self._generate_cache_key(personalities, weights)
-            async with self._lock:
-                if cache_key in self._blend_cache:
-                    logger.info(f"Returning cached blend: {cache_key}")
-                    return self._blend_cache[cache_key]
+            cached = await self._cache_get(cache_key)
+            if cached is not None:
+                logger.debug(f"Returning cached blend: {cache_key}")
+                return cached
             
             # Generate blend name if not provided
             if not blend_name:
@@ -129,15 +164,14 @@ class PersonalityBlender:
                 blended_personality = await self._perform_blend(personalities, weights, blend_name)
             
             # Cache the blend (mantener comportamiento)
-            async with self._lock:
-                self._blend_cache[cache_key] = blended_personality
+            await self._cache_put(cache_key, blended_personality)
             
             logger.info(
                 f"Successfully blended {len(personalities)} personalities "
                 f"into '{blend_name}'"
             )
             return blended_personality
-            
+        
         except Exception as e:
             logger.error(f"Failed to blend personalities: {e}")
             # Mantener tipo de excepción consistente
@@ -161,10 +195,10 @@ class PersonalityBlender:
         Args:
             blend_config: Dictionary mapping personality names to weights
             personality_manager: PersonalityManager instance
-            
+        
         Returns:
             Blended personality data
-            
+        
         Raises:
             PersonalityError: If blending fails
         """
@@ -193,7 +227,7 @@ class PersonalityBlender:
             
             logger.info(f"Blended from config: {blend_config}")
             return blended
-            
+        
         except Exception as e:
             logger.error(f"Failed to blend from config: {e}")
             raise PersonalityError(
@@ -217,7 +251,7 @@ class PersonalityBlender:
             weights: List of weights for each personality
             blend_name: Optional name for the blended personality
             validation_rules: Optional validation rules
-            
+        
         Returns:
             Blended personality data
         """
@@ -243,17 +277,15 @@ class PersonalityBlender:
         Args:
             personalities: List of personality data objects
             weights: List of weights for each personality
-            
+        
         Returns:
             Cached blended personality or None
         """
-        cache_key = self._generate_cache_key(personalities, weights)
-        async with self._lock:
-            return self._blend_cache.get(cache_key)
+        return await self._cache_get(self._generate_cache_key(personalities, weights))
     
     async def clear_blend_cache(self) -> int:
         """
-        Clear the blend cache.
+        Clear the blend cache (including persisted blends).
         
         Returns:
             Number of cached blends cleared
@@ -261,6 +293,18 @@ class PersonalityBlender:
         async with self._lock:
             cache_size = len(self._blend_cache)
             self._blend_cache.clear()
+            self._blend_sizes.clear()
+            self._cache_bytes = 0
+            self._cache_hits = 0
+            self._cache_misses = 0
+            self._evictions = 0
+        
+        if self.cache_dir is not None:
+            for path in self.cache_dir.glob("blend_*.json"):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
         
         logger.info(f"Cleared {cache_size} cached blends")
         return cache_size
@@ -286,6 +330,13 @@ class PersonalityBlender:
         async with self._lock:
             return {
                 "cache_size": len(self._blend_cache),
+                "cache_bytes": self._cache_bytes,
+                "max_cache_entries": self.max_cache_entries,
+                "max_cache_bytes": self.max_cache_bytes,
+                "cache_hits": self._cache_hits,
+                "cache_misses": self._cache_misses,
+                "evictions": self._evictions,
+                "cache_dir": str(self.cache_dir) if self.cache_dir is not None else None,
                 "cached_blends": list(self._blend_cache.keys()),
                 "cache_entries": [
                     {
@@ -297,6 +348,118 @@ class PersonalityBlender:
                 ]
             }
     
+    async def _cache_get(self, cache_key: str) -> Optional[PersonalityData]:
+        """Look a blend up in memory, then on disk"""
+        async with self._lock:
+            blend = self._blend_cache.get(cache_key)
+            if blend is not None:
+                self._blend_cache.move_to_end(cache_key)
+                self._cache_hits += 1
+                return blend
+        
+        if self.cache_dir is not None:
+            loop = asyncio.get_running_loop()
+            payload = await loop.run_in_executor(None, self._read_persisted, cache_key)
+            if payload is not None:
+                try:
+                    blend = PersonalityData.model_validate_json(payload)
+                except ValueError as e:
+                    logger.warning(f"Ignoring unreadable persisted blend {cache_key}: {e}")
+                else:
+                    async with self._lock:
+                        self._cache_hits += 1
+                        self._store(cache_key, blend, len(payload))
+                    return blend
+        
+        async with self._lock:
+            self._cache_misses += 1
+        return None
+    
+    async def _cache_put(self, cache_key: str, blend: PersonalityData) -> None:
+        """Add a blend to the LRU and persist it when a cache_dir is set"""
+        payload = blend.model_dump_json().encode("utf-8")
+        async with self._lock:
+            self._store(cache_key, blend, len(payload))
+        
+        if self.cache_dir is not None:
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(None, self._write_persisted, cache_key, payload)
+            except OSError as e:
+                logger.warning(f"Failed to persist blend {cache_key}: {e}")
+            else:
+                await loop.run_in_executor(None, self._prune_persisted, cache_key)
+    
+    def _store(self, cache_key: str, blend: PersonalityData, size: int) -> None:
+        """Insert into the LRU and evict down to the bounds (lock held)"""
+        if cache_key in self._blend_cache:
+            self._cache_bytes -= self._blend_sizes[cache_key]
+        self._blend_cache[cache_key] = blend
+        self._blend_cache.move_to_end(cache_key)
+        self._blend_sizes[cache_key] = size
+        self._cache_bytes += size
+        
+        while len(self._blend_cache) > 1 and (
+            len(self._blend_cache) > self.max_cache_entries or
+            (self.max_cache_bytes is not None and self._cache_bytes > self.max_cache_bytes)
+        ):
+            victim, _ = self._blend_cache.popitem(last=False)
+            self._cache_bytes -= self._blend_sizes.pop(victim)
+            self._evictions += 1
+            logger.debug(f"Evicted cached blend: {victim}")
+    
+    def _persisted_path(self, cache_key: str) -> Path:
+        return self.cache_dir / f"{cache_key}.json"
+    
+    def _read_persisted(self, cache_key: str) -> Optional[bytes]:
+        path = self._persisted_path(cache_key)
+        try:
+            payload = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            os.utime(path)  # Refresh recency for pruning
+        except OSError:
+            pass
+        return payload
+    
+    def _write_persisted(self, cache_key: str, payload: bytes) -> None:
+        # Write-then-rename so readers never see a partial file
+        path = self._persisted_path(cache_key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, path)
+    
+    def _prune_persisted(self, keep_key: str) -> None:
+        """Drop the least recently used files beyond the cache bounds"""
+        entries = []
+        for path in self.cache_dir.glob("blend_*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            # The blend just written always survives, then newest first
+            entries.append((path.stem == keep_key, stat.st_mtime_ns, stat.st_size, path))
+        entries.sort(key=lambda entry: entry[:2], reverse=True)
+        
+        # Like the in-memory LRU: keep the newest prefix that fits
+        kept = 0
+        kept_bytes = 0
+        full = False
+        for _, _, size, path in entries:
+            full = full or not (kept < self.max_cache_entries and (
+                self.max_cache_bytes is None or kept_bytes + size <= self.max_cache_bytes
+            ))
+            if not full or kept == 0:
+                kept += 1
+                kept_bytes += size
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            logger.debug(f"Pruned persisted blend: {path.stem}")
+    
     async def _perform_blend(
         self,
         personalities: List[PersonalityData],
@@ -313,7 +476,7 @@ class PersonalityBlender:
             personalities: List of personality data objects
             weights: List of weights for each personality
             blend_name: Name for the blended personality
-            
+        
         Returns:
             Blended personality data
         """
@@ -375,7 +538,7 @@ class PersonalityBlender:
         Args:
             texts: List of text strings
             weights: List of weights for each text
-            
+        
         Returns:
             Blended text string
         """
@@ -412,7 +575,7 @@ class PersonalityBlender:
         Args:
             metadata_list: List of metadata dictionaries
             weights: List of weights for each metadata
-            
+        
         Returns:
             Blended metadata dictionary
         """
@@ -446,7 +609,7 @@ class PersonalityBlender:
         Args:
             personality: Blended personality to validate
             validation_rules: Validation rules to apply
-            
+        
         Raises:
             PersonalityError: If validation fails
         """
@@ -504,11 +667,17 @@ class PersonalityBlender:
         """
         Generate cache key for blend.
         
-        UNCHANGED: Helper method mantiene misma lógica.
+        Hashes each personality's full content together with its own
+        weight, in input order, so edited personalities miss the cache.
         """
-        personality_names = sorted([p.name for p in personalities])
-        weights_str = "_".join([f"{w:.2f}" for w in weights])
-        return f"blend_{'_'.join(personality_names)}_{weights_str}"
+        digest = hashlib.sha256()
+        for personality, weight in zip(personalities, weights):
+            content = json.dumps(
+                personality.model_dump(mode="json"), sort_keys=True, separators=(",", ":")
+            )
+            digest.update(hashlib.sha256(content.encode("utf-8")).digest())
+            digest.update(repr(float(weight)).encode("ascii"))
+        return f"blend_{digest.hexdigest()[:32]}"
 
 
 # Mantener exports para backward compatibility
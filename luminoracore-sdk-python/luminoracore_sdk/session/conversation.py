@@ -1,29 +1,153 @@
 """Conversation management for LuminoraCore SDK."""
 
 import asyncio
-from typing import Dict, List, Optional, Any
+import re
+from collections import deque
+from itertools import islice
+from typing import Dict, List, Optional, Any, Set, Deque, Tuple
 import logging
 from datetime import datetime
 
 from ..types.session import Conversation, Message, MessageRole
 from ..utils.exceptions import SessionError
 from ..utils.helpers import generate_session_id
+from .storage import SessionStorage
 
 logger = logging.getLogger(__name__)
 
+# Evicted messages are written to storage in chunks of this many messages
+DEFAULT_SPILL_BATCH_SIZE = 50
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+# Length of the character n-grams the token index is keyed by
+_GRAM_SIZE = 3
+
+
+def _archive_key(session_id: str, chunk: int) -> str:
+    """Storage key of an archived (spilled) message chunk"""
+    return f"{session_id}:history:{chunk}"
+
+
+def _grams(text_lower: str) -> Set[str]:
+    """Character n-grams of the word tokens of a lowercase text"""
+    return {
+        token[start:start + _GRAM_SIZE]
+        for token in _TOKEN_PATTERN.findall(text_lower)
+        for start in range(len(token) - _GRAM_SIZE + 1)
+    }
+
+
+class _TokenIndex:
+    """
+    Inverted index from token trigrams to message sequence numbers.
+    
+    Keying by trigrams rather than whole tokens keeps substring search
+    an index lookup: a message containing the query contains every
+    trigram of the query's tokens. Messages only ever leave the ring
+    buffer from the oldest end, so posting lists stay sorted and stale
+    entries are trimmed from the left.
+    """
+    
+    def __init__(self):
+        self.postings: Dict[str, Deque[int]] = {}
+        self.lowered: Dict[int, str] = {}
+    
+    def add(self, seq: int, content: str) -> None:
+        lowered = content.lower()
+        self.lowered[seq] = lowered
+        for gram in _grams(lowered):
+            self.postings.setdefault(gram, deque()).append(seq)
+    
+    def evict(self, seq: int) -> None:
+        lowered = self.lowered.pop(seq, None)
+        if lowered is None:
+            return
+        for gram in _grams(lowered):
+            posting = self.postings.get(gram)
+            while posting and posting[0] <= seq:
+                posting.popleft()
+            if not posting:
+                self.postings.pop(gram, None)
+    
+    def candidates(self, query_lower: str) -> Optional[Set[int]]:
+        """
+        Sequence numbers of messages that may contain query_lower.
+        
+        Intersects the posting lists of the query's trigrams, shortest
+        first. Returns None when no query token is long enough to have a
+        trigram; callers then scan the messages.
+        """
+        grams = _grams(query_lower)
+        if not grams:
+            return None
+        
+        postings = [self.postings.get(gram) for gram in grams]
+        if not all(postings):
+            return set()
+        postings.sort(key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result.intersection_update(posting)
+            if not result:
+                break
+        return result
+
+
+class _HistoryState:
+    """Ring-buffer bookkeeping for one conversation"""
+    
+    __slots__ = ("first_seq", "index", "pending_spill", "spilled_chunks", "unspilled")
+    
+    def __init__(self, index_tokens: bool):
+        self.first_seq = 0  # Sequence number of messages[0]
+        self.index = _TokenIndex() if index_tokens else None
+        self.pending_spill: List[Message] = []
+        self.spilled_chunks = 0
+        # Chunks whose storage write failed, kept until a retry succeeds
+        self.unspilled: Dict[int, List[Message]] = {}
+
 
 class ConversationManager:
-    """Manages conversation history and context."""
+    """
+    Manages conversation history and context.
+    
+    Each conversation keeps its hot history in a bounded ring buffer
+    (``deque(maxlen=max_history)``), so appending and evicting are O(1).
+    When a storage backend is given, evicted messages are spilled to it in
+    chunks instead of being dropped; ``get_archived_messages`` reads them
+    back. A chunk whose write fails stays in memory and is retried with
+    the next chunk. ``index_tokens`` maintains a per-conversation token index so
+    ``search_messages`` only verifies candidate messages.
+    """
     
-    def __init__(self, max_history: int = 100):
+    def __init__(
+        self,
+        max_history: int = 100,
+        storage: Optional[SessionStorage] = None,
+        index_tokens: bool = False,
+        spill_batch_size: int = DEFAULT_SPILL_BATCH_SIZE
+    ):
         """
         Initialize the conversation manager.
         
         Args:
             max_history: Maximum number of messages to keep in history
+            storage: Optional storage backend evicted messages spill to
+            index_tokens: Maintain a token index for search_messages
+            spill_batch_size: Evicted messages per storage write
         """
+        if max_history < 1:
+            raise ValueError("max_history must be at least 1")
+        if spill_batch_size < 1:
+            raise ValueError("spill_batch_size must be at least 1")
+        
         self.max_history = max_history
+        self.storage = storage
+        self.index_tokens = index_tokens
+        self.spill_batch_size = spill_batch_size
         self._conversations: Dict[str, Conversation] = {}
+        self._history: Dict[str, _HistoryState] = {}
         self._lock = asyncio.Lock()
     
     async def create_conversation(self, session_id: str) -> Conversation:
@@ -38,13 +162,14 @@ class ConversationManager:
         """
         conversation = Conversation(
             session_id=session_id,
-            messages=[],
+            messages=deque(maxlen=self.max_history),
             created_at=datetime.utcnow(),
             updated_at=datetime.utcnow(),
         )
         
         async with self._lock:
             self._conversations[session_id] = conversation
+            self._history[session_id] = _HistoryState(self.index_tokens)
         
         logger.info(f"Created conversation for session: {session_id}")
         return conversation
@@ -92,17 +217,95 @@ class ConversationManager:
             metadata=metadata or {}
         )
         
+        spill_chunks: List[Tuple[int, List[Message]]] = []
         async with self._lock:
-            conversation.messages.append(message)
-            conversation.updated_at = datetime.utcnow()
+            state = self._state_for(session_id, conversation)
+            messages = conversation.messages
+            seq = state.first_seq + len(messages)
+            
+            # The deque drops messages[0] on append once full
+            if len(messages) == messages.maxlen:
+                evicted = messages[0]
+                if state.index is not None:
+                    state.index.evict(state.first_seq)
+                state.first_seq += 1
+                if self.storage is not None:
+                    state.pending_spill.append(evicted)
+                    if len(state.pending_spill) >= self.spill_batch_size:
+                        # Failed chunks are retried alongside the next one
+                        spill_chunks.extend(state.unspilled.items())
+                        state.unspilled.clear()
+                        spill_chunks.append((state.spilled_chunks, state.pending_spill))
+                        state.spilled_chunks += 1
+                        state.pending_spill = []
             
-            # Trim history if necessary
-            if len(conversation.messages) > self.max_history:
-                conversation.messages = conversation.messages[-self.max_history:]
+            if state.index is not None:
+                state.index.add(seq, content)
+            messages.append(message)
+            conversation.updated_at = datetime.utcnow()
+        
+        # Storage I/O happens outside the lock
+        for chunk, chunk_messages in spill_chunks:
+            await self._spill(session_id, state, chunk, chunk_messages)
         
         logger.debug(f"Added message to conversation {session_id}: {role}")
         return message
     
+    def _state_for(self, session_id: str, conversation: Conversation) -> _HistoryState:
+        """Get ring-buffer state, adopting conversations created elsewhere (lock held)"""
+        state = self._history.get(session_id)
+        if state is None or not isinstance(conversation.messages, deque):
+            conversation.messages = deque(conversation.messages, maxlen=self.max_history)
+            state = self._history[session_id] = _HistoryState(self.index_tokens)
+            if state.index is not None:
+                for position, existing in enumerate(conversation.messages):
+                    state.index.add(position, existing.content)
+        return state
+    
+    async def _spill(self, session_id: str, state: _HistoryState, chunk: int, messages: List[Message]) -> None:
+        """Write a chunk of evicted messages to storage, keeping it in memory on failure"""
+        try:
+            saved = await self.storage.save_session(
+                _archive_key(session_id, chunk),
+                {"session_id": session_id, "chunk": chunk, "messages": [m.to_dict() for m in messages]}
+            )
+            if saved is False:
+                raise SessionError("storage did not save the chunk")
+        except Exception as e:
+            logger.error(
+                f"Failed to spill {len(messages)} messages for session {session_id}, "
+                f"keeping them in memory: {e}"
+            )
+            async with self._lock:
+                state.unspilled[chunk] = messages
+    
+    async def get_archived_messages(self, session_id: str) -> List[Message]:
+        """
+        Get messages evicted from the ring buffer, oldest first.
+        
+        Args:
+            session_id: Session ID
+            
+        Returns:
+            Archived messages (empty without a storage backend)
+        """
+        state = self._history.get(session_id)
+        if state is None or self.storage is None:
+            return []
+        
+        pending = list(state.pending_spill)
+        unspilled = dict(state.unspilled)
+        archived: List[Message] = []
+        for chunk in range(state.spilled_chunks):
+            if chunk in unspilled:
+                archived.extend(unspilled[chunk])
+                continue
+            data = await self.storage.load_session(_archive_key(session_id, chunk))
+            if data:
+                archived.extend(Message.from_dict(m) for m in data.get("messages", []))
+        archived.extend(pending)
+        return archived
+    
     async def get_messages(
         self,
         session_id: str,
@@ -124,11 +327,8 @@ class ConversationManager:
         if not conversation:
             return []
         
-        messages = conversation.messages[offset:]
-        if limit:
-            messages = messages[:limit]
-        
-        return messages
+        stop = offset + limit if limit else None
+        return list(islice(conversation.messages, offset, stop))
     
     async def get_last_message(self, session_id: str) -> Optional[Message]:
         """
@@ -177,7 +377,11 @@ class ConversationManager:
             return False
         
         async with self._lock:
+            state = self._state_for(session_id, conversation)
+            state.first_seq += len(conversation.messages)
             conversation.messages.clear()
+            if state.index is not None:
+                state.index = _TokenIndex()
             conversation.updated_at = datetime.utcnow()
         
         logger.info(f"Cleared conversation for session: {session_id}")
@@ -194,12 +398,17 @@ class ConversationManager:
             True if conversation was deleted
         """
         async with self._lock:
-            if session_id in self._conversations:
-                del self._conversations[session_id]
-                logger.info(f"Deleted conversation for session: {session_id}")
-                return True
+            if session_id not in self._conversations:
+                return False
+            del self._conversations[session_id]
+            state = self._history.pop(session_id, None)
         
-        return False
+        if state is not None and self.storage is not None:
+            for chunk in range(state.spilled_chunks):
+                await self.storage.delete_session(_archive_key(session_id, chunk))
+        
+        logger.info(f"Deleted conversation for session: {session_id}")
+        return True
     
     async def get_conversation_summary(self, session_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -253,12 +462,24 @@ class ConversationManager:
         query_lower = query.lower()
         matching_messages = []
         
-        for message in conversation.messages:
-            if query_lower in message.content.lower():
-                matching_messages.append(message)
-        
-        if limit:
-            matching_messages = matching_messages[:limit]
+        state = self._history.get(session_id)
+        index = state.index if state is not None and isinstance(conversation.messages, deque) else None
+        candidates = index.candidates(query_lower) if index is not None else None
+        
+        if candidates is None:
+            for message in conversation.messages:
+                if query_lower in message.content.lower():
+                    matching_messages.append(message)
+                    if limit and len(matching_messages) >= limit:
+                        break
+            return matching_messages
+        
+        # Verify index candidates in conversation order
+        for seq in sorted(candidates):
+            if query_lower in index.lowered[seq]:
+                matching_messages.append(conversation.messages[seq - state.first_seq])
+                if limit and len(matching_messages) >= limit:
+                    break
         
         return matching_messages
     
@@ -283,12 +504,8 @@ class ConversationManager:
         if not conversation:
             return []
         
-        messages = [msg for msg in conversation.messages if msg.role == role]
-        
-        if limit:
-            messages = messages[:limit]
-        
-        return messages
+        messages = (msg for msg in conversation.messages if msg.role == role)
+        return list(islice(messages, limit or None))
     
     async def list_conversations(self) -> List[str]:
         """
@@ -6,7 +6,10 @@ mantiene implementación propia como fallback.
 """
 
 import asyncio
-from typing import Dict, List, Optional, Any, Union
+import heapq
+import itertools
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Union, Tuple
 import logging
 from datetime import datetime, timedelta
 import json
@@ -28,6 +31,22 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Number of locks sessions are distributed over
+DEFAULT_LOCK_SHARDS = 64
+
+# Rebuild the expiry heap once stale entries outnumber live ones this much
+HEAP_COMPACTION_FACTOR = 2
+
+EVICTION_POLICIES = ("lru", "lfu")
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate memory footprint of a value (JSON length)"""
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return len(str(value))
+
 
 class MemoryManager:
     """
@@ -35,12 +54,22 @@ class MemoryManager:
     
     REFACTORED: Usa Core MemorySystem cuando disponible,
     mantiene implementación propia como fallback.
+    
+    The fallback store shards sessions over ``num_lock_shards`` locks so
+    unrelated sessions never wait on each other, keeps a min-heap on
+    ``expires_at`` so cleanup only touches expired items, and enforces an
+    optional per-session budget (``max_entries`` / ``max_bytes_per_session``,
+    both unlimited by default) by evicting the least recently ("lru") or
+    least frequently ("lfu") used memory. LFU victims come from a lazy
+    per-session min-heap on (access_count, last touch), so an eviction does
+    not scan the session.
     """
     
     def __init__(
         self,
         config: Optional[MemoryConfig] = None,
-        optimizer: Optional[Any] = None
+        optimizer: Optional[Any] = None,
+        num_lock_shards: int = DEFAULT_LOCK_SHARDS
     ):
         """
         Initialize memory manager
@@ -48,9 +77,15 @@ class MemoryManager:
         Args:
             config: Memory configuration
             optimizer: Optimizer from Core (optional)
+            num_lock_shards: Number of locks sessions are sharded over
         """
+        if num_lock_shards < 1:
+            raise ValueError("num_lock_shards must be at least 1")
+        
         self.config = config or MemoryConfig()
         self.optimizer = optimizer
+        if self.config.eviction_policy not in EVICTION_POLICIES:
+            raise ValueError(f"eviction_policy must be one of {EVICTION_POLICIES}")
         
         # NUEVO: Usar Core MemorySystem si disponible
         if HAS_CORE_MEMORY:
@@ -71,8 +106,137 @@ class MemoryManager:
             self._core_memory = None
         
         # Fallback: implementación propia (mantener backward compat)
-        self._memories: Dict[str, Dict[str, Any]] = {}
-        self._lock = asyncio.Lock()
+        # Per-session OrderedDict: iteration order is least -> most recently used
+        self._memories: Dict[str, "OrderedDict[str, Dict[str, Any]]"] = {}
+        self._locks = [asyncio.Lock() for _ in range(num_lock_shards)]
+        self.num_lock_shards = num_lock_shards
+        
+        # (expires_at, sequence, session_id, key); stale entries are skipped lazily
+        self._expiry_heap: List[Tuple[datetime, int, str, str]] = []
+        self._expiry_sequence = itertools.count()
+        self._total_memories = 0
+        self._session_bytes: Dict[str, int] = {}
+        self._evictions = 0
+        
+        # LFU only: per-session (access_count, touched, key); stale entries skipped lazily
+        self._lfu = self.config.eviction_policy == "lfu"
+        self._lfu_heaps: Dict[str, List[Tuple[int, int, str]]] = {}
+        self._touch_sequence = itertools.count()
+    
+    def _lock_for(self, session_id: str) -> asyncio.Lock:
+        """Get the lock shard guarding a session's memories"""
+        return self._locks[hash(session_id) % self.num_lock_shards]
+    
+    @staticmethod
+    def _is_expired(memory_item: Dict[str, Any], now: datetime) -> bool:
+        return bool(memory_item["expires_at"]) and now > memory_item["expires_at"]
+    
+    def _touch(self, session_id: str, key: str, memory_item: Dict[str, Any]) -> None:
+        """Record a store/access in the session's LFU heap (shard lock held)"""
+        memory_item["touched"] = next(self._touch_sequence)
+        if not self._lfu:
+            return
+        heap = self._lfu_heaps.setdefault(session_id, [])
+        heapq.heappush(heap, (memory_item["access_count"], memory_item["touched"], key))
+        
+        # Rebuild once stale entries dominate the heap
+        memories = self._memories.get(session_id, {})
+        if len(heap) > HEAP_COMPACTION_FACTOR * len(memories) + 64:
+            heap[:] = [(item["access_count"], item["touched"], k) for k, item in memories.items()]
+            heapq.heapify(heap)
+    
+    def _put_item(self, session_id: str, key: str, memory_item: Dict[str, Any]) -> None:
+        """Insert or replace an item, then enforce the session budget (shard lock held)"""
+        memories = self._memories.get(session_id)
+        if memories is None:
+            memories = self._memories[session_id] = OrderedDict()
+        
+        previous = memories.get(key)
+        if previous is not None:
+            memories.move_to_end(key)
+            self._session_bytes[session_id] -= previous["size"]
+        else:
+            self._total_memories += 1
+        memory_item.setdefault("size", _estimate_size(memory_item["value"]))
+        memories[key] = memory_item
+        self._session_bytes[session_id] = self._session_bytes.get(session_id, 0) + memory_item["size"]
+        self._touch(session_id, key, memory_item)
+        
+        if memory_item["expires_at"]:
+            heapq.heappush(
+                self._expiry_heap,
+                (memory_item["expires_at"], next(self._expiry_sequence), session_id, key)
+            )
+            self._maybe_compact_heap()
+        
+        self._enforce_budget(session_id, memories, protect=key)
+    
+    def _remove_item(self, session_id: str, key: str) -> bool:
+        """Remove an item (shard lock held); its heap entry goes stale"""
+        memories = self._memories.get(session_id)
+        memory_item = memories.pop(key, None) if memories is not None else None
+        if memory_item is None:
+            return False
+        self._total_memories -= 1
+        self._session_bytes[session_id] -= memory_item["size"]
+        return True
+    
+    def _enforce_budget(self, session_id: str, memories: "OrderedDict[str, Dict[str, Any]]",
+                        protect: Optional[str] = None) -> None:
+        """Evict memories until the session fits its entry and byte budgets"""
+        max_entries = self.config.max_entries
+        max_bytes = self.config.max_bytes_per_session
+        
+        while memories and (
+            (max_entries and len(memories) > max_entries) or
+            (max_bytes and self._session_bytes[session_id] > max_bytes)
+        ):
+            victim = self._pick_victim(session_id, memories, protect)
+            if victim is None:
+                break
+            self._remove_item(session_id, victim)
+            self._evictions += 1
+            logger.debug(f"Evicted memory for session {session_id}: {victim}")
+    
+    def _pick_victim(self, session_id: str, memories: "OrderedDict[str, Dict[str, Any]]",
+                     protect: Optional[str]) -> Optional[str]:
+        """Choose the memory to evict according to the eviction policy"""
+        if self._lfu:
+            # Least accessed; ties broken by least recent touch
+            heap = self._lfu_heaps.get(session_id, [])
+            protected = None
+            victim = None
+            while heap:
+                count, touched, key = heapq.heappop(heap)
+                memory_item = memories.get(key)
+                if memory_item is None or memory_item["access_count"] != count or memory_item["touched"] != touched:
+                    continue  # Stale
+                if key == protect:
+                    protected = (count, touched, key)
+                    continue
+                victim = key
+                break
+            if protected is not None:
+                heapq.heappush(heap, protected)
+            return victim
+        
+        for key in memories:
+            if key != protect:
+                return key
+        return None
+    
+    def _maybe_compact_heap(self) -> None:
+        """Drop stale heap entries once they dominate the heap"""
+        if len(self._expiry_heap) <= HEAP_COMPACTION_FACTOR * self._total_memories + 64:
+            return
+        
+        live = []
+        for expires_at, sequence, session_id, key in self._expiry_heap:
+            memory_item = self._memories.get(session_id, {}).get(key)
+            if memory_item is not None and memory_item["expires_at"] == expires_at:
+                live.append((expires_at, sequence, session_id, key))
+        heapq.heapify(live)
+        self._expiry_heap = live
     
     async def store_memory(
         self,
@@ -95,19 +259,17 @@ class MemoryManager:
         """
         ttl = ttl or self.config.ttl
         
+        now = datetime.utcnow()
         memory_item = {
             "value": value,
-            "created_at": datetime.utcnow(),
-            "expires_at": datetime.utcnow() + timedelta(seconds=ttl) if ttl else None,
+            "created_at": now,
+            "expires_at": now + timedelta(seconds=ttl) if ttl else None,
             "access_count": 0,
-            "last_accessed": datetime.utcnow(),
+            "last_accessed": now,
         }
         
-        async with self._lock:
-            if session_id not in self._memories:
-                self._memories[session_id] = {}
-            
-            self._memories[session_id][key] = memory_item
+        async with self._lock_for(session_id):
+            self._put_item(session_id, key, memory_item)
         
         logger.debug(f"Stored memory for session {session_id}: {key}")
         return True
@@ -123,23 +285,24 @@ class MemoryManager:
         Returns:
             Memory value or None if not found or expired
         """
-        async with self._lock:
-            if session_id not in self._memories:
+        async with self._lock_for(session_id):
+            memories = self._memories.get(session_id)
+            if memories is None or key not in memories:
                 return None
             
-            if key not in self._memories[session_id]:
-                return None
-            
-            memory_item = self._memories[session_id][key]
+            memory_item = memories[key]
+            now = datetime.utcnow()
             
             # Check if expired
-            if memory_item["expires_at"] and datetime.utcnow() > memory_item["expires_at"]:
-                del self._memories[session_id][key]
+            if self._is_expired(memory_item, now):
+                self._remove_item(session_id, key)
                 return None
             
-            # Update access statistics
+            # Update access statistics (and LRU order)
             memory_item["access_count"] += 1
-            memory_item["last_accessed"] = datetime.utcnow()
+            memory_item["last_accessed"] = now
+            memories.move_to_end(key)
+            self._touch(session_id, key, memory_item)
             
             return memory_item["value"]
     
@@ -154,12 +317,8 @@ class MemoryManager:
         Returns:
             True if memory was deleted
         """
-        async with self._lock:
-            if session_id not in self._memories:
-                return False
-            
-            if key in self._memories[session_id]:
-                del self._memories[session_id][key]
+        async with self._lock_for(session_id):
+            if self._remove_item(session_id, key):
                 logger.debug(f"Deleted memory for session {session_id}: {key}")
                 return True
         
@@ -175,9 +334,11 @@ class MemoryManager:
         Returns:
             True if memories were cleared
         """
-        async with self._lock:
+        async with self._lock_for(session_id):
             if session_id in self._memories:
-                del self._memories[session_id]
+                self._total_memories -= len(self._memories.pop(session_id))
+                self._session_bytes.pop(session_id, None)
+                self._lfu_heaps.pop(session_id, None)
                 logger.info(f"Cleared all memories for session: {session_id}")
                 return True
         
@@ -193,17 +354,22 @@ class MemoryManager:
         Returns:
             List of memory keys
         """
-        async with self._lock:
+        async with self._lock_for(session_id):
             if session_id not in self._memories:
                 return []
             
             # Filter out expired memories
+            now = datetime.utcnow()
             valid_keys = []
+            expired_keys = []
             for key, memory_item in self._memories[session_id].items():
-                if not memory_item["expires_at"] or datetime.utcnow() <= memory_item["expires_at"]:
-                    valid_keys.append(key)
+                if self._is_expired(memory_item, now):
+                    expired_keys.append(key)
                 else:
-                    del self._memories[session_id][key]
+                    valid_keys.append(key)
+            
+            for key in expired_keys:
+                self._remove_item(session_id, key)
             
             return valid_keys
     
@@ -218,15 +384,15 @@ class MemoryManager:
         Returns:
             Memory information or None if not found
         """
-        async with self._lock:
+        async with self._lock_for(session_id):
             if session_id not in self._memories or key not in self._memories[session_id]:
                 return None
             
             memory_item = self._memories[session_id][key]
             
             # Check if expired
-            if memory_item["expires_at"] and datetime.utcnow() > memory_item["expires_at"]:
-                del self._memories[session_id][key]
+            if self._is_expired(memory_item, datetime.utcnow()):
+                self._remove_item(session_id, key)
                 return None
             
             return {
@@ -235,6 +401,7 @@ class MemoryManager:
                 "expires_at": memory_item["expires_at"],
                 "access_count": memory_item["access_count"],
                 "last_accessed": memory_item["last_accessed"],
+                "size": memory_item["size"],
                 "is_expired": memory_item["expires_at"] and datetime.utcnow() > memory_item["expires_at"],
             }
     
@@ -242,18 +409,25 @@ class MemoryManager:
         """
         Clean up expired memories.
         
+        Pops the expiry heap up to the current time, so the cost is
+        proportional to the number of expired entries, not to the number
+        of sessions or memories.
+        
         Returns:
             Number of expired memories cleaned up
         """
         cleaned_count = 0
+        now = datetime.utcnow()
+        heap = self._expiry_heap
         
-        async with self._lock:
-            for session_id in list(self._memories.keys()):
-                for key in list(self._memories[session_id].keys()):
-                    memory_item = self._memories[session_id][key]
-                    if memory_item["expires_at"] and datetime.utcnow() > memory_item["expires_at"]:
-                        del self._memories[session_id][key]
-                        cleaned_count += 1
+        while heap and heap[0][0] < now:
+            expires_at, _, session_id, key = heapq.heappop(heap)
+            async with self._lock_for(session_id):
+                memory_item = self._memories.get(session_id, {}).get(key)
+                # Skip entries for items that were deleted or re-stored since
+                if memory_item is not None and memory_item["expires_at"] == expires_at:
+                    self._remove_item(session_id, key)
+                    cleaned_count += 1
         
         if cleaned_count > 0:
             logger.info(f"Cleaned up {cleaned_count} expired memories")
@@ -286,7 +460,7 @@ class MemoryManager:
                 logger.warning(f"Failed to get stats from Core: {e}, using fallback")
         
         # Fallback: implementación SDK
-        async with self._lock:
+        async with self._lock_for(session_id):
             if session_id not in self._memories:
                 return None
             
@@ -296,10 +470,12 @@ class MemoryManager:
             total_access_count = 0
             oldest_memory = None
             newest_memory = None
+            now = datetime.utcnow()
             
             for key, memory_item in memories.items():
-                if memory_item["expires_at"] and datetime.utcnow() > memory_item["expires_at"]:
+                if self._is_expired(memory_item, now):
                     expired_memories += 1
+
                 
                 total_access_count += memory_item["access_count"]
                 
@@ -317,6 +493,7 @@ class MemoryManager:
                 "average_access_count": total_access_count / total_memories if total_memories > 0 else 0,
                 "oldest_memory": oldest_memory,
                 "newest_memory": newest_memory,
+                "total_bytes": self._session_bytes.get(session_id, 0),
                 "using_core": False
             }
     
@@ -326,28 +503,22 @@ class MemoryManager:
         
         NUEVO en v1.2: Returns overall stats
         """
+        # Fallback stats (counters are maintained incrementally)
+        stats = {
+            "total_sessions": len(self._memories),
+            "total_memories": self._total_memories,
+            "evictions": self._evictions,
+            "pending_expirations": len(self._expiry_heap),
+            "lock_shards": self.num_lock_shards,
+            "using_core": False
+        }
+        
         if self._use_core and self._core_memory:
-            # Stats del Core (requiere user_id, usar session_id como fallback)
-            try:
-                # Core requiere user_id, pero SDK usa session_id
-                # Por ahora, retornar stats básicos
-                return {
-                    "using_core": True,
-                    "total_sessions": len(self._memories),
-                    "core_available": True
-                }
-            except Exception as e:
-                logger.warning(f"Failed to get stats from Core: {e}")
+            # Core requiere user_id, pero SDK usa session_id:
+            # los memories de sesión siguen en el store propio
+            stats.update({"using_core": True, "core_available": True})
         
-        # Fallback stats
-        async with self._lock:
-            return {
-                "total_sessions": len(self._memories),
-                "total_memories": sum(
-                    len(msgs) for msgs in self._memories.values()
-                ),
-                "using_core": False
-            }
+        return stats
     
     async def search_memories(
         self,
@@ -366,20 +537,23 @@ class MemoryManager:
         Returns:
             List of matching memories
         """
-        async with self._lock:
+        async with self._lock_for(session_id):
             if session_id not in self._memories:
                 return []
             
             query_lower = query.lower()
             matching_memories = []
+            now = datetime.utcnow()
             
             for key, memory_item in self._memories[session_id].items():
                 # Check if expired
-                if memory_item["expires_at"] and datetime.utcnow() > memory_item["expires_at"]:
+                if self._is_expired(memory_item, now):
                     continue
                 
-                # Search in value (convert to string for searching)
-                value_str = str(memory_item["value"]).lower()
+                # Search in value; the lowercased text is computed once per item
+                value_str = memory_item.get("search_text")
+                if value_str is None:
+                    value_str = memory_item["search_text"] = str(memory_item["value"]).lower()
                 if query_lower in value_str:
                     matching_memories.append({
                         "key": key,
@@ -388,9 +562,8 @@ class MemoryManager:
                         "access_count": memory_item["access_count"],
                         "last_accessed": memory_item["last_accessed"],
                     })
-            
-            if limit:
-                matching_memories = matching_memories[:limit]
+                    if limit and len(matching_memories) >= limit:
+                        break
             
             return matching_memories
     
@@ -404,14 +577,15 @@ class MemoryManager:
         Returns:
             Exported memories or None if session not found
         """
-        async with self._lock:
+        async with self._lock_for(session_id):
             if session_id not in self._memories:
                 return None
             
             memories = {}
+            now = datetime.utcnow()
             for key, memory_item in self._memories[session_id].items():
                 # Skip expired memories
-                if memory_item["expires_at"] and datetime.utcnow() > memory_item["expires_at"]:
+                if self._is_expired(memory_item, now):
                     continue
                 
                 memories[key] = {
@@ -440,10 +614,7 @@ class MemoryManager:
             True if memories were imported
         """
         try:
-            async with self._lock:
-                if session_id not in self._memories:
-                    self._memories[session_id] = {}
-                
+            async with self._lock_for(session_id):
                 for key, memory_data in memories_data.get("memories", {}).items():
                     memory_item = {
                         "value": memory_data["value"],
@@ -453,7 +624,7 @@ class MemoryManager:
                         "last_accessed": datetime.fromisoformat(memory_data["last_accessed"]),
                     }
                     
-                    self._memories[session_id][key] = memory_item
+                    self._put_item(session_id, key, memory_item)
             
             logger.info(f"Imported memories for session: {session_id}")
             return True
@@ -8,15 +8,22 @@ The user can use their own tables with their own schemas.
 import json
 import os
 import boto3
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Union, Tuple
 from datetime import datetime, timedelta
 import logging
 from botocore.exceptions import ClientError
 from decimal import Decimal
 
-from .storage_v1_1 import StorageV11Extension
+from .storage_v1_1 import (
+    StorageV11Extension,
+    DEFAULT_AFFINITY_CLAMP,
+    calculate_affinity_level,
+    clamp_affinity_points,
+)
+from ..logging_config import StructuredLogger, Lazy
 
 logger = logging.getLogger(__name__)
+log = StructuredLogger(logger)
 
 
 def _convert_floats_to_decimal(obj):
@@ -298,6 +305,124 @@ class FlexibleDynamoDBStorageV11(StorageV11Extension):
             logger.error(f"Failed to get affinity: {e}")
             return None
     
+    async def increment_affinity(
+        self,
+        user_id: str,
+        personality_name: str,
+        delta: int,
+        clamp: Tuple[int, int] = DEFAULT_AFFINITY_CLAMP,
+        max_retries: int = 10
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Atomically add delta to affinity points
+        
+        Usually a single UpdateItem: ADD-style increment guarded by a
+        condition that keeps the result inside the clamp, returning the
+        new item. Updates that would leave the range write the clamped
+        value conditioned on the points just read (retried on conflict).
+        The level is rewritten, conditioned on the points, only when the
+        returned level is stale.
+        """
+        low, high = clamp
+        try:
+            key_values = self._generate_key_values(user_id, personality_name, "affinity", "AFFINITY")
+            gsi_values = self._generate_gsi_values(user_id, personality_name)
+            
+            names = {'#ttl': 'TTL'}
+            values = {
+                ':uid': user_id,
+                ':pname': personality_name,
+                ':zero': 0,
+                ':now': datetime.now().isoformat(),
+                ':ttl': int((datetime.now() + timedelta(days=365)).timestamp())
+            }
+            common = [
+                'user_id = :uid',
+                'personality_name = :pname',
+                'session_id = if_not_exists(session_id, :uid)',
+                'total_interactions = if_not_exists(total_interactions, :zero)',
+                'positive_interactions = if_not_exists(positive_interactions, :zero)',
+                'created_at = if_not_exists(created_at, :now)',
+                'updated_at = :now',
+                '#ttl = :ttl'
+            ]
+            for index, (name, value) in enumerate(gsi_values.items()):
+                names[f'#gsi{index}'] = name
+                values[f':gsi{index}'] = value
+                common.append(f'#gsi{index} = :gsi{index}')
+            
+            def update(assignments: str, condition: str, extra_values: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+                try:
+                    response = self.table.update_item(
+                        Key=key_values,
+                        UpdateExpression="SET " + ", ".join([assignments] + common),
+                        ConditionExpression=condition,
+                        ExpressionAttributeNames=names,
+                        ExpressionAttributeValues={**values, **extra_values},
+                        ReturnValues="ALL_NEW"
+                    )
+                    return response['Attributes']
+                except ClientError as e:
+                    if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+                        return None
+                    raise
+            
+            # Fast path: increment when the result stays inside the clamp
+            condition = 'affinity_points BETWEEN :from_low AND :from_high'
+            if low <= delta <= high:
+                condition = 'attribute_not_exists(affinity_points) OR ' + condition
+            item = update(
+                'affinity_points = if_not_exists(affinity_points, :zero) + :delta',
+                condition,
+                {':delta': delta, ':from_low': low - delta, ':from_high': high - delta}
+            )
+            
+            # Clamped path: compare-and-set on the current points
+            attempts = 0
+            while item is None:
+                attempts += 1
+                if attempts > max_retries:
+                    raise RuntimeError(f"affinity update conflicted {max_retries} times")
+                current = self.table.get_item(Key=key_values).get('Item', {}).get('affinity_points')
+                points = clamp_affinity_points(int(current or 0) + delta, clamp)
+                if current is None:
+                    condition, expected = 'attribute_not_exists(affinity_points)', {}
+                else:
+                    condition, expected = 'affinity_points = :expected', {':expected': current}
+                item = update(
+                    'affinity_points = :points, current_level = :level',
+                    condition,
+                    {':points': points, ':level': calculate_affinity_level(points), **expected}
+                )
+            
+            level = calculate_affinity_level(int(item['affinity_points']))
+            if item.get('current_level') != level:
+                try:
+                    self.table.update_item(
+                        Key=key_values,
+                        UpdateExpression="SET current_level = :level",
+                        ConditionExpression="affinity_points = :points",
+                        ExpressionAttributeValues={':level': level, ':points': item['affinity_points']}
+                    )
+                except ClientError as e:
+                    # A newer increment owns the level now
+                    if e.response.get('Error', {}).get('Code') != 'ConditionalCheckFailedException':
+                        raise
+                item['current_level'] = level
+            
+            return {
+                "affinity_points": item.get('affinity_points', 0),
+                "current_level": item.get('current_level', 'stranger'),
+                "total_interactions": item.get('total_interactions', 0),
+                "positive_interactions": item.get('positive_interactions', 0),
+                "created_at": item.get('created_at'),
+                "updated_at": item.get('updated_at')
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to increment affinity: {e}")
+            return None
+    
     # FACT METHODS
     async def save_fact(
         self,
@@ -345,14 +470,14 @@ class FlexibleDynamoDBStorageV11(StorageV11Extension):
         try:
             from boto3.dynamodb.conditions import Key
             
-            # DEBUG: Log all parameters
-            logger.info(f"DEBUG get_facts() - user_id: {user_id}")
-            logger.info(f"DEBUG get_facts() - category: {category}")
-            logger.info(f"DEBUG get_facts() - table_name: {self.table.table_name}")
-            logger.info(f"DEBUG get_facts() - range_key_name: {self.range_key_name}")
-            logger.info(f"DEBUG get_facts() - hash_key_name: {self.hash_key_name}")
-            logger.info(f"DEBUG get_facts() - AWS Region: {self.region_name}")
-            logger.info(f"DEBUG get_facts() - Table Status: {self.table.table_status}")
+            log.debug(
+                "get_facts query",
+                user_id=user_id,
+                category=category,
+                table_name=Lazy(lambda: self.table.table_name),
+                hash_key_name=self.hash_key_name,
+                range_key_name=self.range_key_name
+            )
             
             # ✅ FIX CRÍTICO: Usar QUERY en lugar de SCAN para 100x mejor performance
             # ✅ FIX CRÍTICO: Usar hash_key_name (no hardcodear 'user_id')
@@ -360,7 +485,6 @@ class FlexibleDynamoDBStorageV11(StorageV11Extension):
             
             if category:
                 # Filter by specific category: FACT#category#*
-                logger.info(f"DEBUG get_facts() - Using category filter: {category}")
                 response = self.table.query(
                     KeyConditionExpression=(
                         Key(self.hash_key_name).eq(user_id) &
@@ -369,7 +493,6 @@ class FlexibleDynamoDBStorageV11(StorageV11Extension):
                 )
             else:
                 # Get all facts: FACT#*
-                logger.info(f"DEBUG get_facts() - Getting all facts for user")
                 response = self.table.query(
                     KeyConditionExpression=(
                         Key(self.hash_key_name).eq(user_id) &
@@ -377,25 +500,11 @@ class FlexibleDynamoDBStorageV11(StorageV11Extension):
                     )
                 )
             
-            # DEBUG: Log query response
-            logger.info(f"DEBUG get_facts() - Query response: {response}")
-            logger.info(f"DEBUG get_facts() - Items found: {len(response.get('Items', []))}")
-            
-            # DEBUG: Log first few items
             items = response.get('Items', [])
-            if items:
-                logger.info(f"DEBUG get_facts() - First item: {items[0]}")
-            else:
-                logger.info(f"DEBUG get_facts() - No items found")
-            
             facts = []
-            logger.info(f"DEBUG get_facts() - Processing {len(items)} items")
             
-            for i, item in enumerate(items):
-                logger.info(f"DEBUG get_facts() - Processing item {i}: {item}")
-                
+            for item in items:
                 if item.get('key') and item.get('category'):
-                    logger.info(f"DEBUG get_facts() - Item {i} has key and category")
                     try:
                         fact_value = item['value']
                         
@@ -429,16 +538,18 @@ class FlexibleDynamoDBStorageV11(StorageV11Extension):
                         }
                         
                         facts.append(fact)
-                        logger.info(f"DEBUG get_facts() - Added fact: {fact}")
                         
                     except Exception as e:
                         logger.warning(f"Failed to parse fact item: {e}")
                         continue
                 else:
-                    logger.info(f"DEBUG get_facts() - Item {i} missing key or category")
+                    log.sampled(
+                        logging.DEBUG, 100,
+                        "get_facts skipped item without key or category",
+                        sort_key=Lazy(lambda item=item: item.get(self.range_key_name))
+                    )
             
-            logger.info(f"DEBUG get_facts() - Final facts count: {len(facts)}")
-            logger.info(f"DEBUG get_facts() - Final facts: {facts}")
+            log.debug("get_facts returned %d facts from %d items", len(facts), len(items), user_id=user_id)
             
             return facts
             
@@ -5,7 +5,7 @@ This implementation allows users to use ANY MongoDB database with ANY collection
 """
 
 import json
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 import logging
 
@@ -16,7 +16,12 @@ except ImportError:
     AsyncIOMotorDatabase = None
     AsyncIOMotorCollection = None
 
-from .storage_v1_1 import StorageV11Extension
+try:
+    from pymongo import ReturnDocument
+except ImportError:
+    ReturnDocument = None
+
+from .storage_v1_1 import StorageV11Extension, AFFINITY_LEVELS, DEFAULT_AFFINITY_CLAMP
 
 logger = logging.getLogger(__name__)
 
@@ -258,6 +263,61 @@ class FlexibleMongoDBStorageV11(StorageV11Extension):
             logger.error(f"Failed to get affinity: {e}")
             return None
     
+    async def increment_affinity(
+        self,
+        user_id: str,
+        personality_name: str,
+        delta: int,
+        clamp: Tuple[int, int] = DEFAULT_AFFINITY_CLAMP
+    ) -> Optional[Dict[str, Any]]:
+        """Atomically add delta to affinity points (pipeline find_one_and_update)"""
+        try:
+            await self._ensure_initialized()
+            
+            low, high = clamp
+            now = datetime.now()
+            points = {"$min": [high, {"$max": [low, {"$add": [{"$ifNull": ["$affinity_points", 0]}, delta]}]}]}
+            level = {
+                "$switch": {
+                    "branches": [
+                        {"case": {"$gte": ["$affinity_points", threshold]}, "then": name}
+                        for threshold, name in AFFINITY_LEVELS[:-1]
+                    ],
+                    "default": AFFINITY_LEVELS[-1][1]
+                }
+            }
+            
+            affinity_coll = self.database[self.affinity_collection]
+            affinity_doc = await affinity_coll.find_one_and_update(
+                {"user_id": user_id, "personality_name": personality_name},
+                [
+                    {"$set": {
+                        "affinity_points": points,
+                        "session_id": {"$ifNull": ["$session_id", user_id]},
+                        "total_interactions": {"$ifNull": ["$total_interactions", 0]},
+                        "positive_interactions": {"$ifNull": ["$positive_interactions", 0]},
+                        "created_at": {"$ifNull": ["$created_at", now]},
+                        "updated_at": now
+                    }},
+                    {"$set": {"current_level": level}}
+                ],
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            
+            return {
+                "affinity_points": affinity_doc.get('affinity_points', 0),
+                "current_level": affinity_doc.get('current_level', 'stranger'),
+                "total_interactions": affinity_doc.get('total_interactions', 0),
+                "positive_interactions": affinity_doc.get('positive_interactions', 0),
+                "created_at": affinity_doc.get('created_at').isoformat() if affinity_doc.get('created_at') else None,
+                "updated_at": affinity_doc.get('updated_at').isoformat() if affinity_doc.get('updated_at') else None
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to increment affinity: {e}")
+            return None
+    
     # FACT METHODS
     async def save_fact(
         self,
@@ -6,7 +6,7 @@ This implementation allows users to use ANY PostgreSQL database with ANY schema.
 
 import asyncio
 import json
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 import logging
 
@@ -18,7 +18,13 @@ except ImportError:
     Connection = None
     Pool = None
 
-from .storage_v1_1 import StorageV11Extension
+from .storage_v1_1 import (
+    StorageV11Extension,
+    DEFAULT_AFFINITY_CLAMP,
+    affinity_level_sql,
+    calculate_affinity_level,
+    clamp_affinity_points,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -336,6 +342,48 @@ class FlexiblePostgreSQLStorageV11(StorageV11Extension):
             logger.error(f"Failed to get affinity: {e}")
             return None
     
+    async def increment_affinity(
+        self,
+        user_id: str,
+        personality_name: str,
+        delta: int,
+        clamp: Tuple[int, int] = DEFAULT_AFFINITY_CLAMP
+    ) -> Optional[Dict[str, Any]]:
+        """Atomically add delta to affinity points (single UPSERT ... RETURNING)"""
+        low, high = int(clamp[0]), int(clamp[1])
+        first_points = clamp_affinity_points(delta, (low, high))
+        table = f"{self.schema}.{self.affinity_table}"
+        points = f"LEAST({high}, GREATEST({low}, COALESCE({table}.affinity_points, 0) + $4))"
+        try:
+            async with self._get_connection() as conn:
+                row = await conn.fetchrow(f"""
+                    INSERT INTO {table}
+                    (user_id, session_id, personality_name, affinity_points, current_level,
+                     total_interactions, positive_interactions, created_at, updated_at)
+                    VALUES ($1, $1, $2, $3, $5, 0, 0, $6, $6)
+                    ON CONFLICT (user_id, personality_name)
+                    DO UPDATE SET
+                        affinity_points = {points},
+                        current_level = {affinity_level_sql(points)},
+                        updated_at = EXCLUDED.updated_at
+                    RETURNING affinity_points, current_level, total_interactions,
+                              positive_interactions, created_at, updated_at
+                """, user_id, personality_name, first_points, int(delta),
+                    calculate_affinity_level(first_points), datetime.now())
+                
+                return {
+                    "affinity_points": row['affinity_points'],
+                    "current_level": row['current_level'],
+                    "total_interactions": row['total_interactions'],
+                    "positive_interactions": row['positive_interactions'],
+                    "created_at": row['created_at'].isoformat() if row['created_at'] else None,
+                    "updated_at": row['updated_at'].isoformat() if row['updated_at'] else None
+                }
+                
+        except Exception as e:
+            logger.error(f"Failed to increment affinity: {e}")
+            return None
+    
     # FACT METHODS
     async def save_fact(
         self,
@@ -6,18 +6,25 @@ This implementation allows users to use ANY Redis database with ANY key patterns
 
 import json
 import pickle
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 import logging
 
 try:
     import redis.asyncio as redis
     from redis.asyncio import Redis
+    from redis.exceptions import WatchError
 except ImportError:
     redis = None
     Redis = None
+    WatchError = None
 
-from .storage_v1_1 import StorageV11Extension
+from .storage_v1_1 import (
+    StorageV11Extension,
+    DEFAULT_AFFINITY_CLAMP,
+    calculate_affinity_level,
+    clamp_affinity_points,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -259,6 +266,71 @@ class FlexibleRedisStorageV11(StorageV11Extension):
             logger.error(f"Failed to get affinity: {e}")
             return None
     
+    async def increment_affinity(
+        self,
+        user_id: str,
+        personality_name: str,
+        delta: int,
+        clamp: Tuple[int, int] = DEFAULT_AFFINITY_CLAMP,
+        max_retries: int = 10
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Atomically add delta to affinity points
+        
+        Affinity records are serialized blobs, so the update is an
+        optimistic WATCH/MULTI transaction retried when another client
+        changes the record in between.
+        """
+        try:
+            await self._ensure_initialized()
+            
+            affinity_key = self._get_affinity_key(user_id, personality_name)
+            user_affinity_set = self._get_user_set_key(user_id, "affinity")
+            ttl = self.ttl_days * 86400
+            
+            async with self.redis.pipeline(transaction=True) as pipe:
+                for _ in range(max_retries):
+                    try:
+                        await pipe.watch(affinity_key)
+                        data = await pipe.get(affinity_key)
+                        now = datetime.now().isoformat()
+                        affinity_data = self._deserialize_value(data) if data else {
+                            "affinity_points": 0,
+                            "total_interactions": 0,
+                            "positive_interactions": 0,
+                            "session_id": user_id,
+                            "created_at": now
+                        }
+                        points = clamp_affinity_points(affinity_data.get('affinity_points', 0) + delta, clamp)
+                        affinity_data["affinity_points"] = points
+                        affinity_data["current_level"] = calculate_affinity_level(points)
+                        affinity_data["updated_at"] = now
+                        
+                        pipe.multi()
+                        pipe.set(affinity_key, self._serialize_value(affinity_data))
+                        pipe.sadd(user_affinity_set, affinity_key)
+                        pipe.expire(affinity_key, ttl)
+                        pipe.expire(user_affinity_set, ttl)
+                        await pipe.execute()
+                        break
+                    except WatchError:
+                        continue
+                else:
+                    raise RuntimeError(f"affinity update conflicted {max_retries} times")
+            
+            return {
+                "affinity_points": affinity_data.get('affinity_points', 0),
+                "current_level": affinity_data.get('current_level', 'stranger'),
+                "total_interactions": affinity_data.get('total_interactions', 0),
+                "positive_interactions": affinity_data.get('positive_interactions', 0),
+                "created_at": affinity_data.get('created_at'),
+                "updated_at": affinity_data.get('updated_at')
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to increment affinity: {e}")
+            return None
+    
     # FACT METHODS
     async def save_fact(
         self,
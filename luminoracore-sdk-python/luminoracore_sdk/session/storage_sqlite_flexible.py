@@ -7,12 +7,18 @@ This implementation allows users to use ANY SQLite database with ANY schema.
 import sqlite3
 import json
 import os
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 import logging
 from contextlib import asynccontextmanager
 
-from .storage_v1_1 import StorageV11Extension
+from .storage_v1_1 import (
+    StorageV11Extension,
+    DEFAULT_AFFINITY_CLAMP,
+    affinity_level_sql,
+    calculate_affinity_level,
+    clamp_affinity_points,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -321,6 +327,62 @@ class FlexibleSQLiteStorageV11(StorageV11Extension):
             logger.error(f"Failed to get affinity: {e}")
             return None
     
+    async def increment_affinity(
+        self,
+        user_id: str,
+        personality_name: str,
+        delta: int,
+        clamp: Tuple[int, int] = DEFAULT_AFFINITY_CLAMP
+    ) -> Optional[Dict[str, Any]]:
+        """Atomically add delta to affinity points (one write transaction)"""
+        low, high = int(clamp[0]), int(clamp[1])
+        first_points = clamp_affinity_points(delta, (low, high))
+        points = f"MIN({high}, MAX({low}, COALESCE(affinity_points, 0) + {int(delta)}))"
+        now = datetime.now().isoformat()
+        try:
+            async with self._get_connection() as conn:
+                # Take the write lock up front so the read below sees our update
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    cursor = conn.execute(f"""
+                        UPDATE {self.affinity_table}
+                        SET affinity_points = {points},
+                            current_level = {affinity_level_sql(points)},
+                            updated_at = ?
+                        WHERE user_id = ? AND personality_name = ?
+                    """, (now, user_id, personality_name))
+                    
+                    if cursor.rowcount == 0:
+                        conn.execute(f"""
+                            INSERT INTO {self.affinity_table}
+                            (user_id, session_id, personality_name, affinity_points, current_level,
+                             total_interactions, positive_interactions, created_at, updated_at)
+                            VALUES (?, ?, ?, ?, ?, 0, 0, ?, ?)
+                        """, (user_id, user_id, personality_name, first_points,
+                              calculate_affinity_level(first_points), now, now))
+                    
+                    row = conn.execute(f"""
+                        SELECT * FROM {self.affinity_table}
+                        WHERE user_id = ? AND personality_name = ?
+                    """, (user_id, personality_name)).fetchone()
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                
+                return {
+                    "affinity_points": row['affinity_points'],
+                    "current_level": row['current_level'],
+                    "total_interactions": row['total_interactions'],
+                    "positive_interactions": row['positive_interactions'],
+                    "created_at": row['created_at'],
+                    "updated_at": row['updated_at']
+                }
+                
+        except Exception as e:
+            logger.error(f"Failed to increment affinity: {e}")
+            return None
+    
     # FACT METHODS
     async def save_fact(
         self,
@@ -408,24 +470,9 @@ class FlexibleSQLiteStorageV11(StorageV11Extension):
                 
                 facts = []
                 for row in cursor.fetchall():
-                    try:
-                        value = row['value']
-                        try:
-                            value = json.loads(value)
-                        except:
-                            pass  # Keep as string if not JSON
-                        
-                        facts.append({
-                            'category': row['category'],
-                            'key': row['key'],
-                            'value': value,
-                            'confidence': row['confidence'],
-                            'created_at': row['created_at'],
-                            'updated_at': row['updated_at']
-                        })
-                    except Exception as e:
-                        logger.warning(f"Failed to parse fact: {e}")
-                        continue
+                    fact = self._fact_from_row(row)
+                    if fact is not None:
+                        facts.append(fact)
                 
                 return facts
                 
@@ -433,6 +480,56 @@ class FlexibleSQLiteStorageV11(StorageV11Extension):
             logger.error(f"Failed to get facts: {e}")
             return []
     
+    async def get_facts_by_keys(
+        self,
+        user_id: str,
+        category: str,
+        keys: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get the facts of a category with the given keys, by key"""
+        facts = {}
+        keys = list(dict.fromkeys(keys))
+        try:
+            async with self._get_connection() as conn:
+                cursor = conn.cursor()
+                # Stay under SQLite's bound-parameter limit
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    cursor.execute(f"""
+                        SELECT * FROM {self.facts_table}
+                        WHERE user_id = ? AND category = ? AND key IN ({", ".join("?" * len(chunk))})
+                    """, (user_id, category, *chunk))
+                    for row in cursor.fetchall():
+                        fact = self._fact_from_row(row)
+                        if fact is not None:
+                            facts[fact['key']] = fact
+                return facts
+                
+        except Exception as e:
+            logger.error(f"Failed to get facts by key: {e}")
+            return {}
+    
+    @staticmethod
+    def _fact_from_row(row) -> Optional[Dict[str, Any]]:
+        try:
+            value = row['value']
+            try:
+                value = json.loads(value)
+            except:
+                pass  # Keep as string if not JSON
+            
+            return {
+                'category': row['category'],
+                'key': row['key'],
+                'value': value,
+                'confidence': row['confidence'],
+                'created_at': row['created_at'],
+                'updated_at': row['updated_at']
+            }
+        except Exception as e:
+            logger.warning(f"Failed to parse fact: {e}")
+            return None
+    
     async def delete_fact(
         self,
         user_id: str,
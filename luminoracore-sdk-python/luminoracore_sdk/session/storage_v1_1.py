@@ -5,12 +5,50 @@ Adds v1.1 table support to existing storage backends.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Affinity levels by minimum points, highest first
+AFFINITY_LEVELS: Tuple[Tuple[int, str], ...] = (
+    (50, "friend"),
+    (25, "acquaintance"),
+    (0, "stranger"),
+)
+
+DEFAULT_AFFINITY_CLAMP: Tuple[int, int] = (0, 100)
+
+# Fact categories the SDK keeps in a user's partition for its own
+# bookkeeping; they are not facts about the user
+INTERNAL_FACT_CATEGORIES = frozenset({"conversation_history", "evolution_history"})
+
+
+def calculate_affinity_level(points: int) -> str:
+    """Affinity level for a number of points"""
+    for threshold, level in AFFINITY_LEVELS:
+        if points >= threshold:
+            return level
+    return AFFINITY_LEVELS[-1][1]
+
+
+def clamp_affinity_points(points: int, clamp: Tuple[int, int] = DEFAULT_AFFINITY_CLAMP) -> int:
+    """Clamp affinity points to the (low, high) range"""
+    low, high = clamp
+    if low > high:
+        raise ValueError(f"Invalid affinity clamp: {clamp}")
+    return max(low, min(high, points))
+
+
+def affinity_level_sql(points_expression: str) -> str:
+    """SQL CASE expression computing the affinity level from a points expression"""
+    branches = " ".join(
+        f"WHEN {points_expression} >= {int(threshold)} THEN '{level}'"
+        for threshold, level in AFFINITY_LEVELS[:-1]
+    )
+    return f"CASE {branches} ELSE '{AFFINITY_LEVELS[-1][1]}' END"
+
 
 class StorageV11Extension(ABC):
     """
@@ -42,6 +80,46 @@ class StorageV11Extension(ABC):
         """Get user affinity data"""
         pass
     
+    async def increment_affinity(
+        self,
+        user_id: str,
+        personality_name: str,
+        delta: int,
+        clamp: Tuple[int, int] = DEFAULT_AFFINITY_CLAMP
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Add delta to affinity points, clamp, recompute the level and return the new state
+        
+        Missing records start at 0 points. Backends override this with a
+        single atomic operation; this default is a read-modify-write and
+        is only safe when nothing else writes the record concurrently.
+        
+        Args:
+            user_id: User identifier
+            personality_name: Personality name
+            delta: Points to add (negative to subtract)
+            clamp: (low, high) bounds for the resulting points
+            
+        Returns:
+            Affinity data after the update, or None on failure
+        """
+        current = await self.get_affinity(user_id, personality_name)
+        points = clamp_affinity_points((current or {}).get("affinity_points", 0) + delta, clamp)
+        extra = {
+            k: current[k] for k in ("total_interactions", "positive_interactions")
+            if current and k in current
+        }
+        saved = await self.save_affinity(
+            user_id=user_id,
+            personality_name=personality_name,
+            affinity_points=points,
+            current_level=calculate_affinity_level(points),
+            **extra
+        )
+        if not saved:
+            return None
+        return await self.get_affinity(user_id, personality_name)
+    
     # FACT METHODS
     @abstractmethod
     async def save_fact(
@@ -64,6 +142,25 @@ class StorageV11Extension(ABC):
         """Get user facts, optionally filtered by category"""
         pass
     
+    async def get_facts_by_keys(
+        self,
+        user_id: str,
+        category: str,
+        keys: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the facts of a category with the given keys, by key
+        
+        Filters get_facts(); backends with a keyed lookup override it so
+        that only the requested facts are read.
+        """
+        wanted = set(keys)
+        return {
+            fact["key"]: fact
+            for fact in await self.get_facts(user_id, category) or []
+            if fact.get("key") in wanted
+        }
+    
     # EPISODE METHODS
     @abstractmethod
     async def save_episode(
@@ -196,6 +293,28 @@ class InMemoryStorageV11(StorageV11Extension):
         key = f"{user_id}:{personality_name}"
         return self._affinity.get(key)
     
+    async def increment_affinity(
+        self,
+        user_id: str,
+        personality_name: str,
+        delta: int,
+        clamp: Tuple[int, int] = DEFAULT_AFFINITY_CLAMP
+    ) -> Optional[Dict[str, Any]]:
+        """Increment affinity in memory (atomic: no await between read and write)"""
+        key = f"{user_id}:{personality_name}"
+        affinity = self._affinity.get(key)
+        if affinity is None:
+            affinity = self._affinity[key] = {
+                "user_id": user_id,
+                "personality_name": personality_name,
+                "affinity_points": 0
+            }
+        points = clamp_affinity_points(affinity["affinity_points"] + delta, clamp)
+        affinity["affinity_points"] = points
+        affinity["current_level"] = calculate_affinity_level(points)
+        affinity["updated_at"] = datetime.now().isoformat()
+        return dict(affinity)
+    
     async def save_fact(
         self,
         user_id: str,
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from enum import Enum
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Deque, Union
 from dataclasses import dataclass, field
 from datetime import datetime
 
@@ -67,7 +67,8 @@ class Conversation:
     """Represents a conversation with messages and metadata."""
     
     session_id: str
-    messages: List[Message] = field(default_factory=list)
+    # ConversationManager keeps a bounded deque (its ring buffer)
+    messages: Union[List[Message], Deque[Message]] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
     created_at: datetime = field(default_factory=datetime.utcnow)
     updated_at: datetime = field(default_factory=datetime.utcnow)
@@ -79,7 +80,8 @@ class Conversation:
     
     def get_recent_messages(self, count: int) -> List[Message]:
         """Get the most recent messages."""
-        return self.messages[-count:] if count > 0 else self.messages
+        messages = list(self.messages)
+        return messages[-count:] if count > 0 else messages
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert conversation to dictionary."""
@@ -156,11 +158,15 @@ class MemoryConfig:
     """Configuration for conversation memory."""
     
     enabled: bool = True
-    max_entries: int = 1000
+    max_entries: Optional[int] = None  # Per-session entry budget (None = unlimited)
     decay_factor: float = 0.1
     importance_threshold: float = 0.5
     ttl: Optional[int] = None  # Time-to-live in seconds (None = no expiration)
     
+    # Per-session byte budget and eviction policy (with max_entries)
+    max_bytes_per_session: Optional[int] = None  # None = no byte budget
+    eviction_policy: str = "lru"  # "lru" (least recently used) or "lfu" (least accessed)
+    
     # Memory types to track
     track_topics: bool = True
     track_preferences: bool = True
@@ -0,0 +1,76 @@
+"""
+Fixtures compartidas: storage y cliente v1.1 en memoria
+"""
+
+import json
+
+import pytest
+
+
+class FakeStorage:
+    def __init__(self):
+        self.facts = []
+        self.memories = {}
+    
+    def add_turn(self, index, user_message, assistant_response="ok"):
+        self.facts.append({
+            "user_id": "session-1",
+            "category": "conversation_history",
+            "key": f"turn_20260101_0000{index:02d}_000000",
+            "value": json.dumps({
+                "user_message": user_message,
+                "assistant_response": assistant_response,
+                "timestamp": f"2026-01-01T00:00:{index:02d}"
+            })
+        })
+    
+    async def get_facts(self, user_id, category=None):
+        return [f for f in self.facts if f["user_id"] == user_id and category in (None, f["category"])]
+    
+    async def save_fact(self, user_id, category, key, value, **kwargs):
+        self.facts.append({"user_id": user_id, "category": category, "key": key, "value": value})
+        return True
+    
+    async def get_memory(self, user_id, memory_key):
+        return self.memories.get((user_id, memory_key))
+    
+    async def save_memory(self, user_id, memory_key, memory_value, **kwargs):
+        self.memories[(user_id, memory_key)] = memory_value
+        return True
+    
+    async def get_episodes(self, user_id):
+        return []
+
+
+class FakeClient:
+    def __init__(self, metrics_collector=None, tracer=None):
+        self.storage_v11 = FakeStorage()
+        self.base_client = object()
+        self.metrics_collector = metrics_collector
+        self.tracer = tracer
+        self.affinity_updates = []
+    
+    async def get_facts(self, user_id):
+        return await self.storage_v11.get_facts(user_id)
+    
+    async def get_affinity(self, user_id, personality_name):
+        return None
+    
+    async def save_fact(self, user_id, category, key, value, **kwargs):
+        return await self.storage_v11.save_fact(user_id, category, key, value)
+    
+    async def update_affinity(self, **kwargs):
+        self.affinity_updates.append(kwargs)
+        return None
+
+
+@pytest.fixture
+def fake_storage():
+    """Storage v1.1 in memory with just the calls the SDK managers use."""
+    return FakeStorage()
+
+
+@pytest.fixture
+def make_fake_client():
+    """Factory of v1.1 clients backed by their own FakeStorage."""
+    return FakeClient
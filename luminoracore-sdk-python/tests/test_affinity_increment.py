@@ -0,0 +1,129 @@
+"""
+Tests para increment_affinity atómico en los backends de storage
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from luminoracore_sdk.session.storage_v1_1 import (
+    InMemoryStorageV11,
+    StorageV11Extension,
+    affinity_level_sql,
+    calculate_affinity_level,
+)
+from luminoracore_sdk.session.storage_sqlite_flexible import FlexibleSQLiteStorageV11
+
+
+class TestAffinityLevels:
+    """Niveles de afinidad compartidos"""
+    
+    def test_levels(self):
+        """Levels follow the point thresholds."""
+        assert calculate_affinity_level(0) == "stranger"
+        assert calculate_affinity_level(25) == "acquaintance"
+        assert calculate_affinity_level(50) == "friend"
+    
+    def test_sql_expression(self):
+        """The SQL CASE matches the Python thresholds."""
+        import sqlite3
+        conn = sqlite3.connect(":memory:")
+        for points in (0, 24, 25, 49, 50, 100):
+            level = conn.execute(f"SELECT {affinity_level_sql('?')}", (points,) * 2).fetchone()[0]
+            assert level == calculate_affinity_level(points)
+
+
+class TestInMemoryIncrement:
+    """Backend en memoria"""
+    
+    @pytest.mark.asyncio
+    async def test_creates_and_clamps(self):
+        """Missing records start at 0 and results are clamped."""
+        storage = InMemoryStorageV11()
+        state = await storage.increment_affinity("u1", "alicia", 30)
+        assert state["affinity_points"] == 30
+        assert state["current_level"] == "acquaintance"
+        
+        state = await storage.increment_affinity("u1", "alicia", 500)
+        assert state["affinity_points"] == 100
+        assert state["current_level"] == "friend"
+        
+        state = await storage.increment_affinity("u1", "alicia", -7, clamp=(95, 100))
+        assert state["affinity_points"] == 95
+        
+        state = await storage.increment_affinity("u1", "alicia", -500)
+        assert state["affinity_points"] == 0
+        assert (await storage.get_affinity("u1", "alicia"))["current_level"] == "stranger"
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_increments(self):
+        """Concurrent increments are not lost."""
+        storage = InMemoryStorageV11()
+        await asyncio.gather(*(storage.increment_affinity("u1", "alicia", 1) for _ in range(40)))
+        assert (await storage.get_affinity("u1", "alicia"))["affinity_points"] == 40
+
+
+class TestSQLiteIncrement:
+    """Backend SQLite"""
+    
+    @pytest.mark.asyncio
+    async def test_creates_updates_and_keeps_counters(self, tmp_path):
+        """Increments upsert, clamp, recompute the level and keep other columns."""
+        storage = FlexibleSQLiteStorageV11(str(tmp_path / "affinity.db"))
+        state = await storage.increment_affinity("u1", "alicia", 20)
+        assert state["affinity_points"] == 20
+        assert state["current_level"] == "stranger"
+        
+        await storage.save_affinity("u1", "alicia", 20, "stranger", total_interactions=7)
+        state = await storage.increment_affinity("u1", "alicia", 40)
+        assert state["affinity_points"] == 60
+        assert state["current_level"] == "friend"
+        assert state["total_interactions"] == 7
+        
+        state = await storage.increment_affinity("u1", "alicia", 90)
+        assert state["affinity_points"] == 100
+        state = await storage.increment_affinity("u1", "alicia", -150)
+        assert state["affinity_points"] == 0
+        assert state == await storage.get_affinity("u1", "alicia")
+    
+    def test_concurrent_writers(self, tmp_path):
+        """Increments from several connections and threads are all applied."""
+        path = str(tmp_path / "affinity.db")
+        FlexibleSQLiteStorageV11(path)
+        
+        def worker():
+            storage = FlexibleSQLiteStorageV11(path, auto_create_tables=False)
+            
+            async def run():
+                for _ in range(10):
+                    assert await storage.increment_affinity("u1", "alicia", 1) is not None
+            
+            asyncio.run(run())
+        
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        state = asyncio.run(FlexibleSQLiteStorageV11(path).get_affinity("u1", "alicia"))
+        assert state["affinity_points"] == 40
+
+
+class TestDefaultIncrement:
+    """Implementación por defecto para backends de terceros"""
+    
+    @pytest.mark.asyncio
+    async def test_read_modify_write_fallback(self):
+        """Backends without an override get a read-modify-write increment."""
+        
+        class MinimalStorage(InMemoryStorageV11):
+            increment_affinity = StorageV11Extension.increment_affinity
+        
+        storage = MinimalStorage()
+        await storage.save_affinity("u1", "alicia", 45, "acquaintance", total_interactions=3)
+        state = await storage.increment_affinity("u1", "alicia", 10)
+        assert state["affinity_points"] == 55
+        assert state["current_level"] == "friend"
+        assert state["total_interactions"] == 3
@@ -0,0 +1,226 @@
+"""
+Tests para la evolución de personalidad por lotes
+"""
+
+import asyncio
+
+import pytest
+
+from luminoracore_sdk.evolution import PersonalityEvolutionEngine, BatchEvolutionRunner
+from luminoracore_sdk.session.storage_sqlite_flexible import FlexibleSQLiteStorageV11
+from luminoracore_sdk.session.storage_v1_1 import InMemoryStorageV11
+
+
+async def _seed(storage, count):
+    user_ids = []
+    for index in range(count):
+        user_id = f"user_{index}"
+        user_ids.append(user_id)
+        await storage.save_affinity(
+            user_id, "default", (index * 7) % 60, "stranger",
+            total_interactions=(index * 3) % 20,
+            positive_interactions=index % 5
+        )
+        for episode in range(index % 4):
+            sentiment = ["positive", "negative", "neutral"][(index + episode) % 3]
+            await storage.save_episode(user_id, "chat", f"e{episode}", "", 0.5, sentiment)
+        for pattern in range(index % 5):
+            await storage.save_fact(user_id, "communication_style", f"style_{pattern}", "casual")
+        if index % 3:
+            # Traits far enough from the caps for the 0.1 steps to register
+            personality = _default_personality("alicia")
+            personality["advanced_parameters"].update(warmth=0.3, empathy=0.3, patience=0.3, formality=0.3)
+            await storage.save_fact("global", "personality", f"personality_{user_id}_alicia", personality)
+    return user_ids
+
+
+def _default_personality(personality_name):
+    return PersonalityEvolutionEngine(InMemoryStorageV11())._get_default_personality(personality_name)
+
+
+async def _traits(engine, user_id):
+    personality = await engine._get_current_personality(user_id, "alicia")
+    return personality["advanced_parameters"]
+
+
+class _SlowStorage(InMemoryStorageV11):
+    def __init__(self):
+        super().__init__()
+        self.in_flight = 0
+        self.peak = 0
+    
+    async def _slow(self, result):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+        return await result
+    
+    async def get_affinity(self, user_id, personality_name):
+        return await self._slow(super().get_affinity(user_id, personality_name))
+    
+    async def get_facts(self, user_id, category=None):
+        return await self._slow(super().get_facts(user_id, category))
+    
+    async def get_episodes(self, user_id, **kwargs):
+        return await self._slow(super().get_episodes(user_id, **kwargs))
+
+
+class _KeyedLookupStorage(InMemoryStorageV11):
+    def __init__(self):
+        super().__init__()
+        self.personality_scans = 0
+        self.key_lookups = []
+    
+    async def get_facts(self, user_id, category=None):
+        if (user_id, category) == ("global", "personality"):
+            self.personality_scans += 1
+        return await super().get_facts(user_id, category)
+    
+    async def get_facts_by_keys(self, user_id, category, keys):
+        self.key_lookups.append(list(keys))
+        facts = await InMemoryStorageV11.get_facts(self, user_id, category)
+        return {fact["key"]: fact for fact in facts if fact["key"] in keys}
+
+
+class _MalformedFactStorage(InMemoryStorageV11):
+    async def get_facts(self, user_id, category=None, **kwargs):
+        facts = await super().get_facts(user_id, category, **kwargs)
+        if user_id == "user_3":
+            return facts + [{"key": "broken", "value": "no category"}]
+        return facts
+
+
+class TestBatchEvolution:
+    """Ejecución por lotes equivalente a la evolución por usuario"""
+    
+    @pytest.mark.asyncio
+    async def test_triggers_match_engine(self):
+        """Column-wise triggers equal the engine's per-user triggers."""
+        storage = InMemoryStorageV11()
+        engine = PersonalityEvolutionEngine(storage)
+        user_ids = await _seed(storage, 40)
+        analyses = [await engine._analyze_interactions("s", user_id) for user_id in user_ids]
+        
+        expected = [await engine._check_evolution_triggers("s", "u", analysis) for analysis in analyses]
+        assert BatchEvolutionRunner(engine)._shard_triggers(analyses) == expected
+        assert any(expected) and not all(expected)
+    
+    @pytest.mark.asyncio
+    async def test_matches_per_user_evolution(self):
+        """A batch run evolves the same traits as evolve_personality per user."""
+        single_storage, batch_storage = InMemoryStorageV11(), InMemoryStorageV11()
+        user_ids = await _seed(single_storage, 30)
+        await _seed(batch_storage, 30)
+        single = PersonalityEvolutionEngine(single_storage)
+        batch = PersonalityEvolutionEngine(batch_storage)
+        
+        evolved = 0
+        for user_id in user_ids:
+            result = await single.evolve_personality("s", user_id, "alicia")
+            evolved += result.changes_detected
+        report = await BatchEvolutionRunner(batch, shard_size=7).run(user_ids, "alicia", run_id="r1")
+        
+        assert report.completed and report.position == 30
+        assert report.evolved == evolved > 0
+        assert report.evolved + report.unchanged == 30
+        for user_id in user_ids:
+            assert await _traits(batch, user_id) == await _traits(single, user_id)
+        histories = [await batch.get_evolution_history("s", user_id) for user_id in user_ids]
+        assert sum(len(history) for history in histories) == report.evolved
+    
+    @pytest.mark.asyncio
+    async def test_resume_does_not_evolve_twice(self):
+        """A resumed run continues after the checkpoint and skips evolved users."""
+        storage = InMemoryStorageV11()
+        engine = PersonalityEvolutionEngine(storage)
+        user_ids = await _seed(storage, 20)
+        runner = BatchEvolutionRunner(engine, shard_size=5)
+        
+        async def interrupted():
+            for index, user_id in enumerate(user_ids):
+                if index == 12:
+                    raise RuntimeError("worker killed")
+                yield user_id
+        
+        with pytest.raises(RuntimeError):
+            await runner.run(interrupted(), "alicia", run_id="nightly")
+        checkpoint = await runner.load_checkpoint("nightly")
+        assert checkpoint.position == 10 and not checkpoint.completed
+        after_crash = {user_id: await _traits(engine, user_id) for user_id in user_ids}
+        
+        report = await runner.run(user_ids, "alicia", run_id="nightly")
+        assert report.resumed_from == 10 and report.completed
+        for user_id in user_ids[:10]:
+            assert await _traits(engine, user_id) == after_crash[user_id]
+        
+        # Same run again: nothing to do; a forced rerun skips evolved users
+        again = await runner.run(user_ids, "alicia", run_id="nightly")
+        assert again.to_dict() == report.to_dict()
+        forced = await runner.run(user_ids, "alicia", run_id="nightly", resume=False)
+        assert forced.evolved == 0 and forced.skipped == report.evolved
+    
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """At most `concurrency` storage reads are in flight."""
+        storage = _SlowStorage()
+        engine = PersonalityEvolutionEngine(storage)
+        user_ids = await _seed(storage, 30)
+        report = await BatchEvolutionRunner(engine, shard_size=30, concurrency=4).run(user_ids, "alicia")
+        
+        assert report.completed
+        assert 1 < storage.peak <= 4
+    
+    @pytest.mark.asyncio
+    async def test_personalities_are_read_per_shard(self):
+        """Each shard looks up only its own users' personality keys."""
+        storage = _KeyedLookupStorage()
+        engine = PersonalityEvolutionEngine(storage)
+        user_ids = await _seed(storage, 12)
+        
+        report = await BatchEvolutionRunner(engine, shard_size=5).run(user_ids, "alicia")
+        
+        assert report.completed and report.evolved > 0
+        assert storage.personality_scans == 0
+        assert storage.key_lookups == [
+            [f"personality_{user_id}_alicia" for user_id in user_ids[start:start + 5]]
+            for start in (0, 5, 10)
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_sqlite_keyed_lookup(self, tmp_path):
+        """SQLite reads only the requested fact keys."""
+        storage = FlexibleSQLiteStorageV11(str(tmp_path / "facts.db"))
+        await storage.save_fact("global", "personality", "personality_u1_alicia", {"name": "a"})
+        await storage.save_fact("global", "personality", "personality_u2_alicia", {"name": "b"})
+        await storage.save_fact("global", "other", "personality_u1_alicia", "x")
+        
+        found = await storage.get_facts_by_keys(
+            "global", "personality", ["personality_u1_alicia", "personality_u3_alicia"]
+        )
+        
+        assert list(found) == ["personality_u1_alicia"]
+        assert found["personality_u1_alicia"]["value"] == {"name": "a"}
+    
+    @pytest.mark.asyncio
+    async def test_malformed_user_does_not_abort_shard(self):
+        """A user whose analysis fails is counted as failed and the run continues."""
+        storage = _MalformedFactStorage()
+        engine = PersonalityEvolutionEngine(storage)
+        user_ids = await _seed(storage, 12)
+        runner = BatchEvolutionRunner(engine, shard_size=5)
+        
+        report = await runner.run(user_ids, "alicia", run_id="malformed")
+        
+        assert report.completed and report.position == 12
+        assert report.failed == 1
+        assert report.evolved + report.unchanged == 11
+        assert (await runner.load_checkpoint("malformed")).completed
+    
+    def test_invalid_arguments(self):
+        """Shard size and concurrency must be positive."""
+        engine = PersonalityEvolutionEngine(InMemoryStorageV11())
+        with pytest.raises(ValueError):
+            BatchEvolutionRunner(engine, shard_size=0)
+        with pytest.raises(ValueError):
+            BatchEvolutionRunner(engine, concurrency=0)
@@ -0,0 +1,111 @@
+"""
+Tests para la caché de mezclas direccionada por contenido
+"""
+
+import pytest
+
+from luminoracore_sdk.personality.blender import PersonalityBlender
+from luminoracore_sdk.types.personality import PersonalityData
+
+
+class _CountingAdapter:
+    def __init__(self):
+        self.calls = 0
+    
+    async def blend_personalities(self, personalities, weights, blend_name):
+        self.calls += 1
+        return PersonalityData(
+            name=blend_name,
+            description=" / ".join(p.description for p in personalities),
+            system_prompt="x" * 200,
+            metadata={"weights": list(weights)}
+        )
+
+
+def _personality(name, description="description"):
+    return PersonalityData(name=name, description=description, system_prompt=f"You are {name}")
+
+
+def _blender(**kwargs):
+    blender = PersonalityBlender(**kwargs)
+    blender._adapter = _CountingAdapter()
+    return blender
+
+
+class TestBlendCache:
+    """Claves por contenido, LRU acotada y persistencia en disco"""
+    
+    @pytest.mark.asyncio
+    async def test_key_covers_content_and_weight_pairing(self):
+        """Edited content and swapped weights are different blends."""
+        blender = _blender()
+        a, b = _personality("a"), _personality("b")
+        
+        await blender.blend_personalities([a, b], [0.7, 0.3])
+        await blender.blend_personalities([a, b], [0.7, 0.3])
+        assert blender._adapter.calls == 1
+        
+        await blender.blend_personalities([a, b], [0.3, 0.7])
+        await blender.blend_personalities([b, a], [0.7, 0.3])
+        assert blender._adapter.calls == 3
+        
+        edited = _personality("a", "edited description")
+        blended = await blender.blend_personalities([edited, b], [0.7, 0.3])
+        assert blender._adapter.calls == 4
+        assert blended.description.startswith("edited")
+    
+    @pytest.mark.asyncio
+    async def test_lru_bounds(self):
+        """The cache evicts least recently used blends by entries and bytes."""
+        blender = _blender(max_cache_entries=2)
+        a, b, c = _personality("a"), _personality("b"), _personality("c")
+        
+        await blender.blend_personalities([a, b], [0.5, 0.5])
+        await blender.blend_personalities([a, c], [0.5, 0.5])
+        assert await blender.get_cached_blend([a, b], [0.5, 0.5]) is not None  # Refresh
+        await blender.blend_personalities([b, c], [0.5, 0.5])
+        
+        assert await blender.get_cached_blend([a, c], [0.5, 0.5]) is None
+        assert await blender.get_cached_blend([a, b], [0.5, 0.5]) is not None
+        info = await blender.get_blend_cache_info()
+        assert info["cache_size"] == 2 and info["evictions"] == 1
+        
+        small = _blender(max_cache_bytes=info["cache_bytes"] // 2 + 1)
+        await small.blend_personalities([a, b], [0.5, 0.5])
+        await small.blend_personalities([a, c], [0.5, 0.5])
+        info = await small.get_blend_cache_info()
+        assert info["cache_size"] == 1 and info["cache_bytes"] <= small.max_cache_bytes
+    
+    @pytest.mark.asyncio
+    async def test_disk_persistence(self, tmp_path):
+        """Blends written by one blender are reused by the next one."""
+        a, b = _personality("a"), _personality("b")
+        first = _blender(cache_dir=tmp_path)
+        blended = await first.blend_personalities([a, b], [0.6, 0.4], blend_name="ab")
+        
+        second = _blender(cache_dir=tmp_path)
+        restored = await second.blend_personalities([a, b], [0.6, 0.4])
+        assert second._adapter.calls == 0
+        assert restored == blended
+        
+        assert await second.clear_blend_cache() == 1
+        assert list(tmp_path.glob("*.json")) == []
+    
+    @pytest.mark.asyncio
+    async def test_disk_cache_is_bounded(self, tmp_path):
+        """Persisted blends are pruned to the same bounds as memory."""
+        a, b, c = _personality("a"), _personality("b"), _personality("c")
+        blender = _blender(max_cache_entries=2, cache_dir=tmp_path)
+        
+        await blender.blend_personalities([a, b], [0.5, 0.5])
+        await blender.blend_personalities([a, c], [0.5, 0.5])
+        await blender.blend_personalities([b, c], [0.5, 0.5])
+        newest = blender._generate_cache_key([b, c], [0.5, 0.5])
+        persisted = {path.stem for path in tmp_path.glob("blend_*.json")}
+        assert len(persisted) == 2 and newest in persisted
+        
+        size = max(path.stat().st_size for path in tmp_path.glob("blend_*.json"))
+        small = _blender(max_cache_bytes=size, cache_dir=tmp_path)
+        await small.blend_personalities([c, a], [0.5, 0.5])
+        persisted = [path.stem for path in tmp_path.glob("blend_*.json")]
+        assert persisted == [small._generate_cache_key([c, a], [0.5, 0.5])]
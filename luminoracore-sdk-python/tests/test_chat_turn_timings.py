@@ -0,0 +1,74 @@
+"""
+Tests para la instrumentación por etapas de send_message_with_full_context
+"""
+
+import pytest
+
+from luminoracore_sdk.conversation_memory_manager import ConversationMemoryManager
+from luminoracore_sdk.monitoring.metrics import MetricsCollector
+from luminoracore_sdk.monitoring.stages import NULL_STAGE_TIMER, StageTimer
+from luminoracore_sdk.monitoring.tracer import DistributedTracer
+from luminoracore_sdk.providers.factory import ProviderFactory
+from luminoracore_sdk.types.provider import ChatResponse, ProviderConfig
+
+
+class _FakeProvider:
+    async def chat(self, messages, **kwargs):
+        return ChatResponse(content="3", usage={"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12})
+
+
+@pytest.fixture
+def fake_provider(monkeypatch):
+    monkeypatch.setattr(ProviderFactory, "create_provider", classmethod(lambda cls, config: _FakeProvider()))
+    return ProviderConfig(name="deepseek", api_key="test")
+
+
+class TestChatTurnTimings:
+    """Tests del bloque timings"""
+    
+    @pytest.mark.asyncio
+    async def test_timings_block(self, fake_provider, make_fake_client):
+        """All stages and token usage are reported when requested"""
+        manager = ConversationMemoryManager(make_fake_client())
+        
+        result = await manager.send_message_with_full_context(
+            "s1", "hello", user_id="u1", provider_config=fake_provider, include_timings=True
+        )
+        
+        assert result["success"] is True
+        timings = result["timings"]
+        assert set(timings["stages"]) == {
+            "history_fetch", "fact_fetch", "affinity_fetch", "personality_load",
+            "llm_call", "fact_extraction", "affinity_rating", "writes",
+        }
+        assert timings["total_ms"] >= max(timings["stages"].values())
+        assert timings["tokens"]["total"]["total_tokens"] == 36  # Three LLM calls
+        assert timings["tokens"]["by_stage"]["llm_call"]["prompt_tokens"] == 10
+    
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self, fake_provider, make_fake_client):
+        """No timings block and no timer without metrics, tracer or flag"""
+        manager = ConversationMemoryManager(make_fake_client())
+        
+        result = await manager.send_message_with_full_context("s1", "hello", provider_config=fake_provider)
+        
+        assert "timings" not in result
+        assert StageTimer.create("chat_turn") is NULL_STAGE_TIMER
+    
+    @pytest.mark.asyncio
+    async def test_metrics_and_spans(self, fake_provider, make_fake_client):
+        """Stages are recorded as labelled histograms and child spans"""
+        metrics, tracer = MetricsCollector(), DistributedTracer()
+        manager = ConversationMemoryManager(make_fake_client(metrics, tracer))
+        
+        result = await manager.send_message_with_full_context("s1", "hello", provider_config=fake_provider)
+        
+        assert "timings" not in result
+        stats = await metrics.get_histogram_stats("chat_turn.stage_seconds", {"stage": "llm_call"})
+        assert stats["count"] == 1
+        assert await metrics.get_counter("chat_turn.tokens", {"stage": "llm_call", "kind": "total_tokens"}) == 12
+        
+        trace = tracer.get_trace(tracer.list_traces()[0])
+        assert trace.root_span.operation_name == "chat_turn"
+        assert "llm_call" in {span.operation_name for span in trace.root_span.child_spans}
+        assert tracer.get_trace_summary()["finished_traces"] == 1
@@ -0,0 +1,189 @@
+"""
+Tests para ConversationManager: ring buffer, token index y spill a storage
+"""
+
+import random
+
+import pytest
+from collections import deque
+
+from luminoracore_sdk.session.conversation import ConversationManager, _TokenIndex
+from luminoracore_sdk.session.storage import InMemoryStorage
+from luminoracore_sdk.types.session import MessageRole, StorageConfig, StorageType
+
+
+async def _fill(manager, session_id, count, prefix="message"):
+    for i in range(count):
+        await manager.add_message(session_id, MessageRole.USER, f"{prefix} {i}")
+
+
+class _FlakyStorage(InMemoryStorage):
+    failures = 0
+    
+    async def save_session(self, session_id, session_data):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("storage unavailable")
+        return await super().save_session(session_id, session_data)
+
+
+class TestConversationRingBuffer:
+    """Tests del historial acotado"""
+    
+    @pytest.mark.asyncio
+    async def test_history_is_bounded(self):
+        """Oldest messages are evicted once max_history is reached"""
+        manager = ConversationManager(max_history=3)
+        await manager.create_conversation("s1")
+        await _fill(manager, "s1", 5)
+        
+        conversation = await manager.get_conversation("s1")
+        assert isinstance(conversation.messages, deque)
+        assert [m.content for m in conversation.messages] == ["message 2", "message 3", "message 4"]
+        assert (await manager.get_last_message("s1")).content == "message 4"
+    
+    @pytest.mark.asyncio
+    async def test_get_messages_offset_and_limit(self):
+        """Offsets and limits work on the ring buffer"""
+        manager = ConversationManager(max_history=10)
+        await manager.create_conversation("s1")
+        await _fill(manager, "s1", 6)
+        
+        messages = await manager.get_messages("s1", limit=2, offset=3)
+        
+        assert [m.content for m in messages] == ["message 3", "message 4"]
+        assert len(await manager.get_messages("s1")) == 6
+    
+    @pytest.mark.asyncio
+    async def test_recent_messages(self):
+        """Conversation.get_recent_messages works with a deque"""
+        manager = ConversationManager(max_history=10)
+        conversation = await manager.create_conversation("s1")
+        await _fill(manager, "s1", 4)
+        
+        assert [m.content for m in conversation.get_recent_messages(2)] == ["message 2", "message 3"]
+    
+    def test_invalid_configuration(self):
+        """Invalid sizes raise ValueError"""
+        with pytest.raises(ValueError):
+            ConversationManager(max_history=0)
+        with pytest.raises(ValueError):
+            ConversationManager(spill_batch_size=0)
+
+
+class TestConversationSearch:
+    """Tests de búsqueda con y sin índice"""
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("index_tokens", [False, True])
+    async def test_search_matches_substrings(self, index_tokens):
+        """Indexed and linear search return the same results"""
+        manager = ConversationManager(max_history=4, index_tokens=index_tokens)
+        await manager.create_conversation("s1")
+        for content in ["I love Pizza", "pizzeria nearby?", "sushi time", "Pizza again", "more sushi", "no food"]:
+            await manager.add_message("s1", MessageRole.USER, content)
+        
+        assert [m.content for m in await manager.search_messages("s1", "PIZZ")] == ["Pizza again"]
+        assert [m.content for m in await manager.search_messages("s1", "sushi")] == ["sushi time", "more sushi"]
+        assert [m.content for m in await manager.search_messages("s1", "i time")] == ["sushi time"]
+        assert [m.content for m in await manager.search_messages("s1", "sushi", limit=1)] == ["sushi time"]
+        assert await manager.search_messages("s1", "burger") == []
+        assert [m.content for m in await manager.search_messages("s1", " ")] == [
+            "sushi time", "Pizza again", "more sushi", "no food"
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_index_matches_linear_search(self):
+        """Indexed search agrees with a scan on random text and queries"""
+        rng = random.Random(3)
+        words = ["pizza", "pizzeria", "sushi", "ramen", "tacos", "zza", "sus", "men"]
+        indexed = ConversationManager(max_history=30, index_tokens=True)
+        linear = ConversationManager(max_history=30)
+        for manager in (indexed, linear):
+            await manager.create_conversation("s1")
+        for _ in range(80):
+            content = " ".join(rng.choice(words) for _ in range(rng.randint(1, 4)))
+            for manager in (indexed, linear):
+                await manager.add_message("s1", MessageRole.USER, content)
+        
+        for query in ["pizz", "zza", "sushi ra", "a sus", "men", "izzer", "taco", "pi", "burger"]:
+            expected = [m.content for m in await linear.search_messages("s1", query)]
+            assert [m.content for m in await indexed.search_messages("s1", query)] == expected
+    
+    def test_candidates_are_trigram_lookups(self):
+        """Candidates come from trigram postings; short queries fall back to a scan"""
+        index = _TokenIndex()
+        index.add(0, "i love pizza")
+        index.add(1, "pizzeria nearby")
+        index.add(2, "sushi")
+        
+        assert index.candidates("pizz") == {0, 1}
+        assert index.candidates("zza") == {0}
+        assert index.candidates("burger") == set()
+        assert index.candidates("pi") is None
+    
+    @pytest.mark.asyncio
+    async def test_index_after_clear(self):
+        """Clearing resets the index"""
+        manager = ConversationManager(max_history=4, index_tokens=True)
+        await manager.create_conversation("s1")
+        await _fill(manager, "s1", 3, prefix="hello")
+        await manager.clear_conversation("s1")
+        await manager.add_message("s1", MessageRole.USER, "hello again")
+        
+        assert [m.content for m in await manager.search_messages("s1", "hello")] == ["hello again"]
+
+
+class TestConversationSpill:
+    """Tests del spill de mensajes desalojados a storage"""
+    
+    @pytest.mark.asyncio
+    async def test_evicted_messages_spill_to_storage(self):
+        """Evicted messages are archived instead of lost"""
+        storage = InMemoryStorage(StorageConfig(storage_type=StorageType.MEMORY))
+        manager = ConversationManager(max_history=3, storage=storage, spill_batch_size=2)
+        await manager.create_conversation("s1")
+        await _fill(manager, "s1", 8)
+        
+        archived = await manager.get_archived_messages("s1")
+        
+        assert [m.content for m in archived] == [f"message {i}" for i in range(5)]
+        assert len(await storage.list_sessions()) == 2  # Two full chunks, one pending
+    
+    @pytest.mark.asyncio
+    async def test_failed_spill_keeps_messages(self):
+        """A chunk that fails to spill stays readable and is retried with the next one"""
+        storage = _FlakyStorage(StorageConfig(storage_type=StorageType.MEMORY))
+        manager = ConversationManager(max_history=2, storage=storage, spill_batch_size=2)
+        await manager.create_conversation("s1")
+        storage.failures = 1
+        await _fill(manager, "s1", 4)
+        
+        assert await storage.list_sessions() == []
+        assert [m.content for m in await manager.get_archived_messages("s1")] == ["message 0", "message 1"]
+        
+        await _fill(manager, "s1", 2, prefix="more")
+        assert len(await storage.list_sessions()) == 2
+        assert [m.content for m in await manager.get_archived_messages("s1")] == [
+            "message 0", "message 1", "message 2", "message 3"
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_delete_removes_archive(self):
+        """Deleting a conversation deletes its archived chunks"""
+        storage = InMemoryStorage(StorageConfig(storage_type=StorageType.MEMORY))
+        manager = ConversationManager(max_history=2, storage=storage, spill_batch_size=1)
+        await manager.create_conversation("s1")
+        await _fill(manager, "s1", 5)
+        
+        assert await manager.delete_conversation("s1") is True
+        assert await storage.list_sessions() == []
+    
+    @pytest.mark.asyncio
+    async def test_no_storage_drops_evicted(self):
+        """Without storage, evicted messages are dropped as before"""
+        manager = ConversationManager(max_history=2)
+        await manager.create_conversation("s1")
+        await _fill(manager, "s1", 5)
+        
+        assert await manager.get_archived_messages("s1") == []
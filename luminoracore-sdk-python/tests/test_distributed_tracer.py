@@ -0,0 +1,183 @@
+"""
+Tests para DistributedTracer: muestreo head/tail, índice de spans,
+tabla de trazas acotada y exportación por lotes
+"""
+
+import json
+
+import pytest
+
+from luminoracore_sdk.monitoring import (
+    BatchTraceProcessor,
+    DistributedTracer,
+    FileTraceExporter,
+)
+from luminoracore_sdk.monitoring.trace_export import TraceExporter
+from luminoracore_sdk.monitoring.tracer import trace_operation
+
+
+class _ListExporter(TraceExporter):
+    def __init__(self):
+        self.batches = []
+    
+    def export(self, traces):
+        self.batches.append(list(traces))
+
+
+class TestSpans:
+    """Tests de spans e índice"""
+    
+    def test_parent_lookup_uses_index(self):
+        """Child spans attach to their parent"""
+        tracer = DistributedTracer()
+        trace_id = tracer.start_trace("chat")
+        parent = tracer.start_span("memory", trace_id)
+        child = tracer.start_span("facts", trace_id, parent_span_id=parent)
+        
+        assert tracer.get_span(parent).child_spans[0].span_id == child
+        assert len(tracer.get_trace(trace_id).spans) == 3
+        assert len(trace_id) == 32 and len(child) == 16
+    
+    def test_span_limit_per_trace(self):
+        """Spans beyond the per-trace limit are counted, not stored"""
+        tracer = DistributedTracer(max_spans_per_trace=3)
+        trace_id = tracer.start_trace("chat")
+        for _ in range(5):
+            tracer.start_span("step", trace_id)
+        
+        trace = tracer.get_trace(trace_id)
+        assert len(trace.spans) == 3
+        assert trace.dropped_spans == 3  # Root span counts towards the limit
+
+
+class TestBoundedTable:
+    """Tests de la tabla de trazas acotada"""
+    
+    def test_finished_traces_are_evicted_first(self):
+        """Finished traces make room before in-flight ones"""
+        tracer = DistributedTracer(max_traces=3)
+        in_flight = tracer.start_trace("a")
+        finished = tracer.start_trace("b")
+        tracer.finish_trace(finished)
+        tracer.start_trace("c")
+        tracer.start_trace("d")
+        
+        assert tracer.get_trace(finished) is None
+        assert tracer.get_trace(in_flight) is not None
+        assert tracer.get_trace_summary()["evicted_finished"] == 1
+    
+    def test_memory_stays_bounded(self):
+        """Many traces never exceed max_traces and leave no index entries"""
+        tracer = DistributedTracer(max_traces=10)
+        for _ in range(500):
+            trace_id = tracer.start_trace("turn")
+            span_id = tracer.start_span("llm", trace_id)
+            tracer.finish_span(span_id)
+            tracer.finish_span(trace_id)
+        
+        summary = tracer.get_trace_summary()
+        assert summary["total_traces"] == 10
+        assert summary["active_spans"] == 0
+        assert summary["indexed_spans"] == 0
+
+
+class TestSampling:
+    """Tests de muestreo"""
+    
+    def test_head_sampling_is_deterministic(self):
+        """Unsampled traces record nothing; decisions depend on the trace ID"""
+        tracer = DistributedTracer(sample_rate=0.0)
+        trace_id = tracer.start_trace("chat")
+        tracer.start_span("step", trace_id)
+        
+        assert tracer.get_trace(trace_id) is None
+        assert tracer.get_trace_summary()["sampled_out"] == 2
+        
+        half = DistributedTracer(sample_rate=0.5)
+        ids = [f"trace-{i}" for i in range(1000)]
+        decisions = [half._head_sampled(i) for i in ids]
+        assert decisions == [half._head_sampled(i) for i in ids]
+        assert 400 < sum(decisions) < 600
+    
+    def test_tail_sampling_keeps_errors(self):
+        """Errors are exported even when ordinary traces are dropped"""
+        exporter = _ListExporter()
+        processor = BatchTraceProcessor(exporter, schedule_delay=60)
+        tracer = DistributedTracer(tail_sample_rate=0.0, exporter=processor)
+        
+        ok = tracer.start_trace("ok")
+        tracer.finish_span(ok)
+        failed = tracer.start_trace("failed")
+        span = tracer.start_span("llm", failed)
+        tracer.add_span_tag(span, "error", "timeout")
+        tracer.finish_span(span)
+        tracer.finish_span(failed)
+        
+        assert processor.flush(timeout=5)
+        exported = [trace.trace_id for batch in exporter.batches for trace in batch]
+        assert exported == [failed]
+        assert tracer.get_trace_summary()["tail_dropped"] == 1
+        processor.shutdown(timeout=5)
+
+
+class TestExport:
+    """Tests del exportador por lotes"""
+    
+    def test_batches(self):
+        """Traces are exported in batches of max_batch_size"""
+        exporter = _ListExporter()
+        processor = BatchTraceProcessor(exporter, max_batch_size=4, schedule_delay=60)
+        tracer = DistributedTracer(exporter=processor)
+        for _ in range(10):
+            tracer.finish_span(tracer.start_trace("turn"))
+        
+        processor.shutdown(timeout=5)
+        assert sum(len(batch) for batch in exporter.batches) == 10
+        assert max(len(batch) for batch in exporter.batches) <= 4
+        assert processor.get_stats()["exported"] == 10
+    
+    def test_exporter_without_export_fails_on_construction(self):
+        """An exporter missing export() cannot be instantiated"""
+        class _Incomplete(TraceExporter):
+            pass
+        
+        with pytest.raises(TypeError):
+            _Incomplete()
+    
+    def test_queue_overflow_drops(self):
+        """A full queue drops traces instead of blocking"""
+        processor = BatchTraceProcessor(_ListExporter(), max_queue_size=1, schedule_delay=60)
+        processor._stopped.set()
+        
+        assert processor.submit(object()) is False
+        assert processor.get_stats()["dropped"] == 1
+    
+    @pytest.mark.parametrize("format", ["otlp", "jaeger"])
+    def test_file_exporter(self, tmp_path, format):
+        """File exporter writes one JSON document per batch"""
+        path = tmp_path / "traces.jsonl"
+        processor = BatchTraceProcessor(FileTraceExporter(path, format=format), schedule_delay=60)
+        tracer = DistributedTracer(exporter=processor)
+        trace_id = tracer.start_trace("chat")
+        tracer.start_span("llm", trace_id, tags={"tokens": 12})
+        tracer.finish_trace(trace_id)
+        processor.shutdown(timeout=5)
+        
+        document = json.loads(path.read_text().splitlines()[0])
+        if format == "otlp":
+            spans = document["resourceSpans"][0]["scopeSpans"][0]["spans"]
+            assert {span["traceId"] for span in spans} == {trace_id}
+            assert spans[1]["attributes"] == [{"key": "tokens", "value": {"intValue": "12"}}]
+        else:
+            assert document["data"][0]["traceID"] == trace_id
+    
+    @pytest.mark.asyncio
+    async def test_trace_operation_creates_trace(self):
+        """trace_operation without a trace starts and finishes one"""
+        tracer = DistributedTracer()
+        async with trace_operation(tracer, "standalone") as span_id:
+            pass
+        
+        trace_id = tracer.list_traces()[0]
+        assert tracer.get_trace(trace_id).root_span.span_id == span_id
+        assert tracer.get_trace_summary()["finished_traces"] == 1
@@ -0,0 +1,136 @@
+"""
+Tests para el historial de evolución por usuario
+"""
+
+import pytest
+
+from luminoracore_sdk.conversation_memory_manager import ConversationMemoryManager
+from luminoracore_sdk.evolution import PersonalityEvolutionEngine
+from luminoracore_sdk.evolution.personality_evolution import PersonalityChange
+from luminoracore_sdk.session.storage_v1_1 import InMemoryStorageV11
+
+
+class _CountingStorage(InMemoryStorageV11):
+    def __init__(self):
+        super().__init__()
+        self.fact_reads = []
+    
+    async def get_facts(self, user_id, category=None):
+        self.fact_reads.append((user_id, category))
+        return await super().get_facts(user_id, category)
+
+
+async def _append(engine, user_id, confidence):
+    change = PersonalityChange("warmth", 0.5, 0.6, "positive_interaction_pattern", confidence)
+    personality = {"last_evolution": {"confidence_score": confidence}}
+    assert await engine._save_evolution_history(user_id, personality, [change], "alicia")
+
+
+class TestEvolutionHistory:
+    """Historial append-only, acotado y paginado"""
+    
+    @pytest.mark.asyncio
+    async def test_append_is_per_user_and_does_not_read(self):
+        """Appends write to the user's partition without reading history."""
+        storage = _CountingStorage()
+        engine = PersonalityEvolutionEngine(storage, history_prune_every=1000)
+        await _append(engine, "u1", 0.8)
+        await _append(engine, "u2", 0.7)
+        
+        assert storage.fact_reads == []
+        assert await storage.get_facts("global", "evolution_history") == []
+        
+        history = await engine.get_evolution_history("s1", "u1")
+        assert len(history) == 1
+        assert history[0]["personality_name"] == "alicia"
+        assert history[0]["changes"] == [
+            {"trait": "warmth", "old_value": 0.5, "new_value": 0.6, "reason": "positive_interaction_pattern"}
+        ]
+        assert storage.fact_reads[-1] == ("u1", "evolution_history")
+    
+    @pytest.mark.asyncio
+    async def test_pagination(self):
+        """Pages are newest first and continue from the before cursor."""
+        engine = PersonalityEvolutionEngine(InMemoryStorageV11())
+        for index in range(7):
+            await _append(engine, "u1", index / 10)
+        
+        first = await engine.get_evolution_history("s1", "u1", limit=3)
+        second = await engine.get_evolution_history("s1", "u1", limit=3, before=first[-1]["entry_id"])
+        third = await engine.get_evolution_history("s1", "u1", limit=3, before=second[-1]["entry_id"])
+        
+        scores = [entry["confidence_score"] for entry in first + second + third]
+        assert scores == [0.6, 0.5, 0.4, 0.3, 0.2, 0.1, 0.0]
+        
+        summary = await engine.get_evolution_history("s1", "u1", limit=0, include_details=False)
+        assert len(summary) == 7
+        assert "changes" not in summary[0]
+    
+    @pytest.mark.asyncio
+    async def test_retention_cap(self):
+        """Pruning keeps only the newest max_history_entries per user."""
+        storage = InMemoryStorageV11()
+        engine = PersonalityEvolutionEngine(storage, max_history_entries=3, history_prune_every=1)
+        for index in range(6):
+            await _append(engine, "u1", index / 10)
+        
+        assert len(await storage.get_facts("u1", "evolution_history")) == 3
+        history = await engine.get_evolution_history("s1", "u1", limit=0)
+        assert [entry["confidence_score"] for entry in history] == [0.5, 0.4, 0.3]
+    
+    @pytest.mark.asyncio
+    async def test_ttl(self):
+        """Expired entries are hidden and pruned."""
+        storage = InMemoryStorageV11()
+        engine = PersonalityEvolutionEngine(storage, history_ttl_days=-1, history_prune_every=1000)
+        await _append(engine, "u1", 0.8)
+        assert await engine.get_evolution_history("s1", "u1") == []
+        
+        assert await engine._prune_evolution_history("u1") == 1
+        assert await storage.get_facts("u1", "evolution_history") == []
+    
+    @pytest.mark.asyncio
+    async def test_cap_applies_between_prunes(self):
+        """Reads return at most max_history_entries; pruning runs every N appends."""
+        storage = InMemoryStorageV11()
+        engine = PersonalityEvolutionEngine(storage, max_history_entries=2, history_prune_every=3)
+        for index in range(4):
+            await _append(engine, "u1", index / 10)
+        
+        history = await engine.get_evolution_history("s1", "u1", limit=0)
+        assert [entry["confidence_score"] for entry in history] == [0.3, 0.2]
+        # Pruned on the third append only
+        assert len(await storage.get_facts("u1", "evolution_history")) == 3
+    
+    @pytest.mark.asyncio
+    async def test_legacy_history_is_migrated(self):
+        """Pre-1.1 blobs under "global" are moved into the user's partition on first read."""
+        storage = _CountingStorage()
+        for user_id in ("u1", "u2"):
+            await storage.save_fact("global", "evolution_history", f"evolution_history_{user_id}", {"evolutions": [
+                {"timestamp": "2025-02-01T10:00:00", "confidence_score": 0.9, "changes": []},
+                {"timestamp": "2025-01-01T10:00:00", "confidence_score": 0.8, "changes": []},
+            ]})
+        engine = PersonalityEvolutionEngine(storage)
+        await _append(engine, "u1", 0.7)
+        
+        history = await engine.get_evolution_history("s1", "u1", limit=0)
+        assert [entry["confidence_score"] for entry in history] == [0.7, 0.9, 0.8]
+        assert [f["key"] for f in await storage.get_facts("global", "evolution_history")] == ["evolution_history_u2"]
+        
+        assert len(await engine.get_evolution_history("s1", "u2")) == 2
+        await engine.get_evolution_history("s1", "u1")
+        storage.fact_reads.clear()
+        await engine.get_evolution_history("s1", "u1")
+        assert storage.fact_reads == [("u1", "evolution_history")]
+    
+    @pytest.mark.asyncio
+    async def test_history_is_not_a_user_fact(self, make_fake_client):
+        """Evolution history stays out of the facts given to the LLM."""
+        client = make_fake_client()
+        await _append(PersonalityEvolutionEngine(client.storage_v11), "u1", 0.8)
+        await client.save_fact("u1", "preferences", "drink", "tea")
+        
+        _, user_facts, _, _ = await ConversationMemoryManager(client)._load_turn_context("s1", "u1", "hola", "alicia")
+        
+        assert [fact["category"] for fact in user_facts] == ["preferences"]
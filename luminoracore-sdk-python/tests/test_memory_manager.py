@@ -2,8 +2,12 @@
 Tests adicionales para MemoryManager con Core integration
 """
 
+import asyncio
+import random
 import pytest
 import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
 from unittest.mock import Mock, AsyncMock, patch
 
 from luminoracore_sdk.session.memory import MemoryManager
@@ -108,6 +112,151 @@ class TestMemoryManagerCoreIntegration:
         assert stats["total_memories"] >= 1
 
 
+class TestMemoryManagerFallbackStore:
+    """Tests del store propio: lock sharding, expiry heap y eviction"""
+    
+    @pytest.mark.asyncio
+    async def test_lru_eviction_per_session(self):
+        """Session budget evicts the least recently used memory"""
+        manager = MemoryManager(MemoryConfig(max_entries=2))
+        
+        await manager.store_memory("session1", "a", 1)
+        await manager.store_memory("session1", "b", 2)
+        await manager.get_memory("session1", "a")  # "b" is now least recent
+        await manager.store_memory("session1", "c", 3)
+        
+        assert sorted(await manager.list_memories("session1")) == ["a", "c"]
+        stats = await manager.get_stats()
+        assert stats["evictions"] == 1
+        assert stats["total_memories"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_lfu_eviction(self):
+        """LFU policy evicts the least accessed memory"""
+        manager = MemoryManager(MemoryConfig(max_entries=2, eviction_policy="lfu"))
+        
+        await manager.store_memory("session1", "a", 1)
+        await manager.store_memory("session1", "b", 2)
+        await manager.get_memory("session1", "a")
+        await manager.get_memory("session1", "a")
+        await manager.get_memory("session1", "b")
+        await manager.store_memory("session1", "c", 3)
+        
+        assert sorted(await manager.list_memories("session1")) == ["a", "c"]
+    
+    @pytest.mark.asyncio
+    async def test_no_entry_budget_by_default(self):
+        """Without max_entries a session keeps every memory"""
+        manager = MemoryManager(MemoryConfig())
+        
+        for index in range(1500):
+            await manager.store_memory("session1", f"k{index}", index)
+        
+        assert len(await manager.list_memories("session1")) == 1500
+        assert (await manager.get_stats())["evictions"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_lfu_matches_full_scan(self):
+        """LFU heap picks the same victims as a scan of the session"""
+        rng = random.Random(7)
+        manager = MemoryManager(MemoryConfig(max_entries=8, eviction_policy="lfu"))
+        reference = OrderedDict()  # key -> access_count, least recently touched first
+        
+        for step in range(600):
+            key = f"k{rng.randrange(20)}"
+            if rng.random() < 0.6:
+                await manager.store_memory("session1", key, step)
+                if key in reference:
+                    reference.move_to_end(key)
+                    reference[key] = 0  # A re-store is a new item
+                else:
+                    reference[key] = 0
+                    if len(reference) > 8:
+                        victim = min((k for k in reference if k != key), key=lambda k: reference[k])
+                        del reference[victim]
+            elif await manager.get_memory("session1", key) is not None:
+                reference[key] += 1
+                reference.move_to_end(key)
+        
+        assert sorted(await manager.list_memories("session1")) == sorted(reference)
+    
+    @pytest.mark.asyncio
+    async def test_byte_budget(self):
+        """Byte budget evicts until the session fits"""
+        manager = MemoryManager(MemoryConfig(max_bytes_per_session=20))
+        
+        await manager.store_memory("session1", "a", "x" * 10)
+        await manager.store_memory("session1", "b", "y" * 10)
+        
+        assert await manager.list_memories("session1") == ["b"]
+        info = await manager.get_memory_info("session1", "b")
+        assert info["size"] == 12
+    
+    @pytest.mark.asyncio
+    async def test_budgets_are_per_session(self):
+        """One session's budget never evicts another session's memories"""
+        manager = MemoryManager(MemoryConfig(max_entries=1))
+        
+        await manager.store_memory("session1", "a", 1)
+        await manager.store_memory("session2", "a", 2)
+        
+        assert await manager.get_memory("session1", "a") == 1
+        assert await manager.get_memory("session2", "a") == 2
+    
+    @pytest.mark.asyncio
+    async def test_cleanup_uses_expiry_heap(self):
+        """Cleanup removes expired items and skips stale heap entries"""
+        manager = MemoryManager(MemoryConfig())
+        
+        await manager.store_memory("session1", "short", "x", ttl=60)
+        await manager.store_memory("session2", "keep", "y", ttl=3600)
+        await manager.store_memory("session3", "forever", "z")
+        
+        # Expire "short" and re-store "keep" with a longer TTL (stale heap entry)
+        past = datetime.utcnow() - timedelta(seconds=1)
+        manager._memories["session1"]["short"]["expires_at"] = past
+        manager._expiry_heap[0] = (past,) + manager._expiry_heap[0][1:]
+        await manager.store_memory("session2", "keep", "y", ttl=7200)
+        
+        assert await manager.cleanup_expired_memories() == 1
+        assert await manager.get_memory("session1", "short") is None
+        assert await manager.get_memory("session2", "keep") == "y"
+        assert await manager.get_memory("session3", "forever") == "z"
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_sessions(self):
+        """Many sessions can be written concurrently"""
+        manager = MemoryManager(MemoryConfig(), num_lock_shards=4)
+        
+        async def write(session_index):
+            for i in range(20):
+                await manager.store_memory(f"session{session_index}", f"k{i}", i)
+        
+        await asyncio.gather(*(write(i) for i in range(50)))
+        
+        stats = await manager.get_stats()
+        assert stats["total_sessions"] == 50
+        assert stats["total_memories"] == 1000
+    
+    @pytest.mark.asyncio
+    async def test_search_with_limit(self):
+        """Search stops at the limit"""
+        manager = MemoryManager(MemoryConfig())
+        for i in range(5):
+            await manager.store_memory("session1", f"k{i}", f"Likes Pizza {i}")
+        
+        results = await manager.search_memories("session1", "pizza", limit=2)
+        
+        assert [r["key"] for r in results] == ["k0", "k1"]
+    
+    def test_invalid_configuration(self):
+        """Invalid policy or shard count raise ValueError"""
+        with pytest.raises(ValueError):
+            MemoryManager(MemoryConfig(eviction_policy="random"))
+        with pytest.raises(ValueError):
+            MemoryManager(MemoryConfig(), num_lock_shards=0)
+
+
 # IMPORTANTE: Estos tests validan que MemoryManager funciona
 # con o sin Core MemorySystem
 
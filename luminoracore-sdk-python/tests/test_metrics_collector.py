@@ -0,0 +1,207 @@
+"""
+Tests para MetricsCollector: contadores sin lock, sketches de histogramas,
+series por etiquetas con límite de cardinalidad e historial muestreado
+"""
+
+import threading
+
+import pytest
+
+from luminoracore_sdk.monitoring.metrics import (
+    HistogramSketch,
+    MetricsCollector,
+    OVERFLOW_LABELS,
+    TimingContext,
+    timing,
+)
+
+
+class TestHistogramSketch:
+    """Tests del sketch de histogramas"""
+    
+    def test_quantiles_within_relative_accuracy(self):
+        """Quantiles stay within the configured relative error"""
+        sketch = HistogramSketch(relative_accuracy=0.01)
+        values = [i / 10 for i in range(1, 10001)]
+        for value in values:
+            sketch.add(value)
+        
+        for q in (0.5, 0.95, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            assert abs(sketch.quantile(q) - exact) <= exact * 0.011
+        assert sketch.count == 10000
+        assert sketch.min == 0.1 and sketch.max == 1000.0
+    
+    def test_memory_is_bounded(self):
+        """Bucket count never exceeds max_buckets"""
+        sketch = HistogramSketch(max_buckets=32)
+        for exponent in range(-200, 200):
+            sketch.add(1.1 ** exponent)
+        
+        assert len(sketch._positive) <= 32
+        assert sketch.quantile(0.99) == pytest.approx(1.1 ** 195, rel=0.02)
+    
+    def test_merge_matches_single_sketch(self):
+        """Merging two sketches equals recording everything in one"""
+        single, left, right = HistogramSketch(), HistogramSketch(), HistogramSketch()
+        for value in range(-50, 500):
+            single.add(value)
+            (left if value % 2 else right).add(value)
+        left.merge(right)
+        
+        assert left.stats() == single.stats()
+    
+    def test_empty(self):
+        """Empty sketches report nothing"""
+        assert HistogramSketch().quantile(0.5) is None
+        assert HistogramSketch().stats() is None
+
+
+class TestMetricsCollector:
+    """Tests del colector de métricas"""
+    
+    @pytest.mark.asyncio
+    async def test_counters_gauges_histograms(self):
+        """The async API keeps its shape"""
+        metrics = MetricsCollector()
+        await metrics.increment_counter("requests")
+        await metrics.increment_counter("requests", 2)
+        await metrics.set_gauge("sessions", 3)
+        for value in (1.0, 2.0, 3.0):
+            await metrics.record_histogram("latency", value)
+        
+        assert await metrics.get_counter("requests") == 3
+        assert await metrics.get_gauge("sessions") == 3
+        stats = await metrics.get_histogram_stats("latency")
+        assert stats["count"] == 3
+        assert stats["min"] == 1.0 and stats["max"] == 3.0
+        assert stats["median"] == pytest.approx(2.0, rel=0.01)
+        assert set(stats) >= {"count", "min", "max", "mean", "median", "p95", "p99"}
+        
+        all_metrics = await metrics.get_all_metrics()
+        assert all_metrics["counters"] == {"requests": 3}
+        assert all_metrics["histograms"]["latency"]["count"] == 3
+    
+    @pytest.mark.asyncio
+    async def test_labeled_series(self):
+        """Tags create separate series that aggregate by name"""
+        metrics = MetricsCollector()
+        metrics.inc("calls", tags={"provider": "openai"})
+        metrics.inc("calls", 2, tags={"provider": "deepseek"})
+        
+        assert await metrics.get_counter("calls") == 3
+        assert await metrics.get_counter("calls", {"provider": "deepseek"}) == 2
+    
+    @pytest.mark.asyncio
+    async def test_cardinality_limit(self):
+        """Label sets past the limit fold into the overflow series"""
+        metrics = MetricsCollector(max_series_per_metric=2)
+        for user in range(5):
+            metrics.inc("turns", tags={"user": str(user)})
+        
+        assert len(metrics._counters["turns"]) == 3
+        assert await metrics.get_counter("turns", dict(OVERFLOW_LABELS)) == 3
+        assert (await metrics.get_metric_summary())["dropped_series"] == 3
+    
+    def test_threaded_counters_are_not_lost(self):
+        """Concurrent increments from many threads are all counted"""
+        metrics = MetricsCollector()
+        
+        def worker():
+            for _ in range(5000):
+                metrics.inc("hits")
+                metrics.observe("size", 1.0)
+        
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert metrics._counter_value("hits", None) == 40000
+        assert metrics._merged_sketch("size", None).count == 40000
+    
+    def test_finished_threads_are_folded(self):
+        """A finished thread's cell is merged into the retired totals and removed"""
+        metrics = MetricsCollector()
+        metrics.inc("hits")
+        
+        def worker():
+            for _ in range(100):
+                metrics.inc("hits")
+                metrics.observe("size", 2.0)
+        
+        for _ in range(20):
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+        
+        counter = metrics._counters["hits"][()]
+        assert len(counter.cells) == 1  # Only the main thread's cell is live
+        assert len(metrics._histograms["size"][()].cells) == 0
+        assert metrics._counter_value("hits", None) == 2001
+        sketch = metrics._merged_sketch("size", None)
+        assert sketch.count == 2000 and sketch.sum == 4000.0
+    
+    @pytest.mark.asyncio
+    async def test_history_is_sampled(self):
+        """History is off by default and bounded when enabled"""
+        metrics = MetricsCollector()
+        metrics.inc("a")
+        assert await metrics.get_metric_history("a") == []
+        
+        metrics = MetricsCollector(max_history=5, history_sample_rate=1.0)
+        for _ in range(10):
+            metrics.inc("a")
+        history = await metrics.get_metric_history("a")
+        assert len(history) == 5
+        assert history[0]["type"] == "counter"
+        assert history[0]["tags"] == {}
+    
+    @pytest.mark.asyncio
+    async def test_prometheus_export(self):
+        """Prometheus export uses labels and summary quantiles"""
+        metrics = MetricsCollector()
+        metrics.inc("chat.requests", tags={"provider": "openai"})
+        metrics.observe("chat.latency", 0.25)
+        
+        text = await metrics.export_metrics("prometheus")
+        
+        assert 'chat_requests{provider="openai"} 1' in text
+        assert "# TYPE chat_latency summary" in text
+        assert 'chat_latency{quantile="0.5"}' in text
+        assert "chat_latency_count 1" in text
+
+
+class TestTiming:
+    """Tests del decorador timing"""
+    
+    def test_sync_decorator(self):
+        """Sync functions are timed through the sync context manager"""
+        metrics = MetricsCollector()
+        
+        @timing(metrics, "work")
+        def work():
+            return 42
+        
+        assert work() == 42
+        assert work.__name__ == "work"
+        assert metrics._counter_value("work.count", None) == 1
+        assert metrics._merged_sketch("work.duration", None).count == 1
+    
+    @pytest.mark.asyncio
+    async def test_async_decorator_and_context(self):
+        """Async functions and async with record timings"""
+        metrics = MetricsCollector()
+        
+        @timing(metrics, "work", tags={"kind": "async"})
+        async def work():
+            return 1
+        
+        await work()
+        async with TimingContext(metrics, "work") as context:
+            pass
+        
+        assert context.duration is not None
+        assert await metrics.get_counter("work.count") == 2
+        assert await metrics.get_counter("work.count", {"kind": "async"}) == 1
@@ -0,0 +1,139 @@
+"""
+Tests para el análisis de sentimiento incremental
+"""
+
+import json
+
+import pytest
+
+from luminoracore_sdk.analysis import AdvancedSentimentAnalyzer, SentimentAggregate
+
+
+def _count_scans(analyzer):
+    calls = []
+    original = analyzer._matcher.scan_batch
+    
+    def scan_batch(texts):
+        calls.extend(texts)
+        return original(texts)
+    
+    analyzer._matcher.scan_batch = scan_batch
+    return calls
+
+
+class TestIncrementalSentiment:
+    """Análisis incremental por marca de agua"""
+    
+    @pytest.mark.asyncio
+    async def test_only_new_turns_are_scanned(self, fake_storage):
+        """Each call scans only messages from turns after the high-water mark."""
+        fake_storage.add_turn(1, "I am happy, thanks")
+        fake_storage.add_turn(2, "This is great")
+        analyzer = AdvancedSentimentAnalyzer(fake_storage)
+        calls = _count_scans(analyzer)
+        
+        first = await analyzer.analyze_sentiment("session-1", "user-1", incremental=True)
+        assert first.message_count == 4
+        assert len(calls) == 4
+        
+        fake_storage.add_turn(3, "terrible problem, I am angry")
+        calls.clear()
+        second = await analyzer.analyze_sentiment("session-1", "user-1", incremental=True)
+        assert len(calls) == 2
+        assert second.message_count == 6
+        assert second.detailed_analysis["incremental"]["new_messages"] == 2
+        assert second.detailed_analysis["incremental"]["high_water_mark"].endswith("000003_000000")
+        
+        calls.clear()
+        third = await analyzer.analyze_sentiment("session-1", "user-1", incremental=True)
+        assert calls == []
+        assert third.message_count == 6
+    
+    @pytest.mark.asyncio
+    async def test_aggregates_match_full_analysis(self, fake_storage):
+        """Running counts give the same basic score and emotions as a full scan."""
+        fake_storage.add_turn(1, "I am happy and excited", "great")
+        fake_storage.add_turn(2, "bad error, I am worried")
+        analyzer = AdvancedSentimentAnalyzer(fake_storage)
+        await analyzer.analyze_sentiment("session-1", "user-1", incremental=True)
+        fake_storage.add_turn(3, "thanks, that is perfect")
+        incremental = await analyzer.analyze_sentiment("session-1", "user-1", incremental=True)
+        
+        full = await AdvancedSentimentAnalyzer(fake_storage).analyze_sentiment("session-1", "user-1")
+        
+        assert incremental.sentiment_score == pytest.approx(full.sentiment_score)
+        assert incremental.overall_sentiment == full.overall_sentiment
+        assert set(incremental.emotions_detected) == set(full.emotions_detected)
+        inc_basic = incremental.detailed_analysis["basic_analysis"]
+        full_basic = full.detailed_analysis["basic_analysis"]
+        for key in ("positive_count", "negative_count", "neutral_count"):
+            assert inc_basic[key] == full_basic[key]
+    
+    @pytest.mark.asyncio
+    async def test_moving_score_tracks_recent_messages(self, fake_storage):
+        """The exponential moving score follows the latest messages."""
+        for index in range(1, 4):
+            fake_storage.add_turn(index, "great, thanks", "wonderful")
+        analyzer = AdvancedSentimentAnalyzer(fake_storage, ema_alpha=0.5)
+        result = await analyzer.analyze_sentiment("session-1", "user-1", incremental=True)
+        positive_ema = result.detailed_analysis["incremental"]["ema_score"]
+        assert positive_ema > 0.9
+        
+        fake_storage.add_turn(4, "terrible, I hate this", "awful error")
+        result = await analyzer.analyze_sentiment("session-1", "user-1", incremental=True)
+        assert result.detailed_analysis["incremental"]["ema_score"] < 0.5
+        assert result.sentiment_score > 0.5  # Cumulative score is still positive
+    
+    @pytest.mark.asyncio
+    async def test_state_is_persisted_and_resumed(self, fake_storage):
+        """A new analyzer resumes from the stored aggregates."""
+        fake_storage.add_turn(1, "happy")
+        await AdvancedSentimentAnalyzer(fake_storage).analyze_sentiment("session-1", "user-1", incremental=True)
+        
+        stored = json.loads(fake_storage.memories[("user-1", "sentiment_state_session-1")])
+        assert SentimentAggregate.from_dict(stored).message_count == 2
+        
+        fake_storage.add_turn(2, "sad")
+        analyzer = AdvancedSentimentAnalyzer(fake_storage)
+        calls = _count_scans(analyzer)
+        result = await analyzer.analyze_sentiment("session-1", "user-1", incremental=True)
+        assert len(calls) == 2
+        assert result.message_count == 4
+        
+        await analyzer.reset_incremental_state("session-1", "user-1")
+        calls.clear()
+        result = await analyzer.analyze_sentiment("session-1", "user-1", incremental=True)
+        assert len(calls) == 4
+        assert result.message_count == 4
+    
+    @pytest.mark.asyncio
+    async def test_no_turns_falls_back_to_full_analysis(self, fake_storage):
+        """Sessions without conversation turns use the regular analysis."""
+        analyzer = AdvancedSentimentAnalyzer(fake_storage)
+        result = await analyzer.analyze_sentiment("session-1", "user-1", incremental=True)
+        assert result.message_count == 0
+        assert result.sentiment_trend == "no_data"
+    
+    @pytest.mark.asyncio
+    async def test_cached_state_is_bounded(self, fake_storage):
+        """Least recently used sessions leave the cache and resume from storage."""
+        fake_storage.add_turn(1, "happy")
+        analyzer = AdvancedSentimentAnalyzer(fake_storage, max_cached_sessions=2)
+        for session_id in ("session-1", "session-2", "session-3"):
+            await analyzer.analyze_sentiment(session_id, "user-1", incremental=True)
+        
+        assert list(analyzer._aggregates) == ["session-2", "session-3"]
+        analyzer.forget("session-3")
+        assert list(analyzer._aggregates) == ["session-2"]
+        
+        calls = _count_scans(analyzer)
+        result = await analyzer.analyze_sentiment("session-1", "user-1", incremental=True)
+        assert calls == []
+        assert result.message_count == 2
+    
+    def test_invalid_alpha(self, fake_storage):
+        """ema_alpha outside (0, 1] and an empty cache are rejected."""
+        with pytest.raises(ValueError):
+            AdvancedSentimentAnalyzer(fake_storage, ema_alpha=0)
+        with pytest.raises(ValueError):
+            AdvancedSentimentAnalyzer(fake_storage, max_cached_sessions=0)
@@ -0,0 +1,100 @@
+"""
+Tests para el matcher combinado de sentimiento y emociones
+"""
+
+import random
+import re
+
+from luminoracore_sdk.analysis import AdvancedSentimentAnalyzer, SentimentMatcher
+
+
+def _reference_scan(analyzer, content):
+    """Per-pattern matching the combined matcher replaces."""
+    content = content.lower()
+    polarities = [
+        polarity for polarity, patterns in analyzer.SENTIMENT_PATTERNS.items()
+        if any(re.search(pattern, content, re.IGNORECASE) for pattern in patterns)
+    ]
+    emotions = [
+        emotion for emotion, keywords in analyzer.EMOTION_KEYWORDS.items()
+        if any(keyword in content for keyword in keywords)
+    ]
+    return polarities, emotions
+
+
+def _random_texts(analyzer, count=400):
+    vocabulary = [k for keywords in analyzer.EMOTION_KEYWORDS.values() for k in keywords]
+    vocabulary += ["me gusta", "no me gusta", "me siento bien", "thank you", "ok", "bien",
+                   "error", "distrust", "sadness", "hello", "the", "weather", "¿qué?", "!!"]
+    rng = random.Random(7)
+    return [
+        rng.choice(["", " ", ", "]).join(rng.choice(vocabulary) for _ in range(rng.randint(0, 12)))
+        for _ in range(count)
+    ]
+
+
+class TestSentimentMatcher:
+    """Equivalencia y solapamientos"""
+    
+    def test_matches_reference_scan(self):
+        """Polarities and emotions are the same as the per-pattern loops."""
+        analyzer = AdvancedSentimentAnalyzer(None)
+        matcher = SentimentMatcher(analyzer.SENTIMENT_PATTERNS, analyzer.EMOTION_KEYWORDS)
+        for text in _random_texts(analyzer):
+            hits = matcher.scan(text)
+            assert (list(hits.sentiments), list(hits.emotions)) == _reference_scan(analyzer, text), text
+    
+    def test_batch_matches_single_scans(self):
+        """One pass over a batch gives the same hits as scanning each message."""
+        analyzer = AdvancedSentimentAnalyzer(None)
+        matcher = SentimentMatcher(analyzer.SENTIMENT_PATTERNS, analyzer.EMOTION_KEYWORDS)
+        texts = _random_texts(analyzer) + ["happy\nsad", None]
+        assert matcher.scan_batch(texts) == [matcher.scan(text) for text in texts]
+        assert matcher.scan_batch([]) == []
+    
+    def test_overlapping_hits(self):
+        """Overlapping phrases and keywords are all reported."""
+        analyzer = AdvancedSentimentAnalyzer(None)
+        hits = SentimentMatcher(analyzer.SENTIMENT_PATTERNS, analyzer.EMOTION_KEYWORDS).scan(
+            "No me gusta. Me siento bien"
+        )
+        assert "no me gusta" in hits.sentiments["negative"]
+        assert "me gusta" in hits.sentiments["positive"]
+        assert "me siento bien" in hits.sentiments["positive"]
+        assert hits.sentiments["neutral"] == ["bien"]
+        
+        hits = SentimentMatcher({}, {"trust": ["trust"], "sadness": ["sad", "sadness"]}).scan("Distrust and SADNESS")
+        assert hits.emotions == {"sadness": ["sad", "sadness"], "trust": ["trust"]}
+    
+    def test_word_boundaries(self):
+        """Sentiment phrases only match whole words."""
+        matcher = SentimentMatcher({"positive": [r"\b(good|like)\b"]}, {})
+        assert matcher.scan("goodness, unlikely").sentiments == {}
+        assert matcher.scan("good!").sentiments == {"positive": ["good"]}
+    
+    def test_non_literal_patterns_fall_back(self):
+        """Patterns that are not plain alternations are still matched."""
+        matcher = SentimentMatcher({"negative": [r"\bfail(ed|ure)?\b"], "positive": [r"\b(yes)\b"]}, {})
+        assert matcher.scan("It FAILED, yes").sentiments == {"negative": ["failed"], "positive": ["yes"]}
+        assert matcher.scan_batch(["failure", "no"])[1].sentiments == {}
+
+
+class TestScoreMessages:
+    """API por lotes del analizador"""
+    
+    def test_score_messages(self):
+        """Messages are scored individually in one call."""
+        analyzer = AdvancedSentimentAnalyzer(None)
+        results = analyzer.score_messages(["Thanks, I am happy", "terrible error", "ok"])
+        
+        assert [r["overall_sentiment"] for r in results] == ["positive", "negative", "neutral"]
+        assert [r["sentiment_score"] for r in results] == [1.0, 0.0, 0.5]
+        assert results[0]["emotions_detected"] == ["joy"]
+        assert "happy" in results[0]["sentiment_hits"]["positive"]
+    
+    def test_compile_patterns_after_table_change(self):
+        """Edited tables take effect after recompiling."""
+        analyzer = AdvancedSentimentAnalyzer(None)
+        analyzer.EMOTION_KEYWORDS["joy"].append("stoked")
+        analyzer.compile_patterns()
+        assert analyzer.score_messages(["stoked"])[0]["emotions_detected"] == ["joy"]
@@ -0,0 +1,196 @@
+"""
+Tests para el streaming de send_message_with_memory
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from luminoracore_sdk.client_v1_1 import LuminoraCoreClientV11
+from luminoracore_sdk.conversation_memory_manager import ConversationMemoryManager
+from luminoracore_sdk.providers.factory import ProviderFactory
+from luminoracore_sdk.types.provider import ChatResponse, ProviderConfig
+
+
+_FACTS_REPLY = json.dumps({"facts": [
+    {"category": "personal_info", "key": "name", "value": "Ana", "confidence": 0.99}
+]})
+
+
+class _StreamingProvider:
+    def __init__(self, chunks=("Hola ", "Ana", "!"), fail_after=None, delay=0.0):
+        self.chunks = chunks
+        self.fail_after = fail_after
+        self.delay = delay
+        self.chat_prompts = []
+        self.stream_closed = False
+    
+    async def chat(self, messages, **kwargs):
+        prompt = messages[-1].content
+        self.chat_prompts.append(prompt)
+        if "Extract factual information" in prompt:
+            return ChatResponse(content=_FACTS_REPLY)
+        return ChatResponse(content="4")
+    
+    async def stream_chat(self, messages, **kwargs):
+        try:
+            for index, chunk in enumerate(self.chunks):
+                if self.fail_after is not None and index >= self.fail_after:
+                    raise RuntimeError("connection reset")
+                await asyncio.sleep(self.delay)
+                yield ChatResponse(content=chunk)
+            await asyncio.sleep(self.delay)
+            yield ChatResponse(content="", finish_reason="stop", usage={"total_tokens": 7})
+        finally:
+            self.stream_closed = True
+
+
+def _install(monkeypatch, provider):
+    monkeypatch.setattr(ProviderFactory, "create_provider", classmethod(lambda cls, config: provider))
+    return ProviderConfig(name="deepseek", api_key="test")
+
+
+class TestStreamMessageWithFullContext:
+    """Tests del turno con streaming"""
+    
+    @pytest.mark.asyncio
+    async def test_tokens_then_metadata(self, monkeypatch, make_fake_client):
+        """Tokens arrive before the metadata event with facts and affinity"""
+        provider = _StreamingProvider()
+        config = _install(monkeypatch, provider)
+        client = make_fake_client()
+        manager = ConversationMemoryManager(client)
+        
+        events = [e async for e in manager.stream_message_with_full_context("s1", "Me llamo Ana", user_id="u1", provider_config=config)]
+        
+        assert [e["content"] for e in events[:-1]] == ["Hola ", "Ana", "!"]
+        assert all(e["type"] == "token" for e in events[:-1])
+        final = events[-1]
+        assert final["type"] == "metadata"
+        assert final["success"] is True
+        assert final["response"] == "Hola Ana!"
+        assert final["facts_learned"] == 1
+        assert final["new_facts"][0]["key"] == "name"
+        assert final["affinity_change"]["points_change"] == 4
+        
+        turns = await client.storage_v11.get_facts("s1", "conversation_history")
+        assert json.loads(turns[0]["value"])["assistant_response"] == "Hola Ana!"
+    
+    @pytest.mark.asyncio
+    async def test_post_processing_starts_after_stream(self, monkeypatch, make_fake_client):
+        """Context is loaded before the first token; extraction and affinity wait for the stream"""
+        provider = _StreamingProvider()
+        config = _install(monkeypatch, provider)
+        client = make_fake_client()
+        manager = ConversationMemoryManager(client)
+        
+        stream = manager.stream_message_with_full_context("s1", "Me llamo Ana", user_id="u1", provider_config=config)
+        first = await stream.__anext__()
+        
+        assert first == {"type": "token", "content": "Hola "}
+        assert provider.chat_prompts == []
+        assert client.affinity_updates == []
+        assert client.storage_v11.facts == []
+        
+        rest = [e async for e in stream]
+        assert rest[-1]["type"] == "metadata"
+        assert len(provider.chat_prompts) == 2
+        assert len(client.affinity_updates) == 1
+    
+    @pytest.mark.asyncio
+    async def test_same_result_as_non_streaming(self, monkeypatch, make_fake_client):
+        """The metadata event carries the send_message_with_full_context fields"""
+        config = _install(monkeypatch, _StreamingProvider(chunks=("4",)))
+        
+        streamed = [e async for e in ConversationMemoryManager(make_fake_client()).stream_message_with_full_context(
+            "s1", "Me llamo Ana", user_id="u1", provider_config=config
+        )][-1]
+        expected = await ConversationMemoryManager(make_fake_client()).send_message_with_full_context(
+            "s1", "Me llamo Ana", user_id="u1", provider_config=config
+        )
+        
+        streamed.pop("type")
+        assert streamed == expected
+    
+    @pytest.mark.asyncio
+    async def test_failure_before_first_token_uses_fallback(self, monkeypatch, make_fake_client):
+        """A stream that fails immediately yields the context-aware fallback"""
+        config = _install(monkeypatch, _StreamingProvider(fail_after=0))
+        manager = ConversationMemoryManager(make_fake_client())
+        
+        events = [e async for e in manager.stream_message_with_full_context("s1", "hola", provider_config=config)]
+        
+        assert len(events) == 2
+        assert events[0]["content"] == events[1]["response"]
+        assert events[1]["success"] is True
+    
+    @pytest.mark.asyncio
+    async def test_interrupted_stream_keeps_partial_response(self, monkeypatch, make_fake_client):
+        """Chunks already sent are kept when the stream breaks midway"""
+        config = _install(monkeypatch, _StreamingProvider(fail_after=2))
+        manager = ConversationMemoryManager(make_fake_client())
+        
+        events = [e async for e in manager.stream_message_with_full_context("s1", "hola", provider_config=config)]
+        
+        assert [e["content"] for e in events[:-1]] == ["Hola ", "Ana"]
+        assert events[-1]["response"] == "Hola Ana"
+    
+    @pytest.mark.asyncio
+    async def test_timings_in_metadata(self, monkeypatch, make_fake_client):
+        """Stage timings and streamed token usage are reported in the final event"""
+        config = _install(monkeypatch, _StreamingProvider())
+        manager = ConversationMemoryManager(make_fake_client())
+        
+        events = [e async for e in manager.stream_message_with_full_context(
+            "s1", "hola", provider_config=config, include_timings=True
+        )]
+        
+        timings = events[-1]["timings"]
+        assert "llm_call" in timings["stages"]
+        assert timings["tokens"]["by_stage"]["llm_call"]["total_tokens"] == 7
+    
+    @pytest.mark.asyncio
+    async def test_slow_consumer_not_counted_as_llm_call(self, monkeypatch, make_fake_client):
+        """llm_call covers the waits on the provider, not the time the consumer holds each token"""
+        config = _install(monkeypatch, _StreamingProvider(delay=0.01))
+        manager = ConversationMemoryManager(make_fake_client())
+        
+        events = []
+        async for event in manager.stream_message_with_full_context(
+            "s1", "hola", provider_config=config, include_timings=True
+        ):
+            events.append(event)
+            if event["type"] == "token":
+                await asyncio.sleep(0.05)
+        
+        llm_ms = events[-1]["timings"]["stages"]["llm_call"]
+        assert 40 <= llm_ms < 150  # Four provider waits of 10 ms, three consumer holds of 50 ms
+    
+    @pytest.mark.asyncio
+    async def test_early_stop_closes_provider_stream(self, monkeypatch, make_fake_client):
+        """Closing the stream after the first token closes the provider stream too"""
+        provider = _StreamingProvider()
+        config = _install(monkeypatch, provider)
+        manager = ConversationMemoryManager(make_fake_client())
+        
+        stream = manager.stream_message_with_full_context("s1", "hola", provider_config=config)
+        assert (await stream.__anext__())["content"] == "Hola "
+        await stream.aclose()
+        
+        assert provider.stream_closed is True
+
+
+class TestStreamMessageWithMemory:
+    """Tests del método del cliente v1.1"""
+    
+    @pytest.mark.asyncio
+    async def test_without_memory_manager(self):
+        """Without storage the stream is a single error metadata event"""
+        client = LuminoraCoreClientV11(base_client=object())
+        
+        events = [e async for e in client.stream_message_with_memory("s1", "hola")]
+        
+        assert len(events) == 1
+        assert events[0]["type"] == "metadata"
+        assert events[0]["success"] is False
@@ -0,0 +1,120 @@
+"""
+Tests para el logging estructurado: niveles, formato diferido, muestreo y modo cola
+"""
+
+import logging
+import threading
+
+import pytest
+
+from luminoracore_sdk.conversation_memory_manager import ConversationMemoryManager
+from luminoracore_sdk.logging_config import (
+    Lazy,
+    StructuredLogger,
+    start_queue_logging,
+    stop_queue_logging,
+)
+from luminoracore_sdk.providers.factory import ProviderFactory
+from luminoracore_sdk.types.provider import ChatResponse, ProviderConfig
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.threads = set()
+    
+    def emit(self, record):
+        self.threads.add(threading.get_ident())
+        self.records.append(record)
+
+
+@pytest.fixture
+def captured():
+    logger = logging.getLogger("luminoracore_sdk.tests.structured")
+    logger.handlers.clear()
+    logger.propagate = False
+    handler = _ListHandler()
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    yield logger, handler
+    stop_queue_logging(logger)
+    logger.handlers.clear()
+
+
+class TestStructuredLogger:
+    """Tests de StructuredLogger"""
+    
+    def test_disabled_levels_do_no_work(self, captured):
+        """Lazy values are never evaluated below the logger level"""
+        logger, handler = captured
+        log = StructuredLogger(logger)
+        
+        def expensive():
+            raise AssertionError("should not be evaluated")
+        
+        log.debug("facts: %s", Lazy(expensive), facts=Lazy(expensive))
+        
+        assert handler.records == []
+    
+    def test_fields_become_record_attributes(self, captured):
+        """Keyword fields are attached to the record"""
+        logger, handler = captured
+        StructuredLogger(logger).info("query done: %d items", 3, user_id="u1")
+        
+        record = handler.records[0]
+        assert record.getMessage() == "query done: 3 items"
+        assert record.user_id == "u1"
+    
+    def test_sampling(self, captured):
+        """sampled() emits one in every N calls per message"""
+        logger, handler = captured
+        log = StructuredLogger(logger)
+        for i in range(25):
+            log.sampled(logging.INFO, 10, "item %d", i)
+        
+        assert [r.getMessage() for r in handler.records] == ["item 0", "item 10", "item 20"]
+        assert handler.records[0].sample_every == 10
+
+
+class TestQueueLogging:
+    """Tests del modo QueueHandler/QueueListener"""
+    
+    def test_io_runs_on_listener_thread(self, captured):
+        """Handlers run on the listener thread and stop() flushes them"""
+        logger, handler = captured
+        start_queue_logging(logger)
+        
+        assert isinstance(logger.handlers[0], logging.handlers.QueueHandler)
+        for i in range(50):
+            logger.info("record %d", i)
+        stop_queue_logging(logger)
+        
+        assert len(handler.records) == 50
+        assert threading.get_ident() not in handler.threads
+        assert handler in logger.handlers
+        assert not any(isinstance(h, logging.handlers.QueueHandler) for h in logger.handlers)
+
+
+class TestNoStdoutOnHotPath:
+    """La extracción de hechos no escribe en stdout"""
+    
+    @pytest.mark.asyncio
+    async def test_fact_extraction_is_silent(self, monkeypatch, capsys):
+        """Fact extraction no longer prints debug lines"""
+        class _Provider:
+            async def chat(self, messages, **kwargs):
+                return ChatResponse(content='{"facts": [{"category": "personal_info", "key": "name", "value": "Ana", "confidence": 0.99}]}')
+        
+        class _Client:
+            base_client = object()
+        
+        monkeypatch.setattr(ProviderFactory, "create_provider", classmethod(lambda cls, config: _Provider()))
+        manager = ConversationMemoryManager(_Client())
+        
+        facts = await manager._extract_facts_from_conversation(
+            "s1", "My name is Ana", "Hi Ana", [], {"name": "deepseek", "api_key": "test"}
+        )
+        
+        assert [f["key"] for f in facts] == ["name"]
+        assert capsys.readouterr().out == ""
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Contention microbenchmark for ConcurrentInMemoryStorage.
+
+Measures aggregate read throughput as the number of reader threads grows,
+comparing per-user lock striping against a single global lock (one stripe).
+On a free-threaded interpreter striped reads scale with the thread count;
+on a GIL build the striped storage keeps throughput flat instead of
+collapsing under lock contention.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add the parent directory to the path to import luminoracore
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from luminoracore.storage import ConcurrentInMemoryStorage
+
+USERS = 256
+FACTS_PER_USER = 20
+READS_PER_THREAD = 20000
+THREAD_COUNTS = [1, 2, 4, 8]
+
+
+def populate(storage: ConcurrentInMemoryStorage) -> None:
+    """Fill the storage with a fixed data set."""
+    async def fill():
+        for u in range(USERS):
+            for f in range(FACTS_PER_USER):
+                await storage.save_fact(f"user{u}", "general", f"key{f}", f"value{f}")
+    asyncio.run(fill())
+
+
+def measure(storage: ConcurrentInMemoryStorage, num_threads: int) -> float:
+    """Return aggregate reads per second for num_threads reader threads."""
+    barrier = threading.Barrier(num_threads + 1)
+
+    def reader(index: int):
+        async def read_loop():
+            for i in range(READS_PER_THREAD):
+                await storage.get_facts(f"user{(index * 31 + i) % USERS}")
+        barrier.wait()
+        asyncio.run(read_loop())
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(num_threads)]
+    for thread in threads:
+        thread.start()
+
+    barrier.wait()
+    start_time = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start_time
+
+    return (num_threads * READS_PER_THREAD) / elapsed
+
+
+def run_benchmark():
+    """Run the contention benchmark for striped and single-lock storage."""
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print("ConcurrentInMemoryStorage Contention Benchmark")
+    print("=" * 50)
+    print(f"Python {sys.version.split()[0]} (GIL {'enabled' if gil_enabled else 'disabled'})")
+
+    for label, stripes in (("striped (64 locks)", 64), ("global lock", 1)):
+        storage = ConcurrentInMemoryStorage(num_stripes=stripes)
+        populate(storage)
+
+        print(f"\n{label}:")
+        baseline = None
+        for num_threads in THREAD_COUNTS:
+            throughput = measure(storage, num_threads)
+            baseline = baseline or throughput
+            print(f"  {num_threads} thread(s): {throughput:>12,.0f} reads/s "
+                  f"(x{throughput / baseline:.2f} vs 1 thread)")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -13,6 +13,7 @@ __license__ = "MIT"
 from .core.personality import Personality, PersonalityError, find_personality_file
 from .core.schema import PersonalitySchema
 from .tools.validator import PersonalityValidator
+from .tools.batch_validator import BatchValidator
 from .tools.compiler import PersonalityCompiler, LLMProvider
 from .tools.blender import PersonaBlend
 
@@ -27,7 +28,7 @@ from .storage import migrations
 # New core components
 from .core import PersonalityEngine, MemorySystem, EvolutionEngine
 from .interfaces import StorageInterface, MemoryInterface, PersonalityInterface, EvolutionInterface
-from .storage import BaseStorage, InMemoryStorage
+from .storage import BaseStorage, InMemoryStorage, ConcurrentInMemoryStorage
 
 # Flexible storage modules
 from .storage import (
@@ -46,6 +47,7 @@ __all__ = [
     "find_personality_file",
     "PersonalitySchema",
     "PersonalityValidator",
+    "BatchValidator",
     "PersonalityCompiler",
     "LLMProvider",
     "PersonaBlend",
@@ -68,6 +70,7 @@ __all__ = [
     "EvolutionInterface",
     "BaseStorage",
     "InMemoryStorage",
+    "ConcurrentInMemoryStorage",
     
     # Flexible storage modules
     "FlexibleStorageManager",
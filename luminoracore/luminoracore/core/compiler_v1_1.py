@@ -5,7 +5,7 @@ Compiles personality dynamically based on current state (affinity, mood).
 Works alongside existing v1.0 compiler.
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, TYPE_CHECKING
 from copy import deepcopy
 import logging
 
@@ -14,11 +14,79 @@ from .personality_v1_1 import (
     LevelModifiers
 )
 
+if TYPE_CHECKING:
+    from ..tools.compiler import PersonalityCompiler, LLMProvider, CompilationResult
+
 logger = logging.getLogger(__name__)
 
+# Top-level sections of the v1.0 personality schema
+V1_0_KEYS = (
+    'persona', 'core_traits', 'linguistic_profile', 'behavioral_rules',
+    'trigger_responses', 'advanced_parameters', 'safety_guards', 'examples', 'metadata'
+)
+
+VariantKey = Tuple[Optional[int], Optional[str]]
+
+
+def _read_only(*args, **kwargs):
+    raise TypeError("Compiled personalities are shared and read-only; use copy.deepcopy() for a mutable copy")
+
+
+class FrozenDict(dict):
+    """Read-only dict shared between compile() calls"""
+    
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+    
+    def __deepcopy__(self, memo):
+        return {key: deepcopy(value, memo) for key, value in self.items()}
+    
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class FrozenList(list):
+    """Read-only list shared between compile() calls"""
+    
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = clear = extend = insert = pop = remove = reverse = sort = _read_only
+    
+    def __deepcopy__(self, memo):
+        return [deepcopy(value, memo) for value in self]
+    
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(_freeze(item) for item in value)
+    return value
+
+
+def _replace_text(value: Any, old: str, new: str) -> Any:
+    """Replace old with new in every string of a compiled provider prompt"""
+    if isinstance(value, str):
+        return value.replace(old, new)
+    if isinstance(value, dict):
+        return {key: _replace_text(item, old, new) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_replace_text(item, old, new) for item in value]
+    return value
+
 
 class DynamicPersonalityCompiler:
-    """Compiles personality dynamically based on runtime state"""
+    """
+    Compiles personality dynamically based on runtime state
+    
+    A compiled personality depends only on the active relationship level
+    and mood, so each (level, mood) variant is built once and the same
+    read-only dictionary is returned on every later call. Provider
+    prompts are memoized per variant in the same way. Call clear_cache()
+    after changing the base personality or its extensions.
+    """
     
     def __init__(
         self,
@@ -34,6 +102,9 @@ class DynamicPersonalityCompiler:
         """
         self.base = base_personality
         self.extensions = extensions
+        self._variants: Dict[VariantKey, FrozenDict] = {}
+        self._provider_results: Dict[Tuple[Any, ...], "CompilationResult"] = {}
+        self._prompt_compiler: Optional["PersonalityCompiler"] = None
     
     def compile(
         self,
@@ -48,24 +119,159 @@ class DynamicPersonalityCompiler:
             current_mood: Current mood name, None = no mood modifiers
             
         Returns:
-            Compiled personality dictionary with modifiers applied
+            Compiled personality dictionary with modifiers applied (shared
+            and read-only; deepcopy it to modify)
         """
-        # Start with deep copy of base (immutable operation)
-        compiled = deepcopy(self.base)
+        return self._variant(self._variant_key(affinity_points, current_mood))
+    
+    def compile_for_provider(
+        self,
+        provider: "LLMProvider",
+        affinity_points: Optional[int] = None,
+        current_mood: Optional[str] = None,
+        max_tokens: Optional[int] = None
+    ) -> "CompilationResult":
+        """
+        Compile the final provider prompt for the current state
+        
+        The v1.0 sections of the variant are compiled with
+        PersonalityCompiler, and the level and mood system prompt
+        additions are applied around its system prompt.
         
-        # Apply relationship level modifiers if enabled and affinity provided
+        Args:
+            provider: Target LLM provider
+            affinity_points: Current affinity (0-100), None = no level modifiers
+            current_mood: Current mood name, None = no mood modifiers
+            max_tokens: Maximum token limit (optional)
+            
+        Returns:
+            CompilationResult (shared; prompt is read-only)
+        """
+        return self._provider_result(
+            self._variant_key(affinity_points, current_mood), provider, max_tokens
+        )
+    
+    def precompile(self, providers: Optional[List["LLMProvider"]] = None) -> int:
+        """
+        Build every (level, mood) variant ahead of time
+        
+        Args:
+            providers: Also compile the provider prompts of each variant
+            
+        Returns:
+            Number of variants built
+        """
+        levels: List[Optional[int]] = [None]
+        if self.extensions.has_hierarchical():
+            levels += list(range(len(self.extensions.hierarchical_config.relationship_levels)))
+        moods: List[Optional[str]] = [None] + self.get_available_moods()
+        
+        for level_index in levels:
+            for mood in moods:
+                self._variant((level_index, mood))
+                for provider in providers or []:
+                    self._provider_result((level_index, mood), provider, None)
+        return len(levels) * len(moods)
+    
+    def clear_cache(self) -> None:
+        """Drop memoized variants and provider prompts"""
+        self._variants.clear()
+        self._provider_results.clear()
+    
+    def _variant(self, key: VariantKey) -> FrozenDict:
+        compiled = self._variants.get(key)
+        if compiled is None:
+            compiled = _freeze(self._build_variant(*key))
+            self._variants[key] = compiled
+        return compiled
+    
+    def _provider_result(
+        self,
+        variant_key: VariantKey,
+        provider: "LLMProvider",
+        max_tokens: Optional[int]
+    ) -> "CompilationResult":
+        from ..tools.compiler import PersonalityCompiler, CompilationResult
+        from .personality import Personality
+        
+        key = (*variant_key, provider, max_tokens)
+        cached = self._provider_results.get(key)
+        if cached is not None:
+            return cached
+        
+        if self._prompt_compiler is None:
+            self._prompt_compiler = PersonalityCompiler()
+        compiler = self._prompt_compiler
+        
+        variant = self._variant(variant_key)
+        personality = Personality({k: variant[k] for k in V1_0_KEYS if k in variant})
+        result = compiler.compile(personality, provider, max_tokens)
+        
+        core_prompt = compiler._build_system_prompt(personality)
+        system_prompt = core_prompt
+        for modifiers in self._variant_modifiers(*variant_key):
+            system_prompt = modifiers.system_prompt_additions.apply_to(system_prompt)
+        prompt = result.prompt
+        if system_prompt != core_prompt:
+            prompt = _replace_text(prompt, core_prompt, system_prompt)
+        
+        level_index, mood = variant_key
+        compiled = CompilationResult(
+            provider=provider,
+            prompt=_freeze(prompt),
+            token_estimate=compiler._estimate_tokens(prompt),
+            metadata=_freeze({
+                **result.metadata,
+                "relationship_level": self._level_name(level_index),
+                "mood": mood,
+                "system_prompt": system_prompt
+            })
+        )
+        self._provider_results[key] = compiled
+        return compiled
+    
+    def _variant_key(
+        self,
+        affinity_points: Optional[int],
+        current_mood: Optional[str]
+    ) -> VariantKey:
+        """(level index, mood) that actually apply to the given state"""
+        level_index = None
         if self.extensions.has_hierarchical() and affinity_points is not None:
-            level_config = self.extensions.hierarchical_config.get_level_for_affinity(affinity_points)
-            if level_config:
-                logger.debug(f"Applying level modifiers: {level_config.name}")
-                self._apply_modifiers(compiled, level_config.modifiers)
+            level_index = self.extensions.hierarchical_config.get_level_index_for_affinity(affinity_points)
         
-        # Apply mood modifiers if enabled and mood provided
+        mood = None
         if self.extensions.has_moods() and current_mood is not None:
-            mood_config = self.extensions.mood_config.get_mood_config(current_mood)
-            if mood_config:
-                logger.debug(f"Applying mood modifiers: {current_mood}")
-                self._apply_modifiers(compiled, mood_config.modifiers)
+            if self.extensions.mood_config.get_mood_config(current_mood) is not None:
+                mood = current_mood
+        
+        return level_index, mood
+    
+    def _variant_modifiers(self, level_index: Optional[int], mood: Optional[str]) -> List[LevelModifiers]:
+        """Modifiers of a variant, in application order (level, then mood)"""
+        modifiers = []
+        if level_index is not None:
+            modifiers.append(self.extensions.hierarchical_config.relationship_levels[level_index].modifiers)
+        if mood is not None:
+            modifiers.append(self.extensions.mood_config.get_mood_config(mood).modifiers)
+        return modifiers
+    
+    def _level_name(self, level_index: Optional[int]) -> Optional[str]:
+        if level_index is None:
+            return None
+        return self.extensions.hierarchical_config.relationship_levels[level_index].name
+    
+    def _build_variant(self, level_index: Optional[int], mood: Optional[str]) -> Dict[str, Any]:
+        """Apply a variant's modifiers to a copy of the base personality"""
+        # Start with deep copy of base (immutable operation)
+        compiled = deepcopy(self.base)
+        
+        if level_index is not None:
+            logger.debug(f"Applying level modifiers: {self._level_name(level_index)}")
+        if mood is not None:
+            logger.debug(f"Applying mood modifiers: {mood}")
+        for modifiers in self._variant_modifiers(level_index, mood):
+            self._apply_modifiers(compiled, modifiers)
         
         return compiled
     
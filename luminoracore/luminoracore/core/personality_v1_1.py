@@ -9,8 +9,9 @@ Extends v1.0 personality system with:
 These are EXTENSIONS - v1.0 Personality class remains unchanged.
 """
 
+from bisect import bisect_right
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from enum import Enum
 
 
@@ -252,12 +253,47 @@ class HierarchicalConfig:
     enabled: bool = False
     relationship_levels: List[RelationshipLevelConfig] = field(default_factory=list)
     
+    def _affinity_table(self) -> Tuple[List[int], List[Optional[int]]]:
+        """
+        Sorted interval starts and the level index owning each interval
+        
+        Every range bound starts a new interval, so within one interval the
+        first matching level (list order) is constant. Rebuilt when the
+        levels list is replaced or resized.
+        """
+        levels = self.relationship_levels
+        signature = (id(levels), len(levels))
+        table = self.__dict__.get('_table')
+        if table is None or table[0] != signature:
+            starts = sorted({
+                bound
+                for level in levels
+                for bound in (level.affinity_range.min_points, level.affinity_range.max_points + 1)
+            })
+            owners = [
+                next((i for i, level in enumerate(levels) if level.applies_to_affinity(start)), None)
+                for start in starts
+            ]
+            table = (signature, starts, owners)
+            self._table = table
+        return table[1], table[2]
+    
+    def get_level_index_for_affinity(self, points: int) -> Optional[int]:
+        """Get the index of the relationship level for given affinity points"""
+        if not isinstance(points, int):
+            # Fractional points can fall between integer ranges
+            return next(
+                (i for i, level in enumerate(self.relationship_levels) if level.applies_to_affinity(points)),
+                None
+            )
+        starts, owners = self._affinity_table()
+        position = bisect_right(starts, points) - 1
+        return owners[position] if position >= 0 else None
+    
     def get_level_for_affinity(self, points: int) -> Optional[RelationshipLevelConfig]:
         """Get the relationship level that applies to given affinity points"""
-        for level in self.relationship_levels:
-            if level.applies_to_affinity(points):
-                return level
-        return None
+        index = self.get_level_index_for_affinity(points)
+        return self.relationship_levels[index] if index is not None else None
     
     def get_level_names(self) -> List[str]:
         """Get list of all level names"""
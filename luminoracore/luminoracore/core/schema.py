@@ -2,12 +2,18 @@
 JSON Schema validation for LuminoraCore personalities.
 """
 
+import copy
 import json
 import os
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 import jsonschema
 from jsonschema import validate, ValidationError
+from jsonschema.exceptions import best_match
+
+# Loaded schemas and their compiled validators, shared by every
+# PersonalitySchema in the process (keyed by path and modification time)
+_SCHEMA_CACHE: Dict[Tuple[str, int], Tuple[Dict[str, Any], Any]] = {}
 
 def _raise_personality_error(message: str):
     """Raise the shared PersonalityError without causing import cycles."""
@@ -32,17 +38,35 @@ class PersonalitySchema:
         
         self.schema_path = Path(schema_path)
         self._schema = None
+        self._validator = None
         self._load_schema()
     
     def _load_schema(self) -> None:
-        """Load the JSON schema from file."""
+        """Load the JSON schema from file and compile its validator (once per process)."""
         try:
-            with open(self.schema_path, 'r', encoding='utf-8') as f:
-                self._schema = json.load(f)
+            cache_key = (str(self.schema_path.resolve()), self.schema_path.stat().st_mtime_ns)
         except FileNotFoundError:
             _raise_personality_error(f"Schema file not found: {self.schema_path}")
-        except json.JSONDecodeError as e:
-            _raise_personality_error(f"Invalid JSON schema: {e}")
+        
+        cached = _SCHEMA_CACHE.get(cache_key)
+        if cached is None:
+            try:
+                with open(self.schema_path, 'r', encoding='utf-8') as f:
+                    schema = json.load(f)
+            except FileNotFoundError:
+                _raise_personality_error(f"Schema file not found: {self.schema_path}")
+            except json.JSONDecodeError as e:
+                _raise_personality_error(f"Invalid JSON schema: {e}")
+            
+            validator_class = jsonschema.validators.validator_for(schema)
+            try:
+                validator_class.check_schema(schema)
+            except jsonschema.SchemaError as e:
+                _raise_personality_error(f"Invalid JSON schema: {e.message}")
+            cached = (schema, validator_class(schema))
+            _SCHEMA_CACHE[cache_key] = cached
+        
+        self._schema, self._validator = cached
     
     def validate(self, personality_data: Dict[str, Any]) -> bool:
         """
@@ -57,15 +81,15 @@ class PersonalitySchema:
         Raises:
             PersonalityError: If validation fails
         """
-        try:
-            validate(instance=personality_data, schema=self._schema)
-            return True
-        except ValidationError as e:
-            _raise_personality_error(f"Schema validation failed: {e.message}")
+        # Same error selection as jsonschema.validate, without re-checking the schema
+        error = best_match(self._validator.iter_errors(personality_data))
+        if error is not None:
+            _raise_personality_error(f"Schema validation failed: {error.message}")
+        return True
     
     def get_schema(self) -> Dict[str, Any]:
         """Get the loaded schema."""
-        return self._schema.copy()
+        return copy.deepcopy(self._schema)
     
     def validate_file(self, file_path: str) -> bool:
         """
@@ -7,7 +7,11 @@ This module provides:
 - JSON minification (minifier.py) - Remove whitespace  
 - Compact array format (compact_format.py) - Dict to array conversion
 - Memory deduplication (deduplicator.py) - Merge duplicate facts
+- Near-duplicate consolidation (near_duplicates.py) - MinHash/LSH merging
 - Caching layer (cache.py) - LRU cache for facts
+- Fused codec (codec.py) - Single-pass encode/decode pipeline
+- Binary format (binary_format.py) - Versioned binary fact batches
+- Columnar format (columnar_format.py) - Dictionary/RLE encoded fact batches
 
 Author: LuminoraCore Team
 Version: 1.2.0-lite
@@ -42,11 +46,40 @@ from .compact_format import (
     from_compact_batch
 )
 
+from .binary_format import (
+    BinaryFactBatch,
+    BINARY_FORMAT_VERSION,
+    to_binary,
+    from_binary,
+    to_binary_batch,
+    from_binary_batch,
+    get_binary_size_reduction
+)
+
+from .columnar_format import (
+    ColumnarBatch,
+    COLUMNAR_FORMAT_VERSION,
+    to_columnar,
+    from_columnar,
+    get_columnar_size_reduction
+)
+
 # Imports - Semana 3
 from .deduplicator import (
     FactDeduplicator,
+    DeduplicationIndex,
     DeduplicationConfig,
-    deduplicate_facts
+    deduplicate_facts,
+    deduplicate_iter
+)
+
+from .near_duplicates import (
+    NearDuplicateConfig,
+    NearDuplicateIndex,
+    MinHasher,
+    consolidate_near_duplicates,
+    compact_user_facts,
+    DEFAULT_NEAR_DUPLICATE_THRESHOLD
 )
 
 from .cache import (
@@ -56,13 +89,18 @@ from .cache import (
     DEFAULT_CACHE_CAPACITY,
     DEFAULT_TTL_SECONDS,
     DEFAULT_CLEANUP_INTERVAL,
-    CACHE_KEY_SEPARATOR
+    CACHE_KEY_SEPARATOR,
+    DEFAULT_NEGATIVE_TTL_SECONDS
 )
 from .deduplicator import (
     SOURCE_SEPARATOR
 )
 
 # Imports - Semana 4
+from .codec import (
+    FactCodec
+)
+
 from .optimizer import (
     Optimizer,
     OptimizationConfig,
@@ -96,10 +134,36 @@ __all__ = [
     "to_compact_batch",
     "from_compact_batch",
     
+    # binary_format exports
+    "BinaryFactBatch",
+    "BINARY_FORMAT_VERSION",
+    "to_binary",
+    "from_binary",
+    "to_binary_batch",
+    "from_binary_batch",
+    "get_binary_size_reduction",
+    
+    # columnar_format exports
+    "ColumnarBatch",
+    "COLUMNAR_FORMAT_VERSION",
+    "to_columnar",
+    "from_columnar",
+    "get_columnar_size_reduction",
+    
     # deduplicator exports
     "FactDeduplicator",
+    "DeduplicationIndex",
     "DeduplicationConfig",
     "deduplicate_facts",
+    "deduplicate_iter",
+    
+    # near_duplicates exports
+    "NearDuplicateConfig",
+    "NearDuplicateIndex",
+    "MinHasher",
+    "consolidate_near_duplicates",
+    "compact_user_facts",
+    "DEFAULT_NEAR_DUPLICATE_THRESHOLD",
     
     # cache exports
     "LRUCache",
@@ -109,10 +173,14 @@ __all__ = [
     "DEFAULT_TTL_SECONDS",
     "DEFAULT_CLEANUP_INTERVAL",
     "CACHE_KEY_SEPARATOR",
+    "DEFAULT_NEGATIVE_TTL_SECONDS",
     
     # deduplicator constants
     "SOURCE_SEPARATOR",
     
+    # codec exports
+    "FactCodec",
+    
     # optimizer exports
     "Optimizer",
     "OptimizationConfig",
@@ -0,0 +1,396 @@
+"""
+Binary Compact Format - Phase 1 Quick Wins
+Versioned binary encoding for facts and fact batches
+
+CompactFact arrays are still JSON text and must be parsed on every read.
+This format stores the same positional fields as bytes:
+
+    header     magic "LCFB", version, fact count, section offsets
+    offsets    uint32 per fact (+ end sentinel) for random access
+    strings    interned dictionary for user IDs, categories, keys,
+               sources and tags (varint length-prefixed UTF-8)
+    facts      per fact: field count + one tagged value per field
+
+Numbers use zigzag varints, floats are stored as float64 so values
+round-trip exactly, and everything else is length-prefixed. Decoding
+works directly over a ``memoryview``: a batch (or a memory-mapped file)
+is opened without copying, and each fact is decoded only when accessed.
+
+Example:
+    >>> data = BinaryFactBatch.encode([{"user_id": "carlos", "category": "pref", "key": "sport"}])
+    >>> batch = BinaryFactBatch(data)
+    >>> batch[0]["key"]
+    'sport'
+
+Author: LuminoraCore Team
+Version: 1.2.0-lite
+"""
+
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Tuple, Union
+import json
+import mmap
+import struct
+
+from .compact_format import CompactFact
+
+# Format constants
+BINARY_MAGIC = b"LCFB"
+BINARY_FORMAT_VERSION = 1
+
+# magic, version, flags, reserved, count, strings offset, facts offset
+_HEADER = struct.Struct("<4sBBHIII")
+_OFFSET = struct.Struct("<I")
+_FLOAT = struct.Struct("<d")
+
+# Value tags
+TAG_NONE = 0
+TAG_STR = 1
+TAG_INT = 2
+TAG_FLOAT = 3
+TAG_TRUE = 4
+TAG_FALSE = 5
+TAG_JSON = 6
+TAG_INTERNED = 7
+TAG_LIST = 8
+
+# Fields whose string values are interned in the dictionary
+_INTERNED_FIELDS = frozenset({"user_id", "category", "key", "source", "tags"})
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    """Append an unsigned LEB128 varint"""
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(buf: memoryview, pos: int) -> Tuple[int, int]:
+    """Read an unsigned LEB128 varint, returning (value, new position)"""
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+class _StringTable:
+    """Interning dictionary used while encoding"""
+    
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.strings: List[str] = []
+    
+    def intern(self, value: str) -> int:
+        idx = self.index.get(value)
+        if idx is None:
+            idx = self.index[value] = len(self.strings)
+            self.strings.append(value)
+        return idx
+
+
+def _write_value(out: bytearray, value: Any, strings: _StringTable, interned: bool) -> None:
+    """Append one tagged value"""
+    if value is None:
+        out.append(TAG_NONE)
+    elif value is True:
+        out.append(TAG_TRUE)
+    elif value is False:
+        out.append(TAG_FALSE)
+    elif isinstance(value, str):
+        if interned:
+            out.append(TAG_INTERNED)
+            _write_varint(out, strings.intern(value))
+        else:
+            raw = value.encode("utf-8")
+            out.append(TAG_STR)
+            _write_varint(out, len(raw))
+            out += raw
+    elif isinstance(value, int):
+        out.append(TAG_INT)
+        _write_varint(out, (value << 1) if value >= 0 else ((-value << 1) - 1))
+    elif isinstance(value, float):
+        out.append(TAG_FLOAT)
+        out += _FLOAT.pack(value)
+    elif isinstance(value, list) and interned:
+        out.append(TAG_LIST)
+        _write_varint(out, len(value))
+        for item in value:
+            _write_value(out, item, strings, interned)
+    else:
+        raw = json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode("utf-8")
+        out.append(TAG_JSON)
+        _write_varint(out, len(raw))
+        out += raw
+
+
+class BinaryFactBatch:
+    """
+    Read-only, lazily decoded view over a binary fact batch
+    
+    Construction only parses the fixed-size header; the string dictionary
+    is resolved on first use and facts are decoded one at a time when
+    indexed or iterated. The underlying buffer is never copied.
+    """
+    
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview, mmap.mmap]):
+        """
+        Open a batch over an encoded buffer
+        
+        Args:
+            buffer: Encoded batch (bytes, memoryview or mmap)
+        
+        Raises:
+            ValueError: If the buffer is not a supported binary fact batch
+        """
+        self._mmap: Optional[mmap.mmap] = None
+        self._buf = memoryview(buffer)
+        if len(self._buf) < _HEADER.size:
+            raise ValueError("Buffer too small for a binary fact batch")
+        
+        magic, version, _flags, _reserved, count, strings_offset, facts_offset = (
+            _HEADER.unpack_from(self._buf, 0)
+        )
+        if magic != BINARY_MAGIC:
+            raise ValueError("Not a binary fact batch (bad magic)")
+        if version > BINARY_FORMAT_VERSION:
+            raise ValueError(f"Unsupported binary fact format version: {version}")
+        
+        self.version = version
+        self._count = count
+        self._strings_offset = strings_offset
+        self._facts_offset = facts_offset
+        self._string_spans: Optional[List[Tuple[int, int]]] = None
+        self._string_cache: Dict[int, str] = {}
+    
+    @staticmethod
+    def encode(facts: Iterable[Dict[str, Any]]) -> bytes:
+        """
+        Encode facts into a binary batch
+        
+        Args:
+            facts: Fact dictionaries (long or short keys)
+        
+        Returns:
+            Encoded batch
+        
+        Example:
+            >>> data = BinaryFactBatch.encode(facts)
+            >>> len(data) < len(json.dumps(facts))
+            True
+        """
+        strings = _StringTable()
+        records = bytearray()
+        offsets = [0]
+        fields = CompactFact.FIELD_ORDER
+        
+        for fact in facts:
+            array = CompactFact.to_array(fact)
+            _write_varint(records, len(array))
+            for name, value in zip(fields, array):
+                _write_value(records, value, strings, name in _INTERNED_FIELDS)
+            offsets.append(len(records))
+        
+        string_section = bytearray()
+        _write_varint(string_section, len(strings.strings))
+        for value in strings.strings:
+            raw = value.encode("utf-8")
+            _write_varint(string_section, len(raw))
+            string_section += raw
+        
+        count = len(offsets) - 1
+        offsets_size = _OFFSET.size * len(offsets)
+        strings_offset = _HEADER.size + offsets_size
+        facts_offset = strings_offset + len(string_section)
+        
+        out = bytearray(_HEADER.pack(
+            BINARY_MAGIC, BINARY_FORMAT_VERSION, 0, 0,
+            count, strings_offset, facts_offset
+        ))
+        out += struct.pack(f"<{len(offsets)}I", *offsets)
+        out += string_section
+        out += records
+        return bytes(out)
+    
+    @classmethod
+    def open(cls, path: str) -> "BinaryFactBatch":
+        """
+        Memory-map an encoded batch file
+        
+        Args:
+            path: Path to a file written from BinaryFactBatch.encode()
+        
+        Returns:
+            Batch view backed by the mapped file (call close() when done)
+        """
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        batch = cls(mapped)
+        batch._mmap = mapped
+        return batch
+    
+    def close(self) -> None:
+        """Release the buffer (and the file mapping, if any)"""
+        self._buf.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+    
+    def __enter__(self) -> "BinaryFactBatch":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("fact index out of range")
+        return self._decode_fact(index)
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(self._count):
+            yield self._decode_fact(index)
+    
+    def _string(self, idx: int) -> str:
+        """Resolve an interned string, decoding it on first use"""
+        value = self._string_cache.get(idx)
+        if value is None:
+            if self._string_spans is None:
+                self._string_spans = self._scan_strings()
+            start, end = self._string_spans[idx]
+            value = self._string_cache[idx] = str(self._buf[start:end], "utf-8")
+        return value
+    
+    def _scan_strings(self) -> List[Tuple[int, int]]:
+        """Locate every dictionary string without decoding it"""
+        count, pos = _read_varint(self._buf, self._strings_offset)
+        spans = []
+        for _ in range(count):
+            length, pos = _read_varint(self._buf, pos)
+            spans.append((pos, pos + length))
+            pos += length
+        return spans
+    
+    def _read_value(self, pos: int) -> Tuple[Any, int]:
+        """Read one tagged value at pos"""
+        buf = self._buf
+        tag = buf[pos]
+        pos += 1
+        
+        if tag == TAG_NONE:
+            return None, pos
+        if tag == TAG_INTERNED:
+            idx, pos = _read_varint(buf, pos)
+            return self._string(idx), pos
+        if tag == TAG_STR:
+            length, pos = _read_varint(buf, pos)
+            return str(buf[pos:pos + length], "utf-8"), pos + length
+        if tag == TAG_INT:
+            raw, pos = _read_varint(buf, pos)
+            return (raw >> 1) ^ -(raw & 1), pos
+        if tag == TAG_FLOAT:
+            return _FLOAT.unpack_from(buf, pos)[0], pos + _FLOAT.size
+        if tag == TAG_TRUE:
+            return True, pos
+        if tag == TAG_FALSE:
+            return False, pos
+        if tag == TAG_LIST:
+            length, pos = _read_varint(buf, pos)
+            items = []
+            for _ in range(length):
+                item, pos = self._read_value(pos)
+                items.append(item)
+            return items, pos
+        if tag == TAG_JSON:
+            length, pos = _read_varint(buf, pos)
+            return json.loads(str(buf[pos:pos + length], "utf-8")), pos + length
+        raise ValueError(f"Unknown value tag {tag} at offset {pos - 1}")
+    
+    def get_array(self, index: int) -> List[Any]:
+        """
+        Decode one fact into CompactFact array form
+        
+        Args:
+            index: Fact position in the batch
+        
+        Returns:
+            Positional array (see CompactFact.FIELD_ORDER)
+        """
+        start = self._facts_offset + _OFFSET.unpack_from(self._buf, _HEADER.size + index * _OFFSET.size)[0]
+        field_count, pos = _read_varint(self._buf, start)
+        array = []
+        for _ in range(field_count):
+            value, pos = self._read_value(pos)
+            array.append(value)
+        return array
+    
+    def _decode_fact(self, index: int) -> Dict[str, Any]:
+        return CompactFact.from_array(self.get_array(index))
+
+
+def to_binary(fact: Dict[str, Any]) -> bytes:
+    """Encode a single fact as a one-element binary batch"""
+    return BinaryFactBatch.encode([fact])
+
+
+def from_binary(data: Union[bytes, memoryview]) -> Dict[str, Any]:
+    """Decode a single fact encoded with to_binary()"""
+    return BinaryFactBatch(data)[0]
+
+
+def to_binary_batch(facts: Iterable[Dict[str, Any]]) -> bytes:
+    """Shorthand for BinaryFactBatch.encode()"""
+    return BinaryFactBatch.encode(facts)
+
+
+def from_binary_batch(data: Union[bytes, memoryview]) -> BinaryFactBatch:
+    """Open a lazily decoded view over an encoded batch"""
+    return BinaryFactBatch(data)
+
+
+def get_binary_size_reduction(facts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Compare binary batch size against minified compact JSON arrays
+    
+    Args:
+        facts: Fact dictionaries
+    
+    Returns:
+        Dictionary with size metrics
+    """
+    array_size = len(json.dumps(CompactFact.to_array_batch(facts), separators=(',', ':')))
+    binary_size = len(BinaryFactBatch.encode(facts))
+    reduction_bytes = array_size - binary_size
+    reduction_percent = (
+        (reduction_bytes / array_size * 100)
+        if array_size > 0
+        else 0
+    )
+    
+    return {
+        'array_size': array_size,
+        'binary_size': binary_size,
+        'reduction_bytes': reduction_bytes,
+        'reduction_percent': round(reduction_percent, 2)
+    }
+
+
+# Module exports
+__all__ = [
+    "BinaryFactBatch",
+    "BINARY_FORMAT_VERSION",
+    "to_binary",
+    "from_binary",
+    "to_binary_batch",
+    "from_binary_batch",
+    "get_binary_size_reduction"
+]
@@ -4,8 +4,10 @@ Intelligent caching layer for frequently accessed facts
 
 Caching strategy:
 - LRU (Least Recently Used) eviction policy
-- TTL-based expiration
-- Size-based limits
+- TTL-based expiration driven by a min-heap
+- Size-based limits (item count and optional byte budget)
+- Per-user secondary index for cheap invalidation
+- Materialized per-user/per-category collections and negative entries
 - Cache hit/miss metrics
 
 Benefits:
@@ -17,8 +19,11 @@ Author: LuminoraCore Team
 Version: 1.2.0-lite
 """
 
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Callable, Set
 from collections import OrderedDict
+import heapq
+import json
+import threading
 import time
 
 # Default configuration constants
@@ -26,6 +31,42 @@ DEFAULT_CACHE_CAPACITY = 1000
 DEFAULT_TTL_SECONDS = 3600  # 1 hour
 DEFAULT_CLEANUP_INTERVAL = 300  # 5 minutes
 CACHE_KEY_SEPARATOR = ":"
+DEFAULT_NEGATIVE_TTL_SECONDS = 30  # Short-lived "does not exist" entries
+COLLECTION_KEY_PREFIX = "#"
+
+# Sentinel stored for negative entries
+_MISSING = object()
+
+# Rebuild the expiry heap once stale entries outnumber live ones by this factor
+HEAP_COMPACTION_FACTOR = 2
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the memory footprint of a cached value in bytes
+    
+    Uses the length of its minified JSON form, which tracks the size
+    of fact dictionaries far better than ``sys.getsizeof``.
+    
+    Args:
+        value: Cached value
+        
+    Returns:
+        Estimated size in bytes
+    """
+    return len(json.dumps(value, separators=(',', ':'), default=str))
+
+
+class _CacheEntry:
+    """Single cache slot: value plus expiry, size and index tag"""
+    
+    __slots__ = ('value', 'expires_at', 'size', 'tag')
+    
+    def __init__(self, value: Any, expires_at: float, size: int, tag: Optional[str]):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+        self.tag = tag
 
 
 class LRUCache:
@@ -33,40 +74,102 @@ class LRUCache:
     Least Recently Used (LRU) cache implementation
     
     Features:
-    - Fixed capacity
-    - TTL (time-to-live) support
-    - Automatic eviction of old/unused items
+    - Fixed capacity, with optional byte budget
+    - TTL (time-to-live) support with per-item overrides
+    - Expiry through a min-heap, so cleanup costs O(expired)
+    - Secondary index by tag for O(k) group invalidation
+    - Thread-safe (and therefore safe to share between asyncio tasks)
     - Hit/miss statistics
     """
     
-    def __init__(self, capacity: int = DEFAULT_CACHE_CAPACITY, ttl_seconds: int = DEFAULT_TTL_SECONDS):
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CACHE_CAPACITY,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None
+    ):
         """
         Initialize LRU cache
         
         Args:
             capacity: Maximum number of items in cache
             ttl_seconds: Time-to-live in seconds (default 1 hour)
+            max_bytes: Optional byte budget; LRU items are evicted to stay within it
+            sizeof: Size estimator used when max_bytes is set (default: estimate_size)
             
         Example:
             >>> cache = LRUCache(capacity=100, ttl_seconds=300)
+            >>> sized = LRUCache(capacity=100, max_bytes=64 * 1024)
         """
         self.capacity = capacity
         self.ttl_seconds = ttl_seconds
-        self.cache: OrderedDict = OrderedDict()
-        self.timestamps: Dict[str, float] = {}
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or estimate_size
+        self.cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self.total_bytes = 0
+        
+        # Min-heap of (expires_at, key); entries are invalidated lazily
+        self._expiry_heap: List[Tuple[float, str]] = []
+        # Secondary index: tag -> keys
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = threading.RLock()
         
         # Statistics
         self.hits = 0
         self.misses = 0
         self.evictions = 0
+        self.expirations = 0
     
-    def _is_expired(self, key: str) -> bool:
+    def _is_expired(self, key: str, now: Optional[float] = None) -> bool:
         """Check if cached item is expired"""
-        if key not in self.timestamps:
+        entry = self.cache.get(key)
+        if entry is None:
             return True
         
-        age = time.time() - self.timestamps[key]
-        return age > self.ttl_seconds
+        return (now if now is not None else time.monotonic()) > entry.expires_at
+    
+    def _unlink(self, key: str) -> Optional[_CacheEntry]:
+        """Drop a key from storage and the tag index (lock must be held)"""
+        entry = self.cache.pop(key, None)
+        if entry is None:
+            return None
+        
+        self.total_bytes -= entry.size
+        if entry.tag is not None:
+            keys = self._tags.get(entry.tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[entry.tag]
+        return entry
+    
+    def _expire(self, now: float) -> int:
+        """Pop expired entries off the heap (lock must be held)"""
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            expires_at, key = heapq.heappop(heap)
+            entry = self.cache.get(key)
+            # Skip heap entries superseded by a later put
+            if entry is not None and entry.expires_at == expires_at:
+                self._unlink(key)
+                removed += 1
+        self.expirations += removed
+        return removed
+    
+    def _compact_heap(self) -> None:
+        """Rebuild the heap from live entries once stale ones dominate"""
+        limit = HEAP_COMPACTION_FACTOR * max(len(self.cache), self.capacity, 1)
+        if len(self._expiry_heap) > limit:
+            self._expiry_heap = [(e.expires_at, k) for k, e in self.cache.items()]
+            heapq.heapify(self._expiry_heap)
+    
+    def _evict_lru(self) -> None:
+        """Evict the least recently used item (lock must be held)"""
+        oldest_key = next(iter(self.cache))
+        self._unlink(oldest_key)
+        self.evictions += 1
     
     def get(self, key: str) -> Optional[Any]:
         """
@@ -84,63 +187,128 @@ class LRUCache:
             >>> cache.get("key1")
             'value1'
         """
-        # Check if key exists
-        if key not in self.cache:
-            self.misses += 1
-            return None
-        
-        # Check if expired
-        if self._is_expired(key):
-            self.remove(key)
-            self.misses += 1
-            return None
-        
-        # Move to end (most recently used)
-        self.cache.move_to_end(key)
-        self.hits += 1
-        return self.cache[key]
+        with self._lock:
+            entry = self.cache.get(key)
+            
+            # Check if key exists
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            # Check if expired
+            if time.monotonic() > entry.expires_at:
+                self._unlink(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            
+            # Move to end (most recently used)
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return entry.value
+    
+    def peek(self, key: str) -> Optional[Any]:
+        """Get a live item without updating recency or statistics"""
+        with self._lock:
+            entry = self.cache.get(key)
+            if entry is None or time.monotonic() > entry.expires_at:
+                return None
+            return entry.value
     
-    def put(self, key: str, value: Any) -> None:
+    def contains(self, key: str) -> bool:
+        """Check if a live (non-expired) item is cached, without touching statistics"""
+        with self._lock:
+            return not self._is_expired(key)
+    
+    def put(
+        self,
+        key: str,
+        value: Any,
+        ttl_seconds: Optional[float] = None,
+        tag: Optional[str] = None
+    ) -> None:
         """
         Put item in cache
         
         Args:
             key: Cache key
             value: Value to cache
+            ttl_seconds: Optional TTL override for this item
+            tag: Optional group tag for invalidate_tag (e.g. user ID)
             
         Example:
             >>> cache = LRUCache()
             >>> cache.put("key1", {"data": "value"})
+            >>> cache.put("carlos:pref", ["..."], tag="carlos")
         """
-        # If key exists, update and move to end
-        if key in self.cache:
-            self.cache.move_to_end(key)
-            self.cache[key] = value
-            self.timestamps[key] = time.time()
+        if self.capacity <= 0:
             return
         
-        # If at capacity, remove oldest
-        if len(self.cache) >= self.capacity and self.capacity > 0:
-            oldest_key = next(iter(self.cache))
-            self.remove(oldest_key)
-            self.evictions += 1
+        now = time.monotonic()
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        entry = _CacheEntry(value, now + ttl, size, tag)
         
-        # Add new item (only if capacity > 0)
-        if self.capacity > 0:
-            self.cache[key] = value
-            self.timestamps[key] = time.time()
+        with self._lock:
+            self._expire(now)
+            
+            # Replace existing entry (keeps capacity, never evicts)
+            if key in self.cache:
+                self._unlink(key)
+            elif len(self.cache) >= self.capacity:
+                self._evict_lru()
+            
+            self.cache[key] = entry
+            self.total_bytes += size
+            if tag is not None:
+                self._tags.setdefault(tag, set()).add(key)
+            heapq.heappush(self._expiry_heap, (entry.expires_at, key))
+            
+            # Enforce byte budget (never evicts the item just inserted)
+            if self.max_bytes is not None:
+                while self.total_bytes > self.max_bytes and len(self.cache) > 1:
+                    self._evict_lru()
+            
+            self._compact_heap()
     
     def remove(self, key: str) -> None:
         """Remove item from cache"""
-        if key in self.cache:
-            del self.cache[key]
-        if key in self.timestamps:
-            del self.timestamps[key]
+        with self._lock:
+            self._unlink(key)
+    
+    def keys_for_tag(self, tag: str) -> List[str]:
+        """Get the cached keys carrying a tag"""
+        with self._lock:
+            return list(self._tags.get(tag, ()))
+    
+    def invalidate_tag(self, tag: str) -> int:
+        """
+        Remove every item carrying a tag
+        
+        Args:
+            tag: Tag passed to put()
+            
+        Returns:
+            Number of items removed
+        """
+        with self._lock:
+            keys = self._tags.pop(tag, None)
+            if not keys:
+                return 0
+            
+            for key in keys:
+                entry = self.cache.pop(key, None)
+                if entry is not None:
+                    self.total_bytes -= entry.size
+            return len(keys)
     
     def clear(self) -> None:
         """Clear entire cache"""
-        self.cache.clear()
-        self.timestamps.clear()
+        with self._lock:
+            self.cache.clear()
+            self._expiry_heap.clear()
+            self._tags.clear()
+            self.total_bytes = 0
         # Don't reset statistics
     
     def size(self) -> int:
@@ -174,6 +342,9 @@ class LRUCache:
             'hits': self.hits,
             'misses': self.misses,
             'evictions': self.evictions,
+            'expirations': self.expirations,
+            'total_bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
             'total_requests': total_requests,
             'hit_rate': round(hit_rate, 2),
             'miss_rate': round(miss_rate, 2)
@@ -183,18 +354,14 @@ class LRUCache:
         """
         Remove all expired items
         
+        Only expired heap entries are visited, so the cost is
+        O(expired * log n) rather than a scan of the whole cache.
+        
         Returns:
             Number of items removed
         """
-        expired_keys = [
-            key for key in self.cache.keys()
-            if self._is_expired(key)
-        ]
-        
-        for key in expired_keys:
-            self.remove(key)
-        
-        return len(expired_keys)
+        with self._lock:
+            return self._expire(time.monotonic())
 
 
 class FactCache:
@@ -205,17 +372,32 @@ class FactCache:
     - Multiple cache keys per fact (by user_id, category, etc.)
     - Automatic key generation
     - Batch operations
+    - Per-user index for O(k) invalidation
+    - Materialized per-user and per-category collections, kept
+      coherent on put_fact/remove_fact
+    - Short-TTL negative entries for facts known not to exist
     """
     
-    def __init__(self, capacity: int = DEFAULT_CACHE_CAPACITY, ttl_seconds: int = DEFAULT_TTL_SECONDS):
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CACHE_CAPACITY,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        max_bytes: Optional[int] = None,
+        negative_ttl_seconds: float = DEFAULT_NEGATIVE_TTL_SECONDS
+    ):
         """
         Initialize fact cache
         
         Args:
             capacity: Maximum cache capacity
             ttl_seconds: TTL for cached facts
+            max_bytes: Optional byte budget for cached facts
+            negative_ttl_seconds: TTL for "fact does not exist" entries
         """
-        self.cache = LRUCache(capacity=capacity, ttl_seconds=ttl_seconds)
+        self.cache = LRUCache(capacity=capacity, ttl_seconds=ttl_seconds, max_bytes=max_bytes)
+        self.negative_ttl_seconds = negative_ttl_seconds
+        # Guards read-modify-write of materialized collections
+        self._lock = threading.RLock()
     
     @staticmethod
     def _make_key(user_id: str, category: str = None, key: str = None) -> str:
@@ -227,6 +409,24 @@ class FactCache:
             parts.append(key)
         return CACHE_KEY_SEPARATOR.join(parts)
     
+    @staticmethod
+    def _make_collection_key(user_id: str, category: str = None) -> str:
+        """Generate cache key for a materialized collection"""
+        return COLLECTION_KEY_PREFIX + FactCache._make_key(user_id, category)
+    
+    @staticmethod
+    def _member_key(category: Any, key: Any) -> str:
+        """Generate the key of a fact inside a collection"""
+        return f"{category}{CACHE_KEY_SEPARATOR}{key}"
+    
+    @staticmethod
+    def _identify(fact: Dict[str, Any]) -> Tuple[Any, Any, Any]:
+        """Extract (user_id, category, key) supporting long and short keys"""
+        uid = fact.get("user_id") if "user_id" in fact else fact.get("uid")
+        cat = fact.get("category") if "category" in fact else fact.get("cat")
+        k = fact.get("key") if "key" in fact else fact.get("k")
+        return uid, cat, k
+    
     def get_fact(
         self,
         user_id: str,
@@ -236,6 +436,9 @@ class FactCache:
         """
         Get cached fact
         
+        Falls back to a materialized collection holding the fact when
+        there is no single-fact entry.
+        
         Args:
             user_id: User ID
             category: Optional category filter
@@ -250,12 +453,161 @@ class FactCache:
             >>> fact = cache.get_fact("carlos", "pref", "sport")
         """
         cache_key = self._make_key(user_id, category, key)
-        return self.cache.get(cache_key)
+        cached = self.cache.get(cache_key)
+        if cached is _MISSING:
+            return None
+        if cached is not None or not (category and key):
+            return cached
+        
+        for collection_key in (
+            self._make_collection_key(user_id, category),
+            self._make_collection_key(user_id)
+        ):
+            collection = self.cache.peek(collection_key)
+            if collection is not None:
+                return collection.get(self._member_key(category, key))
+        return None
+    
+    def is_missing(self, user_id: str, category: str, key: str) -> bool:
+        """
+        Check whether a fact is known not to exist
+        
+        True for live negative entries and for facts absent from a
+        cached (complete) category or user collection.
+        
+        Args:
+            user_id: User ID
+            category: Fact category
+            key: Fact key
+            
+        Returns:
+            True if storage need not be queried for this fact
+        """
+        cached = self.cache.peek(self._make_key(user_id, category, key))
+        if cached is not None:
+            return cached is _MISSING
+        
+        for collection_key in (
+            self._make_collection_key(user_id, category),
+            self._make_collection_key(user_id)
+        ):
+            collection = self.cache.peek(collection_key)
+            if collection is not None:
+                return self._member_key(category, key) not in collection
+        return False
+    
+    def put_missing(
+        self,
+        user_id: str,
+        category: str,
+        key: str,
+        ttl_seconds: Optional[float] = None
+    ) -> None:
+        """
+        Cache a negative entry for a fact that does not exist
+        
+        Args:
+            user_id: User ID
+            category: Fact category
+            key: Fact key
+            ttl_seconds: Optional TTL override (default: negative_ttl_seconds)
+            
+        Example:
+            >>> cache = FactCache()
+            >>> cache.put_missing("carlos", "pref", "music")
+            >>> cache.is_missing("carlos", "pref", "music")
+            True
+        """
+        ttl = self.negative_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.cache.put(self._make_key(user_id, category, key), _MISSING, ttl_seconds=ttl, tag=user_id)
+    
+    def get_facts(self, user_id: str, category: str = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get a cached collection of facts
+        
+        A category request is served from the category collection, or
+        derived from the user collection when only that is cached.
+        
+        Args:
+            user_id: User ID
+            category: Optional category filter
+            
+        Returns:
+            List of facts, or None if the collection isn't cached
+            
+        Example:
+            >>> cache = FactCache()
+            >>> cache.put_facts("carlos", [{"user_id": "carlos", "category": "pref", "key": "sport"}])
+            >>> len(cache.get_facts("carlos"))
+            1
+        """
+        # Writers mutate collections in place under the lock, so copy under it
+        with self._lock:
+            collection = self.cache.get(self._make_collection_key(user_id, category))
+            if collection is not None:
+                return list(collection.values())
+            if not category:
+                return None
+            collection = self.cache.peek(self._make_collection_key(user_id))
+            if collection is None:
+                return None
+            facts = list(collection.values())
+        
+        return [fact for fact in facts if self._identify(fact)[1] == category]
+    
+    def put_facts(
+        self,
+        user_id: str,
+        facts: List[Dict[str, Any]],
+        category: str = None
+    ) -> None:
+        """
+        Cache the complete collection of a user's facts (or one category)
+        
+        The collection must be complete: missing members are treated as
+        non-existent by is_missing().
+        
+        Args:
+            user_id: User ID
+            facts: All facts for the user (or for the category)
+            category: Optional category the collection belongs to
+        """
+        collection: Dict[str, Dict[str, Any]] = {}
+        for fact in facts:
+            _, cat, k = self._identify(fact)
+            collection[self._member_key(cat, k)] = fact
+        
+        with self._lock:
+            self.cache.put(self._make_collection_key(user_id, category), collection, tag=user_id)
+    
+    def _update_collections(self, user_id: str, category: Any, key: Any,
+                            fact: Optional[Dict[str, Any]]) -> None:
+        """Apply a fact write (or removal when fact is None) to cached collections"""
+        for collection_key in (
+            self._make_collection_key(user_id),
+            self._make_collection_key(user_id, category) if category else None
+        ):
+            if collection_key is None:
+                continue
+            collection = self.cache.peek(collection_key)
+            if collection is None:
+                continue
+            member_key = self._member_key(category, key)
+            if fact is None:
+                collection.pop(member_key, None)
+            else:
+                collection[member_key] = fact
+            # Re-store so byte accounting reflects the new contents
+            if self.cache.max_bytes is not None:
+                self.cache.put(collection_key, collection, tag=user_id)
     
     def put_fact(self, fact: Dict[str, Any]) -> None:
         """
         Cache a fact
         
+        Replaces any negative entry for the fact and updates cached
+        collections that contain it.
+        
         Args:
             fact: Fact dictionary
             
@@ -264,33 +616,46 @@ class FactCache:
             >>> fact = {"user_id": "carlos", "category": "pref"}
             >>> cache.put_fact(fact)
         """
-        # Extract identifiers
-        uid = fact.get("user_id") if "user_id" in fact else fact.get("uid")
-        cat = fact.get("category") if "category" in fact else fact.get("cat")
-        k = fact.get("key") if "key" in fact else fact.get("k")
+        uid, cat, k = self._identify(fact)
         
         if not uid:
             return  # Can't cache without user_id
         
-        # Cache with full key
-        cache_key = self._make_key(uid, cat, k)
-        self.cache.put(cache_key, fact)
+        with self._lock:
+            # Cache with full key, indexed by user for invalidation
+            cache_key = self._make_key(uid, cat, k)
+            self.cache.put(cache_key, fact, tag=uid)
+            self._update_collections(uid, cat, k, fact)
     
     def put_facts_batch(self, facts: List[Dict[str, Any]]) -> None:
         """Cache multiple facts"""
         for fact in facts:
             self.put_fact(fact)
     
-    def invalidate_user(self, user_id: str) -> None:
-        """Invalidate all cached facts for a user"""
-        # This is expensive - iterate through cache
-        keys_to_remove = [
-            key for key in self.cache.cache.keys()
-            if key.startswith(f"{user_id}:")
-        ]
+    def remove_fact(self, user_id: str, category: str, key: str) -> None:
+        """
+        Remove a fact from the cache and from cached collections
+        
+        Args:
+            user_id: User ID
+            category: Fact category
+            key: Fact key
+        """
+        with self._lock:
+            self.cache.remove(self._make_key(user_id, category, key))
+            self._update_collections(user_id, category, key, None)
+    
+    def invalidate_user(self, user_id: str) -> int:
+        """
+        Invalidate all cached facts for a user
+        
+        Uses the per-user index, so the cost is O(facts cached for the user).
+        Collections and negative entries for the user are dropped too.
         
-        for key in keys_to_remove:
-            self.cache.remove(key)
+        Returns:
+            Number of entries invalidated
+        """
+        return self.cache.invalidate_tag(user_id)
     
     def clear(self) -> None:
         """Clear entire cache"""
@@ -310,7 +675,8 @@ class CacheConfig:
         capacity: int = DEFAULT_CACHE_CAPACITY,
         ttl_seconds: int = DEFAULT_TTL_SECONDS,
         auto_cleanup: bool = True,
-        cleanup_interval: int = DEFAULT_CLEANUP_INTERVAL
+        cleanup_interval: int = DEFAULT_CLEANUP_INTERVAL,
+        max_bytes: Optional[int] = None
     ):
         """
         Initialize cache configuration
@@ -321,18 +687,22 @@ class CacheConfig:
             ttl_seconds: Time-to-live for cached items
             auto_cleanup: Automatically cleanup expired items
             cleanup_interval: Seconds between cleanups
+            max_bytes: Optional byte budget for cached items
         """
         self.enabled = enabled
         self.capacity = capacity
         self.ttl_seconds = ttl_seconds
         self.auto_cleanup = auto_cleanup
         self.cleanup_interval = cleanup_interval
+        self.max_bytes = max_bytes
 
 
 # Module exports
 __all__ = [
+    "estimate_size",
     "LRUCache",
     "FactCache",
-    "CacheConfig"
+    "CacheConfig",
+    "DEFAULT_NEGATIVE_TTL_SECONDS"
 ]
 
@@ -0,0 +1,169 @@
+"""
+Fused Fact Codec - Phase 1 Quick Wins
+Single-pass encoder/decoder for the optimization pipeline
+
+The original pipeline ran one recursive pass per optimization:
+    compress_keys() -> CompactFact.to_array() -> minify()
+
+each allocating a full copy of the fact. FactCodec walks a fact once,
+writing positional array slots directly and abbreviating keys only
+inside nested containers (the only place keys survive in compact form).
+
+Output is identical to the multi-pass pipeline:
+    >>> codec = FactCodec()
+    >>> codec.encode({"user_id": "carlos", "category": "pref", "key": "sport"})
+    ['carlos', 'pref', 'sport', None, None, None, None, None, []]
+
+Author: LuminoraCore Team
+Version: 1.2.0-lite
+"""
+
+from typing import Dict, List, Any, Iterable, Iterator, Union
+import json
+
+from .key_mapping import compress_keys, expand_keys
+
+# (long key, short key) pairs in CompactFact positional order
+_COMPACT_FIELDS = (
+    ("user_id", "uid"),
+    ("category", "cat"),
+    ("key", "k"),
+    ("value", "v"),
+    ("importance", "imp"),
+    ("timestamp", "ts"),
+    ("source", "src"),
+    ("confidence", "conf"),
+)
+
+# Minified JSON separators (see minifier.JSONMinifier.minify)
+_MINIFIED_SEPARATORS = (',', ':')
+
+
+class FactCodec:
+    """
+    Fused single-pass encoder/decoder for facts
+    
+    Combines key abbreviation, compact array conversion and minification,
+    producing the same output as running those steps one after another.
+    """
+    
+    def __init__(self, key_abbreviation: bool = True, compact_format: bool = True):
+        """
+        Initialize codec
+        
+        Args:
+            key_abbreviation: Abbreviate keys (nested keys in compact mode)
+            compact_format: Emit positional arrays instead of dictionaries
+        """
+        self.key_abbreviation = key_abbreviation
+        self.compact_format = compact_format
+    
+    def encode(self, fact: Dict[str, Any]) -> Union[List[Any], Dict[str, Any]]:
+        """
+        Encode a fact in a single pass
+        
+        Args:
+            fact: Fact dictionary (long or short keys)
+        
+        Returns:
+            Compact array, or abbreviated dictionary if compact format is off
+        
+        Example:
+            >>> FactCodec(compact_format=False).encode({"user_id": "carlos"})
+            {'uid': 'carlos'}
+        """
+        if not self.compact_format:
+            return compress_keys(fact) if self.key_abbreviation else dict(fact)
+        
+        nested = compress_keys if self.key_abbreviation else None
+        array: List[Any] = []
+        for long_key, short_key in _COMPACT_FIELDS:
+            field = fact.get(long_key) if long_key in fact else fact.get(short_key)
+            if nested is not None and isinstance(field, (dict, list)):
+                field = nested(field)
+            array.append(field)
+        
+        tags = fact.get("tags", [])
+        if nested is not None and isinstance(tags, (dict, list)):
+            tags = nested(tags)
+        array.append(tags)
+        return array
+    
+    def encode_minified(self, fact: Dict[str, Any]) -> str:
+        """
+        Encode a fact straight to minified JSON
+        
+        Args:
+            fact: Fact dictionary
+        
+        Returns:
+            Minified JSON string of the encoded fact
+        """
+        return json.dumps(self.encode(fact), separators=_MINIFIED_SEPARATORS, ensure_ascii=False)
+    
+    def decode(self, data: Any) -> Dict[str, Any]:
+        """
+        Decode an encoded fact in a single pass
+        
+        Array slots holding None are dropped, and empty tags are omitted,
+        matching CompactFact.from_array() followed by cleanup and expand_keys().
+        
+        Args:
+            data: Compact array or (abbreviated) dictionary
+        
+        Returns:
+            Fact dictionary with original keys
+        """
+        if not (self.compact_format and isinstance(data, list)):
+            if self.key_abbreviation and isinstance(data, dict):
+                return expand_keys(data)
+            return data
+        
+        nested = expand_keys if self.key_abbreviation else None
+        result: Dict[str, Any] = {}
+        for index, field in enumerate(data[:len(_COMPACT_FIELDS)]):
+            if field is None:
+                continue
+            if nested is not None and isinstance(field, (dict, list)):
+                field = nested(field)
+            result[_COMPACT_FIELDS[index][0]] = field
+        
+        if len(data) > len(_COMPACT_FIELDS):
+            tags = data[len(_COMPACT_FIELDS)]
+            if tags:
+                result["tags"] = nested(tags) if nested is not None else tags
+        return result
+    
+    def iter_encode(self, facts: Iterable[Dict[str, Any]]) -> Iterator[Union[List[Any], Dict[str, Any]]]:
+        """
+        Lazily encode a stream of facts
+        
+        Args:
+            facts: Any iterable of facts (lists, generators, cursors)
+        
+        Yields:
+            Encoded facts, one at a time
+        """
+        encode = self.encode
+        for fact in facts:
+            yield encode(fact)
+    
+    def iter_decode(self, encoded: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily decode a stream of encoded facts
+        
+        Args:
+            encoded: Any iterable of encoded facts
+        
+        Yields:
+            Decoded fact dictionaries, one at a time
+        """
+        decode = self.decode
+        for item in encoded:
+            yield decode(item)
+
+
+# Module exports
+__all__ = [
+    "FactCodec"
+]
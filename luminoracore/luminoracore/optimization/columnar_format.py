@@ -0,0 +1,366 @@
+"""
+Columnar Batch Format - Phase 1 Quick Wins
+Dictionary/run-length encoded columns for fact batches
+
+CompactFact.to_array_batch() still repeats user_id, category and source
+in every row, although a batch almost always belongs to one user with a
+handful of categories. This format transposes the compact arrays into
+columns and encodes each column with the cheapest of:
+
+    ["p", v0, v1, ...]              plain values
+    ["r", v, n, v, n, ...]          run-length encoded (value, run length)
+    ["d", [values], indices]        dictionary encoded; indices are a
+                                    plain or run-length column
+    ["t", fmt, t0, d1, d2, ...]     timestamps as deltas from the
+                                    previous value (fmt: index into
+                                    TIMESTAMP_FORMATS, -1 for numbers)
+
+The result is still plain JSON, so it can be minified and measured
+with the existing size helpers:
+
+    {"v": 1, "n": 3, "c": [["r", "carlos", 3], ["d", ["pref", "goal"], ["p", 0, 1, 0]], ...]}
+
+Decoding is column-at-a-time (list repetition, index mapping and
+prefix sums) followed by a single zip into rows, and single columns can
+be decoded without materializing rows at all.
+
+Author: LuminoraCore Team
+Version: 1.2.0-lite
+"""
+
+from typing import Dict, List, Any, Optional, Tuple
+from datetime import datetime, timedelta
+from itertools import accumulate
+import calendar
+import copy
+import json
+
+from .compact_format import CompactFact
+
+# Format constants
+COLUMNAR_FORMAT_VERSION = 1
+
+# Column encodings
+ENCODING_PLAIN = "p"
+ENCODING_RLE = "r"
+ENCODING_DICT = "d"
+ENCODING_DELTA = "t"
+
+# Timestamp layouts that round-trip exactly through delta encoding
+TIMESTAMP_FORMATS = (
+    "%Y-%m-%dT%H:%M:%S.%f",
+    "%Y-%m-%dT%H:%M:%S.%fZ",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%SZ",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d",
+)
+_NUMERIC_TIMESTAMPS = -1
+_EPOCH = datetime(1970, 1, 1)
+
+# Column index of timestamps in CompactFact arrays
+_TIMESTAMP_COLUMN = CompactFact.INDICES["timestamp"]
+
+
+def _same(first: Any, second: Any) -> bool:
+    """Equality that keeps 1, 1.0 and True apart"""
+    return first.__class__ is second.__class__ and first == second
+
+
+def _runs(values: List[Any]) -> List[Any]:
+    """Flattened (value, run length) pairs"""
+    flat: List[Any] = []
+    for value in values:
+        if flat and _same(flat[-2], value):
+            flat[-1] += 1
+        else:
+            flat.append(value)
+            flat.append(1)
+    return flat
+
+
+def _encode_plain_or_rle(values: List[Any]) -> List[Any]:
+    """Run-length encode when runs at least halve the column"""
+    runs = _runs(values)
+    if len(runs) <= len(values):
+        return [ENCODING_RLE] + runs
+    return [ENCODING_PLAIN] + values
+
+
+def _to_ticks(value: str, fmt: str) -> Optional[int]:
+    """Timestamp string -> integer ticks, or None if it doesn't round-trip"""
+    try:
+        parsed = datetime.strptime(value, fmt)
+    except (TypeError, ValueError):
+        return None
+    if parsed.strftime(fmt) != value:
+        return None
+    seconds = calendar.timegm(parsed.timetuple())
+    return seconds * 1_000_000 + parsed.microsecond if "%f" in fmt else seconds
+
+
+def _from_ticks(ticks: int, fmt: str) -> str:
+    if "%f" in fmt:
+        return (_EPOCH + timedelta(microseconds=ticks)).strftime(fmt)
+    return (_EPOCH + timedelta(seconds=ticks)).strftime(fmt)
+
+
+def _encode_timestamps(values: List[Any]) -> Optional[List[Any]]:
+    """Delta-encode a timestamp column, or None if it can't be done exactly"""
+    present = [value for value in values if value is not None]
+    if len(present) < 2:
+        return None
+    
+    if all(isinstance(value, int) and not isinstance(value, bool) for value in present):
+        fmt_index, ticks = _NUMERIC_TIMESTAMPS, values
+    elif all(isinstance(value, str) for value in present):
+        fmt_index = next(
+            (index for index, fmt in enumerate(TIMESTAMP_FORMATS)
+             if _to_ticks(present[0], fmt) is not None),
+            None
+        )
+        if fmt_index is None:
+            return None
+        fmt = TIMESTAMP_FORMATS[fmt_index]
+        ticks = []
+        for value in values:
+            tick = None if value is None else _to_ticks(value, fmt)
+            if value is not None and tick is None:
+                return None
+            ticks.append(tick)
+    else:
+        return None
+    
+    encoded: List[Any] = [ENCODING_DELTA, fmt_index]
+    previous = 0
+    for tick in ticks:
+        if tick is None:
+            encoded.append(None)
+        else:
+            encoded.append(tick - previous)
+            previous = tick
+    return encoded
+
+
+def _encode_column(values: List[Any], timestamps: bool = False) -> List[Any]:
+    """Pick the cheapest encoding for one column"""
+    if timestamps:
+        encoded = _encode_timestamps(values)
+        if encoded is not None:
+            return encoded
+    
+    runs = _runs(values)
+    if len(runs) <= len(values):
+        return [ENCODING_RLE] + runs
+    
+    # Dictionary encoding for low-cardinality hashable values
+    dictionary: List[Any] = []
+    positions: Dict[Tuple[type, Any], int] = {}
+    indices: List[int] = []
+    try:
+        for value in values:
+            lookup = (value.__class__, value)
+            index = positions.get(lookup)
+            if index is None:
+                index = positions[lookup] = len(dictionary)
+                dictionary.append(value)
+            indices.append(index)
+    except TypeError:  # Unhashable values (lists, dicts)
+        return [ENCODING_PLAIN] + values
+    
+    if len(dictionary) * 2 <= len(values):
+        return [ENCODING_DICT, dictionary, _encode_plain_or_rle(indices)]
+    return [ENCODING_PLAIN] + values
+
+
+def _decode_column(column: List[Any], length: int) -> List[Any]:
+    """Decode one encoded column into a list of length values"""
+    encoding = column[0]
+    
+    if encoding == ENCODING_PLAIN:
+        return column[1:]
+    
+    if encoding == ENCODING_RLE:
+        values: List[Any] = []
+        for position in range(1, len(column), 2):
+            value, count = column[position], column[position + 1]
+            if isinstance(value, (list, dict)):
+                values.extend(copy.deepcopy(value) for _ in range(count))
+            else:
+                values.extend([value] * count)
+        return values
+    
+    if encoding == ENCODING_DICT:
+        dictionary = column[1]
+        return [dictionary[index] for index in _decode_column(column[2], length)]
+    
+    if encoding == ENCODING_DELTA:
+        fmt_index, deltas = column[1], column[2:]
+        ticks = accumulate(delta or 0 for delta in deltas)
+        if fmt_index == _NUMERIC_TIMESTAMPS:
+            return [None if delta is None else tick for delta, tick in zip(deltas, ticks)]
+        fmt = TIMESTAMP_FORMATS[fmt_index]
+        return [None if delta is None else _from_ticks(tick, fmt) for delta, tick in zip(deltas, ticks)]
+    
+    raise ValueError(f"Unknown column encoding: {encoding!r}")
+
+
+class ColumnarBatch:
+    """
+    Columnar representation of CompactFact array batches
+    
+    Operates on compact arrays (see CompactFact / FactCodec), so nested
+    key abbreviation is preserved; from_facts()/to_facts() wrap the
+    conversion to and from fact dictionaries.
+    
+    Example:
+        >>> arrays = [["carlos", "pref", "sport"], ["carlos", "pref", "food"]]
+        >>> ColumnarBatch.encode(arrays)
+        {'v': 1, 'n': 2, 'c': [['r', 'carlos', 2], ['r', 'pref', 2], ['p', 'sport', 'food']]}
+    """
+    
+    @staticmethod
+    def encode(arrays: List[List[Any]]) -> Dict[str, Any]:
+        """
+        Encode compact arrays column by column
+        
+        Args:
+            arrays: Compact fact arrays (rows may have trailing fields trimmed)
+        
+        Returns:
+            JSON-serializable columnar payload
+        """
+        width = max((len(array) for array in arrays), default=0)
+        columns = [[] for _ in range(width)]
+        for array in arrays:
+            for index in range(width):
+                columns[index].append(array[index] if index < len(array) else None)
+        
+        return {
+            "v": COLUMNAR_FORMAT_VERSION,
+            "n": len(arrays),
+            "c": [
+                _encode_column(column, timestamps=(index == _TIMESTAMP_COLUMN))
+                for index, column in enumerate(columns)
+            ]
+        }
+    
+    @staticmethod
+    def decode(payload: Dict[str, Any]) -> List[List[Any]]:
+        """
+        Decode a columnar payload back into compact arrays
+        
+        Args:
+            payload: Payload produced by encode()
+        
+        Returns:
+            Compact fact arrays
+        """
+        ColumnarBatch._check_version(payload)
+        length = payload["n"]
+        if not payload["c"]:
+            return [[] for _ in range(length)]
+        columns = [_decode_column(column, length) for column in payload["c"]]
+        return [list(row) for row in zip(*columns)]
+    
+    @staticmethod
+    def decode_column(payload: Dict[str, Any], field: str) -> List[Any]:
+        """
+        Decode a single field for every fact without building rows
+        
+        Args:
+            payload: Payload produced by encode()
+            field: Field name (see CompactFact.INDICES)
+        
+        Returns:
+            Field values in fact order
+        
+        Example:
+            >>> ColumnarBatch.decode_column(payload, "key")
+            ['sport', 'food']
+        """
+        ColumnarBatch._check_version(payload)
+        index = CompactFact.INDICES[field]
+        if index >= len(payload["c"]):
+            return [None] * payload["n"]
+        return _decode_column(payload["c"][index], payload["n"])
+    
+    @staticmethod
+    def is_columnar(data: Any) -> bool:
+        """Check whether data is a columnar payload"""
+        return isinstance(data, dict) and "c" in data and "n" in data and "v" in data
+    
+    @staticmethod
+    def _check_version(payload: Dict[str, Any]) -> None:
+        if payload.get("v") != COLUMNAR_FORMAT_VERSION:
+            raise ValueError(f"Unsupported columnar format version: {payload.get('v')!r}")
+    
+    @staticmethod
+    def from_facts(facts: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Encode fact dictionaries (via CompactFact arrays)"""
+        return ColumnarBatch.encode(CompactFact.to_array_batch(facts))
+    
+    @staticmethod
+    def to_facts(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Decode a payload into fact dictionaries (via CompactFact arrays)"""
+        return CompactFact.from_array_batch(ColumnarBatch.decode(payload))
+    
+    @staticmethod
+    def get_size_reduction(
+        facts: List[Dict[str, Any]],
+        payload: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """
+        Compare columnar size against minified compact JSON arrays
+        
+        Args:
+            facts: Fact dictionaries
+            payload: Optional pre-computed columnar payload
+        
+        Returns:
+            Dictionary with size metrics
+        """
+        if payload is None:
+            payload = ColumnarBatch.from_facts(facts)
+        array_size = len(json.dumps(CompactFact.to_array_batch(facts), separators=(',', ':')))
+        columnar_size = len(json.dumps(payload, separators=(',', ':')))
+        reduction_bytes = array_size - columnar_size
+        reduction_percent = (
+            (reduction_bytes / array_size * 100)
+            if array_size > 0
+            else 0
+        )
+        
+        return {
+            'array_size': array_size,
+            'columnar_size': columnar_size,
+            'reduction_bytes': reduction_bytes,
+            'reduction_percent': round(reduction_percent, 2)
+        }
+
+
+# Convenience functions
+def to_columnar(facts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Shorthand for ColumnarBatch.from_facts()"""
+    return ColumnarBatch.from_facts(facts)
+
+
+def from_columnar(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Shorthand for ColumnarBatch.to_facts()"""
+    return ColumnarBatch.to_facts(payload)
+
+
+def get_columnar_size_reduction(facts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Shorthand for ColumnarBatch.get_size_reduction()"""
+    return ColumnarBatch.get_size_reduction(facts)
+
+
+# Module exports
+__all__ = [
+    "ColumnarBatch",
+    "COLUMNAR_FORMAT_VERSION",
+    "TIMESTAMP_FORMATS",
+    "to_columnar",
+    "from_columnar",
+    "get_columnar_size_reduction"
+]
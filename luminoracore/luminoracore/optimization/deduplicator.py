@@ -12,12 +12,15 @@ This module:
 - Merges duplicates preserving highest importance/confidence
 - Maintains source tracking
 - Achieves 5-10% additional memory reduction
+- Supports incremental deduplication of a fact stream the caller
+  owns (DeduplicationIndex) and streaming compaction (deduplicate_iter)
+- Hands off to near-duplicate consolidation (near_duplicates.py)
 
 Author: LuminoraCore Team
 Version: 1.2.0-lite
 """
 
-from typing import Dict, List, Any, Set, Tuple, Optional
+from typing import Dict, List, Any, Set, Tuple, Optional, Hashable, Iterable, Iterator
 import hashlib
 import json
 from datetime import datetime
@@ -74,6 +77,37 @@ class FactDeduplicator:
         
         return fingerprint
     
+    @staticmethod
+    def _canonical(value: Any) -> Hashable:
+        """Hashable canonical form that distinguishes types like JSON does"""
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, sort_keys=True, separators=(',', ':'))
+        return (value.__class__, value)
+    
+    @staticmethod
+    def get_fact_key(fact: Dict[str, Any]) -> Hashable:
+        """
+        Generate a cheap in-process fingerprint for a fact
+        
+        Equivalent to get_fact_fingerprint() for equality purposes, but
+        built as a tuple of core fields instead of a SHA256 of JSON, so it
+        costs a few dict lookups for scalar values. Not stable across
+        processes; use get_fact_fingerprint() for persisted fingerprints.
+        
+        Args:
+            fact: Fact dictionary
+            
+        Returns:
+            Hashable key for the core fields
+        """
+        canonical = FactDeduplicator._canonical
+        return (
+            canonical(fact.get("user_id") if "user_id" in fact else fact.get("uid")),
+            canonical(fact.get("category") if "category" in fact else fact.get("cat")),
+            canonical(fact.get("key") if "key" in fact else fact.get("k")),
+            canonical(fact.get("value") if "value" in fact else fact.get("v"))
+        )
+    
     @staticmethod
     def merge_duplicates(facts: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -137,7 +171,11 @@ class FactDeduplicator:
             # Sources
             src = fact.get("source") if "source" in fact else fact.get("src")
             if src:
-                all_sources.add(src)
+                # Split already-merged sources so merging is associative
+                if isinstance(src, str):
+                    all_sources.update(part.strip() for part in src.split(SOURCE_SEPARATOR))
+                else:
+                    all_sources.add(src)
             
             # Tags
             tags = fact.get("tags", [])
@@ -151,6 +189,7 @@ class FactDeduplicator:
             merged["confidence"] = max_confidence
         if latest_timestamp:
             merged["timestamp"] = latest_timestamp
+        all_sources.discard("")
         if all_sources:
             merged["source"] = SOURCE_SEPARATOR.join(sorted(all_sources))
         if all_tags:
@@ -180,10 +219,10 @@ class FactDeduplicator:
             2
         """
         # Group facts by fingerprint
-        groups: Dict[str, List[Dict[str, Any]]] = {}
+        groups: Dict[Hashable, List[Dict[str, Any]]] = {}
         
         for fact in facts:
-            fingerprint = FactDeduplicator.get_fact_fingerprint(fact)
+            fingerprint = FactDeduplicator.get_fact_key(fact)
             if fingerprint not in groups:
                 groups[fingerprint] = []
             groups[fingerprint].append(fact)
@@ -196,6 +235,62 @@ class FactDeduplicator:
         
         return deduplicated
     
+    @staticmethod
+    def deduplicate_iter(facts: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Deduplicate a stream of facts in bounded memory
+        
+        Intended for offline compaction of large fact tables: the input
+        must be ordered by (user_id, category, key), e.g. a storage scan
+        sorted by primary key. Only the current run of facts sharing those
+        fields is held in memory, so memory use is bounded by the largest
+        run rather than by the table size. Output order matches
+        deduplicate() for such input.
+        
+        Args:
+            facts: Iterable of facts ordered by (user_id, category, key)
+            
+        Yields:
+            Unique facts (duplicates merged)
+            
+        Example:
+            >>> rows = storage_scan_sorted_by_key()  # generator
+            >>> for fact in FactDeduplicator.deduplicate_iter(rows):
+            ...     write(fact)
+        """
+        run_key = None
+        groups: Dict[Hashable, List[Dict[str, Any]]] = {}
+        
+        for fact in facts:
+            fact_key = FactDeduplicator.get_fact_key(fact)
+            if fact_key[:3] != run_key:
+                for group_facts in groups.values():
+                    yield FactDeduplicator.merge_duplicates(group_facts)
+                groups = {}
+                run_key = fact_key[:3]
+            groups.setdefault(fact_key, []).append(fact)
+        
+        for group_facts in groups.values():
+            yield FactDeduplicator.merge_duplicates(group_facts)
+    
+    @staticmethod
+    def consolidate_near_duplicates(facts: Iterable[Dict[str, Any]], config=None) -> List[Dict[str, Any]]:
+        """
+        Near-duplicate stage: merge paraphrased facts (MinHash/LSH)
+        
+        Catches facts such as favorite_food/favourite_food/food_preference
+        that exact deduplication misses. See near_duplicates.py.
+        
+        Args:
+            facts: Facts to consolidate
+            config: NearDuplicateConfig (uses defaults if None)
+            
+        Returns:
+            Consolidated facts
+        """
+        from .near_duplicates import consolidate_near_duplicates
+        return consolidate_near_duplicates(facts, config)
+    
     @staticmethod
     def get_deduplication_stats(
         original: List[Dict[str, Any]],
@@ -250,6 +345,76 @@ class FactDeduplicator:
         }
 
 
+class DeduplicationIndex:
+    """
+    Incremental fingerprint index for deduplicating a stream of facts
+    
+    Each add() merges a fact whose core fields match an indexed fact
+    into it in O(1), so a caller feeding facts one at a time (e.g. an
+    import) never holds duplicates. Storage backends do not use it:
+    they keep last-write-wins semantics.
+    """
+    
+    def __init__(self):
+        """Initialize an empty index"""
+        self._facts: Dict[Hashable, Dict[str, Any]] = {}
+    
+    def add(self, fact: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """
+        Index a fact, merging it with an existing duplicate
+        
+        Args:
+            fact: Fact being written
+            
+        Returns:
+            (fact to store, whether it was merged with a duplicate)
+            
+        Example:
+            >>> index = DeduplicationIndex()
+            >>> index.add({"user_id": "carlos", "key": "sport", "confidence": 0.7})
+            >>> stored, merged = index.add({"user_id": "carlos", "key": "sport", "confidence": 0.9})
+            >>> merged, stored["confidence"]
+            (True, 0.9)
+        """
+        fact_key = FactDeduplicator.get_fact_key(fact)
+        existing = self._facts.get(fact_key)
+        
+        if existing is None:
+            self._facts[fact_key] = fact
+            return fact, False
+        
+        merged = FactDeduplicator.merge_duplicates([existing, fact])
+        self._facts[fact_key] = merged
+        return merged, True
+    
+    def get(self, fact: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Get the indexed fact with the same core fields, if any"""
+        return self._facts.get(FactDeduplicator.get_fact_key(fact))
+    
+    def discard(self, fact: Dict[str, Any]) -> bool:
+        """
+        Remove a fact from the index (call before deleting or mutating it)
+        
+        Returns:
+            True if the fact was indexed
+        """
+        return self._facts.pop(FactDeduplicator.get_fact_key(fact), None) is not None
+    
+    def clear(self) -> None:
+        """Remove every indexed fact"""
+        self._facts.clear()
+    
+    def facts(self) -> List[Dict[str, Any]]:
+        """Get all indexed (deduplicated) facts"""
+        return list(self._facts.values())
+    
+    def __contains__(self, fact: Dict[str, Any]) -> bool:
+        return FactDeduplicator.get_fact_key(fact) in self._facts
+    
+    def __len__(self) -> int:
+        return len(self._facts)
+
+
 class DeduplicationConfig:
     """Configuration for deduplication behavior"""
     
@@ -275,16 +440,23 @@ class DeduplicationConfig:
         self.merge_tags = merge_tags
 
 
-# Convenience function
+# Convenience functions
 def deduplicate_facts(facts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Shorthand for FactDeduplicator.deduplicate()"""
     return FactDeduplicator.deduplicate(facts)
 
 
+def deduplicate_iter(facts: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Shorthand for FactDeduplicator.deduplicate_iter()"""
+    return FactDeduplicator.deduplicate_iter(facts)
+
+
 # Module exports
 __all__ = [
     "FactDeduplicator",
+    "DeduplicationIndex",
     "DeduplicationConfig",
-    "deduplicate_facts"
+    "deduplicate_facts",
+    "deduplicate_iter"
 ]
 
@@ -0,0 +1,472 @@
+"""
+Near-Duplicate Consolidation - Phase 1 Quick Wins
+Detect and merge paraphrased facts using MinHash/LSH
+
+Exact deduplication only catches identical (user_id, category, key, value)
+tuples. LLM extraction keeps producing paraphrased keys for the same
+information:
+
+    favorite_food: pizza
+    favourite_food: pizza
+    food_preference: pizza
+
+This module:
+- Normalizes keys and values (case, separators, filler key words)
+- Builds MinHash signatures over character shingles of the key
+- Buckets signatures with locality-sensitive hashing (LSH bands), scoped
+  by user, category and normalized value, so a new fact is only compared
+  against facts with the same value and a colliding key
+- Verifies candidate keys with exact Jaccard similarity
+- Merges near-duplicates with FactDeduplicator.merge_duplicates
+
+Facts whose normalized values differ are never merged, however similar
+their keys: "job_title: senior engineer" and "job_title: junior engineer"
+are different facts, and merging them would drop one of the values.
+
+Author: LuminoraCore Team
+Version: 1.2.0-lite
+"""
+
+from typing import Dict, List, Any, Tuple, Optional, Iterable, FrozenSet, Hashable
+import random
+import re
+import zlib
+
+from .deduplicator import FactDeduplicator
+
+# Constants
+DEFAULT_NEAR_DUPLICATE_THRESHOLD = 0.7
+DEFAULT_NUM_PERMUTATIONS = 64
+DEFAULT_SHINGLE_SIZE = 3
+DEFAULT_MAX_VARIANTS = 8
+
+# Key words that carry no information about *what* a fact is
+DEFAULT_KEY_STOPWORDS = frozenset({
+    "favorite", "favourite", "fav", "preferred", "preference", "preferences",
+    "user", "users", "my", "the", "of", "is"
+})
+
+# Which fact becomes the base of a merged group
+KEEP_POLICIES = ("confidence", "latest", "first")
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+class NearDuplicateConfig:
+    """Configuration for near-duplicate detection"""
+    
+    def __init__(
+        self,
+        threshold: float = DEFAULT_NEAR_DUPLICATE_THRESHOLD,
+        num_permutations: int = DEFAULT_NUM_PERMUTATIONS,
+        shingle_size: int = DEFAULT_SHINGLE_SIZE,
+        same_category: bool = True,
+        keep: str = "confidence",
+        max_variants: int = DEFAULT_MAX_VARIANTS,
+        stopwords: Iterable[str] = DEFAULT_KEY_STOPWORDS,
+        seed: int = 1
+    ):
+        """
+        Initialize near-duplicate configuration
+        
+        Args:
+            threshold: Minimum key similarity (Jaccard) for two facts with
+                the same normalized value to merge
+            num_permutations: MinHash signature length (accuracy vs. cost)
+            shingle_size: Character shingle length
+            same_category: Only compare facts within the same category
+            keep: Base fact of a merge ("confidence", "latest" or "first")
+            max_variants: Merged variants a cluster keeps for matching
+            stopwords: Key words ignored during normalization
+            seed: Seed for the MinHash permutations
+        """
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        if num_permutations < 1:
+            raise ValueError("num_permutations must be at least 1")
+        if shingle_size < 1:
+            raise ValueError("shingle_size must be at least 1")
+        if max_variants < 1:
+            raise ValueError("max_variants must be at least 1")
+        if keep not in KEEP_POLICIES:
+            raise ValueError(f"keep must be one of {KEEP_POLICIES}")
+        
+        self.threshold = threshold
+        self.num_permutations = num_permutations
+        self.shingle_size = shingle_size
+        self.same_category = same_category
+        self.keep = keep
+        self.max_variants = max_variants
+        self.stopwords = frozenset(stopwords)
+        self.seed = seed
+
+
+class MinHasher:
+    """
+    MinHash signatures over normalized fact keys
+    
+    Each permutation is a universal hash (a*x + b) mod p applied to a
+    32-bit shingle hash; the signature keeps the minimum per permutation.
+    The fraction of equal signature slots estimates Jaccard similarity.
+    """
+    
+    def __init__(self, config: Optional[NearDuplicateConfig] = None):
+        """
+        Initialize hasher
+        
+        Args:
+            config: Near-duplicate configuration (uses defaults if None)
+        """
+        self.config = config or NearDuplicateConfig()
+        rng = random.Random(self.config.seed)
+        self._permutations = [
+            (rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1))
+            for _ in range(self.config.num_permutations)
+        ]
+    
+    def normalize_key(self, fact: Dict[str, Any]) -> str:
+        """
+        Normalize a fact's key, dropping separators and filler words
+        
+        Example:
+            >>> MinHasher().normalize_key({"key": "Favourite_Food"})
+            'food'
+        """
+        key = fact.get("key") if "key" in fact else fact.get("k")
+        # Key words are joined so "home_town" and "hometown" normalize alike
+        return "".join(
+            word for word in _NON_ALNUM.split(str(key or "").lower())
+            if word and word not in self.config.stopwords
+        )
+    
+    @staticmethod
+    def normalize_value(fact: Dict[str, Any]) -> str:
+        """
+        Normalize a fact's value (case and punctuation only)
+        
+        Example:
+            >>> MinHasher.normalize_value({"value": "Football, on Sundays"})
+            'football on sundays'
+        """
+        value = fact.get("value") if "value" in fact else fact.get("v")
+        return " ".join(word for word in _NON_ALNUM.split(str(value if value is not None else "").lower()) if word)
+    
+    def normalize(self, fact: Dict[str, Any]) -> str:
+        """
+        Normalize a fact's key and value into comparable text
+        
+        Example:
+            >>> MinHasher().normalize({"key": "Favourite_Food", "value": "Pizza"})
+            'food pizza'
+        """
+        return " ".join(part for part in (self.normalize_key(fact), self.normalize_value(fact)) if part)
+    
+    def shingles(self, fact: Dict[str, Any]) -> FrozenSet[str]:
+        """Character shingles of the normalized fact key"""
+        text = self.normalize_key(fact)
+        size = self.config.shingle_size
+        if len(text) <= size:
+            return frozenset((text,))
+        return frozenset(text[i:i + size] for i in range(len(text) - size + 1))
+    
+    def signature(self, shingles: Iterable[str]) -> Tuple[int, ...]:
+        """
+        MinHash signature of a shingle set
+        
+        Args:
+            shingles: Shingle set (see shingles())
+        
+        Returns:
+            Tuple of num_permutations minimum hash values
+        """
+        hashes = [zlib.crc32(shingle.encode("utf-8")) for shingle in shingles]
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._permutations
+        )
+    
+    @staticmethod
+    def jaccard(first: FrozenSet[str], second: FrozenSet[str]) -> float:
+        """Exact Jaccard similarity of two shingle sets"""
+        if not first and not second:
+            return 1.0
+        return len(first & second) / len(first | second)
+
+
+def optimal_bands(num_permutations: int, threshold: float) -> Tuple[int, int]:
+    """
+    Choose LSH (bands, rows) so the collision curve is centred on threshold
+    
+    Two facts with Jaccard similarity s collide in at least one band with
+    probability 1 - (1 - s^rows)^bands; the curve's midpoint is roughly
+    (1 / bands) ^ (1 / rows).
+    
+    Args:
+        num_permutations: Signature length
+        threshold: Target similarity threshold
+    
+    Returns:
+        (bands, rows) with bands * rows <= num_permutations
+    """
+    best = (num_permutations, 1)
+    best_error = float("inf")
+    for rows in range(1, num_permutations + 1):
+        bands = num_permutations // rows
+        # Bias slightly below the threshold: a missed candidate is never
+        # recovered, while a false candidate is rejected by verification
+        error = abs((1.0 / bands) ** (1.0 / rows) - threshold * 0.9)
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class _Cluster:
+    """A consolidated fact and the shingle sets of every merged variant"""
+    
+    __slots__ = ("fact", "members")
+    
+    def __init__(self, fact: Dict[str, Any]):
+        self.fact = fact
+        self.members: List[FrozenSet[str]] = []
+
+
+class NearDuplicateIndex:
+    """
+    Incremental LSH index for near-duplicate consolidation
+    
+    Each added fact costs one signature plus one bucket lookup per band,
+    and is verified only against the clusters it collides with, so the
+    cost per new fact does not grow with the number of indexed facts.
+    Merged variants keep their own buckets (up to max_variants per
+    cluster), so later paraphrases of any variant still find the cluster.
+    
+    LSH only proposes candidate keys: buckets are scoped by the normalized
+    value, so a fact is merged only into a cluster with the same value.
+    """
+    
+    def __init__(self, config: Optional[NearDuplicateConfig] = None):
+        """
+        Initialize an empty index
+        
+        Args:
+            config: Near-duplicate configuration (uses defaults if None)
+        """
+        self.config = config or NearDuplicateConfig()
+        self.hasher = MinHasher(self.config)
+        self.bands, self.rows = optimal_bands(self.config.num_permutations, self.config.threshold)
+        
+        self._clusters: Dict[int, _Cluster] = {}
+        self._buckets: Dict[Hashable, List[int]] = {}
+        self._next_id = 0
+    
+    def _scope(self, fact: Dict[str, Any]) -> Tuple[Any, Any, str]:
+        """Facts are only compared within the same user (and category) and value"""
+        uid = fact.get("user_id") if "user_id" in fact else fact.get("uid")
+        cat = None
+        if self.config.same_category:
+            cat = fact.get("category") if "category" in fact else fact.get("cat")
+        return (uid, cat, self.hasher.normalize_value(fact))
+    
+    def _bucket_keys(self, scope: Tuple[Any, Any, str], signature: Tuple[int, ...]) -> List[Hashable]:
+        rows = self.rows
+        return [
+            (scope, band, signature[band * rows:(band + 1) * rows])
+            for band in range(self.bands)
+        ]
+    
+    def _best_match(self, shingles: FrozenSet[str],
+                    bucket_keys: List[Hashable]) -> Tuple[Optional[int], float]:
+        """Verify colliding clusters and return the most similar one"""
+        jaccard = self.hasher.jaccard
+        best_id, best_score = None, 0.0
+        seen = set()
+        for bucket_key in bucket_keys:
+            for cluster_id in self._buckets.get(bucket_key, ()):
+                if cluster_id in seen:
+                    continue
+                seen.add(cluster_id)
+                score = max(jaccard(shingles, member) for member in self._clusters[cluster_id].members)
+                if score > best_score:
+                    best_id, best_score = cluster_id, score
+        if best_score >= self.config.threshold:
+            return best_id, best_score
+        return None, best_score
+    
+    def _order(self, facts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Put the fact that should survive a merge first"""
+        keep = self.config.keep
+        if keep == "first":
+            return facts
+        
+        def confidence(fact):
+            conf = fact.get("confidence") if "confidence" in fact else fact.get("conf")
+            imp = fact.get("importance") if "importance" in fact else fact.get("imp")
+            return (conf or 0.0, imp or 0.0)
+        
+        def timestamp(fact):
+            ts = fact.get("timestamp") if "timestamp" in fact else fact.get("ts")
+            return str(ts or fact.get("updated_at") or fact.get("created_at") or "")
+        
+        if keep == "latest":
+            return sorted(facts, key=lambda f: (timestamp(f), confidence(f)), reverse=True)
+        return sorted(facts, key=lambda f: (confidence(f), timestamp(f)), reverse=True)
+    
+    def add(self, fact: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        Index a fact, merging it into a near-duplicate cluster if one exists
+        
+        Args:
+            fact: Fact being written
+        
+        Returns:
+            (consolidated fact, the fact it replaced or None if it is new)
+        
+        Example:
+            >>> index = NearDuplicateIndex()
+            >>> index.add({"user_id": "carlos", "category": "pref", "key": "favorite_food", "value": "pizza"})
+            >>> stored, replaced = index.add({"user_id": "carlos", "category": "pref",
+            ...                               "key": "favourite_food", "value": "pizza"})
+            >>> replaced is not None
+            True
+        """
+        shingles = self.hasher.shingles(fact)
+        bucket_keys = self._bucket_keys(self._scope(fact), self.hasher.signature(shingles))
+        cluster_id, _ = self._best_match(shingles, bucket_keys)
+        
+        if cluster_id is None:
+            cluster_id = self._next_id
+            self._next_id += 1
+            cluster = _Cluster(fact)
+            self._clusters[cluster_id] = cluster
+            replaced = None
+        else:
+            cluster = self._clusters[cluster_id]
+            replaced = cluster.fact
+            cluster.fact = FactDeduplicator.merge_duplicates(self._order([replaced, fact]))
+        
+        # Bounded variants keep verification and bucket growth per cluster constant
+        if len(cluster.members) < self.config.max_variants:
+            cluster.members.append(shingles)
+            for bucket_key in bucket_keys:
+                self._buckets.setdefault(bucket_key, []).append(cluster_id)
+        
+        return cluster.fact, replaced
+    
+    def find(self, fact: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Find the indexed near-duplicate of a fact without adding it
+        
+        Args:
+            fact: Fact to look up
+        
+        Returns:
+            Consolidated fact, or None if no cluster is similar enough
+        """
+        shingles = self.hasher.shingles(fact)
+        bucket_keys = self._bucket_keys(self._scope(fact), self.hasher.signature(shingles))
+        cluster_id, _ = self._best_match(shingles, bucket_keys)
+        return self._clusters[cluster_id].fact if cluster_id is not None else None
+    
+    def similarity(self, first: Dict[str, Any], second: Dict[str, Any]) -> float:
+        """Exact key similarity of two facts (0.0 when their normalized values differ)"""
+        if self.hasher.normalize_value(first) != self.hasher.normalize_value(second):
+            return 0.0
+        return self.hasher.jaccard(self.hasher.shingles(first), self.hasher.shingles(second))
+    
+    def clear(self) -> None:
+        """Remove every indexed fact"""
+        self._clusters.clear()
+        self._buckets.clear()
+    
+    def facts(self) -> List[Dict[str, Any]]:
+        """Get all consolidated facts in insertion order"""
+        return [cluster.fact for cluster in self._clusters.values()]
+    
+    def __len__(self) -> int:
+        return len(self._clusters)
+
+
+def consolidate_near_duplicates(facts: Iterable[Dict[str, Any]],
+                                config: Optional[NearDuplicateConfig] = None) -> List[Dict[str, Any]]:
+    """
+    Batch compaction: merge near-duplicate facts
+    
+    Args:
+        facts: Facts to consolidate (exact duplicates are merged too)
+        config: Near-duplicate configuration (uses defaults if None)
+    
+    Returns:
+        Consolidated facts, one per near-duplicate group
+    
+    Example:
+        >>> facts = [
+        ...     {"user_id": "carlos", "category": "pref", "key": "favorite_food", "value": "pizza"},
+        ...     {"user_id": "carlos", "category": "pref", "key": "food_preference", "value": "pizza"},
+        ... ]
+        >>> len(consolidate_near_duplicates(facts))
+        1
+    """
+    index = NearDuplicateIndex(config)
+    for fact in facts:
+        index.add(fact)
+    return index.facts()
+
+
+async def compact_user_facts(storage, user_id: str,
+                             config: Optional[NearDuplicateConfig] = None) -> Dict[str, Any]:
+    """
+    Compaction job: consolidate a user's stored near-duplicate facts
+    
+    Surviving facts are updated in place with the merged value and
+    confidence; absorbed variants are deleted.
+    
+    Args:
+        storage: Storage implementing get_facts/update_fact/delete_fact
+        user_id: User whose facts are compacted
+        config: Near-duplicate configuration (uses defaults if None)
+    
+    Returns:
+        Statistics dictionary
+    """
+    facts = await storage.get_facts(user_id)
+    consolidated = {
+        (fact.get("category"), fact.get("key")): fact
+        for fact in consolidate_near_duplicates(facts, config)
+    }
+    
+    removed = 0
+    for fact in facts:
+        survivor = consolidated.get((fact.get("category"), fact.get("key")))
+        if survivor is None:
+            await storage.delete_fact(user_id, fact.get("category"), fact.get("key"))
+            removed += 1
+        elif survivor is not fact:
+            await storage.update_fact(
+                user_id,
+                survivor.get("category"),
+                survivor.get("key"),
+                survivor.get("value"),
+                survivor.get("confidence", 0.8)
+            )
+    
+    return {
+        'user_id': user_id,
+        'original_count': len(facts),
+        'compacted_count': len(facts) - removed,
+        'removed_count': removed
+    }
+
+
+# Module exports
+__all__ = [
+    "NearDuplicateConfig",
+    "NearDuplicateIndex",
+    "MinHasher",
+    "optimal_bands",
+    "consolidate_near_duplicates",
+    "compact_user_facts",
+    "DEFAULT_NEAR_DUPLICATE_THRESHOLD",
+    "DEFAULT_KEY_STOPWORDS"
+]
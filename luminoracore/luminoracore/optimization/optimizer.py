@@ -19,15 +19,17 @@ Author: LuminoraCore Team
 Version: 1.2.0-lite
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union, Iterable, Iterator
 from dataclasses import dataclass, field
 import json
 
-from .key_mapping import compress_keys, expand_keys
 from .minifier import minify, parse_minified
 from .compact_format import CompactFact
+from .codec import FactCodec
+from .columnar_format import ColumnarBatch
 from .deduplicator import FactDeduplicator
-from .cache import FactCache, DEFAULT_CACHE_CAPACITY, DEFAULT_TTL_SECONDS
+from .near_duplicates import NearDuplicateIndex, NearDuplicateConfig
+from .cache import FactCache, DEFAULT_CACHE_CAPACITY, DEFAULT_TTL_SECONDS, DEFAULT_NEGATIVE_TTL_SECONDS
 
 
 @dataclass
@@ -42,21 +44,28 @@ class OptimizationConfig:
     key_abbreviation: bool = True
     minify_json: bool = True
     compact_format: bool = True
+    columnar_batches: bool = False  # compress_batch returns a ColumnarBatch payload
     deduplicate_memory: bool = True
     cache_enabled: bool = True
     
     # Cache configuration
     cache_capacity: int = DEFAULT_CACHE_CAPACITY
     cache_ttl_seconds: int = DEFAULT_TTL_SECONDS  # 1 hour
+    cache_max_bytes: Optional[int] = None  # No byte budget by default
+    cache_negative_ttl_seconds: int = DEFAULT_NEGATIVE_TTL_SECONDS
     
     # Deduplication config
     auto_deduplicate: bool = True
     preserve_sources: bool = True
     merge_tags: bool = True
+    near_duplicate_threshold: Optional[float] = None  # Enable MinHash/LSH stage, e.g. 0.7
     
     # Token budget (for future use)
     max_tokens_per_context: int = 20000
     
+    # Size statistics: measure every Nth compression (1 = every call)
+    stats_sample_every: int = 1
+    
     # Backward compatibility
     auto_expand: bool = True  # Expand keys when returning to user
     
@@ -66,14 +75,19 @@ class OptimizationConfig:
             'key_abbreviation': self.key_abbreviation,
             'minify_json': self.minify_json,
             'compact_format': self.compact_format,
+            'columnar_batches': self.columnar_batches,
             'deduplicate_memory': self.deduplicate_memory,
             'cache_enabled': self.cache_enabled,
             'cache_capacity': self.cache_capacity,
             'cache_ttl_seconds': self.cache_ttl_seconds,
+            'cache_max_bytes': self.cache_max_bytes,
+            'cache_negative_ttl_seconds': self.cache_negative_ttl_seconds,
             'auto_deduplicate': self.auto_deduplicate,
             'preserve_sources': self.preserve_sources,
             'merge_tags': self.merge_tags,
+            'near_duplicate_threshold': self.near_duplicate_threshold,
             'max_tokens_per_context': self.max_tokens_per_context,
+            'stats_sample_every': self.stats_sample_every,
             'auto_expand': self.auto_expand
         }
     
@@ -105,11 +119,22 @@ class Optimizer:
         if self.config.cache_enabled:
             self.cache = FactCache(
                 capacity=self.config.cache_capacity,
-                ttl_seconds=self.config.cache_ttl_seconds
+                ttl_seconds=self.config.cache_ttl_seconds,
+                max_bytes=self.config.cache_max_bytes,
+                negative_ttl_seconds=self.config.cache_negative_ttl_seconds
             )
         
         # Initialize deduplicator
         self.deduplicator = FactDeduplicator()
+        self.near_duplicate_config = None
+        if self.config.near_duplicate_threshold is not None:
+            self.near_duplicate_config = NearDuplicateConfig(threshold=self.config.near_duplicate_threshold)
+        
+        # Fused single-pass encoder for the compress/expand pipeline
+        self.codec = FactCodec(
+            key_abbreviation=self.config.key_abbreviation,
+            compact_format=self.config.compact_format
+        )
         
         # Statistics tracking
         self.stats = {
@@ -117,6 +142,7 @@ class Optimizer:
             'expansions': 0,
             'cache_hits': 0,
             'cache_misses': 0,
+            'sampled_compressions': 0,  # Compressions whose sizes were measured
             'total_reduction_bytes': 0,
             'total_original_bytes': 0,  # Track sum of original sizes
             'total_reduction_percent': 0.0
@@ -126,7 +152,7 @@ class Optimizer:
         """
         Apply full optimization pipeline to data
         
-        Pipeline:
+        Pipeline (fused into a single pass by FactCodec):
         1. Key abbreviation (if enabled)
         2. Compact format (if enabled)
         3. Minification (if enabled)
@@ -138,40 +164,53 @@ class Optimizer:
         Returns:
             Optimized data (compressed)
         """
-        original_size = len(json.dumps(data))
-        result = data.copy()
-        
-        # Step 1: Key abbreviation
-        if self.config.key_abbreviation:
-            result = compress_keys(result)
+        result = self.codec.encode(data)
         
-        # Step 2: Compact format (dict -> array)
-        if self.config.compact_format:
-            result = CompactFact.to_array(result)
+        # Minification is applied when serializing (see compress_to_json)
         
-        # Step 3: Minification
-        # Note: Minification is typically applied when serializing to string
-        # Here we return the structure, actual minification happens during JSON dump
-        
-        # Update stats
         if calculate_stats:
-            compressed_size = len(json.dumps(result, separators=(',', ':')))
-            self.stats['compressions'] += 1
-            self.stats['total_original_bytes'] += original_size
-            self.stats['total_reduction_bytes'] += (original_size - compressed_size)
-            if self.stats['total_original_bytes'] > 0:
-                self.stats['total_reduction_percent'] = (
-                    (self.stats['total_reduction_bytes'] / 
-                     self.stats['total_original_bytes']) * 100
-                )
+            self._record_compression(data, result)
         
         return result
     
+    def _record_compression(self, original: Dict[str, Any], compressed: Any) -> None:
+        """Update compression statistics, measuring sizes on sampled calls only"""
+        self.stats['compressions'] += 1
+        
+        sample_every = max(1, self.config.stats_sample_every)
+        if self.stats['compressions'] % sample_every:
+            return
+        
+        original_size = len(json.dumps(original))
+        compressed_size = len(json.dumps(compressed, separators=(',', ':')))
+        self.stats['sampled_compressions'] += 1
+        self.stats['total_original_bytes'] += original_size
+        self.stats['total_reduction_bytes'] += (original_size - compressed_size)
+        if self.stats['total_original_bytes'] > 0:
+            self.stats['total_reduction_percent'] = (
+                (self.stats['total_reduction_bytes'] / 
+                 self.stats['total_original_bytes']) * 100
+            )
+    
+    def compress_to_json(self, data: Dict[str, Any]) -> str:
+        """
+        Compress data and serialize it in one step
+        
+        Args:
+            data: Original fact dictionary
+        
+        Returns:
+            JSON string (minified if minify_json is enabled)
+        """
+        if self.config.minify_json:
+            return self.codec.encode_minified(data)
+        return json.dumps(self.codec.encode(data))
+    
     def expand(self, data: Any) -> Dict[str, Any]:
         """
         Reverse optimization pipeline to restore original format
         
-        Pipeline (reverse):
+        Pipeline (reverse, fused into a single pass by FactCodec):
         1. Parse minified (if needed)
         2. Array to dict (if compact format)
         3. Expand keys (if abbreviated)
@@ -182,81 +221,104 @@ class Optimizer:
         Returns:
             Original format dictionary
         """
-        result = data
-        original_array = None
-        
-        # Step 1: If it's an array, convert to dict
-        if isinstance(result, list) and self.config.compact_format:
-            original_array = result  # Save for later reference
-            result = CompactFact.from_array(result)
-            # Remove None values that weren't in original
-            result = {k: v for k, v in result.items() if v is not None}
-            # Remove empty tags list if it wasn't explicitly set in original
-            # CompactFact.from_array always adds tags: [] as default, so we remove it
-            # if it's the default empty list (was None or [] in array position 8)
-            if 'tags' in result and result['tags'] == []:
-                # If array has 9 elements and index 8 is empty list, it's the default
-                # Remove it to match original format
-                if original_array and len(original_array) > 8:
-                    # Check if tags was explicitly set or is default
-                    # Default is when arr[8] is None or empty list
-                    if original_array[8] is None or original_array[8] == []:
-                        result.pop('tags', None)
-        
-        # Step 2: Expand keys
-        if self.config.key_abbreviation and isinstance(result, dict):
-            result = expand_keys(result)
+        result = self.codec.decode(data)
         
         self.stats['expansions'] += 1
         
         return result
     
-    def compress_batch(self, facts: List[Dict[str, Any]]) -> List[Any]:
+    def iter_compress_batch(self, facts: Iterable[Dict[str, Any]]) -> Iterator[Any]:
+        """
+        Compress a stream of facts lazily
+        
+        Without deduplication each fact is encoded and yielded as it is
+        read, so generators and storage cursors are never materialized.
+        With deduplication, duplicates are grouped by fingerprint first and
+        each merged fact is encoded once as it is yielded. If
+        near_duplicate_threshold is set, merged facts then go through the
+        near-duplicate stage before encoding.
+        
+        Args:
+            facts: Any iterable of fact dictionaries
+        
+        Yields:
+            Compressed facts
+        """
+        if not self.config.deduplicate_memory:
+            yield from self.codec.iter_encode(facts)
+            return
+        
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for fact in facts:
+            fingerprint = self.deduplicator.get_fact_key(fact)
+            groups.setdefault(fingerprint, []).append(fact)
+        
+        encode = self.codec.encode
+        merge = self.deduplicator.merge_duplicates
+        if self.near_duplicate_config is None:
+            for group in groups.values():
+                yield encode(merge(group))
+            return
+        
+        index = NearDuplicateIndex(self.near_duplicate_config)
+        for group in groups.values():
+            index.add(merge(group))
+        for fact in index.facts():
+            yield encode(fact)
+    
+    def compress_batch(self, facts: List[Dict[str, Any]]) -> Union[List[Any], Dict[str, Any]]:
         """
         Compress multiple facts
         
+        With columnar_batches (and compact_format) enabled, the compressed
+        arrays are returned as a single dictionary/RLE encoded columnar
+        payload instead of a list (see ColumnarBatch).
+        
         Args:
             facts: List of fact dictionaries
         
         Returns:
-            List of compressed facts
-        """
-        compressed = [self.compress(fact, calculate_stats=False) for fact in facts]
-        
-        # Deduplicate if enabled
-        if self.config.deduplicate_memory and len(compressed) > 1:
-            # Convert back to dicts for deduplication
-            if self.config.compact_format:
-                dict_facts = [CompactFact.from_array(f) if isinstance(f, list) else f 
-                             for f in compressed]
-            else:
-                dict_facts = compressed
-            
-            # Deduplicate
-            deduplicated = self.deduplicator.deduplicate(dict_facts)
-            
-            # Convert back to compressed format
-            compressed = [self.compress(fact, calculate_stats=False) 
-                         for fact in deduplicated]
-        
+            List of compressed facts, or a columnar payload
+        """
+        compressed = list(self.iter_compress_batch(facts))
+        if self.config.columnar_batches and self.config.compact_format:
+            return ColumnarBatch.encode(compressed)
         return compressed
     
-    def expand_batch(self, compressed_facts: List[Any]) -> List[Dict[str, Any]]:
+    def iter_expand_batch(self, compressed_facts: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Expand a stream of compressed facts lazily
+        
+        Args:
+            compressed_facts: Any iterable of compressed facts
+        
+        Yields:
+            Original format dictionaries
+        """
+        for fact in compressed_facts:
+            yield self.expand(fact)
+    
+    def expand_batch(self, compressed_facts: Union[List[Any], Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Expand multiple facts
         
         Args:
-            compressed_facts: List of compressed facts
+            compressed_facts: List of compressed facts, or a columnar payload
         
         Returns:
             List of original format dictionaries
         """
-        return [self.expand(fact) for fact in compressed_facts]
+        if ColumnarBatch.is_columnar(compressed_facts):
+            compressed_facts = ColumnarBatch.decode(compressed_facts)
+        return list(self.iter_expand_batch(compressed_facts))
     
     def get_fact_cached(self, user_id: str, category: Optional[str] = None, 
-                        key: Optional[str] = None) -> Optional[Dict[str, Any]]:
+                        key: Optional[str] = None) -> Optional[Union[Dict[str, Any], List[Dict[str, Any]]]]:
         """
-        Get fact from cache or return None
+        Get fact (or fact collection) from cache or return None
+        
+        Without a key, serves get_facts(user_id) / get_facts(user_id, category)
+        from the materialized collections stored by put_facts_cache.
         
         Args:
             user_id: User ID
@@ -264,11 +326,20 @@ class Optimizer:
             key: Optional key filter
         
         Returns:
-            Fact dictionary if cached, None otherwise
+            Fact dictionary (or list of facts when key is None) if cached,
+            None otherwise
         """
         if not self.cache:
             return None
         
+        if key is None:
+            collection = self.cache.get_facts(user_id, category)
+            if collection is not None:
+                self.stats['cache_hits'] += 1
+                if self.config.auto_expand:
+                    return [self.expand(fact) for fact in collection]
+                return collection
+        
         cached = self.cache.get_fact(user_id, category, key)
         
         if cached:
@@ -278,24 +349,74 @@ class Optimizer:
             self.stats['cache_misses'] += 1
             return None
     
+    def _to_cache_format(self, fact: Dict[str, Any]) -> Dict[str, Any]:
+        """Compress a fact into the dict form stored in the cache"""
+        compressed = self.compress(fact)
+        
+        # Cache uses dict format, convert if needed
+        if isinstance(compressed, list):
+            compressed = CompactFact.from_array(compressed)
+        return compressed
+    
     def put_fact_cache(self, fact: Dict[str, Any]) -> None:
         """
         Store fact in cache
         
+        Cached collections containing the fact are updated as well.
+        
         Args:
             fact: Fact dictionary (in original format)
         """
         if not self.cache:
             return
         
-        # Compress before caching
-        compressed = self.compress(fact)
+        self.cache.put_fact(self._to_cache_format(fact))
+    
+    def put_facts_cache(self, user_id: str, facts: List[Dict[str, Any]],
+                        category: Optional[str] = None) -> None:
+        """
+        Store the complete fact collection for a user (or one category)
         
-        # Cache uses dict format, convert if needed
-        if isinstance(compressed, list):
-            compressed = CompactFact.from_array(compressed)
+        Args:
+            user_id: User ID
+            facts: All facts returned by storage for this query
+            category: Optional category the query was filtered by
+        """
+        if not self.cache:
+            return
+        
+        self.cache.put_facts(user_id, [self._to_cache_format(fact) for fact in facts], category)
+    
+    def put_missing_cache(self, user_id: str, category: str, key: str) -> None:
+        """
+        Remember (for a short TTL) that a fact does not exist
+        
+        Args:
+            user_id: User ID
+            category: Fact category
+            key: Fact key
+        """
+        if not self.cache:
+            return
+        
+        self.cache.put_missing(user_id, category, key)
+    
+    def is_missing_cached(self, user_id: str, category: str, key: str) -> bool:
+        """
+        Check whether the cache knows a fact does not exist
+        
+        Args:
+            user_id: User ID
+            category: Fact category
+            key: Fact key
+        
+        Returns:
+            True if the storage lookup can be skipped
+        """
+        if not self.cache:
+            return False
         
-        self.cache.put_fact(compressed)
+        return self.cache.is_missing(user_id, category, key)
     
     def invalidate_user_cache(self, user_id: str) -> int:
         """
@@ -359,6 +480,7 @@ class Optimizer:
             'expansions': 0,
             'cache_hits': 0,
             'cache_misses': 0,
+            'sampled_compressions': 0,
             'total_reduction_bytes': 0,
             'total_original_bytes': 0,
             'total_reduction_percent': 0.0
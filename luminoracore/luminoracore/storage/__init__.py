@@ -5,6 +5,7 @@ Storage implementations for different databases
 
 from .base_storage import BaseStorage
 from .in_memory_storage import InMemoryStorage
+from .concurrent_storage import ConcurrentInMemoryStorage
 
 # Import flexible storage if available
 try:
@@ -12,6 +13,7 @@ try:
     __all__ = [
         'BaseStorage',
         'InMemoryStorage',
+        'ConcurrentInMemoryStorage',
         'FlexibleStorageManager',
         'StorageType',
         'StorageConfig'
@@ -19,5 +21,6 @@ try:
 except ImportError:
     __all__ = [
         'BaseStorage',
-        'InMemoryStorage'
+        'InMemoryStorage',
+        'ConcurrentInMemoryStorage'
     ]
\ No newline at end of file
@@ -20,6 +20,12 @@ class BaseStorage(StorageInterface):
         }
         self.next_id = 1
     
+    def _allocate_id(self) -> int:
+        """Allocate the next sequential record ID"""
+        allocated = self.next_id
+        self.next_id += 1
+        return allocated
+    
     async def save_fact(self, user_id: str, category: str, key: str, value: Any, confidence: float = 0.8) -> bool:
         """Save a fact for a user"""
         try:
@@ -84,8 +90,7 @@ class BaseStorage(StorageInterface):
                           metadata: Optional[Dict] = None) -> bool:
         """Save an episode for a user"""
         try:
-            episode_id = f"episode_{self.next_id}"
-            self.next_id += 1
+            episode_id = f"episode_{self._allocate_id()}"
             
             episode_data = {
                 'id': episode_id,
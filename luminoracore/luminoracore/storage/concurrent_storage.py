@@ -0,0 +1,142 @@
+"""
+Concurrent In-Memory Storage Implementation
+Thread-safe in-memory storage with per-user lock striping
+"""
+
+import threading
+from contextlib import ExitStack
+from typing import Dict, List, Optional, Any
+from .base_storage import BaseStorage
+
+
+class ConcurrentInMemoryStorage(BaseStorage):
+    """
+    Thread-safe in-memory storage for multi-threaded hosts.
+
+    Every user is mapped onto one of ``num_stripes`` re-entrant locks, so
+    threads working on different users rarely contend with each other while
+    all mutations of a single user's data are serialized. Record IDs are
+    allocated under a dedicated lock, and readers always receive copies of
+    the stored records so they never observe a concurrent write.
+
+    The base implementations never suspend, so a stripe lock is never held
+    across a real ``await`` point.
+    """
+
+    DEFAULT_STRIPES = 64
+
+    def __init__(self, num_stripes: int = DEFAULT_STRIPES):
+        """
+        Initialize concurrent storage
+
+        Args:
+            num_stripes: Number of lock stripes users are distributed over
+        """
+        if num_stripes < 1:
+            raise ValueError("num_stripes must be at least 1")
+
+        super().__init__()
+        self.name = "ConcurrentInMemoryStorage"
+        self.description = "Thread-safe in-memory storage with per-user lock striping"
+        self.num_stripes = num_stripes
+        self._stripes = [threading.RLock() for _ in range(num_stripes)]
+        self._id_lock = threading.Lock()
+
+    def _lock_for(self, user_id: str) -> threading.RLock:
+        """Get the stripe lock guarding a user's data"""
+        return self._stripes[hash(user_id) % self.num_stripes]
+
+    def _lock_all(self) -> ExitStack:
+        """Acquire every stripe (in index order) for storage-wide operations"""
+        stack = ExitStack()
+        for lock in self._stripes:
+            stack.enter_context(lock)
+        return stack
+
+    def _allocate_id(self) -> int:
+        """Allocate the next sequential record ID atomically"""
+        with self._id_lock:
+            return super()._allocate_id()
+
+    async def save_fact(self, user_id: str, category: str, key: str, value: Any, confidence: float = 0.8) -> bool:
+        """Save a fact for a user"""
+        with self._lock_for(user_id):
+            return await super().save_fact(user_id, category, key, value, confidence)
+
+    async def get_facts(self, user_id: str, category: Optional[str] = None) -> List[Dict]:
+        """Get a snapshot of facts for a user, optionally filtered by category"""
+        with self._lock_for(user_id):
+            facts = await super().get_facts(user_id, category)
+            return [fact.copy() for fact in facts]
+
+    async def update_fact(self, user_id: str, category: str, key: str, value: Any, confidence: float = 0.8) -> bool:
+        """Update an existing fact"""
+        with self._lock_for(user_id):
+            return await super().update_fact(user_id, category, key, value, confidence)
+
+    async def delete_fact(self, user_id: str, category: str, key: str) -> bool:
+        """Delete a fact"""
+        with self._lock_for(user_id):
+            return await super().delete_fact(user_id, category, key)
+
+    async def save_episode(self, user_id: str, episode_type: str, title: str, summary: str,
+                          importance: float = 0.5, sentiment: str = "neutral",
+                          metadata: Optional[Dict] = None) -> bool:
+        """Save an episode for a user"""
+        with self._lock_for(user_id):
+            return await super().save_episode(user_id, episode_type, title, summary, importance, sentiment, metadata)
+
+    async def get_episodes(self, user_id: str, min_importance: Optional[float] = None,
+                          limit: Optional[int] = None) -> List[Dict]:
+        """Get a snapshot of episodes for a user, optionally filtered by importance"""
+        with self._lock_for(user_id):
+            episodes = await super().get_episodes(user_id, min_importance, limit)
+            return [episode.copy() for episode in episodes]
+
+    async def update_episode(self, user_id: str, episode_id: str, **kwargs) -> bool:
+        """Update an existing episode"""
+        with self._lock_for(user_id):
+            return await super().update_episode(user_id, episode_id, **kwargs)
+
+    async def delete_episode(self, user_id: str, episode_id: str) -> bool:
+        """Delete an episode"""
+        with self._lock_for(user_id):
+            return await super().delete_episode(user_id, episode_id)
+
+    async def update_affinity(self, user_id: str, personality_name: str, points_delta: int,
+                             interaction_type: str = "neutral") -> Dict:
+        """Update affinity between user and personality"""
+        with self._lock_for(user_id):
+            return await super().update_affinity(user_id, personality_name, points_delta, interaction_type)
+
+    async def get_affinity(self, user_id: str, personality_name: str) -> Optional[Dict]:
+        """Get affinity between user and personality"""
+        with self._lock_for(user_id):
+            return await super().get_affinity(user_id, personality_name)
+
+    async def get_all_affinities(self, user_id: str) -> List[Dict]:
+        """Get a snapshot of all affinities for a user"""
+        with self._lock_for(user_id):
+            affinities = await super().get_all_affinities(user_id)
+            return [affinity.copy() for affinity in affinities]
+
+    async def cleanup_old_data(self, days_old: int = 365) -> int:
+        """Clean up old data"""
+        with self._lock_all():
+            return await super().cleanup_old_data(days_old)
+
+    async def health_check(self) -> Dict:
+        """Check storage health"""
+        with self._lock_all():
+            return await super().health_check()
+
+    def get_storage_info(self) -> Dict:
+        """Get storage information"""
+        return {
+            'type': 'in_memory',
+            'name': self.name,
+            'description': self.description,
+            'persistent': False,
+            'thread_safe': True,
+            'lock_stripes': self.num_stripes
+        }
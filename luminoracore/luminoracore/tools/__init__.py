@@ -3,7 +3,15 @@ Tools for LuminoraCore personality management.
 """
 
 from .validator import PersonalityValidator
+from .batch_validator import BatchValidator, BatchValidationItem, ValidationCache
 from .compiler import PersonalityCompiler
 from .blender import PersonaBlend
 
-__all__ = ["PersonalityValidator", "PersonalityCompiler", "PersonaBlend"]
+__all__ = [
+    "PersonalityValidator",
+    "BatchValidator",
+    "BatchValidationItem",
+    "ValidationCache",
+    "PersonalityCompiler",
+    "PersonaBlend",
+]
@@ -0,0 +1,357 @@
+"""
+Batch personality validation for LuminoraCore.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Union, Iterable, Iterator, Set, Tuple
+
+from .. import __version__
+from .validator import PersonalityValidator, ValidationResult
+
+logger = logging.getLogger(__name__)
+
+# (cache key, content hash, file content) of a file waiting for validation
+_Job = Tuple[str, str, bytes]
+
+# Validator built once per worker process by _init_worker
+_worker_validator: Optional[PersonalityValidator] = None
+
+
+@dataclass
+class BatchValidationItem:
+    """Validation result of one file in a batch."""
+    path: Path
+    result: ValidationResult
+    cached: bool = False
+
+
+def _init_worker(
+    validator_class: type,
+    schema_path: str,
+    enable_performance_checks: bool,
+    validation_rules: Dict[str, Any]
+) -> None:
+    """Build the worker's validator, loading and compiling the schema once."""
+    global _worker_validator
+    # Per-file INFO logs from every worker would flood the parent's stderr
+    logging.getLogger(PersonalityValidator.__module__).setLevel(logging.WARNING)
+    _worker_validator = validator_class(schema_path, enable_performance_checks)
+    # Rules customised on the caller's validator must apply in workers too
+    _worker_validator.validation_rules = validation_rules
+
+
+def _validate_content(validator: PersonalityValidator, content: bytes) -> ValidationResult:
+    """Validate raw file content the way PersonalityValidator.validate validates a path."""
+    try:
+        data = json.loads(content.decode("utf-8"))
+    except ValueError as e:
+        return ValidationResult(False, [f"Validation error: {e}"], [], [])
+    return validator.validate(data)
+
+
+def _validate_chunk(jobs: List[_Job]) -> List[Tuple[str, str, ValidationResult]]:
+    """Worker task: validate a chunk of files."""
+    return [(key, digest, _validate_content(_worker_validator, content)) for key, digest, content in jobs]
+
+
+class ValidationCache:
+    """
+    Content hashes and results of previously validated files.
+    
+    Stored as one JSON file. Entries are only reused while the validator
+    fingerprint (schema, rules, options and package version) is unchanged.
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, path: Union[str, Path], fingerprint: str):
+        """
+        Initialize the cache.
+        
+        Args:
+            path: Cache file path
+            fingerprint: Fingerprint of the validator configuration
+        """
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._load()
+    
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable validation cache {self.path}: {e}")
+            return
+        if data.get("version") == self.VERSION and data.get("fingerprint") == self.fingerprint:
+            self._entries = data.get("entries", {})
+    
+    def get(self, key: str, digest: str) -> Optional[ValidationResult]:
+        """
+        Get the stored result of a file if its content is unchanged.
+        
+        Args:
+            key: File key
+            digest: SHA-256 of the file content
+        
+        Returns:
+            ValidationResult or None
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry.get("sha256") != digest:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return ValidationResult(**entry["result"])
+    
+    def put(self, key: str, digest: str, result: ValidationResult) -> None:
+        """Store the result of a file."""
+        self._entries[key] = {"sha256": digest, "result": asdict(result)}
+        self._dirty = True
+    
+    def save(self) -> None:
+        """Write the cache file if it changed."""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(
+                {"version": self.VERSION, "fingerprint": self.fingerprint, "entries": self._entries},
+                f, separators=(",", ":")
+            )
+        os.replace(temp_path, self.path)
+        self._dirty = False
+    
+    def clear(self) -> None:
+        """Remove all entries and the cache file."""
+        self._entries = {}
+        self._dirty = False
+        if self.path.exists():
+            self.path.unlink()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class BatchValidator:
+    """
+    Validates large sets of personality files with a process pool.
+    
+    Each worker process builds its validator once, so the schema is read
+    and compiled once per worker rather than once per file. Files are
+    read and hashed in the calling process and sent to the workers in
+    chunks, with a bounded number of chunks in flight, and results are
+    yielded as soon as their chunk finishes. With a cache_path, files
+    whose content hash matches the previous run are not validated again.
+    
+    Batches smaller than one chunk, or a max_workers of 1, are validated
+    in the calling process.
+    
+    Example:
+        >>> batch = BatchValidator(max_workers=8, cache_path=".luminoracore/validation-cache.json")
+        >>> for item in batch.iter_directory("personalities", recursive=True):
+        ...     if not item.result.is_valid:
+        ...         print(item.path, item.result.errors)
+    """
+    
+    def __init__(
+        self,
+        validator: Optional[PersonalityValidator] = None,
+        max_workers: Optional[int] = None,
+        chunk_size: int = 32,
+        cache_path: Optional[Union[str, Path]] = None
+    ):
+        """
+        Initialize the batch validator.
+        
+        Args:
+            validator: Validator used in the calling process (default:
+                PersonalityValidator()); workers build
+                ``type(validator)(schema_path, enable_performance_checks)``
+            max_workers: Worker processes (default: CPU count)
+            chunk_size: Files sent to a worker per task
+            cache_path: Incremental validation cache file (None disables it)
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.validator = validator or PersonalityValidator()
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.cache = ValidationCache(cache_path, self._fingerprint()) if cache_path else None
+    
+    def _fingerprint(self) -> str:
+        validator = self.validator
+        config = {
+            "version": __version__,
+            "validator": f"{type(validator).__module__}.{type(validator).__qualname__}",
+            "schema": validator.schema.get_schema(),
+            "rules": validator.validation_rules,
+            "performance_checks": validator.enable_performance_checks,
+        }
+        canonical = json.dumps(config, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+    
+    def _executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(
+                type(self.validator),
+                str(self.validator.schema.schema_path),
+                self.validator.enable_performance_checks,
+                self.validator.validation_rules,
+            )
+        )
+    
+    def _finish(self, path: Path, key: str, digest: str, result: ValidationResult) -> BatchValidationItem:
+        if self.cache is not None:
+            self.cache.put(key, digest, result)
+        return BatchValidationItem(path, result)
+    
+    def iter_files(self, paths: Iterable[Union[str, Path]]) -> Iterator[BatchValidationItem]:
+        """
+        Validate files, yielding results as they complete.
+        
+        Cached and unreadable files are yielded immediately; the others in
+        the order their chunks finish. The cache is saved when the
+        iteration ends or is closed.
+        
+        Args:
+            paths: Personality file paths
+        
+        Yields:
+            BatchValidationItem per file
+        """
+        paths_by_key: Dict[str, Path] = {}
+        chunk: List[_Job] = []
+        pending: Set[Future] = set()
+        executor: Optional[ProcessPoolExecutor] = None
+        
+        def drain(futures: Set[Future]) -> Iterator[BatchValidationItem]:
+            for future in futures:
+                pending.discard(future)
+                for key, digest, result in future.result():
+                    yield self._finish(paths_by_key.pop(key), key, digest, result)
+        
+        try:
+            for path in paths:
+                path = Path(path)
+                try:
+                    content = path.read_bytes()
+                except OSError as e:
+                    yield BatchValidationItem(path, ValidationResult(False, [f"Validation error: {e}"], [], []))
+                    continue
+                
+                key = str(path.resolve())
+                digest = hashlib.sha256(content).hexdigest()
+                if self.cache is not None:
+                    cached = self.cache.get(key, digest)
+                    if cached is not None:
+                        yield BatchValidationItem(path, cached, cached=True)
+                        continue
+                
+                if self.max_workers == 1:
+                    yield self._finish(path, key, digest, _validate_content(self.validator, content))
+                    continue
+                
+                paths_by_key[key] = path
+                chunk.append((key, digest, content))
+                if len(chunk) < self.chunk_size:
+                    continue
+                
+                if executor is None:
+                    executor = self._executor()
+                pending.add(executor.submit(_validate_chunk, chunk))
+                chunk = []
+                
+                # Bound memory: wait while the pool has enough queued work
+                if len(pending) >= self.max_workers * 2:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    yield from drain(done)
+                else:
+                    yield from drain({future for future in pending if future.done()})
+            
+            if chunk and executor is None:
+                # Less than one chunk in total: not worth starting processes
+                for key, digest, content in chunk:
+                    yield self._finish(paths_by_key.pop(key), key, digest, _validate_content(self.validator, content))
+            elif chunk:
+                pending.add(executor.submit(_validate_chunk, chunk))
+            chunk = []
+            
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                yield from drain(done)
+        finally:
+            if executor is not None:
+                for future in pending:
+                    future.cancel()
+                executor.shutdown(wait=True)
+            if self.cache is not None:
+                self.cache.save()
+    
+    def iter_directory(
+        self,
+        directory_path: Union[str, Path],
+        pattern: str = "*.json",
+        recursive: bool = False
+    ) -> Iterator[BatchValidationItem]:
+        """
+        Validate all personality files in a directory, yielding results as they complete.
+        
+        Args:
+            directory_path: Directory containing personality files
+            pattern: File name pattern
+            recursive: Include subdirectories
+        
+        Yields:
+            BatchValidationItem per file
+        """
+        directory = Path(directory_path)
+        if not directory.exists():
+            logger.error(f"Directory not found: {directory_path}")
+            return
+        
+        files = directory.rglob(pattern) if recursive else directory.glob(pattern)
+        found = False
+        for item in self.iter_files(path for path in files if path.is_file()):
+            found = True
+            yield item
+        if not found:
+            logger.warning(f"No JSON files found in {directory_path}")
+    
+    def validate_directory(
+        self,
+        directory_path: Union[str, Path],
+        pattern: str = "*.json",
+        recursive: bool = False
+    ) -> Dict[str, ValidationResult]:
+        """
+        Validate all personality files in a directory.
+        
+        Args:
+            directory_path: Directory containing personality files
+            pattern: File name pattern
+            recursive: Include subdirectories
+        
+        Returns:
+            Dictionary mapping file paths relative to the directory to validation results
+        """
+        directory = Path(directory_path)
+        return {
+            item.path.relative_to(directory).as_posix(): item.result
+            for item in self.iter_directory(directory, pattern, recursive)
+        }
@@ -15,6 +15,9 @@ from ..core.personality import Personality, PersonalityError
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+ADVANCED_PARAMETER_NAMES = ("verbosity", "formality", "humor", "empathy", "creativity", "directness")
+DEFAULT_TONE_LIMITS = ("max_aggression", "max_informality")
+
 
 @dataclass
 class BlendWeights:
@@ -43,6 +46,97 @@ class BlendResult:
     weights: BlendWeights
 
 
+class _NumericColumns:
+    """
+    Numeric sections of a personality set, packed column-wise.
+    
+    Advanced parameters, tone limits and ratings are extracted once per
+    personality set; each column keeps the row indices of personalities
+    that define it. Weighted averages for many weight vectors then run
+    over plain float lists, in the same order and with the same rounding
+    as the per-section blend methods.
+    """
+    
+    def __init__(self, personalities: List[Personality]):
+        self.names = [p.persona.name for p in personalities]
+        
+        # column name -> [(row index, value)]
+        self.parameters: Dict[str, List[Tuple[int, float]]] = {}
+        for name in ADVANCED_PARAMETER_NAMES:
+            self.parameters[name] = [
+                (row, getattr(p.advanced_parameters, name))
+                for row, p in enumerate(personalities)
+                if p.advanced_parameters and getattr(p.advanced_parameters, name) is not None
+            ]
+        
+        self.tone_limits: Dict[str, List[Tuple[int, float]]] = {name: [] for name in DEFAULT_TONE_LIMITS}
+        for row, p in enumerate(personalities):
+            if p.safety_guards and p.safety_guards.tone_limits:
+                for limit_name, limit_value in p.safety_guards.tone_limits.items():
+                    self.tone_limits.setdefault(limit_name, []).append((row, limit_value))
+        
+        self.ratings = [
+            (row, p.metadata.rating)
+            for row, p in enumerate(personalities)
+            if p.metadata and p.metadata.rating is not None
+        ]
+    
+    def weight_rows(self, weight_sets: List[BlendWeights]) -> List[List[float]]:
+        """Weight of each personality (columns) for each weight set (rows)."""
+        return [[weights.get_weight(name) for name in self.names] for weights in weight_sets]
+    
+    def advanced_parameters(self, weight_rows: List[List[float]]) -> List[Dict[str, float]]:
+        """Weighted average of each advanced parameter, per weight row."""
+        results: List[Dict[str, float]] = [{} for _ in weight_rows]
+        for name, column in self.parameters.items():
+            for result, row_weights in zip(results, weight_rows):
+                weighted_sum = 0
+                total_weight = 0
+                for row, value in column:
+                    weight = row_weights[row]
+                    weighted_sum += value * weight
+                    total_weight += weight
+                if total_weight > 0:
+                    result[name] = round(weighted_sum / total_weight, 2)
+        return results
+    
+    def tone_limit_sums(self, weight_rows: List[List[float]]) -> List[Dict[str, float]]:
+        """Weighted sum of each tone limit, per weight row."""
+        results: List[Dict[str, float]] = [{} for _ in weight_rows]
+        for name, column in self.tone_limits.items():
+            for result, row_weights in zip(results, weight_rows):
+                total = 0
+                for row, value in column:
+                    total = total + value * row_weights[row]
+                result[name] = total
+        return results
+    
+    def rating_averages(self, weight_rows: List[List[float]]) -> List[Optional[float]]:
+        """Weighted average rating (None when no weighted rating), per weight row."""
+        results: List[Optional[float]] = []
+        for row_weights in weight_rows:
+            rating_sum = 0
+            rating_count = 0
+            for row, rating in self.ratings:
+                weight = row_weights[row]
+                rating_sum += rating * weight
+                rating_count += weight
+            results.append(round(rating_sum / rating_count, 1) if rating_count > 0 else None)
+        return results
+    
+    def blend(self, weight_sets: List[BlendWeights]) -> List[Dict[str, Any]]:
+        """All numeric sections for each weight set."""
+        weight_rows = self.weight_rows(weight_sets)
+        return [
+            {"advanced_parameters": params, "tone_limits": limits, "rating": rating}
+            for params, limits, rating in zip(
+                self.advanced_parameters(weight_rows),
+                self.tone_limit_sums(weight_rows),
+                self.rating_averages(weight_rows)
+            )
+        ]
+
+
 class PersonaBlend:
     """Blends multiple personalities with specified weights."""
     
@@ -72,62 +166,111 @@ class PersonaBlend:
             BlendResult with blended personality
         """
         try:
-            # Validate inputs
-            if len(personalities) < 2:
-                raise PersonalityError("Need at least 2 personalities to blend")
-            
-            if len(personalities) != len(weights):
-                raise PersonalityError("Number of personalities must match number of weights")
+            blend_weights = self._validate_inputs(personalities, weights, strategy)
+            return self._blend_one(personalities, blend_weights, strategy, name)
             
-            # Convert weights to BlendWeights
-            if isinstance(weights, dict):
-                blend_weights = BlendWeights(weights)
-            else:
-                blend_weights = weights
-            
-            # Get blending strategy
-            if strategy not in self.blend_strategies:
-                raise PersonalityError(f"Unknown blending strategy: {strategy}")
-            
-            blend_func = self.blend_strategies[strategy]
-            
-            # Perform blending
-            blended_data = blend_func(personalities, blend_weights)
-            
-            # Set name if provided
-            if name:
-                blended_data["persona"]["name"] = name
-            else:
-                blended_data["persona"]["name"] = self._generate_blend_name(personalities, blend_weights)
-            
-            # Update metadata
-            blended_data["persona"]["description"] = self._generate_blend_description(personalities, blend_weights)
-            blended_data["persona"]["author"] = "PersonaBlend"
-            blended_data["persona"]["tags"] = self._blend_tags(personalities, blend_weights)
+        except Exception as e:
+            logger.error(f"Blending failed: {e}")
+            raise PersonalityError(f"Failed to blend personalities: {e}")
+    
+    def blend_batch(self, personalities: List[Personality],
+                    weight_sets: List[Union[Dict[str, float], BlendWeights]],
+                    strategy: str = "weighted_average",
+                    names: Optional[List[Optional[str]]] = None) -> List[BlendResult]:
+        """
+        Blend one personality set under many weight configurations.
+        
+        The numeric sections (advanced parameters, tone limits, rating) are
+        packed once and computed for all weight sets together; results are
+        the same as calling blend() once per weight set.
+        
+        Args:
+            personalities: List of Personality objects to blend
+            weight_sets: Weights for each configuration (dict or BlendWeights)
+            strategy: Blending strategy to use
+            names: Optional name per configuration
             
-            # Create blended personality
-            blended_personality = Personality(blended_data)
+        Returns:
+            BlendResult per weight set, in order
+        """
+        try:
+            if names is not None and len(names) != len(weight_sets):
+                raise PersonalityError("Number of names must match number of weight sets")
             
-            # Create blend info
-            blend_info = {
-                "strategy": strategy,
-                "source_personalities": [p.persona.name for p in personalities],
-                "weights": blend_weights.weights,
-                "created_at": blended_data.get("metadata", {}).get("created_at"),
-                "version": "1.0.0"
-            }
+            all_weights = [self._validate_inputs(personalities, weights, strategy) for weights in weight_sets]
+            numeric_rows: List[Optional[Dict[str, Any]]] = [None] * len(all_weights)
+            if strategy in ("weighted_average", "hybrid") and all_weights:
+                numeric_rows = _NumericColumns(personalities).blend(all_weights)
             
-            return BlendResult(
-                blended_personality=blended_personality,
-                blend_info=blend_info,
-                weights=blend_weights
-            )
+            return [
+                self._blend_one(personalities, blend_weights, strategy, names[k] if names else None, numeric_rows[k])
+                for k, blend_weights in enumerate(all_weights)
+            ]
             
         except Exception as e:
-            logger.error(f"Blending failed: {e}")
+            logger.error(f"Batch blending failed: {e}")
             raise PersonalityError(f"Failed to blend personalities: {e}")
     
-    def _weighted_average_blend(self, personalities: List[Personality], weights: BlendWeights) -> Dict[str, Any]:
+    def _validate_inputs(self, personalities: List[Personality],
+                         weights: Union[Dict[str, float], BlendWeights],
+                         strategy: str) -> BlendWeights:
+        """Validate blend inputs and return normalized weights."""
+        if len(personalities) < 2:
+            raise PersonalityError("Need at least 2 personalities to blend")
+        
+        if len(personalities) != len(weights.weights if isinstance(weights, BlendWeights) else weights):
+            raise PersonalityError("Number of personalities must match number of weights")
+        
+        if strategy not in self.blend_strategies:
+            raise PersonalityError(f"Unknown blending strategy: {strategy}")
+        
+        # Convert weights to BlendWeights
+        if isinstance(weights, dict):
+            return BlendWeights(weights)
+        return weights
+    
+    def _blend_one(self, personalities: List[Personality], blend_weights: BlendWeights,
+                   strategy: str, name: Optional[str],
+                   numeric: Optional[Dict[str, Any]] = None) -> BlendResult:
+        """Blend with validated inputs; numeric holds precomputed numeric sections."""
+        blend_func = self.blend_strategies[strategy]
+        if numeric is None and strategy in ("weighted_average", "hybrid"):
+            numeric = _NumericColumns(personalities).blend([blend_weights])[0]
+        
+        # Perform blending
+        blended_data = blend_func(personalities, blend_weights, numeric)
+        
+        # Set name if provided
+        if name:
+            blended_data["persona"]["name"] = name
+        else:
+            blended_data["persona"]["name"] = self._generate_blend_name(personalities, blend_weights)
+        
+        # Update metadata
+        blended_data["persona"]["description"] = self._generate_blend_description(personalities, blend_weights)
+        blended_data["persona"]["author"] = "PersonaBlend"
+        blended_data["persona"]["tags"] = self._blend_tags(personalities, blend_weights)
+        
+        # Create blended personality
+        blended_personality = Personality(blended_data)
+        
+        # Create blend info
+        blend_info = {
+            "strategy": strategy,
+            "source_personalities": [p.persona.name for p in personalities],
+            "weights": blend_weights.weights,
+            "created_at": blended_data.get("metadata", {}).get("created_at"),
+            "version": "1.0.0"
+        }
+        
+        return BlendResult(
+            blended_personality=blended_personality,
+            blend_info=blend_info,
+            weights=blend_weights
+        )
+    
+    def _weighted_average_blend(self, personalities: List[Personality], weights: BlendWeights,
+                                numeric: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Blend using weighted average of all components."""
         blended = {}
         
@@ -148,17 +291,18 @@ class PersonaBlend:
             elif key == "trigger_responses":
                 blended[key] = self._blend_trigger_responses(personalities, weights)
             elif key == "advanced_parameters":
-                blended[key] = self._blend_advanced_parameters(personalities, weights)
+                blended[key] = self._blend_advanced_parameters(personalities, weights, numeric)
             elif key == "safety_guards":
-                blended[key] = self._blend_safety_guards(personalities, weights)
+                blended[key] = self._blend_safety_guards(personalities, weights, numeric)
             elif key == "examples":
                 blended[key] = self._blend_examples(personalities, weights)
             elif key == "metadata":
-                blended[key] = self._blend_metadata(personalities, weights)
+                blended[key] = self._blend_metadata(personalities, weights, numeric)
         
         return blended
     
-    def _dominant_blend(self, personalities: List[Personality], weights: BlendWeights) -> Dict[str, Any]:
+    def _dominant_blend(self, personalities: List[Personality], weights: BlendWeights,
+                        numeric: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Blend using the dominant personality with some influence from others."""
         # Find dominant personality
         dominant_name = max(weights.weights.keys(), key=lambda k: weights.weights[k])
@@ -180,14 +324,15 @@ class PersonaBlend:
         
         return blended
     
-    def _hybrid_blend(self, personalities: List[Personality], weights: BlendWeights) -> Dict[str, Any]:
+    def _hybrid_blend(self, personalities: List[Personality], weights: BlendWeights,
+                      numeric: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Blend using hybrid approach - some components averaged, others selected."""
         blended = {}
         
         # Average these components
         avg_components = ["linguistic_profile", "advanced_parameters", "safety_guards"]
         for key in avg_components:
-            blended[key] = self._blend_component(personalities, weights, key)
+            blended[key] = self._blend_component(personalities, weights, key, numeric)
         
         # Select dominant for these components
         dominant_name = max(weights.weights.keys(), key=lambda k: weights.weights[k])
@@ -202,11 +347,12 @@ class PersonaBlend:
         # Blend trigger responses and examples
         blended["trigger_responses"] = self._blend_trigger_responses(personalities, weights)
         blended["examples"] = self._blend_examples(personalities, weights)
-        blended["metadata"] = self._blend_metadata(personalities, weights)
+        blended["metadata"] = self._blend_metadata(personalities, weights, numeric)
         
         return blended
     
-    def _random_blend(self, personalities: List[Personality], weights: BlendWeights) -> Dict[str, Any]:
+    def _random_blend(self, personalities: List[Personality], weights: BlendWeights,
+                      numeric: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Blend using random selection weighted by importance."""
         blended = {}
         
@@ -364,30 +510,15 @@ class PersonaBlend:
         
         return responses
     
-    def _blend_advanced_parameters(self, personalities: List[Personality], weights: BlendWeights) -> Dict[str, Any]:
+    def _blend_advanced_parameters(self, personalities: List[Personality], weights: BlendWeights,
+                                   numeric: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Blend advanced parameters using weighted average."""
-        params = {}
-        
-        param_names = ["verbosity", "formality", "humor", "empathy", "creativity", "directness"]
-        
-        for param_name in param_names:
-            weighted_sum = 0
-            total_weight = 0
-            
-            for personality in personalities:
-                if personality.advanced_parameters:
-                    param_value = getattr(personality.advanced_parameters, param_name)
-                    if param_value is not None:
-                        weight = weights.get_weight(personality.persona.name)
-                        weighted_sum += param_value * weight
-                        total_weight += weight
-            
-            if total_weight > 0:
-                params[param_name] = round(weighted_sum / total_weight, 2)
-        
-        return params
+        if numeric is None:
+            numeric = _NumericColumns(personalities).blend([weights])[0]
+        return dict(numeric["advanced_parameters"])
     
-    def _blend_safety_guards(self, personalities: List[Personality], weights: BlendWeights) -> Dict[str, Any]:
+    def _blend_safety_guards(self, personalities: List[Personality], weights: BlendWeights,
+                             numeric: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Blend safety guards."""
         guards = {
             "forbidden_topics": [],
@@ -411,14 +542,9 @@ class PersonaBlend:
         
         # Average tone limits
         if personalities:
-            tone_limits = {"max_aggression": 0, "max_informality": 0}
-            for personality in personalities:
-                if personality.safety_guards and personality.safety_guards.tone_limits:
-                    weight = weights.get_weight(personality.persona.name)
-                    for limit_name, limit_value in personality.safety_guards.tone_limits.items():
-                        tone_limits[limit_name] = tone_limits.get(limit_name, 0) + limit_value * weight
-            
-            guards["tone_limits"] = tone_limits
+            if numeric is None:
+                numeric = _NumericColumns(personalities).blend([weights])[0]
+            guards["tone_limits"] = dict(numeric["tone_limits"])
         
         return guards
     
@@ -456,7 +582,8 @@ class PersonaBlend:
         
         return examples
     
-    def _blend_metadata(self, personalities: List[Personality], weights: BlendWeights) -> Dict[str, Any]:
+    def _blend_metadata(self, personalities: List[Personality], weights: BlendWeights,
+                        numeric: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Blend metadata."""
         from datetime import datetime
         
@@ -469,27 +596,22 @@ class PersonaBlend:
         }
         
         # Average rating
-        rating_sum = 0
-        rating_count = 0
-        for personality in personalities:
-            if personality.metadata and personality.metadata.rating is not None:
-                weight = weights.get_weight(personality.persona.name)
-                rating_sum += personality.metadata.rating * weight
-                rating_count += weight
-        
-        if rating_count > 0:
-            metadata["rating"] = round(rating_sum / rating_count, 1)
+        if numeric is None:
+            numeric = _NumericColumns(personalities).blend([weights])[0]
+        if numeric["rating"] is not None:
+            metadata["rating"] = numeric["rating"]
         
         return metadata
     
-    def _blend_component(self, personalities: List[Personality], weights: BlendWeights, component_name: str) -> Any:
+    def _blend_component(self, personalities: List[Personality], weights: BlendWeights, component_name: str,
+                         numeric: Optional[Dict[str, Any]] = None) -> Any:
         """Blend a specific component."""
         if component_name == "linguistic_profile":
             return self._blend_linguistic_profile(personalities, weights)
         elif component_name == "advanced_parameters":
-            return self._blend_advanced_parameters(personalities, weights)
+            return self._blend_advanced_parameters(personalities, weights, numeric)
         elif component_name == "safety_guards":
-            return self._blend_safety_guards(personalities, weights)
+            return self._blend_safety_guards(personalities, weights, numeric)
         else:
             return {}
     
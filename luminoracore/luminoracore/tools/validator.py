@@ -234,33 +234,30 @@ class PersonalityValidator:
         """
         return self.validate(file_path)
     
-    def validate_directory(self, directory_path: Union[str, Path]) -> Dict[str, ValidationResult]:
+    def validate_directory(
+        self,
+        directory_path: Union[str, Path],
+        max_workers: int = 1,
+        cache_path: Optional[Union[str, Path]] = None,
+        recursive: bool = False
+    ) -> Dict[str, ValidationResult]:
         """
         Validate all personality files in a directory.
         
         Args:
             directory_path: Path to directory containing personality files
+            max_workers: Worker processes (1 validates in this process)
+            cache_path: Incremental validation cache file; files whose content
+                is unchanged since the last run are not validated again
+            recursive: Include subdirectories
             
         Returns:
-            Dictionary mapping filenames to validation results
+            Dictionary mapping filenames (relative to the directory) to validation results
         """
-        results = {}
-        directory = Path(directory_path)
+        from .batch_validator import BatchValidator
         
-        if not directory.exists():
-            logger.error(f"Directory not found: {directory_path}")
-            return results
-        
-        json_files = list(directory.glob("*.json"))
-        if not json_files:
-            logger.warning(f"No JSON files found in {directory_path}")
-            return results
-        
-        for file_path in json_files:
-            logger.info(f"Validating {file_path.name}")
-            results[file_path.name] = self.validate(file_path)
-        
-        return results
+        batch = BatchValidator(self, max_workers=max_workers, cache_path=cache_path)
+        return batch.validate_directory(directory_path, recursive=recursive)
     
     def get_validation_summary(self, results: Dict[str, ValidationResult]) -> Dict[str, Any]:
         """
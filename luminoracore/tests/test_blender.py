@@ -0,0 +1,67 @@
+"""
+Tests for PersonaBlend batch and numeric blending.
+"""
+
+import pytest
+from pathlib import Path
+
+from luminoracore.core.personality import Personality, PersonalityError
+from luminoracore.tools.blender import PersonaBlend, BlendWeights, _NumericColumns
+
+PERSONALITIES_DIR = Path(__file__).parent.parent / "luminoracore" / "personalities"
+
+
+@pytest.fixture
+def personalities():
+    return [
+        Personality(PERSONALITIES_DIR / f"{name}.json")
+        for name in ("dr_luna", "captain_hook", "grandma_hope")
+    ]
+
+
+def _numeric_sections(result):
+    data = result.blended_personality.to_dict()
+    return data["advanced_parameters"], data["safety_guards"]["tone_limits"], data["metadata"]["rating"]
+
+
+class TestPersonaBlendBatch:
+    """Test cases for PersonaBlend.blend_batch."""
+    
+    def test_batch_matches_single_blends(self, personalities):
+        """Test that each batch result equals a separate blend() call."""
+        names = [p.persona.name for p in personalities]
+        weight_sets = [
+            dict(zip(names, weights))
+            for weights in ([0.5, 0.3, 0.2], [0.1, 0.1, 0.8], [1, 2, 3], [0.34, 0.33, 0.33])
+        ]
+        blender = PersonaBlend()
+        
+        for strategy in ("weighted_average", "hybrid"):
+            batch = blender.blend_batch(personalities, weight_sets, strategy=strategy)
+            assert len(batch) == len(weight_sets)
+            for result, weights in zip(batch, weight_sets):
+                single = blender.blend(personalities, weights, strategy=strategy)
+                assert _numeric_sections(result) == _numeric_sections(single)
+                assert result.weights.weights == single.weights.weights
+    
+    def test_batch_names(self, personalities):
+        """Test per-configuration names and name count validation."""
+        names = [p.persona.name for p in personalities]
+        weight_sets = [dict(zip(names, [1, 1, 1])), dict(zip(names, [3, 1, 1]))]
+        blender = PersonaBlend()
+        
+        results = blender.blend_batch(personalities, weight_sets, names=["even", None])
+        assert results[0].blended_personality.persona.name == "even"
+        assert results[1].blended_personality.persona.name == f"Blend of {names[0]}"
+        
+        with pytest.raises(PersonalityError):
+            blender.blend_batch(personalities, weight_sets, names=["only one"])
+    
+    def test_numeric_columns_skip_missing_values(self, personalities):
+        """Test that weighted averages only count personalities defining a value."""
+        columns = _NumericColumns(personalities)
+        columns.parameters["humor"] = [(0, 0.2), (2, 0.8)]  # Row 1 has no humor
+        weights = BlendWeights({name: 1.0 for name in columns.names})
+        
+        params = columns.advanced_parameters(columns.weight_rows([weights]))[0]
+        assert params["humor"] == pytest.approx(0.5)
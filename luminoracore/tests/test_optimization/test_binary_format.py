@@ -0,0 +1,159 @@
+"""
+Tests for binary_format.py
+Phase 1 - Quick Wins - Semana 2
+
+Test Categories:
+- TestRoundtrip: Encode/decode fidelity
+- TestLazyAccess: Random access and memory-mapped files
+- TestValidation: Header validation
+- TestSizeReduction: Size compared to compact JSON arrays
+"""
+
+import pytest
+from luminoracore.optimization.binary_format import (
+    BinaryFactBatch,
+    BINARY_FORMAT_VERSION,
+    to_binary,
+    from_binary,
+    to_binary_batch,
+    from_binary_batch,
+    get_binary_size_reduction
+)
+from luminoracore.optimization.compact_format import CompactFact
+
+
+FACTS = [
+    {
+        "user_id": "carlos",
+        "category": "preferences",
+        "key": "favorite_sport",
+        "value": "basketball",
+        "importance": 0.85,
+        "timestamp": "2024-11-18T10:30:00Z",
+        "source": "conversation",
+        "confidence": 0.95,
+        "tags": ["sports"]
+    },
+    {"user_id": "carlos", "category": "goals", "key": "career", "value": {"role": "engineer", "years": 5}},
+    {"uid": "carlos", "cat": "preferences", "k": "age", "v": -42, "imp": 0, "tags": []},
+    {"user_id": "carlos", "category": "preferences", "key": "vegan", "value": False, "confidence": 1.0},
+    {"user_id": "carlos", "category": "context", "key": "city", "value": "São Paulo ☀"}
+]
+
+
+def _expected(fact):
+    """Decoded form produced by the compact array pipeline"""
+    return CompactFact.from_array(CompactFact.to_array(fact))
+
+
+class TestRoundtrip:
+    """Test encode/decode fidelity"""
+    
+    @pytest.mark.parametrize("fact", FACTS)
+    def test_single_fact(self, fact):
+        """Test single fact roundtrip"""
+        assert from_binary(to_binary(fact)) == _expected(fact)
+    
+    def test_batch(self):
+        """Test batch roundtrip preserves order"""
+        batch = from_binary_batch(to_binary_batch(FACTS))
+        
+        assert len(batch) == len(FACTS)
+        assert list(batch) == [_expected(f) for f in FACTS]
+    
+    def test_generator_input(self):
+        """Test encoding from a generator"""
+        data = BinaryFactBatch.encode(f for f in FACTS)
+        
+        assert len(BinaryFactBatch(data)) == len(FACTS)
+    
+    def test_empty_batch(self):
+        """Test encoding no facts"""
+        batch = BinaryFactBatch(BinaryFactBatch.encode([]))
+        
+        assert len(batch) == 0
+        assert list(batch) == []
+
+
+class TestLazyAccess:
+    """Test random access and memory mapping"""
+    
+    def test_random_access(self):
+        """Test indexing decodes a single fact"""
+        batch = BinaryFactBatch(to_binary_batch(FACTS))
+        
+        assert batch[3]["key"] == "vegan"
+        assert batch[-1]["value"] == "São Paulo ☀"
+        assert batch.get_array(1)[2] == "career"
+    
+    def test_index_out_of_range(self):
+        """Test out of range index raises IndexError"""
+        batch = BinaryFactBatch(to_binary_batch(FACTS))
+        
+        with pytest.raises(IndexError):
+            batch[len(FACTS)]
+    
+    def test_memoryview_input(self):
+        """Test decoding over a memoryview slice"""
+        data = b"padding" + to_binary_batch(FACTS)
+        batch = BinaryFactBatch(memoryview(data)[7:])
+        
+        assert batch[0]["user_id"] == "carlos"
+    
+    def test_memory_mapped_file(self, tmp_path):
+        """Test opening a memory-mapped batch file"""
+        path = tmp_path / "facts.lcfb"
+        path.write_bytes(to_binary_batch(FACTS))
+        
+        with BinaryFactBatch.open(str(path)) as batch:
+            assert len(batch) == len(FACTS)
+            assert batch[1]["value"] == {"role": "engineer", "years": 5}
+
+
+class TestValidation:
+    """Test header validation"""
+    
+    def test_bad_magic(self):
+        """Test non-batch data is rejected"""
+        with pytest.raises(ValueError):
+            BinaryFactBatch(b"x" * 64)
+    
+    def test_too_small(self):
+        """Test truncated buffers are rejected"""
+        with pytest.raises(ValueError):
+            BinaryFactBatch(b"LCFB")
+    
+    def test_future_version(self):
+        """Test newer format versions are rejected"""
+        data = bytearray(to_binary_batch(FACTS))
+        data[4] = BINARY_FORMAT_VERSION + 1
+        
+        with pytest.raises(ValueError):
+            BinaryFactBatch(bytes(data))
+
+
+class TestSizeReduction:
+    """Test size compared to compact JSON arrays"""
+    
+    def test_batch_smaller_than_arrays(self):
+        """Test interning makes large single-user batches smaller"""
+        facts = [
+            {
+                "user_id": "carlos",
+                "category": ["preferences", "goals"][i % 2],
+                "key": f"key_{i % 20}",
+                "value": i,
+                "importance": 0.5,
+                "source": "conversation"
+            }
+            for i in range(200)
+        ]
+        
+        metrics = get_binary_size_reduction(facts)
+        
+        assert metrics['binary_size'] < metrics['array_size']
+        assert metrics['reduction_percent'] > 30
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
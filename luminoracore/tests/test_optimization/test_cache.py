@@ -9,15 +9,20 @@ Test Categories:
 - TestFactCache: Fact-specific caching
 - TestStatistics: Cache statistics
 - TestConfiguration: CacheConfig
+- TestIndexAndBudget: Tag index, byte budget, per-item TTL, thread safety
+- TestFactCollections: Collection and negative caching
 """
 
 import pytest
+import sys
+import threading
 import time
 from luminoracore.optimization.cache import (
     LRUCache,
     FactCache,
     CacheConfig
 )
+from luminoracore.optimization.optimizer import Optimizer
 
 
 class TestLRUCache:
@@ -343,6 +348,243 @@ class TestFactCache:
         assert cache.cache.size() == 0
 
 
+class TestIndexAndBudget:
+    """Test tag index, byte budget, per-item TTL and thread safety"""
+    
+    def test_invalidate_tag(self):
+        """Test tag invalidation only touches tagged keys"""
+        cache = LRUCache()
+        
+        cache.put("a", 1, tag="carlos")
+        cache.put("b", 2, tag="carlos")
+        cache.put("c", 3, tag="maria")
+        
+        assert cache.invalidate_tag("carlos") == 2
+        assert cache.get("a") is None
+        assert cache.get("c") == 3
+        assert cache.keys_for_tag("carlos") == []
+    
+    def test_eviction_updates_tag_index(self):
+        """Test evicted keys leave the tag index"""
+        cache = LRUCache(capacity=1)
+        
+        cache.put("a", 1, tag="carlos")
+        cache.put("b", 2, tag="maria")
+        
+        assert cache.keys_for_tag("carlos") == []
+        assert cache.invalidate_tag("carlos") == 0
+    
+    def test_per_item_ttl(self):
+        """Test per-item TTL overrides the cache default"""
+        cache = LRUCache(ttl_seconds=60)
+        
+        cache.put("short", "value", ttl_seconds=0.1)
+        cache.put("long", "value")
+        time.sleep(0.2)
+        
+        assert cache.cleanup_expired() == 1
+        assert cache.get("long") == "value"
+        assert cache.get_stats()['expirations'] == 1
+    
+    def test_update_resets_expiry(self):
+        """Test re-putting a key supersedes its old expiry"""
+        cache = LRUCache(ttl_seconds=60)
+        
+        cache.put("key", "v1", ttl_seconds=0.1)
+        cache.put("key", "v2")
+        time.sleep(0.2)
+        
+        assert cache.cleanup_expired() == 0
+        assert cache.get("key") == "v2"
+    
+    def test_byte_budget_eviction(self):
+        """Test LRU items are evicted to respect the byte budget"""
+        cache = LRUCache(capacity=100, max_bytes=25, sizeof=len)
+        
+        cache.put("a", "x" * 10)
+        cache.put("b", "x" * 10)
+        cache.put("c", "x" * 10)
+        
+        assert cache.get("a") is None
+        assert cache.get("c") == "x" * 10
+        assert cache.total_bytes <= 25
+    
+    def test_heap_stays_bounded(self):
+        """Test repeated updates don't grow the expiry heap without bound"""
+        cache = LRUCache(capacity=10)
+        
+        for i in range(1000):
+            cache.put("key", i)
+        
+        assert len(cache._expiry_heap) <= 20
+    
+    def test_concurrent_puts(self):
+        """Test cache stays consistent under concurrent writers"""
+        cache = LRUCache(capacity=50)
+        
+        def worker(n):
+            for i in range(500):
+                cache.put(f"{n}:{i}", i, tag=str(n))
+                cache.get(f"{n}:{i - 1}")
+        
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert cache.size() == 50
+        tagged = sum(len(cache.keys_for_tag(str(n))) for n in range(8))
+        assert tagged == 50
+
+
+class TestFactCacheIndex:
+    """Test FactCache per-user index"""
+    
+    def test_invalidate_user_returns_count(self):
+        """Test invalidate_user reports removed entries"""
+        cache = FactCache()
+        
+        cache.put_fact({"user_id": "carlos", "category": "pref", "key": "sport"})
+        cache.put_fact({"user_id": "carlos", "category": "goal", "key": "career"})
+        cache.put_fact({"user_id": "carlos2", "category": "pref", "key": "food"})
+        
+        assert cache.invalidate_user("carlos") == 2
+        assert cache.get_fact("carlos2", "pref", "food") is not None
+
+
+class TestFactCollections:
+    """Test collection-level and negative caching"""
+    
+    FACTS = [
+        {"user_id": "carlos", "category": "pref", "key": "sport", "value": "basketball"},
+        {"user_id": "carlos", "category": "pref", "key": "food", "value": "pizza"},
+        {"user_id": "carlos", "category": "goal", "key": "career", "value": "engineer"}
+    ]
+    
+    def test_user_collection(self):
+        """Test materialized per-user collection"""
+        cache = FactCache()
+        
+        assert cache.get_facts("carlos") is None
+        cache.put_facts("carlos", self.FACTS)
+        
+        assert len(cache.get_facts("carlos")) == 3
+    
+    def test_category_derived_from_user_collection(self):
+        """Test category request served from the user collection"""
+        cache = FactCache()
+        cache.put_facts("carlos", self.FACTS)
+        
+        prefs = cache.get_facts("carlos", "pref")
+        assert {f["key"] for f in prefs} == {"sport", "food"}
+    
+    def test_single_fact_from_collection(self):
+        """Test single-fact lookups fall back to collections"""
+        cache = FactCache()
+        cache.put_facts("carlos", self.FACTS[:2], category="pref")
+        
+        assert cache.get_fact("carlos", "pref", "food")["value"] == "pizza"
+        assert cache.is_missing("carlos", "pref", "music")
+        assert not cache.is_missing("carlos", "goal", "career")
+    
+    def test_put_fact_keeps_collections_coherent(self):
+        """Test put_fact updates cached user and category collections"""
+        cache = FactCache()
+        cache.put_facts("carlos", self.FACTS)
+        cache.put_facts("carlos", self.FACTS[:2], category="pref")
+        
+        cache.put_fact({"user_id": "carlos", "category": "pref", "key": "food", "value": "sushi"})
+        cache.put_fact({"user_id": "carlos", "category": "pref", "key": "music", "value": "jazz"})
+        
+        prefs = {f["key"]: f["value"] for f in cache.get_facts("carlos", "pref")}
+        assert prefs == {"sport": "basketball", "food": "sushi", "music": "jazz"}
+        assert len(cache.get_facts("carlos")) == 4
+    
+    def test_category_read_during_writes(self):
+        """Test derived category reads are snapshots while writers mutate the collection"""
+        cache = FactCache()
+        cache.put_facts("carlos", [
+            {"user_id": "carlos", "category": "goal", "key": f"g{i}", "value": i} for i in range(500)
+        ])
+        errors = []
+        
+        def writer():
+            for i in range(20000):
+                cache.put_fact({"user_id": "carlos", "category": "pref", "key": f"k{i}", "value": i})
+                cache.remove_fact("carlos", "pref", f"k{i - 1}")
+        
+        def reader():
+            try:
+                for _ in range(300):
+                    prefs = cache.get_facts("carlos", "pref")
+                    assert all(f["category"] == "pref" for f in prefs)
+            except Exception as e:
+                errors.append(e)
+        
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(3)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            sys.setswitchinterval(interval)
+        
+        assert errors == []
+    
+    def test_remove_fact_updates_collections(self):
+        """Test remove_fact drops the fact from collections"""
+        cache = FactCache()
+        cache.put_facts("carlos", self.FACTS)
+        
+        cache.remove_fact("carlos", "pref", "sport")
+        
+        assert len(cache.get_facts("carlos")) == 2
+        assert cache.is_missing("carlos", "pref", "sport")
+    
+    def test_negative_entry(self):
+        """Test negative entries expire quickly and are replaced by writes"""
+        cache = FactCache(negative_ttl_seconds=0.1)
+        
+        cache.put_missing("carlos", "pref", "music")
+        assert cache.is_missing("carlos", "pref", "music")
+        assert cache.get_fact("carlos", "pref", "music") is None
+        
+        time.sleep(0.2)
+        assert not cache.is_missing("carlos", "pref", "music")
+        
+        cache.put_missing("carlos", "pref", "music")
+        cache.put_fact({"user_id": "carlos", "category": "pref", "key": "music", "value": "jazz"})
+        assert not cache.is_missing("carlos", "pref", "music")
+    
+    def test_invalidate_user_drops_collections(self):
+        """Test invalidate_user drops collections and negative entries"""
+        cache = FactCache()
+        cache.put_facts("carlos", self.FACTS)
+        cache.put_missing("carlos", "pref", "music")
+        
+        assert cache.invalidate_user("carlos") == 2
+        assert cache.get_facts("carlos") is None
+    
+    def test_optimizer_serves_collections(self):
+        """Test Optimizer.get_fact_cached serves get_facts() queries"""
+        optimizer = Optimizer()
+        optimizer.put_facts_cache("carlos", self.FACTS)
+        
+        facts = optimizer.get_fact_cached("carlos")
+        assert len(facts) == 3
+        assert all("user_id" in f for f in facts)
+        
+        prefs = optimizer.get_fact_cached("carlos", "pref")
+        assert {f["value"] for f in prefs} == {"basketball", "pizza"}
+        
+        optimizer.put_missing_cache("carlos", "goal", "hobby")
+        assert optimizer.is_missing_cached("carlos", "goal", "hobby")
+
+
 class TestConfiguration:
     """Test CacheConfig"""
     
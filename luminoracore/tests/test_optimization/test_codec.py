@@ -0,0 +1,128 @@
+"""
+Tests for codec.py
+Phase 1 - Quick Wins - Semana 4
+
+Test Categories:
+- TestEquivalence: Fused codec matches the multi-pass pipeline
+- TestStreaming: Lazy batch encoding through the Optimizer
+- TestStatsSampling: Sampled size statistics
+"""
+
+import json
+import pytest
+from luminoracore.optimization.codec import FactCodec
+from luminoracore.optimization.key_mapping import compress_keys, expand_keys
+from luminoracore.optimization.compact_format import CompactFact
+from luminoracore.optimization.optimizer import Optimizer, OptimizationConfig
+
+
+FACTS = [
+    {
+        "user_id": "carlos",
+        "category": "preferences",
+        "key": "favorite_sport",
+        "value": "basketball",
+        "importance": 0.85,
+        "timestamp": "2024-11-18T10:30:00Z",
+        "source": "conversation",
+        "confidence": 0.95,
+        "tags": ["sports"]
+    },
+    {"user_id": "maria", "category": "goals", "key": "career", "value": {"user_id": "x", "metadata": {"source": "chat"}}},
+    {"uid": "ana", "cat": "pref", "k": "food", "v": "pizza", "imp": 0.0},
+    {"user_id": "luis", "category": "context", "key": "city", "value": "", "confidence": 0}
+]
+
+
+class TestEquivalence:
+    """Test fused codec matches compress_keys + CompactFact pipeline"""
+    
+    @pytest.mark.parametrize("fact", FACTS)
+    def test_encode_matches_pipeline(self, fact):
+        """Test single-pass encode equals the multi-pass result"""
+        expected = CompactFact.to_array(compress_keys(fact))
+        
+        assert FactCodec().encode(fact) == expected
+    
+    @pytest.mark.parametrize("fact", FACTS)
+    def test_encode_without_compact(self, fact):
+        """Test dict mode equals compress_keys"""
+        assert FactCodec(compact_format=False).encode(fact) == compress_keys(fact)
+    
+    @pytest.mark.parametrize("fact", FACTS)
+    def test_roundtrip(self, fact):
+        """Test decode(encode(fact)) restores the fact fields"""
+        codec = FactCodec()
+        decoded = codec.decode(codec.encode(fact))
+        
+        assert decoded == {
+            k: v for k, v in expand_keys(CompactFact.from_array(CompactFact.to_array(fact))).items()
+            if v is not None and v != []
+        }
+    
+    def test_encode_minified(self):
+        """Test minified output has no whitespace"""
+        encoded = FactCodec().encode_minified(FACTS[0])
+        
+        assert " " not in encoded
+        assert json.loads(encoded) == FactCodec().encode(FACTS[0])
+
+
+class TestStreaming:
+    """Test lazy batch compression"""
+    
+    def test_iter_compress_batch_accepts_generator(self):
+        """Test generator input is consumed lazily without deduplication"""
+        optimizer = Optimizer(OptimizationConfig(deduplicate_memory=False))
+        consumed = []
+        
+        def source():
+            for fact in FACTS:
+                consumed.append(fact)
+                yield fact
+        
+        stream = optimizer.iter_compress_batch(source())
+        first = next(stream)
+        
+        assert len(consumed) == 1
+        assert first == FactCodec().encode(FACTS[0])
+        assert len(list(stream)) == len(FACTS) - 1
+    
+    def test_compress_batch_deduplicates(self):
+        """Test batch compression still merges duplicates"""
+        optimizer = Optimizer()
+        facts = [
+            {"user_id": "carlos", "category": "pref", "key": "sport", "value": "x", "importance": 0.5},
+            {"user_id": "carlos", "category": "pref", "key": "sport", "value": "x", "importance": 0.9},
+        ]
+        
+        compressed = optimizer.compress_batch(facts)
+        
+        assert len(compressed) == 1
+        assert optimizer.expand_batch(compressed)[0]["importance"] == 0.9
+
+
+class TestStatsSampling:
+    """Test sampled size statistics"""
+    
+    def test_every_call_measured_by_default(self):
+        """Test default configuration measures every compression"""
+        optimizer = Optimizer()
+        for fact in FACTS:
+            optimizer.compress(fact)
+        
+        assert optimizer.stats['sampled_compressions'] == len(FACTS)
+        assert optimizer.stats['total_reduction_percent'] > 0
+    
+    def test_sampling(self):
+        """Test only every Nth compression is measured"""
+        optimizer = Optimizer(OptimizationConfig(stats_sample_every=2))
+        for fact in FACTS:
+            optimizer.compress(fact)
+        
+        assert optimizer.stats['compressions'] == 4
+        assert optimizer.stats['sampled_compressions'] == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
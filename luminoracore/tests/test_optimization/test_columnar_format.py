@@ -0,0 +1,193 @@
+"""
+Tests for columnar_format.py
+Phase 1 - Quick Wins - Semana 2
+
+Test Categories:
+- TestColumnEncodings: Per-column encoding choice
+- TestRoundtrip: Encode/decode fidelity
+- TestOptimizerIntegration: compress_batch/expand_batch
+- TestSizeReduction: Size compared to compact JSON arrays
+"""
+
+import json
+
+import pytest
+from luminoracore.optimization import Optimizer, OptimizationConfig, get_size_reduction
+from luminoracore.optimization.columnar_format import (
+    ColumnarBatch,
+    COLUMNAR_FORMAT_VERSION,
+    to_columnar,
+    from_columnar,
+    get_columnar_size_reduction
+)
+from luminoracore.optimization.compact_format import CompactFact
+
+
+def _facts(count=60):
+    return [
+        {
+            "user_id": "carlos",
+            "category": ["preferences", "goals", "work"][i % 3],
+            "key": f"key_{i}",
+            "value": f"value {i}",
+            "importance": 0.5,
+            "timestamp": f"2024-11-18T10:{i // 60:02d}:{i % 60:02d}Z",
+            "source": "conversation",
+            "confidence": [0.8, 0.95][i % 2],
+            "tags": ["sports"] if i % 4 == 0 else []
+        }
+        for i in range(count)
+    ]
+
+
+class TestColumnEncodings:
+    """Test per-column encoding choice"""
+    
+    def test_constant_column_is_run_length_encoded(self):
+        """A single user becomes one run"""
+        payload = to_columnar(_facts())
+        
+        assert payload["c"][0] == ["r", "carlos", 60]
+    
+    def test_low_cardinality_column_is_dictionary_encoded(self):
+        """Categories become a dictionary plus indices"""
+        payload = to_columnar(_facts())
+        
+        assert payload["c"][1][0] == "d"
+        assert payload["c"][1][1] == ["preferences", "goals", "work"]
+    
+    def test_unique_column_is_plain(self):
+        """Unique keys stay plain"""
+        payload = to_columnar(_facts())
+        
+        assert payload["c"][2][0] == "p"
+    
+    def test_timestamps_are_delta_encoded(self):
+        """ISO timestamps become second deltas"""
+        payload = to_columnar(_facts())
+        column = payload["c"][CompactFact.INDICES["timestamp"]]
+        
+        assert column[0] == "t"
+        assert set(column[3:]) == {1}
+    
+    def test_mixed_types_stay_distinct(self):
+        """1, 1.0 and True are not merged by RLE or dictionaries"""
+        arrays = [["u", "c", "k", value] for value in [1, 1.0, True, 1, 1.0, True]]
+        
+        decoded = ColumnarBatch.decode(ColumnarBatch.encode(arrays))
+        
+        assert [type(row[3]) for row in decoded] == [int, float, bool, int, float, bool]
+    
+    def test_unparseable_timestamps_fall_back(self):
+        """Timestamps that don't round-trip exactly are not delta encoded"""
+        arrays = [["u", "c", "k", "v", None, ts] for ts in ["yesterday", "today", "today"]]
+        payload = ColumnarBatch.encode(arrays)
+        
+        assert payload["c"][5][0] != "t"
+        assert ColumnarBatch.decode(payload) == arrays
+    
+    def test_numeric_timestamps(self):
+        """Integer epoch timestamps are delta encoded"""
+        arrays = [["u", "c", "k", "v", None, ts] for ts in [1700000000, None, 1700000060, 1700000061]]
+        payload = ColumnarBatch.encode(arrays)
+        
+        assert payload["c"][5] == ["t", -1, 1700000000, None, 60, 1]
+        assert ColumnarBatch.decode(payload) == arrays
+
+
+class TestRoundtrip:
+    """Test encode/decode fidelity"""
+    
+    def test_facts_roundtrip(self):
+        """Columnar roundtrip matches compact array roundtrip"""
+        facts = _facts()
+        expected = CompactFact.from_array_batch(CompactFact.to_array_batch(facts))
+        
+        assert from_columnar(to_columnar(facts)) == expected
+    
+    def test_json_roundtrip(self):
+        """Payload survives JSON serialization"""
+        facts = _facts()
+        payload = json.loads(json.dumps(to_columnar(facts)))
+        
+        assert from_columnar(payload) == from_columnar(to_columnar(facts))
+    
+    def test_microsecond_timestamps(self):
+        """datetime.isoformat() timestamps round-trip exactly"""
+        stamps = ["2024-11-18T10:30:00.000001", "2024-11-18T10:30:00.500000", "2024-11-19T00:00:00.999999"]
+        arrays = [["u", "c", "k", "v", None, ts] for ts in stamps]
+        
+        assert ColumnarBatch.decode(ColumnarBatch.encode(arrays)) == arrays
+    
+    def test_repeated_tags_are_not_shared(self):
+        """Run-length decoded lists are independent copies"""
+        arrays = [["u", "c", "k", "v", None, None, None, None, ["a"]] for _ in range(3)]
+        decoded = ColumnarBatch.decode(ColumnarBatch.encode(arrays))
+        decoded[0][8].append("b")
+        
+        assert decoded[1][8] == ["a"]
+    
+    def test_ragged_rows(self):
+        """Rows with trimmed trailing fields are padded with None"""
+        arrays = [["u", "c", "k"], ["u", "c", "k2", "v"]]
+        
+        assert ColumnarBatch.decode(ColumnarBatch.encode(arrays)) == [["u", "c", "k", None], ["u", "c", "k2", "v"]]
+    
+    def test_empty_batch(self):
+        """Empty batches roundtrip"""
+        assert from_columnar(to_columnar([])) == []
+    
+    def test_decode_single_column(self):
+        """A single field can be decoded without building rows"""
+        payload = to_columnar(_facts(5))
+        
+        assert ColumnarBatch.decode_column(payload, "key") == [f"key_{i}" for i in range(5)]
+        assert ColumnarBatch.decode_column(payload, "user_id") == ["carlos"] * 5
+    
+    def test_version_check(self):
+        """Unknown versions are rejected"""
+        payload = to_columnar(_facts(3))
+        payload["v"] = COLUMNAR_FORMAT_VERSION + 1
+        
+        with pytest.raises(ValueError):
+            from_columnar(payload)
+
+
+class TestOptimizerIntegration:
+    """Test Optimizer compress_batch/expand_batch"""
+    
+    def test_columnar_batches(self):
+        """Columnar compress_batch output expands to the same facts"""
+        facts = _facts()
+        rows = Optimizer(OptimizationConfig(cache_enabled=False))
+        columnar = Optimizer(OptimizationConfig(cache_enabled=False, columnar_batches=True))
+        
+        payload = columnar.compress_batch(facts)
+        
+        assert ColumnarBatch.is_columnar(payload)
+        assert columnar.expand_batch(payload) == rows.expand_batch(rows.compress_batch(facts))
+    
+    def test_disabled_by_default(self):
+        """compress_batch keeps returning a list by default"""
+        assert isinstance(Optimizer(OptimizationConfig(cache_enabled=False)).compress_batch(_facts(3)), list)
+
+
+class TestSizeReduction:
+    """Test size compared to compact JSON arrays"""
+    
+    def test_smaller_than_arrays(self):
+        """Columnar batches are smaller than compact arrays"""
+        metrics = get_columnar_size_reduction(_facts())
+        
+        assert metrics['columnar_size'] < metrics['array_size']
+        assert metrics['reduction_percent'] > 20
+    
+    def test_measurable_with_size_helpers(self):
+        """Payloads work with the existing minifier helpers"""
+        metrics = get_size_reduction(to_columnar(_facts()))
+        
+        assert metrics['minified_size'] < metrics['original_size']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
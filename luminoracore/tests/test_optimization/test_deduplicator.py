@@ -9,13 +9,16 @@ Test Categories:
 - TestStatistics: Stats calculation
 - TestConfiguration: DeduplicationConfig
 - TestEdgeCases: Edge cases
+- TestIncremental: Write-time index and streaming deduplication
 """
 
 import pytest
 from luminoracore.optimization.deduplicator import (
     FactDeduplicator,
+    DeduplicationIndex,
     DeduplicationConfig,
-    deduplicate_facts
+    deduplicate_facts,
+    deduplicate_iter
 )
 
 
@@ -148,6 +151,17 @@ class TestMerging:
         assert "document" in sources
         assert len(sources) == 3
     
+    def test_merge_normalizes_merged_sources(self):
+        """Should strip already-merged sources and drop empty parts"""
+        facts = [
+            {"user_id": "carlos", "source": "conversation, import"},
+            {"user_id": "carlos", "source": "import,"}
+        ]
+        
+        merged = FactDeduplicator.merge_duplicates(facts)
+        
+        assert merged["source"] == "conversation,import"
+    
     def test_merge_combines_tags(self):
         """Should merge all unique tags"""
         facts = [
@@ -452,6 +466,92 @@ class TestEdgeCases:
         assert fp1 == fp2
 
 
+class TestIncremental:
+    """Test write-time index and streaming deduplication"""
+    
+    def test_fact_key_matches_fingerprint_equality(self):
+        """Cheap key should agree with SHA256 fingerprint on equality"""
+        facts = [
+            {"user_id": "carlos", "category": "pref", "key": "n", "value": 1},
+            {"user_id": "carlos", "category": "pref", "key": "n", "value": 1.0},
+            {"user_id": "carlos", "category": "pref", "key": "n", "value": True},
+            {"user_id": "carlos", "category": "pref", "key": "n", "value": "1"},
+            {"uid": "carlos", "cat": "pref", "k": "n", "v": 1},
+            {"user_id": "carlos", "category": "pref", "key": "d", "value": {"a": 1, "b": 2}},
+            {"user_id": "carlos", "category": "pref", "key": "d", "value": {"b": 2, "a": 1}},
+        ]
+        
+        for a in facts:
+            for b in facts:
+                same_key = FactDeduplicator.get_fact_key(a) == FactDeduplicator.get_fact_key(b)
+                same_fp = (FactDeduplicator.get_fact_fingerprint(a) ==
+                           FactDeduplicator.get_fact_fingerprint(b))
+                assert same_key == same_fp
+    
+    def test_index_merges_on_add(self):
+        """Index should merge duplicates at write time"""
+        index = DeduplicationIndex()
+        
+        stored, merged = index.add({"user_id": "carlos", "key": "sport", "confidence": 0.7, "source": "chat"})
+        assert merged is False
+        
+        stored, merged = index.add({"user_id": "carlos", "key": "sport", "confidence": 0.9, "source": "api"})
+        assert merged is True
+        assert stored["confidence"] == 0.9
+        assert stored["source"] == "api,chat"
+        assert len(index) == 1
+    
+    def test_repeated_merges_keep_sources_unique(self):
+        """Merging into an already merged fact shouldn't repeat sources"""
+        index = DeduplicationIndex()
+        
+        for source in ["chat", "api", "chat", "api"]:
+            stored, _ = index.add({"user_id": "carlos", "key": "sport", "source": source})
+        
+        assert stored["source"] == "api,chat"
+    
+    def test_index_discard(self):
+        """Discarded facts are no longer indexed"""
+        index = DeduplicationIndex()
+        fact = {"user_id": "carlos", "key": "sport", "value": "x"}
+        index.add(fact)
+        
+        assert fact in index
+        assert index.discard(fact) is True
+        assert fact not in index
+        assert index.discard(fact) is False
+    
+    def test_deduplicate_iter_matches_deduplicate(self):
+        """Streaming dedup should equal batch dedup on sorted input"""
+        facts = [
+            {"user_id": "ana", "category": "pref", "key": "food", "value": "pizza", "importance": 0.2},
+            {"user_id": "ana", "category": "pref", "key": "food", "value": "sushi"},
+            {"user_id": "ana", "category": "pref", "key": "food", "value": "pizza", "importance": 0.8},
+            {"user_id": "carlos", "category": "pref", "key": "sport", "value": "x"},
+            {"user_id": "carlos", "category": "pref", "key": "sport", "value": "x"},
+        ]
+        
+        streamed = list(deduplicate_iter(iter(facts)))
+        
+        assert streamed == deduplicate_facts(facts)
+        assert len(streamed) == 3
+    
+    def test_deduplicate_iter_is_lazy(self):
+        """Streaming dedup should yield before consuming the whole input"""
+        consumed = []
+        
+        def rows():
+            for i in range(1000):
+                consumed.append(i)
+                yield {"user_id": "carlos", "category": "c", "key": f"k{i}", "value": i}
+        
+        stream = deduplicate_iter(rows())
+        first = next(stream)
+        
+        assert first["key"] == "k0"
+        assert len(consumed) == 2
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
@@ -0,0 +1,311 @@
+"""
+Tests for near_duplicates.py
+Phase 1 - Quick Wins - Semana 3
+
+Test Categories:
+- TestNormalization: Text normalization and shingling
+- TestMinHash: Signatures and LSH band selection
+- TestNearDuplicateIndex: Incremental consolidation
+- TestBatchCompaction: Batch and storage compaction jobs
+- TestConfiguration: NearDuplicateConfig validation
+"""
+
+import asyncio
+
+import pytest
+from luminoracore.optimization import OptimizationConfig, Optimizer
+from luminoracore.optimization.deduplicator import FactDeduplicator
+from luminoracore.optimization.near_duplicates import (
+    NearDuplicateConfig,
+    NearDuplicateIndex,
+    MinHasher,
+    optimal_bands,
+    consolidate_near_duplicates,
+    compact_user_facts
+)
+from luminoracore.storage import InMemoryStorage
+
+
+def _fact(key, value="pizza", confidence=0.8, user_id="carlos", category="preferences"):
+    return {"user_id": user_id, "category": category, "key": key, "value": value, "confidence": confidence}
+
+
+class TestNormalization:
+    """Test text normalization"""
+    
+    def test_paraphrased_keys_normalize_equal(self):
+        """Spelling variants and filler words should normalize away"""
+        hasher = MinHasher()
+        
+        texts = {
+            hasher.normalize(_fact("favorite_food")),
+            hasher.normalize(_fact("favourite_food")),
+            hasher.normalize(_fact("Food-Preference")),
+        }
+        
+        assert texts == {"food pizza"}
+    
+    def test_shingles_cover_key_only(self):
+        """Values do not take part in candidate search"""
+        hasher = MinHasher()
+        
+        assert hasher.shingles(_fact("job_title", "senior engineer")) == hasher.shingles(_fact("job_title", "junior engineer"))
+        assert hasher.normalize_value(_fact("sport", "Football, on Sundays")) == "football on sundays"
+    
+    def test_short_keys(self):
+        """Short keys use the short key names"""
+        hasher = MinHasher()
+        
+        assert hasher.normalize({"k": "name", "v": "Ana"}) == "name ana"
+    
+    def test_short_text_single_shingle(self):
+        """Text shorter than a shingle is a single shingle"""
+        hasher = MinHasher()
+        
+        assert hasher.shingles({"key": "a"}) == frozenset({"a"})
+
+
+class TestMinHash:
+    """Test MinHash signatures and LSH parameters"""
+    
+    def test_signature_length(self):
+        """Signature has one slot per permutation"""
+        hasher = MinHasher(NearDuplicateConfig(num_permutations=32))
+        
+        assert len(hasher.signature(hasher.shingles(_fact("sport")))) == 32
+    
+    def test_signature_estimates_jaccard(self):
+        """Matching signature slots should approximate Jaccard similarity"""
+        hasher = MinHasher(NearDuplicateConfig(num_permutations=256))
+        first = hasher.shingles(_fact("weekend_sport_activity"))
+        second = hasher.shingles(_fact("weekend_sports_activities"))
+        
+        sig1, sig2 = hasher.signature(first), hasher.signature(second)
+        estimate = sum(a == b for a, b in zip(sig1, sig2)) / len(sig1)
+        
+        assert abs(estimate - MinHasher.jaccard(first, second)) < 0.15
+    
+    def test_signature_deterministic(self):
+        """Same seed should produce the same signature"""
+        shingles = MinHasher().shingles(_fact("sport"))
+        
+        assert MinHasher().signature(shingles) == MinHasher().signature(shingles)
+    
+    def test_optimal_bands(self):
+        """Bands and rows should fit in the signature"""
+        for threshold in (0.3, 0.5, 0.7, 0.9):
+            bands, rows = optimal_bands(64, threshold)
+            assert bands * rows <= 64
+        
+        # Higher thresholds need longer (stricter) bands
+        assert optimal_bands(64, 0.9)[1] > optimal_bands(64, 0.3)[1]
+
+
+class TestNearDuplicateIndex:
+    """Test incremental near-duplicate consolidation"""
+    
+    def test_paraphrases_merge(self):
+        """Paraphrased keys with the same value should merge"""
+        index = NearDuplicateIndex()
+        
+        _, replaced = index.add(_fact("favorite_food", confidence=0.8))
+        assert replaced is None
+        
+        stored, replaced = index.add(_fact("favourite_food", confidence=0.95))
+        assert replaced is not None
+        assert stored["key"] == "favourite_food"  # Most confident survives
+        assert stored["confidence"] == 0.95
+        assert len(index) == 1
+    
+    def test_different_values_do_not_merge(self):
+        """Same key with an unrelated value is not a near-duplicate"""
+        index = NearDuplicateIndex()
+        index.add(_fact("favorite_food", "pizza"))
+        index.add(_fact("favorite_food", "sushi"))
+        
+        assert len(index) == 2
+    
+    @pytest.mark.parametrize("key,older,newer", [
+        ("job_title", "senior software engineer", "junior software engineer"),
+        ("favorite_programming_language", "go", "c"),
+    ])
+    def test_similar_values_never_merge(self, key, older, newer):
+        """Near-identical values under the same key are different facts"""
+        index = NearDuplicateIndex()
+        index.add(_fact(key, older, confidence=0.9))
+        stored, replaced = index.add(_fact(key, newer, confidence=0.6))
+        
+        assert replaced is None
+        assert stored["value"] == newer
+        assert [f["value"] for f in index.facts()] == [older, newer]
+        assert index.similarity(_fact(key, older), _fact(key, newer)) == 0.0
+    
+    def test_value_punctuation_and_case_merge(self):
+        """Values equal after normalization still merge"""
+        index = NearDuplicateIndex()
+        index.add(_fact("favorite_sport", "Football, on Sundays"))
+        _, replaced = index.add(_fact("favourite_sport", "football on sundays"))
+        
+        assert replaced is not None
+        assert len(index) == 1
+    
+    def test_scoped_by_user_and_category(self):
+        """Facts of different users or categories never merge"""
+        index = NearDuplicateIndex()
+        index.add(_fact("favorite_food"))
+        index.add(_fact("favorite_food", user_id="maria"))
+        index.add(_fact("favorite_food", category="health"))
+        
+        assert len(index) == 3
+        
+        cross = NearDuplicateIndex(NearDuplicateConfig(same_category=False))
+        cross.add(_fact("favorite_food"))
+        cross.add(_fact("favorite_food", category="health"))
+        
+        assert len(cross) == 1
+    
+    def test_keep_first_policy(self):
+        """keep='first' keeps the earliest fact as the base"""
+        index = NearDuplicateIndex(NearDuplicateConfig(keep="first"))
+        index.add(_fact("favorite_food", confidence=0.5))
+        stored, _ = index.add(_fact("favourite_food", confidence=0.9))
+        
+        assert stored["key"] == "favorite_food"
+        assert stored["confidence"] == 0.9  # merge_duplicates keeps the max
+    
+    def test_keep_latest_policy(self):
+        """keep='latest' keeps the newest fact as the base"""
+        index = NearDuplicateIndex(NearDuplicateConfig(keep="latest"))
+        index.add(dict(_fact("favorite_food", confidence=0.9), timestamp="2024-11-18"))
+        stored, _ = index.add(dict(_fact("favourite_food", confidence=0.5), timestamp="2024-11-19"))
+        
+        assert stored["key"] == "favourite_food"
+    
+    def test_sources_are_combined(self):
+        """Merged facts combine sources like exact duplicates do"""
+        index = NearDuplicateIndex()
+        index.add(dict(_fact("favorite_food"), source="chat"))
+        stored, _ = index.add(dict(_fact("food_preference"), source="import"))
+        
+        assert stored["source"] == "chat,import"
+    
+    def test_find_does_not_add(self):
+        """find() looks up without indexing"""
+        index = NearDuplicateIndex()
+        index.add(_fact("favorite_food"))
+        
+        assert index.find(_fact("favourite_food"))["key"] == "favorite_food"
+        assert index.find(_fact("hometown", "Madrid")) is None
+        assert len(index) == 1
+    
+    def test_threshold(self):
+        """A strict threshold only merges identical text"""
+        index = NearDuplicateIndex(NearDuplicateConfig(threshold=1.0))
+        index.add(_fact("favorite_sport", "football on sundays"))
+        index.add(_fact("favorite_sport", "football on saturdays"))
+        index.add(_fact("favourite_sport", "football on sundays"))
+        
+        assert len(index) == 2
+
+
+class TestBatchCompaction:
+    """Test batch and storage compaction jobs"""
+    
+    def test_consolidate_batch(self):
+        """Batch consolidation collapses paraphrase groups"""
+        facts = [
+            _fact("favorite_food"),
+            _fact("favourite_food"),
+            _fact("food_preference"),
+            _fact("hometown", "Madrid"),
+            _fact("home_town", "Madrid"),
+            _fact("profession", "developer", category="work"),
+        ]
+        
+        result = consolidate_near_duplicates(facts)
+        
+        assert len(result) == 3
+        assert {f["category"] for f in result} == {"preferences", "work"}
+    
+    def test_deduplicator_stage(self):
+        """FactDeduplicator exposes the near-duplicate stage"""
+        facts = [_fact("favorite_food"), _fact("favourite_food")]
+        
+        assert len(FactDeduplicator.consolidate_near_duplicates(facts)) == 1
+    
+    def test_optimizer_stage(self):
+        """Optimizer runs the near-duplicate stage when configured"""
+        facts = [_fact("favorite_food"), _fact("favourite_food"), _fact("hometown", "Madrid")]
+        
+        plain = Optimizer(OptimizationConfig(cache_enabled=False))
+        near = Optimizer(OptimizationConfig(cache_enabled=False, near_duplicate_threshold=0.7))
+        
+        assert len(plain.compress_batch(facts)) == 3
+        assert len(near.compress_batch(facts)) == 2
+    
+    def test_compact_keeps_different_values(self):
+        """Storage compaction never deletes a fact whose value differs"""
+        storage = InMemoryStorage()
+        
+        async def scenario():
+            await storage.save_fact("carlos", "work", "job_title", "senior software engineer", confidence=0.9)
+            await storage.save_fact("carlos", "work", "current_job_title", "junior software engineer", confidence=0.6)
+            await storage.save_fact("carlos", "work", "favorite_programming_language", "go", confidence=0.9)
+            await storage.save_fact("carlos", "work", "preferred_programming_language", "c", confidence=0.6)
+            stats = await compact_user_facts(storage, "carlos")
+            return stats, await storage.get_facts("carlos")
+        
+        stats, facts = asyncio.run(scenario())
+        
+        assert stats["removed_count"] == 0
+        values = {f["key"]: f["value"] for f in facts}
+        assert values["current_job_title"] == "junior software engineer"
+        assert values["job_title"] == "senior software engineer"
+        assert values["preferred_programming_language"] == "c"
+    
+    def test_compact_user_facts(self):
+        """Storage compaction deletes absorbed variants"""
+        storage = InMemoryStorage()
+        
+        async def scenario():
+            await storage.save_fact("carlos", "preferences", "favorite_food", "pizza", confidence=0.7)
+            await storage.save_fact("carlos", "preferences", "favourite_food", "pizza", confidence=0.9)
+            await storage.save_fact("carlos", "preferences", "food_preference", "pizza", confidence=0.8)
+            await storage.save_fact("carlos", "personal_info", "name", "Carlos", confidence=0.99)
+            stats = await compact_user_facts(storage, "carlos")
+            return stats, await storage.get_facts("carlos")
+        
+        stats, facts = asyncio.run(scenario())
+        
+        assert stats["removed_count"] == 2
+        assert stats["compacted_count"] == 2
+        assert sorted(f["key"] for f in facts) == ["favourite_food", "name"]
+
+
+class TestConfiguration:
+    """Test NearDuplicateConfig validation"""
+    
+    def test_defaults(self):
+        """Default configuration"""
+        config = NearDuplicateConfig()
+        
+        assert config.threshold == 0.7
+        assert config.same_category is True
+        assert config.keep == "confidence"
+    
+    @pytest.mark.parametrize("kwargs", [
+        {"threshold": 0},
+        {"threshold": 1.5},
+        {"num_permutations": 0},
+        {"shingle_size": 0},
+        {"max_variants": 0},
+        {"keep": "random"},
+    ])
+    def test_invalid(self, kwargs):
+        """Invalid parameters raise ValueError"""
+        with pytest.raises(ValueError):
+            NearDuplicateConfig(**kwargs)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
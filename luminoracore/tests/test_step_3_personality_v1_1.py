@@ -4,7 +4,9 @@ Test Step 3: Personality v1.1 Extensions
 Validates hierarchical personality and mood system classes
 """
 
+import json
 import pytest
+from copy import deepcopy
 from pathlib import Path
 import sys
 
@@ -25,6 +27,7 @@ from luminoracore.core.personality_v1_1 import (
 )
 
 from luminoracore.core.compiler_v1_1 import DynamicPersonalityCompiler
+from luminoracore.tools.compiler import LLMProvider
 
 
 class TestAffinityRange:
@@ -126,6 +129,30 @@ class TestHierarchicalConfig:
         
         level = config.get_level_for_affinity(30)
         assert level is None  # Gap in ranges
+    
+    def test_level_lookup_matches_linear_scan(self):
+        """Test bisect lookup against the range order, gaps and overlaps"""
+        config = HierarchicalConfig.from_dict({
+            "enabled": True,
+            "relationship_levels": [
+                {"name": "friend", "affinity_range": [41, 60]},
+                {"name": "stranger", "affinity_range": [0, 20]},
+                {"name": "wide", "affinity_range": [10, 50]},
+            ]
+        })
+        
+        for points in range(-5, 106):
+            expected = next(
+                (level for level in config.relationship_levels if level.applies_to_affinity(points)),
+                None
+            )
+            assert config.get_level_for_affinity(points) is expected
+        assert config.get_level_for_affinity(20.5).name == "wide"
+        
+        config.relationship_levels.append(
+            RelationshipLevelConfig.from_dict({"name": "soulmate", "affinity_range": [61, 100]})
+        )
+        assert config.get_level_for_affinity(80).name == "soulmate"
 
 
 class TestDynamicCompiler:
@@ -190,6 +217,60 @@ class TestDynamicCompiler:
         
         # Base should be unchanged
         assert base["advanced_parameters"]["empathy"] == 0.9
+    
+    def test_variants_are_memoized_and_read_only(self):
+        """Test that each (level, mood) variant is built once and shared"""
+        base = {
+            "advanced_parameters": {"empathy": 0.5},
+            "hierarchical_config": {
+                "enabled": True,
+                "relationship_levels": [
+                    {"name": "stranger", "affinity_range": [0, 40]},
+                    {"name": "friend", "affinity_range": [41, 100],
+                     "modifiers": {"advanced_parameters": {"empathy": 0.2}}}
+                ]
+            },
+            "mood_config": {
+                "enabled": True,
+                "moods": {"happy": {"modifiers": {"advanced_parameters": {"empathy": 0.1}}}}
+            }
+        }
+        
+        extensions = PersonalityV11Extensions.from_personality_dict(base)
+        compiler = DynamicPersonalityCompiler(base, extensions)
+        
+        assert compiler.compile(50, "happy") is compiler.compile(90, "happy")
+        assert compiler.compile(50, "happy") is not compiler.compile(50)
+        assert compiler.compile(10, "unknown") is compiler.compile(20)
+        assert compiler.compile(50, "happy")["advanced_parameters"]["empathy"] == pytest.approx(0.8)
+        
+        compiled = compiler.compile(50)
+        with pytest.raises(TypeError):
+            compiled["advanced_parameters"]["empathy"] = 0.0
+        copy = deepcopy(compiled)
+        copy["advanced_parameters"]["empathy"] = 0.0
+        assert compiler.compile(50)["advanced_parameters"]["empathy"] == pytest.approx(0.7)
+        
+        assert compiler.precompile() == 6  # (none, stranger, friend) x (none, happy)
+    
+    def test_provider_prompt_includes_prompt_additions(self):
+        """Test provider prompts are memoized and carry level prompt additions"""
+        base_path = Path(__file__).parent.parent / "luminoracore" / "personalities" / "dr_luna_v1_1.json"
+        base = json.loads(base_path.read_text(encoding="utf-8"))
+        base["hierarchical_config"]["relationship_levels"][0]["modifiers"]["system_prompt_additions"] = {
+            "prefix": "[formal] "
+        }
+        
+        extensions = PersonalityV11Extensions.from_personality_dict(base)
+        compiler = DynamicPersonalityCompiler(base, extensions)
+        
+        stranger = compiler.compile_for_provider(LLMProvider.OPENAI, affinity_points=5)
+        assert compiler.compile_for_provider(LLMProvider.OPENAI, affinity_points=15) is stranger
+        assert stranger.metadata["relationship_level"] == "stranger"
+        assert stranger.prompt["messages"][0]["content"].startswith("[formal] You are")
+        
+        other = compiler.compile_for_provider(LLMProvider.OPENAI, affinity_points=30)
+        assert not other.prompt["messages"][0]["content"].startswith("[formal]")
 
 
 class TestPersonalityV11Extensions:
@@ -9,6 +9,7 @@ import tempfile
 
 from luminoracore.core.personality import Personality
 from luminoracore.tools.validator import PersonalityValidator, ValidationResult
+from luminoracore.tools.batch_validator import BatchValidator
 
 
 class TestPersonalityValidator:
@@ -322,3 +323,134 @@ class TestPersonalityValidator:
         # Should be valid but with coherence suggestions
         assert result.is_valid
         assert len(result.suggestions) > 0
+
+
+def _personality_data(name):
+    return {
+        "persona": {
+            "name": name,
+            "version": "1.0.0",
+            "description": "Personality for batch validation tests",
+            "author": "Test Author",
+            "tags": ["test"],
+            "language": "en",
+            "compatibility": ["openai"]
+        },
+        "core_traits": {
+            "archetype": "scientist",
+            "temperament": "calm",
+            "communication_style": "formal"
+        },
+        "linguistic_profile": {
+            "tone": ["professional"],
+            "syntax": "varied",
+            "vocabulary": ["test", "example", "sample", "valid", "data"]
+        },
+        "behavioral_rules": [
+            "Always provide accurate information",
+            "Be helpful and supportive",
+            "Maintain professional communication"
+        ]
+    }
+
+
+def _write_catalog(directory, count):
+    for i in range(count):
+        data = _personality_data(f"Batch {i}")
+        if i % 5 == 0:
+            del data["core_traits"]
+        (directory / f"p{i:03d}.json").write_text(json.dumps(data), encoding="utf-8")
+    (directory / "broken.json").write_text("{not json", encoding="utf-8")
+
+
+class TestBatchValidator:
+    """Test cases for BatchValidator."""
+    
+    def test_matches_single_file_validation(self, tmp_path):
+        """Test that batch results equal validating each file on its own."""
+        _write_catalog(tmp_path, 12)
+        validator = PersonalityValidator()
+        expected = {path.name: validator.validate(path) for path in tmp_path.glob("*.json")}
+        
+        sequential = BatchValidator(validator, max_workers=1).validate_directory(tmp_path)
+        in_process = BatchValidator(validator, max_workers=2, chunk_size=100).validate_directory(tmp_path)
+        
+        assert sequential == expected
+        assert in_process == expected
+        assert not expected["p000.json"].is_valid
+        assert expected["p001.json"].is_valid
+        assert not expected["broken.json"].is_valid
+    
+    def test_process_pool_streams_all_results(self, tmp_path):
+        """Test that the process pool validates every file once."""
+        _write_catalog(tmp_path, 20)
+        validator = PersonalityValidator()
+        expected = {path.name: validator.validate(path) for path in tmp_path.glob("*.json")}
+        
+        items = list(BatchValidator(validator, max_workers=2, chunk_size=3).iter_directory(tmp_path))
+        
+        assert sorted(item.path.name for item in items) == sorted(expected)
+        assert {item.path.name: item.result for item in items} == expected
+        assert not any(item.cached for item in items)
+    
+    def test_process_pool_uses_custom_rules(self, tmp_path):
+        """Test that workers apply the caller's customised validation rules."""
+        _write_catalog(tmp_path, 6)
+        validator = PersonalityValidator()
+        validator.validation_rules["quality_rules"]["min_behavioral_rules"] = 10
+        expected = {path.name: validator.validate(path) for path in tmp_path.glob("*.json")}
+        
+        items = list(BatchValidator(validator, max_workers=2, chunk_size=2).iter_directory(tmp_path))
+        
+        assert {item.path.name: item.result for item in items} == expected
+        assert any("minimum 10" in warning for warning in expected["p001.json"].warnings)
+    
+    def test_incremental_cache(self, tmp_path):
+        """Test that unchanged files are served from the cache."""
+        catalog = tmp_path / "catalog"
+        catalog.mkdir()
+        _write_catalog(catalog, 6)
+        cache_path = tmp_path / "validation-cache.json"
+        
+        first = list(BatchValidator(max_workers=1, cache_path=cache_path).iter_directory(catalog))
+        assert cache_path.exists()
+        assert not any(item.cached for item in first)
+        
+        (catalog / "p000.json").write_text(json.dumps(_personality_data("Fixed")), encoding="utf-8")
+        batch = BatchValidator(max_workers=1, cache_path=cache_path)
+        second = {item.path.name: item for item in batch.iter_directory(catalog)}
+        
+        assert not second["p000.json"].cached
+        assert second["p000.json"].result.is_valid
+        assert all(item.cached for name, item in second.items() if name != "p000.json")
+        assert {name: item.result for name, item in second.items() if name != "p000.json"} == {
+            item.path.name: item.result for item in first if item.path.name != "p000.json"
+        }
+        assert batch.cache.hits == len(second) - 1
+    
+    def test_cache_invalidated_by_validator_options(self, tmp_path):
+        """Test that cached results are not reused with different validation options."""
+        catalog = tmp_path / "catalog"
+        catalog.mkdir()
+        _write_catalog(catalog, 3)
+        cache_path = tmp_path / "validation-cache.json"
+        
+        list(BatchValidator(max_workers=1, cache_path=cache_path).iter_directory(catalog))
+        validator = PersonalityValidator(enable_performance_checks=False)
+        items = list(BatchValidator(validator, max_workers=1, cache_path=cache_path).iter_directory(catalog))
+        
+        assert not any(item.cached for item in items)
+    
+    def test_validate_directory_options(self, tmp_path):
+        """Test recursive and cached validation through PersonalityValidator."""
+        nested = tmp_path / "catalog" / "nested"
+        nested.mkdir(parents=True)
+        _write_catalog(nested, 2)
+        cache_path = tmp_path / "validation-cache.json"
+        
+        validator = PersonalityValidator()
+        results = validator.validate_directory(tmp_path / "catalog", recursive=True, cache_path=cache_path)
+        
+        assert set(results) == {"nested/p000.json", "nested/p001.json", "nested/broken.json"}
+        assert validator.validate_directory(tmp_path / "catalog") == {}
+        assert validator.validate_directory(tmp_path / "missing") == {}